@@ -0,0 +1,153 @@
+"""
+Benchmark finance queries over several years of transactions between many
+accounts, with each finance engine.
+
+Times are for the query only (from the transaction item set to the output
+before tabulating), not for loading the manifest.
+
+Run from the repo root with:
+
+    python -m benchmarks.finance_engines
+"""
+
+import random
+from argparse import Namespace
+from datetime import date, timedelta
+from unittest.mock import Mock
+
+from benchmarks.utils import best_time, format_time, print_results
+from modules.finance import FinanceModule
+from modules.manifest_lang.parse import parse_manifest
+from modules.manifest_modules.finance import Finance
+from modules.manifest_modules.financial_account import FinancialAccount
+from modules.manifest_modules.financial_transaction import FinancialTransaction
+
+NUM_TRANSACTIONS = 50_000
+
+QUERIES = {
+    'window': {'window': '2022-01-01:2022-12-31'},
+    'group by account, sum': {'group_by_account': True, 'aggregate': 'sum'},
+    'distribute 7, group by month, sum': {
+        'distribute': '7', 'group_by_time': 'month', 'aggregate': 'sum'
+    },
+    'distribute 1, group by account + month, sum': {
+        'distribute': '1', 'group_by_account': True, 'group_by_time': 'month',
+        'aggregate': 'sum'
+    },
+    'window, distribute 1, group by account + month, median': {
+        'window': '2022-01-01:2022-12-31', 'distribute': '1',
+        'group_by_account': True, 'group_by_time': 'month',
+        'aggregate': 'median'
+    },
+    'distribute 30, group by account, filter, max': {
+        'distribute': '30', 'group_by_account': True,
+        'filter_groups': 'account-type=bank', 'aggregate': 'max'
+    }
+}
+
+def make_finance_manifest_text(
+        num_transactions: int,
+        years: int = 5,
+        seed: int = 0
+):
+    rand = random.Random(seed)
+    banks = [f'bank{i}' for i in range(5)]
+    shops = [f'shop{i}' for i in range(50)]
+    start = date(2019, 1, 1)
+
+    lines = ['@finance {', '@account (type: bank) {']
+    lines.extend(f'  {account}' for account in banks)
+    lines.append('}')
+    lines.append('@account (type: shop) {')
+    lines.extend(f'  {account}' for account in shops)
+    lines.append('}')
+    lines.append('@transaction (default-account: bank0) {')
+    for i in range(num_transactions):
+        paid = start + timedelta(days=rand.randrange(years * 365))
+        # Some transactions (eg. bills) pay for a period of time
+        cover = ''
+        if rand.random() < 0.2:
+            cover_end = paid + timedelta(days=rand.choice((6, 29, 90, 364)))
+            cover = f'coverStart: {paid}, coverEnd: {cover_end}, '
+        lines.append(
+            f'  transaction{i} ('
+                f'from: {rand.choice(banks)}, '
+                f'to: {rand.choice(shops)}, '
+                f'paid: {paid}, {cover}'
+                f'amount: {rand.randrange(100_000) / 100:.2f}'
+            ')'
+        )
+    lines.extend(['}', '}'])
+    return '\n'.join(lines)+'\n'
+
+def load_transactions(text: str):
+    manifest, _ = parse_manifest(Mock(), 'finance', text, 'native', {
+        'finance': [Finance],
+        'account': [FinancialAccount],
+        'transaction': [FinancialTransaction]
+    })
+    return {
+        ref: item
+        for ref, item in manifest.items().items()
+        if 'transaction' in item['tags']
+    }
+
+def query(engine: str, transactions, args: dict):
+    mod = Mock()
+    mod.phase.create_process.return_value = (
+        lambda phase, run_by_default=None: (
+            run_by_default if run_by_default is not None else True
+        )
+    )
+    mod.manifest.get_item_set.return_value = transactions
+    mod.manifest.get_cache_key.return_value = 'manifest-version'
+    mod.cache.get.side_effect = KeyError
+
+    finance = FinanceModule()
+    finance.configure(mod=mod, env=Namespace(
+        ENGINE=engine, MATERIALISE_AGGREGATES=0
+    ))
+    return finance(
+        mod=mod,
+        args=Namespace(**{
+            'window': None,
+            'distribute': None,
+            'filter_transactions': None,
+            'group_by_account': False,
+            'group_by_time': None,
+            'filter_groups': None,
+            'aggregate': None,
+            'output_is_forward': True,
+            'min_phase': None,
+            'max_phase': None,
+            **args
+        }),
+        forwarded_data=None
+    )
+
+def main():
+    transactions = load_transactions(
+        make_finance_manifest_text(NUM_TRANSACTIONS)
+    )
+
+    rows = []
+    for name, args in QUERIES.items():
+        rows.append([
+            name,
+            *(
+                format_time(best_time(
+                    lambda: query(engine, transactions, args),
+                    repeat=1 if engine == 'dict' else 3
+                ))
+                for engine in FinanceModule.ENGINES
+            )
+        ])
+
+    print_results(
+        f'Finance queries over {NUM_TRANSACTIONS} transactions (5 years)',
+        ['query', *FinanceModule.ENGINES],
+        rows
+    )
+
+if __name__ == '__main__':
+    main()
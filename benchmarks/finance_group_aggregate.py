@@ -0,0 +1,96 @@
+"""
+Benchmark grouping and aggregating transactions with the dict finance engine,
+in separate stages (building each group set, then aggregating it) and in a
+single pass (see `GroupAggregation`).
+
+Times are for the grouping, group filtering, and aggregating stages only.
+
+Run from the repo root with:
+
+    python -m benchmarks.finance_group_aggregate
+"""
+
+from argparse import Namespace
+from unittest.mock import Mock
+
+from benchmarks.finance_engines import (
+    load_transactions,
+    make_finance_manifest_text,
+    query
+)
+from benchmarks.utils import best_time, format_time, print_results
+from modules.finance import FinanceModule
+
+NUM_TRANSACTIONS = 50_000
+
+QUERIES = {
+    'sum': {'aggregate': 'sum'},
+    'group by account, sum': {'group_by_account': True, 'aggregate': 'sum'},
+    'group by account + month, mean': {
+        'group_by_account': True, 'group_by_time': 'month',
+        'aggregate': 'mean'
+    },
+    'group by account + week, median': {
+        'group_by_account': True, 'group_by_time': 'week',
+        'aggregate': 'median'
+    },
+    'group by account, filter, max': {
+        'group_by_account': True, 'filter_groups': 'account-type=bank',
+        'aggregate': 'max'
+    }
+}
+
+def group_separately(finance: FinanceModule, transactions, args: dict):
+    groups = finance._wrap_in_group(transactions)
+    if args.get('group_by_account', False):
+        groups = finance._group_by_account(groups)
+    if args.get('group_by_time') is not None:
+        groups = finance._group_by_time(groups, args['group_by_time'])
+    if args.get('filter_groups') is not None:
+        groups = finance._filter_groups(groups, args['filter_groups'])
+    return finance._aggregate(groups, args['aggregate'])
+
+def group_in_one_pass(finance: FinanceModule, transactions, args: dict):
+    groups = finance._wrap_in_group(transactions, deferred=True)
+    if args.get('group_by_account', False):
+        groups = finance._group_by_account(groups)
+    if args.get('group_by_time') is not None:
+        groups = finance._group_by_time(groups, args['group_by_time'])
+    if args.get('filter_groups') is not None:
+        groups = finance._filter_groups(groups, args['filter_groups'])
+    return finance._aggregate(groups, args['aggregate'])
+
+def main():
+    # Distributed and finalised transactions, as the grouping stages get them
+    [transactions] = query(
+        'dict',
+        load_transactions(make_finance_manifest_text(NUM_TRANSACTIONS)),
+        {'distribute': '30', 'aggregate': None}
+    ).values()
+
+    finance = FinanceModule()
+    finance.configure(mod=Mock(), env=Namespace(
+        ENGINE='dict', MATERIALISE_AGGREGATES=0
+    ))
+
+    rows = []
+    for name, args in QUERIES.items():
+        rows.append([
+            name,
+            format_time(best_time(
+                lambda: group_separately(finance, transactions, args)
+            )),
+            format_time(best_time(
+                lambda: group_in_one_pass(finance, transactions, args)
+            ))
+        ])
+
+    print_results(
+        f'Group and aggregate {len(transactions)} distributed transactions'
+        f' ({NUM_TRANSACTIONS} before distributing)',
+        ['query', 'separate stages', 'one pass'],
+        rows
+    )
+
+if __name__ == '__main__':
+    main()
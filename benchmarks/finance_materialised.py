@@ -0,0 +1,122 @@
+"""
+Benchmark repeated finance report queries over several years of transactions,
+run in full, answered from their materialised aggregate for the same version of
+the manifest, and with their materialised aggregate updated after a few
+transactions were added to the manifest.
+
+Materialised aggregates are pickled and unpickled, as they are when persisted
+in the cache.
+
+Run from the repo root with:
+
+    python -m benchmarks.finance_materialised
+"""
+
+import pickle
+from argparse import Namespace
+from unittest.mock import Mock
+
+from benchmarks.finance_engines import (
+    load_transactions,
+    make_finance_manifest_text
+)
+from benchmarks.utils import best_time, format_time, print_results
+from modules.finance import FinanceModule
+
+NUM_TRANSACTIONS = 50_000
+NUM_ADDED = 5
+
+QUERIES = {
+    'group by account, sum': {'group_by_account': True, 'aggregate': 'sum'},
+    'distribute 1, group by account + month, sum': {
+        'distribute': '1', 'group_by_account': True, 'group_by_time': 'month',
+        'aggregate': 'sum'
+    },
+    'distribute 7, group by week, mean': {
+        'distribute': '7', 'group_by_time': 'week', 'aggregate': 'mean'
+    }
+}
+
+def query(transactions, cache: dict, manifest_key: str, args: dict, materialise):
+    mod = Mock()
+    mod.phase.create_process.return_value = (
+        lambda phase, run_by_default=None: (
+            run_by_default if run_by_default is not None else True
+        )
+    )
+    mod.manifest.get_item_set.return_value = transactions
+    mod.manifest.get_cache_key.return_value = manifest_key
+    mod.cache.get.side_effect = lambda name: pickle.loads(cache[name])
+    mod.cache.set.side_effect = (
+        lambda name, data: cache.__setitem__(name, pickle.dumps(data))
+    )
+    mod.cache.get_ref.side_effect = lambda ref: cache['refs/'+ref]
+    mod.cache.set_ref.side_effect = (
+        lambda ref, entries: cache.__setitem__('refs/'+ref, entries)
+    )
+
+    finance = FinanceModule()
+    finance.configure(mod=mod, env=Namespace(
+        ENGINE='dict', MATERIALISE_AGGREGATES=int(materialise)
+    ))
+    return finance(
+        mod=mod,
+        args=Namespace(**{
+            'window': None,
+            'distribute': None,
+            'filter_transactions': None,
+            'group_by_account': False,
+            'group_by_time': None,
+            'filter_groups': None,
+            'aggregate': None,
+            'output_is_forward': True,
+            'min_phase': None,
+            'max_phase': None,
+            **args
+        }),
+        forwarded_data=None
+    )
+
+def main():
+    # The same transactions, with the last few added the next day
+    transactions = load_transactions(make_finance_manifest_text(
+        NUM_TRANSACTIONS + NUM_ADDED
+    ))
+    previous_transactions = dict(
+        list(transactions.items())[:NUM_TRANSACTIONS]
+    )
+
+    rows = []
+    for name, args in QUERIES.items():
+        cache = {}
+        query(previous_transactions, cache, 'previous', args, materialise=True)
+        rows.append([
+            name,
+            format_time(best_time(
+                lambda: query(transactions, {}, 'current', args, False),
+                repeat=1
+            )),
+            format_time(best_time(
+                lambda: query(
+                    previous_transactions, cache, 'previous', args, True
+                )
+            )),
+            format_time(best_time(
+                # Update from the previous version each time
+                lambda: query(transactions, dict(cache), 'current', args, True)
+            ))
+        ])
+
+    print_results(
+        f'Finance queries over {NUM_TRANSACTIONS} transactions (5 years)',
+        [
+            'query',
+            'full query',
+            'materialised (unchanged)',
+            f'materialised ({NUM_ADDED} added)'
+        ],
+        rows
+    )
+
+if __name__ == '__main__':
+    main()
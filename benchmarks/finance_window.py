@@ -0,0 +1,126 @@
+"""
+Benchmark finance queries for a one month window over ten years of
+transactions, with and without the cover period index (see `CoverIndex`).
+
+The transactions are loaded from a compiled manifest, as they are from the
+cache, so that only the transactions that are used are decoded. Times include
+getting the item set from the compiled manifest, but not reading it.
+
+Run from the repo root with:
+
+    python -m benchmarks.finance_window
+"""
+
+from argparse import Namespace
+from unittest.mock import Mock
+
+from benchmarks.finance_engines import make_finance_manifest_text
+from benchmarks.utils import best_time, format_time, print_results
+from modules.finance import FinanceModule
+from modules.manifest import Manifest
+from modules.manifest_lang.parse import parse_manifest
+from modules.manifest_modules.finance import Finance
+from modules.manifest_modules.financial_account import FinancialAccount
+from modules.manifest_modules.financial_transaction import FinancialTransaction
+from modules.manifest_utils.compiled_manifest import (
+    CompiledManifest,
+    compile_manifest
+)
+
+NUM_TRANSACTIONS = 100_000
+YEARS = 10
+
+QUERIES = {
+    'window': {'window': '2024-03-01:2024-03-31'},
+    'window, group by account, sum': {
+        'window': '2024-03-01:2024-03-31', 'group_by_account': True,
+        'aggregate': 'sum'
+    },
+    'window, distribute 1, group by day, sum': {
+        'window': '2024-03-01:2024-03-31', 'distribute': '1',
+        'group_by_time': 'day', 'aggregate': 'sum'
+    }
+}
+
+class FullScanFinanceModule(FinanceModule):
+    """The finance module as it was without the cover period index."""
+
+    def _overlapping(self, mod, item_set, window_start, window_end):
+        return item_set
+
+def compile_transactions(text: str) -> CompiledManifest:
+    manifest, _ = parse_manifest(Mock(), 'finance', text, 'native', {
+        'finance': [Finance],
+        'account': [FinancialAccount],
+        'transaction': [FinancialTransaction]
+    })
+    return CompiledManifest(compile_manifest(manifest.raw()))
+
+def query(finance_module_type, compiled: CompiledManifest, cache: dict, args):
+    # A new manifest each time, so that no items are already decoded
+    manifest = Manifest.from_raw(Mock(), compiled.raw())
+
+    mod = Mock()
+    mod.phase.create_process.return_value = (
+        lambda phase, run_by_default=None: (
+            run_by_default if run_by_default is not None else True
+        )
+    )
+    mod.manifest.get_item_set.return_value = manifest.item_sets()['transaction']
+    mod.manifest.get_cache_key.return_value = 'manifest-version'
+    mod.cache.get.side_effect = lambda name: cache[name]
+    mod.cache.set.side_effect = lambda name, data: cache.__setitem__(name, data)
+
+    finance = finance_module_type()
+    finance.configure(mod=mod, env=Namespace(
+        ENGINE='dict', MATERIALISE_AGGREGATES=0
+    ))
+    return finance(
+        mod=mod,
+        args=Namespace(**{
+            'window': None,
+            'distribute': None,
+            'filter_transactions': None,
+            'group_by_account': False,
+            'group_by_time': None,
+            'filter_groups': None,
+            'aggregate': None,
+            'output_is_forward': True,
+            'min_phase': None,
+            'max_phase': None,
+            **args
+        }),
+        forwarded_data=None
+    )
+
+def main():
+    compiled = compile_transactions(
+        make_finance_manifest_text(NUM_TRANSACTIONS, years=YEARS)
+    )
+
+    warm_cache = {}
+    query(FinanceModule, compiled, warm_cache, {'window': '2024-01-01:2024-01-01'})
+
+    rows = []
+    for name, args in QUERIES.items():
+        rows.append([
+            name,
+            format_time(best_time(
+                lambda: query(FullScanFinanceModule, compiled, {}, args)
+            )),
+            format_time(best_time(
+                lambda: query(FinanceModule, compiled, {}, args)
+            )),
+            format_time(best_time(
+                lambda: query(FinanceModule, compiled, warm_cache, args)
+            ))
+        ])
+
+    print_results(
+        f'Finance queries over {NUM_TRANSACTIONS} transactions ({YEARS} years)',
+        ['query', 'full scan', 'index (building)', 'index (cached)'],
+        rows
+    )
+
+if __name__ == '__main__':
+    main()
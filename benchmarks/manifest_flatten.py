@@ -0,0 +1,78 @@
+"""
+Benchmark flattening a manifest item set into a table for output.
+
+Run from the repo root with:
+
+    python -m benchmarks.manifest_flatten
+"""
+
+import random
+from unittest.mock import Mock
+
+from benchmarks.utils import best_time, format_time, print_results
+from modules.manifest import Manifest, ManifestModule
+
+SIZES = (1_000, 10_000, 100_000)
+LEGACY_MAX_SIZE = 1_000
+
+def make_items(num_items: int, seed: int = 0):
+    rand = random.Random(seed)
+    tag_names = [f'tag{i}' for i in range(20)]
+    return {
+        f'item{i}': {
+            'ref': f'item{i}',
+            'tags': {
+                **{tag: None for tag in rand.sample(tag_names, 3)},
+                'kind': rand.choice(['a', 'b', 'c'])
+            }
+        }
+        for i in range(num_items)
+    }
+
+def make_module(items):
+    manifest = ManifestModule(Mock())
+    manifest._global_manifest = Manifest(Mock(), items, {})
+    return manifest
+
+def legacy_flatten(manifest: ManifestModule, item_set):
+    # The previous implementation, which re-collated the column schema for
+    # every item, then built a list of dicts for TrModule to re-tabulate.
+    objs = [
+        {
+            'ref': item['ref'],
+            **{
+                f':{tag}': manifest._format_item_tag(item, tag)
+                for tag in manifest._all_tags(item_set)
+            },
+            **{
+                f'.{prop}': manifest._format_item_prop(item, prop)
+                for prop in manifest._all_extra_props(item_set)
+            }
+        }
+        for item in item_set.values()
+    ]
+    headers = list(dict.fromkeys(key for obj in objs for key in obj))
+    return [headers, *([obj.get(key) for key in headers] for obj in objs)]
+
+def main():
+    rows = []
+    for size in SIZES:
+        items = make_items(size)
+        manifest = make_module(items)
+
+        columnar = best_time(lambda: manifest._tabulate_flattened_items(items))
+        legacy = (
+            best_time(lambda: legacy_flatten(manifest, items), repeat=1)
+            if size <= LEGACY_MAX_SIZE
+            else None
+        )
+        rows.append([size, format_time(legacy), format_time(columnar)])
+
+    print_results(
+        'Flatten item set to table',
+        ['items', 'legacy', 'columnar'],
+        rows
+    )
+
+if __name__ == '__main__':
+    main()
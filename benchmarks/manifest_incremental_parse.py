@@ -0,0 +1,80 @@
+"""
+Benchmark reparsing a large manifest after a small edit, from scratch and
+incrementally from the parsed blocks of the previous version.
+
+Run from the repo root with:
+
+    python -m benchmarks.manifest_incremental_parse
+"""
+
+import pickle
+import random
+from unittest.mock import Mock
+
+from benchmarks.utils import best_time, format_time, print_results
+from modules.manifest_lang.incremental import parse_manifest_blocks
+from modules.manifest_lang.parse import parse_manifest
+
+NUM_ITEMS = 50_000
+
+def make_manifest_lines(num_items: int, seed: int = 0):
+    rand = random.Random(seed)
+    tag_names = [f'tag{i}' for i in range(20)]
+    return [
+        f'item{i} ('
+            + ', '.join(rand.sample(tag_names, 3))
+            + f', kind: {rand.choice(["a", "b", "c"])}'
+        + ')\n'
+        for i in range(num_items)
+    ]
+
+def main():
+    lines = make_manifest_lines(NUM_ITEMS)
+    text = ''.join(lines)
+    _, previous_blocks = parse_manifest(Mock(), 'root', text, 'native', {'root': []})
+    previous = pickle.loads(previous_blocks) # type: ignore
+
+    middle = len(lines) // 2
+    edits = {
+        'append 10 items': text + ''.join(
+            f'new{i} (tag1, kind: a)\n' for i in range(10)
+        ),
+        'edit middle item': ''.join(
+            lines[:middle] + ['edited (tag1, kind: a)\n'] + lines[middle+1:]
+        )
+    }
+
+    rows = []
+    for edit, new_text in edits.items():
+        full_parse = best_time(lambda: parse_manifest_blocks(Mock(), new_text))
+        incremental_parse = best_time(
+            lambda: parse_manifest_blocks(Mock(), new_text, previous)
+        )
+        full_load = best_time(
+            lambda: parse_manifest(Mock(), 'root', new_text, 'native', {'root': []})
+        )
+        incremental_load = best_time(lambda: parse_manifest(
+            Mock(), 'root', new_text, 'native', {'root': []}, previous_blocks
+        ))
+        rows.append([
+            edit,
+            format_time(full_parse),
+            format_time(incremental_parse),
+            format_time(full_load),
+            format_time(incremental_load)
+        ])
+
+    print_results(
+        f'Reparse a manifest of {NUM_ITEMS} items after an edit',
+        [
+            'edit',
+            'full (parse)',
+            'incremental (parse)',
+            'full (+ replay, pickle)',
+            'incremental (+ replay, pickle)'
+        ],
+        rows
+    )
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""
+Benchmark loading a cached manifest and looking up a single item in it (eg. as
+`limar env cd` does).
+
+Run from the repo root with:
+
+    python -m benchmarks.manifest_load
+"""
+
+import random
+import tempfile
+from unittest.mock import Mock
+
+from benchmarks.utils import best_time, format_time, print_results
+from core.store import Store
+from modules.manifest import Manifest, ManifestModule
+from modules.manifest_lang.native_parser import NativeManifestParser
+from modules.manifest_utils.compiled_manifest import (
+    CompiledManifest,
+    compile_manifest
+)
+
+SIZES = (1_000, 10_000, 100_000)
+
+def make_manifest_text(num_items: int, seed: int = 0):
+    rand = random.Random(seed)
+    tag_names = [f'tag{i}' for i in range(20)]
+    return '\n'.join(
+        f'item{i} ('
+            + ', '.join(rand.sample(tag_names, 3))
+            + f', kind: {rand.choice(["a", "b", "c"])}'
+        + ')'
+        for i in range(num_items)
+    )+'\n'
+
+def load_and_lookup(raw, ref):
+    # As ManifestModule does for `limar env cd`
+    manifest = ManifestModule(Mock())
+    manifest._mod = Mock()
+    manifest._global_manifest = Manifest.from_raw(Mock(), raw)
+    return dict(manifest.get_item(
+        f'^{ref}$',
+        item_set=manifest.get_item_set('^tag1$')
+    ))
+
+def main():
+    rows = []
+    with tempfile.TemporaryDirectory() as cache_dir:
+        store = Store(cache_dir)
+        for size in SIZES:
+            manifest = Manifest(Mock())
+            NativeManifestParser(Mock(), manifest).parse_manifest(
+                make_manifest_text(size)
+            )
+            raw = manifest.raw()
+            ref = next(
+                ref for ref, item in raw['items'].items()
+                if 'tag1' in item['tags']
+            )
+
+            store.setattr(f'{size}.pickle', 'type', 'pickle')
+            store.set(f'{size}.pickle', raw)
+            store.setattr(f'{size}.compiled', 'type', 'binary')
+            store.set(f'{size}.compiled', compile_manifest(raw))
+            store.flush()
+
+            def load(name, type):
+                load_store = Store(cache_dir)
+                load_store.setattr(name, 'type', type)
+                return load_store.get(name)
+
+            pickled = best_time(lambda: load_and_lookup(
+                load(f'{size}.pickle', 'pickle'),
+                ref
+            ))
+            compiled = best_time(lambda: load_and_lookup(
+                CompiledManifest(load(f'{size}.compiled', 'binary')).raw(),
+                ref
+            ))
+
+            rows.append([size, format_time(pickled), format_time(compiled)])
+
+    print_results(
+        'Load cached manifest and look up one item',
+        ['items', 'pickle', 'compiled (mmap)'],
+        rows
+    )
+
+if __name__ == '__main__':
+    main()
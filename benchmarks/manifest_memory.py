@@ -0,0 +1,127 @@
+"""
+Benchmark the memory used by manifest items, before and after the manifest is
+finalised, and the size of the pickled items (as cached).
+
+Run from the repo root with:
+
+    python -m benchmarks.manifest_memory
+"""
+
+import pickle
+import tracemalloc
+from unittest.mock import Mock
+
+from benchmarks.utils import print_results
+from modules.manifest import Manifest, ManifestItem, ManifestItemTags
+from modules.manifest_lang.native_parser import NativeManifestParser
+
+SIZES = (1_000, 10_000, 100_000)
+
+class LegacyItemTags:
+    # The previous item tags class, which held two closures per item
+    def __init__(self, add_callback=None, remove_callback=None):
+        self._tags = {}
+        self._add_callback = add_callback
+        self._remove_callback = remove_callback
+
+    def add(self, *names, **tags):
+        for name, value in tags.items():
+            self._tags[name] = value
+            if self._add_callback is not None:
+                self._add_callback(tags)
+
+        if len(names) > 0:
+            self.add(**{name: None for name in names})
+
+    def raw(self):
+        return self._tags
+
+def on_tags_changed(item_ref, tags):
+    pass
+
+def make_legacy_items(num_items: int):
+    items = {}
+    for i in range(num_items):
+        ref = f'item{i}'
+        items[ref] = {
+            'ref': ref,
+            'tags': LegacyItemTags(
+                lambda tags: on_tags_changed(ref, tags),
+                lambda tags: on_tags_changed(ref, tags)
+            )
+        }
+        items[ref]['tags'].add('tagA', 'tagB', kind='x')
+    return items
+
+def make_items(num_items: int):
+    items = {}
+    for i in range(num_items):
+        ref = f'item{i}'
+        items[ref] = ManifestItem(
+            ref,
+            ManifestItemTags(on_tags_changed, on_tags_changed, item_ref=ref)
+        )
+        items[ref]['tags'].add('tagA', 'tagB', kind='x')
+    return items
+
+def finalise(items):
+    for item in items.values():
+        item['tags'] = item['tags'].raw()
+
+def measure(make):
+    tracemalloc.start()
+    items = make()
+    building, _ = tracemalloc.get_traced_memory()
+    finalise(items)
+    finalised, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return building, finalised, len(pickle.dumps(items))
+
+def measure_parse(num_items: int):
+    text = ''.join(f'item{i} (tagA, tagB, kind: x)\n' for i in range(num_items))
+
+    tracemalloc.start()
+    manifest = Manifest(Mock())
+    NativeManifestParser(Mock(), manifest).parse_manifest(text)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return retained, peak, len(pickle.dumps(manifest.raw()))
+
+def format_bytes(num_bytes: int) -> str:
+    return f'{num_bytes / 1024:.0f}KiB'
+
+def main():
+    items_rows = []
+    parse_rows = []
+    for size in SIZES:
+        legacy = measure(lambda: make_legacy_items(size))
+        slotted = measure(lambda: make_items(size))
+        items_rows.append([
+            size,
+            *(format_bytes(value) for value in (legacy[0], slotted[0])),
+            *(format_bytes(value) for value in (legacy[1], slotted[1])),
+            *(format_bytes(value) for value in (legacy[2], slotted[2]))
+        ])
+
+        parse_rows.append([
+            size, *(format_bytes(value) for value in measure_parse(size))
+        ])
+
+    print_results(
+        'Item memory (legacy dicts with closures vs slotted ManifestItems)',
+        [
+            'items',
+            'building (legacy)', 'building (slotted)',
+            'finalised (legacy)', 'finalised (slotted)',
+            'pickled (legacy)', 'pickled (slotted)'
+        ],
+        items_rows
+    )
+    print_results(
+        'Parsed manifest memory (including indexes)',
+        ['items', 'retained', 'peak', 'pickled'],
+        parse_rows
+    )
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""
+Benchmark parsing several uncached root manifests, sequentially and in a
+process pool with different numbers of workers.
+
+Run from the repo root with:
+
+    python -m benchmarks.manifest_parallel_parse
+"""
+
+import os
+import random
+from unittest.mock import Mock
+
+from benchmarks.utils import best_time, format_time, print_results
+from modules.manifest import ManifestModule
+
+NUM_MANIFESTS = 4
+ITEMS_PER_MANIFEST = 25_000
+
+def make_manifest_text(name: str, num_items: int, seed: int = 0):
+    rand = random.Random(seed)
+    tag_names = [f'tag{i}' for i in range(20)]
+    return '\n'.join(
+        f'{name}-item{i} ('
+            + ', '.join(rand.sample(tag_names, 3))
+            + f', kind: {rand.choice(["a", "b", "c"])}'
+        + ')'
+        for i in range(num_items)
+    )+'\n'
+
+def make_module(manifest_texts: dict[str, str], workers: int):
+    manifest_store = Mock()
+    manifest_store.get.side_effect = lambda key: manifest_texts[
+        key.removesuffix('.manifest.txt')
+    ]
+
+    mod = Mock()
+    mod.cache.get.side_effect = KeyError # Always parse
+    mod.cache.get_ref.side_effect = KeyError
+
+    env = Mock()
+    env.DEFAULT_ITEM_SET = None
+    env.PARSER = 'native'
+    env.PARSE_WORKERS = workers
+
+    manifest = ManifestModule(manifest_store)
+    manifest.configure(mod=mod, env=env)
+    # Root contexts with no context modules
+    manifest._ctx_mod_factories = {name: [] for name in manifest_texts}
+    manifest._manifest_names = list(manifest_texts)
+    return manifest, mod
+
+def main():
+    manifest_texts = {
+        f'root{i}': make_manifest_text(f'root{i}', ITEMS_PER_MANIFEST, seed=i)
+        for i in range(NUM_MANIFESTS)
+    }
+
+    worker_counts = sorted({1, 2, 4, os.cpu_count() or 1})
+    rows = []
+    for workers in worker_counts:
+        def start():
+            manifest, mod = make_module(manifest_texts, workers)
+            manifest.start(mod=mod)
+        rows.append([workers, format_time(best_time(start))])
+
+    print_results(
+        f'Parse {NUM_MANIFESTS} root manifests of {ITEMS_PER_MANIFEST} items'
+        f' ({os.cpu_count()} CPUs)',
+        ['workers', 'time'],
+        rows
+    )
+
+if __name__ == '__main__':
+    main()
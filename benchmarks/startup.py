@@ -0,0 +1,79 @@
+"""
+Benchmark the time to run LIMAR commands end-to-end (as a new process), with
+all modules loaded and with only the modules each command needs loaded (see
+`lazy_load` in ModuleManager).
+
+Run from the repo root with:
+
+    python -m benchmarks.startup
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+
+from benchmarks.utils import best_time, format_time, print_results
+
+COMMANDS = (
+    ['cache', 'list'],
+    ['manifest', 'item', 'project0'],
+    ['env', 'cd', 'project0'],
+    ['env', '--help'],
+    ['info', '--help'],
+    ['finance', '--help']
+)
+
+def make_project_manifest_text(num_projects: int):
+    # Projects need a path for `env cd`
+    return (
+        '@uris (path: /tmp) {\n'
+        + '  @project {\n'
+        + ''.join(f'    project{i} (tag{i % 10})\n' for i in range(num_projects))
+        + '  }\n'
+        + '}\n'
+    )
+
+def main():
+    main_path = os.path.join(os.path.dirname(__file__), '..', 'main.py')
+
+    rows = []
+    with (
+        tempfile.TemporaryDirectory() as manifest_dir,
+        tempfile.TemporaryDirectory() as cache_dir
+    ):
+        with open(os.path.join(manifest_dir, 'project.manifest.txt'), 'w') as f:
+            f.write(make_project_manifest_text(100))
+
+        def run(command, lazy):
+            subprocess.run(
+                [sys.executable, main_path, *command],
+                env={
+                    **os.environ,
+                    'LIMAR_MANIFEST_ROOT': manifest_dir,
+                    'LIMAR_CACHE_ROOT': cache_dir,
+                    'LIMAR__LAZY_LOAD_MODULES': 'true' if lazy else 'false'
+                },
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                check=True
+            )
+
+        for command in COMMANDS:
+            # Populate the cache first, so that both modes load from it
+            run(command, lazy=False)
+            rows.append([
+                ' '.join(command),
+                format_time(best_time(lambda: run(command, lazy=False), 5)),
+                format_time(best_time(lambda: run(command, lazy=True), 5))
+            ])
+
+    print_results(
+        'Run a command in a new process',
+        ['command', 'all modules', 'lazy'],
+        rows
+    )
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""
+Benchmark common operations on a store with many small entries, for each Store
+backend.
+
+Run from the repo root with:
+
+    python -m benchmarks.store_backends
+"""
+
+import os
+import tempfile
+
+from benchmarks.utils import best_time, format_time, print_results
+from core.store import open_store
+
+NUM_ENTRIES = 10_000
+
+def make_entries(num_entries: int):
+    return {
+        f'objects/entry{i}': {'ref': f'entry{i}', 'tags': {'kind': 'a'}}
+        for i in range(num_entries)
+    }
+
+def main():
+    entries = make_entries(NUM_ENTRIES)
+
+    def persist_all(root):
+        store = open_store(root)
+        for key, value in entries.items():
+            store.setattr(key, 'type', 'pickle')
+            store.set(key, value)
+        store.flush()
+
+    def list_all(root):
+        return open_store(root).list(dir='objects')
+
+    def get_all(root):
+        store = open_store(root)
+        for key in entries:
+            store.get(key)
+
+    def delete_tenth(root):
+        store = open_store(root)
+        for key in list(entries)[::10]:
+            store.delete(key)
+        store.flush()
+
+    rows = []
+    with tempfile.TemporaryDirectory() as temp_dir:
+        roots = {
+            'files': os.path.join(temp_dir, 'files'),
+            'sqlite': 'sqlite:'+os.path.join(temp_dir, 'store.sqlite')
+        }
+        for backend, root in roots.items():
+            # Each deletion needs the entries to exist, so is timed once, after
+            # the last write
+            persist = best_time(lambda: persist_all(root))
+            rows.append([
+                backend,
+                format_time(persist),
+                format_time(best_time(lambda: list_all(root))),
+                format_time(best_time(lambda: get_all(root))),
+                format_time(best_time(lambda: delete_tenth(root), repeat=1))
+            ])
+
+    print_results(
+        f'Store operations with {NUM_ENTRIES} entries',
+        ['backend', 'persist all', 'list', 'get all', 'delete 10%'],
+        rows
+    )
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+"""
+Benchmark the size of, and the time to load, representative cached data with
+each Store serialiser.
+
+Load times are for a new Store reading an entry that is already in the OS's
+file cache (as it usually is for data read on every run).
+
+Run from the repo root with:
+
+    python -m benchmarks.store_serialisers
+"""
+
+import random
+import tempfile
+from datetime import date, timedelta
+from unittest.mock import Mock
+
+from benchmarks.utils import best_time, format_time, print_results
+from core.store import Store
+from modules.manifest import ManifestItem
+from modules.manifest_lang.parse import parse_manifest
+from modules.manifest_modules.finance import Finance
+from modules.manifest_modules.financial_account import FinancialAccount
+from modules.manifest_modules.financial_transaction import FinancialTransaction
+
+SIZES = (10_000, 50_000)
+SERIALISERS = ('pickle', 'pickle-zlib', 'pickle-lzma')
+
+def make_finance_manifest_text(num_transactions: int, seed: int = 0):
+    rand = random.Random(seed)
+    accounts = [f'account{i}' for i in range(20)]
+    start = date(2020, 1, 1)
+
+    lines = ['@account (type: bank) {']
+    lines.extend(f'  {account}' for account in accounts)
+    lines.append('}')
+    lines.append('@transaction (default-account: account0) {')
+    for i in range(num_transactions):
+        paid = start + timedelta(days=rand.randrange(1500))
+        lines.append(
+            f'  transaction{i} ('
+                f'to: {rand.choice(accounts[1:])}, '
+                f'paid: {paid.isoformat()}, '
+                f'amount: {rand.randrange(100_000) / 100:.2f}, '
+                f'for: {rand.choice(["food", "rent", "fuel", "books"])}'
+            ')'
+        )
+    lines.append('}')
+    return '\n'.join(lines)+'\n'
+
+def parse_finance_manifest(text: str):
+    manifest, _ = parse_manifest(Mock(), 'finance', text, 'native', {
+        'finance': [Finance],
+        'account': [FinancialAccount],
+        'transaction': [FinancialTransaction]
+    })
+    return manifest.raw()
+
+def flatten(raw):
+    # Only tags can be flattened into built-in types without also encoding
+    # references between items (eg. a transaction's 'from' account).
+    return tuple(
+        (ref, tuple(item['tags'].items()))
+        for ref, item in raw['items'].items()
+    )
+
+def unflatten(flat):
+    return {
+        ref: ManifestItem(ref, dict(tags))
+        for ref, tags in flat
+    }
+
+def main():
+    rows = []
+    with tempfile.TemporaryDirectory() as cache_dir:
+        for size in SIZES:
+            raw = parse_finance_manifest(make_finance_manifest_text(size))
+
+            store = Store(cache_dir)
+            for type in SERIALISERS:
+                store.setattr(f'{size}.{type}', 'type', type)
+                store.set(f'{size}.{type}', raw)
+            store.setattr(f'{size}.marshal', 'type', 'marshal')
+            store.set(f'{size}.marshal', flatten(raw))
+            store.flush()
+
+            def load(name, type):
+                load_store = Store(cache_dir)
+                load_store.setattr(name, 'type', type)
+                return load_store.get(name)
+
+            for type in SERIALISERS:
+                name = f'{size}.{type}'
+                rows.append([
+                    size,
+                    type,
+                    f'{store.size(name) / 1024:.0f}KiB',
+                    format_time(best_time(lambda: load(name, type)))
+                ])
+
+            name = f'{size}.marshal'
+            rows.append([
+                size,
+                'marshal (tags only, + unflatten)',
+                f'{store.size(name) / 1024:.0f}KiB',
+                format_time(best_time(
+                    lambda: unflatten(load(name, 'marshal'))
+                ))
+            ])
+
+    print_results(
+        'Load a cached finance manifest with each serialiser',
+        ['transactions', 'type', 'size', 'load'],
+        rows
+    )
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,32 @@
+import time
+from typing import Any, Callable
+
+def best_time(fn: Callable[[], Any], repeat: int = 3) -> float:
+    """Return the fastest wall-clock time (in seconds) of `repeat` runs of fn."""
+
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+def print_results(title: str, headers: list[str], rows: list[list[Any]]):
+    """Print the given benchmark results as a plain-text table."""
+
+    widths = [
+        max(len(str(cell)) for cell in column)
+        for column in zip(headers, *rows)
+    ]
+    print(title)
+    for row in [headers, *rows]:
+        print('  '.join(
+            str(cell).rjust(width)
+            for cell, width in zip(row, widths)
+        ))
+    print()
+
+def format_time(seconds: float | None) -> str:
+    if seconds is None:
+        return '-'
+    return f'{seconds * 1000:.2f}ms'
@@ -1138,6 +1138,13 @@ class ModuleManager:
     `register_module()` and `register_package()` methods. Any attempt to
     register a module after the registration phase will raise a LIMARException.
 
+    If ModuleManager is created with `lazy_load=True`, then modules registered
+    with `register_package()` are only imported and loaded if they are invoked
+    on the command line, are depended on (directly or indirectly) by a module
+    that is, or are declared by their package to be plugins of a module that is
+    loaded (see `register_package()`). All later phases only run for the loaded
+    modules.
+
     ### Initialisation
     `__init__()`
 
@@ -1299,12 +1306,20 @@ class ModuleManager:
     # Initialisation
     # --------------------
 
-    def __init__(self, app: Callable, app_name: str, mm_cli_args: list[str] | None = None):
+    def __init__(self,
+            app: Callable,
+            app_name: str,
+            mm_cli_args: list[str] | None = None,
+            lazy_load: bool = False
+    ):
         self._app = app
         self._app_name = app_name
         self._mm_cli_args = mm_cli_args
+        self._lazy_load = lazy_load
 
         self._registered_mods = {}
+        self._lazy_mods: dict[str, tuple[str, str]] = {}
+        self._lazy_plugins: dict[str, list[str]] = {}
         self._core_lifecycle = None
         self._main_lifecycle = None
 
@@ -1347,6 +1362,11 @@ class ModuleManager:
         """
 
         assert self._core_lifecycle is not None, 'run() run before __enter__()'
+        if len(self._lazy_mods) > 0:
+            self._load_lazy_modules(
+                cli_args if cli_args is not None else sys.argv[1:]
+            )
+
         self._main_lifecycle = self._core_lifecycle.create_sublifecycle(
             app=self._app,
             app_name=self._app_name,
@@ -1371,6 +1391,27 @@ class ModuleManager:
     # --------------------
 
     def register_package(self, *packages):
+        """
+        Register all modules in the given packages (see `modules_adjacent_to()`
+        in `core.utils`).
+
+        If this ModuleManager was created with `lazy_load=True`, then modules in
+        the packages (other than MM's core modules) are only imported when
+        `run()` is called, and only if they are invoked on the command line, are
+        depended on (directly or indirectly) by a module that is, or are plugins
+        of a module that is loaded. If no registered module is invoked (eg. for
+        `--help`), then all are loaded. Root arguments of modules that are not
+        loaded are not recognised.
+
+        Plugins are modules that change how other modules behave without being
+        depended on by them (eg. by adding manifest context modules). A package
+        declares them in a `PLUGINS` dict of the names of its plugin modules to
+        the names of the modules they extend, eg:
+        ```
+        PLUGINS = {'project-manifest': ['manifest']}
+        ```
+        """
+
         for package in packages:
             if self._core_lifecycle is not None:
                 self._core_lifecycle._debug(
@@ -1378,32 +1419,25 @@ class ModuleManager:
                     f" '{package.__package__}' ({package}) with {self}"
                 )
 
-            mm_modules = []
-            for py_module_name in package.__all__:
-                mm_class_name = self._py_module_to_class(py_module_name)
-
-                try:
-                    py_module = importlib.import_module(
-                        f'{package.__package__}.{py_module_name}'
+            if self._lazy_load and package is not core_module_package:
+                for plugin, extended in getattr(package, 'PLUGINS', {}).items():
+                    for name in extended:
+                        self._lazy_plugins.setdefault(name, []).append(plugin)
+                for py_module_name in package.__all__:
+                    mm_mod_name = self._class_to_mm_module(
+                        self._py_module_to_class(py_module_name)
                     )
-                except ImportError as e:
-                    raise LIMARException(
-                        f"Python module '{py_module_name}' in __all__ failed to"
-                        " load"
-                    ) from e
-
-                try:
-                    mm_module = getattr(py_module, mm_class_name)
-                except AttributeError as e:
-                    raise LIMARException(
-                        f"Python module '{py_module_name}' in __all__ does not"
-                        f" contain a ModuleManager module: '{mm_class_name}'"
-                        " not found"
-                    ) from e
-
-                mm_modules.append(mm_module)
+                    if mm_mod_name not in self._registered_mods:
+                        self._lazy_mods[mm_mod_name] = (
+                            package.__package__,
+                            py_module_name
+                        )
+                continue
 
-            self.register(*mm_modules)
+            self.register(*(
+                self._import_mm_module(package.__package__, py_module_name)
+                for py_module_name in package.__all__
+            ))
 
     def register(self, *modules):
         for module_factory in modules:
@@ -1426,6 +1460,66 @@ class ModuleManager:
     # Utils
     # --------------------
 
+    def _load_lazy_modules(self, cli_args: list[str]):
+        # Peek at the module names in the CLI args. Root option values could
+        # also match module names, but that only loads more modules than
+        # needed.
+        invoked = [arg for arg in cli_args if arg in self._lazy_mods]
+        if len(invoked) == 0:
+            invoked = list(self._lazy_mods.keys())
+
+        # Each module is only imported once it is reached, so that only the
+        # modules that are loaded are imported. It is initialised then to get
+        # its dependencies, so the lifecycle is given that instance, rather
+        # than initialising it again.
+        modules = {}
+        to_visit = list(invoked)
+        while len(to_visit) > 0:
+            name = to_visit.pop()
+            if name in modules or name not in self._lazy_mods:
+                continue
+
+            module = self._import_mm_module(*self._lazy_mods[name])()
+            modules[name] = module
+            if hasattr(module, 'dependencies'):
+                to_visit.extend(module.dependencies())
+            to_visit.extend(self._lazy_plugins.get(name, []))
+        to_load = set(modules.keys())
+
+        if self._core_lifecycle is not None:
+            self._core_lifecycle._debug(
+                f"Loading modules {sorted(to_load)} of lazily registered"
+                f" modules {sorted(self._lazy_mods.keys())}"
+            )
+        self._registered_mods.update({
+            name: lambda module=modules[name]: module
+            for name in to_load
+        })
+        self._lazy_mods = {}
+        self._lazy_plugins = {}
+
+    def _import_mm_module(self, package_name: str, py_module_name: str):
+        mm_class_name = self._py_module_to_class(py_module_name)
+
+        try:
+            py_module = importlib.import_module(
+                f'{package_name}.{py_module_name}'
+            )
+        except ImportError as e:
+            raise LIMARException(
+                f"Python module '{py_module_name}' in __all__ failed to"
+                " load"
+            ) from e
+
+        try:
+            return getattr(py_module, mm_class_name)
+        except AttributeError as e:
+            raise LIMARException(
+                f"Python module '{py_module_name}' in __all__ does not"
+                f" contain a ModuleManager module: '{mm_class_name}'"
+                " not found"
+            ) from e
+
     # Derived from: https://stackoverflow.com/a/1176023/16967315
     def _class_to_mm_module(self, name):
         name = re.sub('(.)([A-Z][a-z]+)', r'\1-\2', name)
@@ -1,17 +1,212 @@
+from contextlib import contextmanager
+import fcntl
+import lzma
+import marshal
+from mmap import mmap, ACCESS_READ
+import os
 from pathlib import Path
 import pickle
+from shutil import rmtree
+import sqlite3
+import sys
+import tempfile
+import time
+import zlib
 
 from core.exceptions import LIMARException
 
+# Types
+from typing import Any, Callable
+
+# Files and directories in the store directory that are not entries. All names
+# starting with '.' are reserved for these, and for temporary files.
+
+# Records the type, size, modification time, checksum, and time of last use of
+# each persisted entry (see `Store.info()`)
+INDEX_FILE = '.index'
+# Locked while persisting, so that only one process persists at a time
+LOCK_FILE = '.lock'
+# Where entries that could not be read are moved to
+QUARANTINE_DIR = '.quarantine'
+
+# The mode that files written by stores are given, as they would be if created
+# with `open()` (`tempfile.mkstemp()` creates them readable only by their owner)
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+FILE_MODE = 0o666 & ~_UMASK
+
+# How much later than the time of last use in the index (in seconds) an entry
+# must be used for that use to be recorded, when nothing else needs the index
+# to be rewritten. Stores without limits only use the time of last use for
+# `Store.info()`, so it need not be exact.
+LAST_USED_RESOLUTION = 60 * 60
+
+# Store roots starting with this are SQLite database files (see `open_store()`)
+SQLITE_SCHEME = 'sqlite:'
+
+# Serialisers
+# --------------------------------------------------
+
+# Functions to serialise values to bytes and to deserialise them again, by the
+# entry type they are used for (see `add_serialiser()`).
+_SERIALISERS: dict[str, tuple[Callable[[Any], bytes], Callable[[bytes], Any]]] = {}
+
+def add_serialiser(
+        type: str,
+        serialise: Callable[[Any], bytes],
+        deserialise: Callable[[bytes], Any]
+):
+    """
+    Add a serialiser for entries of the given type.
+
+    The 'binary' type (for bytes-like values, which are memory-mapped when
+    read) and entries with no type (for str values) are handled by the Store
+    itself.
+    """
+
+    if type in _SERIALISERS or type == 'binary':
+        raise LIMARException(
+            f"Attempt to add serialiser for entry type '{type}', which already"
+            " has one"
+        )
+    _SERIALISERS[type] = (serialise, deserialise)
+
+# Any picklable value. For compiled manifests, this is the fastest to load of
+# the serialisers for arbitrary values, though about 4x the size of
+# 'pickle-zlib' (see benchmarks/store_serialisers.py).
+add_serialiser(
+    'pickle',
+    lambda value: pickle.dumps(value, protocol=5),
+    pickle.loads
+)
+
+# Any picklable value, compressed. Much smaller (about 1/4 and 1/10 the size
+# of 'pickle' for compiled manifests), but slightly slower to load.
+add_serialiser(
+    'pickle-zlib',
+    lambda value: zlib.compress(pickle.dumps(value, protocol=5), level=1),
+    lambda data: pickle.loads(zlib.decompress(data))
+)
+add_serialiser(
+    'pickle-lzma',
+    lambda value: lzma.compress(pickle.dumps(value, protocol=5)),
+    lambda data: pickle.loads(lzma.decompress(data))
+)
+
+# Only built-in types (eg. flat tuples of str), but about twice as fast to load
+# as 'pickle', even including the time to build objects from them.
+add_serialiser('marshal', marshal.dumps, marshal.loads)
+
+# Raised by the deserialisers above for corrupt data (see their docs)
+_DESERIALISING_ERRORS = (
+    pickle.UnpicklingError,
+    zlib.error,
+    lzma.LZMAError,
+    AttributeError,
+    EOFError,
+    ImportError,
+    IndexError,
+    TypeError,
+    ValueError
+)
+
+# Store
+# --------------------------------------------------
+
+def open_store(
+        root: str,
+        *,
+        max_bytes: int | None = None,
+        max_entries: int | None = None,
+        max_age: float | None = None
+) -> 'Store':
+    """
+    Open a store at the given root.
+
+    Roots that start with `sqlite:` (eg. `sqlite:/path/to/cache.sqlite`) open
+    an `SQLiteStore` in that database file. Any other root opens a `Store` in
+    that directory.
+    """
+
+    if root.startswith(SQLITE_SCHEME):
+        return SQLiteStore(
+            root[len(SQLITE_SCHEME):],
+            max_bytes=max_bytes,
+            max_entries=max_entries,
+            max_age=max_age
+        )
+    return Store(
+        root,
+        max_bytes=max_bytes,
+        max_entries=max_entries,
+        max_age=max_age
+    )
+
 class Store:
-    def __init__(self, persist_dir='/tmp'):
+    """
+    A store of entries, held in memory and persisted as files in a directory.
+
+    If any of `max_bytes`, `max_entries`, or `max_age` (in seconds since last
+    use) are given, then the least recently used persisted entries are evicted
+    on `persist()` until all of those limits are met.
+
+    Only entries that have been set since they were last persisted are written
+    on `persist()`, so entries that are modified in place after being got must
+    be set again to be persisted.
+
+    The type of each persisted entry is recorded in an index in the store
+    directory (along with other metadata, see `info()`), so entries can be got
+    without setting their type first. The index is loaded at most once per
+    Store (if it exists), and updated on `persist()`. A store with no index is
+    only scanned for one when it is needed (eg. to evict entries), not on
+    `get()`.
+
+    Stores in different processes can safely share the same directory. Entries
+    are written to a temporary file that is then renamed over the entry, so
+    they are never seen partially written, and only one process can persist to
+    the directory at a time. Entries that cannot be read are quarantined (see
+    `quarantine()`), unless `quarantine` is False (eg. for stores of files that
+    the user owns), in which case the error reading them is raised.
+    """
+
+    def __init__(self,
+            persist_dir='/tmp',
+            *,
+            max_bytes: int | None = None,
+            max_entries: int | None = None,
+            max_age: float | None = None,
+            quarantine: bool = True
+    ):
         self._persist_dir = Path(persist_dir).resolve()
         self._persist_dir.mkdir(parents=True, exist_ok=True)
 
+        self._max_bytes = max_bytes
+        self._max_entries = max_entries
+        self._max_age = max_age
+        self._quarantine = quarantine
+
         self._cache = {}
         self._attrs = {}
+        self._dirty = set()
         self._marked_for_removal = set()
 
+        # When each entry was last used in this session
+        self._used = {}
+
+        # The index, once loaded (see `_get_index()`)
+        self._index = None
+
+        # Statistics for this session (see `stats()`)
+        self._stats = {
+            'hits': 0,
+            'misses': 0,
+            'bytes_read': 0,
+            'bytes_written': 0,
+            'read_time': 0.0,
+            'persist_time': 0.0
+        }
+        self._missed = set()
+
     # Attribute Methods
 
     def setattrs(self, key, **attrs):
@@ -38,66 +233,229 @@ class Store:
 
     # Content Methods
 
-    def list(self, read_persistent=True) -> list[str]:
-        known_entries = set(self._cache.keys())
+    def list(self, read_persistent=True, dir=None) -> list[str]:
+        prefix = '' if dir is None else dir.strip('/') + '/'
+
+        known_entries = set(
+            key for key in self._cache.keys()
+            if key.startswith(prefix)
+        )
         if read_persistent is True:
-            known_entries.update(
-                str(self._key_for(entry))
-                for entry in self._persist_dir.iterdir()
-            )
-        return sorted(known_entries)
+            known_entries.update(self._list_persisted(prefix))
+        return sorted(known_entries - self._marked_for_removal)
 
     def get(self, key, read_persistent=True):
-        if key not in self._cache and read_persistent:
+        if key not in self._cache and not read_persistent:
+            self._count_miss(key)
+            raise KeyError(f"Key '{key}' not found in this store's memory")
+
+        if key not in self._cache:
+            # The entry was persisted as the indexed type, whatever type it is
+            # set as in this session
+            type = self._indexed_type(key) or self.getattr(key, 'type')
+            start = time.perf_counter()
             try:
-                key_path = self._path_for(key)
-                if self.getattr(key, 'type') == 'pickle':
-                    self._cache[key] = pickle.loads(key_path.read_bytes())
-                else:
-                    self._cache[key] = key_path.read_text()
-            except OSError as e:
+                self._cache[key] = self._read(key, type)
+            except (OSError, KeyError) as e:
+                self._count_miss(key)
                 raise KeyError(f"Key '{key}' not found in this store") from e
+            except (*_DESERIALISING_ERRORS, UnicodeDecodeError) as e:
+                if not self._quarantine:
+                    self._count_miss(key)
+                    raise
+
+                # Another process may have rewritten the entry as a different
+                # type since the index was loaded
+                indexed_type = self._indexed_type(key)
+                self._index = None
+                if self._indexed_type(key) != indexed_type:
+                    return self.get(key)
+
+                self.quarantine(key)
+                self._count_miss(key)
+                raise KeyError(
+                    f"Key '{key}' could not be read from this store, so was"
+                    " quarantined"
+                ) from e
+            self._stats['read_time'] += time.perf_counter() - start
+
+        self._stats['hits'] += 1
+        self._used[key] = time.time()
         return self._cache[key]
 
+    def quarantine(self, key):
+        """
+        Move the persisted entry with the given key out of the store (to
+        `.quarantine/` in the store directory), eg. because it is corrupt, and
+        forget it.
+        """
+
+        if key in self._cache:
+            del self._cache[key]
+        self._used.pop(key, None)
+        self._dirty.discard(key)
+        self._quarantine_persisted(key)
+
+    def info(self, key) -> dict[str, Any] | None:
+        """
+        Return the metadata of the persisted entry with the given key, or None
+        if it has not been persisted (or was persisted by something other than
+        a Store).
+
+        The metadata is read from the index, not from the entry itself, and
+        has the keys:
+
+        - `type` - the type the entry was persisted as ('text' if it had none,
+          or None if unknown)
+        - `size` - the size of the entry in bytes
+        - `mtime` - when the entry was last persisted (as a Unix timestamp)
+        - `checksum` - the CRC-32 of the entry's data (as hex), or None if
+          unknown
+        - `last_used` - when the entry was last got or set (as a Unix
+          timestamp). In stores without limits, gets are only recorded if they
+          are at least `LAST_USED_RESOLUTION` seconds after this.
+        """
+
+        index = self._get_index()
+        if key not in index:
+            return None
+
+        info = dict(index[key])
+        if key in self._used:
+            info['last_used'] = self._used[key]
+        return info
+
+    def list_info(self, read_persistent=True) -> dict[str, dict[str, Any] | None]:
+        """
+        Return the metadata (see `info()`) of all entries, including those in
+        subdirectories of the store, by key. Entries that have not been
+        persisted have no metadata.
+        """
+
+        keys = set(self._cache.keys())
+        if read_persistent is True:
+            keys.update(self._get_index().keys())
+        return {
+            key: self.info(key) if read_persistent is True else None
+            for key in sorted(keys - self._marked_for_removal)
+        }
+
+    def size(self, key) -> int:
+        """Return the size of the persisted entry with the given key, if any."""
+
+        try:
+            return self._path_for(key).stat().st_size
+        except OSError:
+            return 0
+
     def set(self, key, value):
         self._cache[key] = value
+        self._dirty.add(key)
+        self._used[key] = time.time()
         if key in self._marked_for_removal:
             self._marked_for_removal.remove(key)
 
     def delete(self, key):
         if key in self._cache:
             del self._cache[key]
+        if key in self._used:
+            del self._used[key]
+        self._dirty.discard(key)
         self._marked_for_removal.add(key)
 
-    def persist(self):
-        for key, value in self._cache.items():
-            key_path = self._path_for(key)
-            key_path.parent.mkdir(parents=True, exist_ok=True)
+    def persist(self) -> int:
+        """
+        Write all entries that have been set since they were last persisted,
+        remove all deleted entries, and return the number of bytes written.
+        """
 
-            if self.getattr(key, 'type') == 'pickle':
-                key_path.write_bytes(pickle.dumps(value))
-            else:
-                key_path.write_text(value)
+        start = time.perf_counter()
+        bytes_written = self._persist()
+        self._stats['bytes_written'] += bytes_written
+        self._stats['persist_time'] += time.perf_counter() - start
+        return bytes_written
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Return statistics about the use of this store in this session:
+
+        - `hits` - the number of gets of entries that were found, whether in
+          memory or persisted
+        - `misses` - the number of gets of entries that were not found, or
+          could not be read
+        - `missed_entries` - the keys of the entries that were missed
+        - `bytes_read` - the size of the persisted entries that were read
+          ('binary' entries are mapped, so may not be read in full)
+        - `bytes_written` - the number of bytes persisted
+        - `read_time` - the time spent reading and deserialising entries, in
+          seconds
+        - `persist_time` - the time spent persisting, in seconds
+        """
+
+        return {
+            'hits': self._stats['hits'],
+            'misses': self._stats['misses'],
+            'missed_entries': sorted(self._missed),
+            'bytes_read': self._stats['bytes_read'],
+            'bytes_written': self._stats['bytes_written'],
+            'read_time': self._stats['read_time'],
+            'persist_time': self._stats['persist_time']
+        }
+
+    def flush(self) -> int:
+        """
+        Persist this store, then forget all entries held in memory. Return the
+        number of bytes written.
+        """
+
+        bytes_written = self.persist()
+        self._cache = {}
+        return bytes_written
+
+    def flush_in_background(self, on_flushed: Callable[[], Any] | None = None) -> int:
+        """
+        Flush this store in a detached child process, and return the child's
+        PID. This process forgets all entries held in memory immediately.
+
+        If `on_flushed` is given, it is called in the child after flushing (eg.
+        to record `stats()`, which include the flush).
 
-        for key in self._marked_for_removal:
-            key_path = self._path_for(key)
-            if key_path.exists():
-                key_path.unlink()
+        Entries are written by the child in the same way as by `flush()`, so
+        are never seen partially written, even if the child is killed. The
+        child's standard streams are redirected to /dev/null, so that it does
+        not hold open pipes that this process's output is written to.
+        """
 
-            # Try to remove parent dirs until a non-empty one is found)
+        # Don't duplicate buffered output in the child
+        sys.stdout.flush()
+        sys.stderr.flush()
+
+        pid = os.fork()
+        if pid == 0:
+            exit_code = 1
             try:
-                for dir in key_path.absolute().parents:
-                    if dir == self._persist_dir:
-                        break
-                    dir.rmdir()
-            except OSError:
-                pass
+                # Don't be killed along with this process's session (eg. when
+                # the terminal is closed)
+                os.setsid()
+                null_fd = os.open(os.devnull, os.O_RDWR)
+                for std_fd in (0, 1, 2):
+                    os.dup2(null_fd, std_fd)
 
-        self._marked_for_removal = set()
+                self._after_fork()
+                self.flush()
+                if on_flushed is not None:
+                    on_flushed()
+                exit_code = 0
+            finally:
+                # Don't run this process's exit handlers in the child
+                os._exit(exit_code)
 
-    def flush(self):
-        self.persist()
         self._cache = {}
+        self._dirty = set()
+        self._marked_for_removal = set()
+        self._used = {}
+        self._index = None
+        return pid
 
     # Pythonic Interface
 
@@ -121,6 +479,345 @@ class Store:
 
     # Utils
 
+    def _list_persisted(self, prefix):
+        # Entries directly in a directory of the store are always within the
+        # store, so don't need resolving.
+        dir_path = self._persist_dir
+        if prefix != '':
+            dir_path = self._path_for(prefix)
+        try:
+            return [
+                prefix + entry.name
+                for entry in dir_path.iterdir()
+                if not entry.name.startswith('.')
+            ]
+        except FileNotFoundError:
+            return []
+
+    def _count_miss(self, key):
+        self._stats['misses'] += 1
+        self._missed.add(key)
+
+    def _persist(self) -> int:
+        # Serialise outside of the lock, to hold it for as little time as
+        # possible
+        to_write = self._serialise_dirty()
+
+        # Don't take the lock to rewrite the index just to record recent uses
+        if (
+            len(to_write) == 0 and
+            len(self._marked_for_removal) == 0 and
+            not self._has_limits() and
+            self._uses_are_recorded()
+        ):
+            self._used = {}
+            return 0
+
+        with self._lock():
+            for key, (_, data) in to_write.items():
+                self._write(self._path_for(key), data)
+
+            for key in self._marked_for_removal:
+                self._remove(key)
+
+            self._update_index(to_write)
+
+        self._dirty = set()
+        self._marked_for_removal = set()
+        return sum(len(data) for _, data in to_write.values())
+
+    def _read(self, key, type):
+        key_path = self._path_for(key)
+        if type == 'binary':
+            data = self._map(key_path)
+            self._stats['bytes_read'] += len(data)
+            return data
+
+        data = key_path.read_bytes()
+        self._stats['bytes_read'] += len(data)
+        if type in _SERIALISERS:
+            _, deserialise = _SERIALISERS[type]
+            return deserialise(data)
+        else:
+            # Translate newlines, as reading in text mode would
+            return data.decode().replace('\r\n', '\n').replace('\r', '\n')
+
+    def _quarantine_persisted(self, key):
+        key_path = self._path_for(key)
+        quarantine_path = (
+            self._persist_dir / QUARANTINE_DIR /
+            f'{key_path.relative_to(self._persist_dir)}.{time.time_ns()}'
+        )
+        quarantine_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock():
+            try:
+                key_path.rename(quarantine_path)
+            except FileNotFoundError:
+                pass # Already quarantined or removed by another process
+
+            index = self._read_index()
+            if key in index:
+                del index[key]
+                self._write(self._persist_dir / INDEX_FILE, pickle.dumps(index))
+            self._index = index
+
+    def _serialise_dirty(self) -> dict[str, tuple[str, Any]]:
+        """
+        Return the type and serialised data of each entry that has been set
+        since it was last persisted, by key.
+        """
+
+        serialised = {}
+        for key in self._dirty:
+            value = self._cache[key]
+            # Entries that were got without setting their type are persisted
+            # as the type they were got as
+            type = self.getattr(key, 'type') or self._indexed_type(key)
+            if type in _SERIALISERS:
+                serialise, _ = _SERIALISERS[type]
+                serialised[key] = (type, serialise(value))
+            elif type == 'binary':
+                serialised[key] = (type, value)
+            else:
+                serialised[key] = ('text', value.encode())
+        return serialised
+
+    def _after_fork(self):
+        # Re-open anything that cannot be shared with the parent process
+        pass
+
+    @contextmanager
+    def _lock(self):
+        with (self._persist_dir / LOCK_FILE).open('a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _write(self, path: Path, data):
+        # Write to a temporary file, then rename it over the file at the given
+        # path, so that the file is never partially written (even if this
+        # process is killed while writing it), and existing memory-mapped
+        # copies of the old file are unaffected.
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(
+            dir=path.parent, prefix='.', suffix='.tmp'
+        )
+        try:
+            os.fchmod(fd, FILE_MODE)
+            with os.fdopen(fd, 'wb') as temp_file:
+                temp_file.write(data)
+                temp_file.flush()
+                os.fsync(temp_file.fileno())
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+    def _remove(self, key):
+        key_path = self._path_for(key)
+        if key_path.is_dir():
+            rmtree(key_path)
+        elif key_path.exists():
+            key_path.unlink()
+
+        # Try to remove parent dirs until a non-empty one is found)
+        try:
+            for dir in key_path.absolute().parents:
+                if dir == self._persist_dir:
+                    break
+                dir.rmdir()
+        except OSError:
+            pass
+
+    def _indexed_type(self, key):
+        # Scanning the store finds no types, so only read the index file (if
+        # any) to find them
+        if self._index is None:
+            index = self._read_index(scan=False)
+            if index is None:
+                return None
+            self._index = index
+
+        record = self._index.get(key)
+        return record['type'] if record is not None else None
+
+    def _uses_are_recorded(self):
+        # Within `LAST_USED_RESOLUTION` of the time of last use in the index
+        # (if there is one), without scanning the store for an index
+        if len(self._used) == 0:
+            return True
+        if self._index is None:
+            self._index = self._read_index(scan=False)
+            if self._index is None:
+                return False
+
+        for key, last_used in self._used.items():
+            record = self._index.get(key)
+            if (
+                record is None or
+                last_used - record['last_used'] >= LAST_USED_RESOLUTION
+            ):
+                return False
+        return True
+
+    def _get_index(self) -> dict[str, dict[str, Any]]:
+        if self._index is None:
+            self._index = self._read_index()
+        return self._index
+
+    def _read_index(self, scan=True) -> dict[str, dict[str, Any]] | None:
+        """
+        Read the index file. If there is none (or it cannot be read), then
+        scan the store for an index if `scan` is True, or return None if not.
+        """
+
+        try:
+            return pickle.loads((self._persist_dir / INDEX_FILE).read_bytes())
+        except (OSError, *_DESERIALISING_ERRORS):
+            return self._scan_index() if scan else None
+
+    def _update_index(self, written: dict[str, tuple[str, Any]]):
+        """
+        Record the metadata of the entries that were written, and when the
+        entries used in this session were last used, then evict entries (if
+        needed) to meet the limits of this store.
+        """
+
+        if (
+            len(self._used) == 0 and
+            len(self._marked_for_removal) == 0 and
+            not self._has_limits()
+        ):
+            return
+
+        # Re-read the index, as other processes may have changed it since it
+        # was loaded
+        index = self._read_index()
+
+        for removed_key in self._marked_for_removal:
+            for key in tuple(index):
+                if key == removed_key or key.startswith(removed_key+'/'):
+                    del index[key]
+        for key, (type, data) in written.items():
+            index[key] = {
+                'type': type,
+                'size': len(data),
+                'mtime': self._path_for(key).stat().st_mtime,
+                'checksum': f'{zlib.crc32(data):08x}',
+                'last_used': self._used.get(key, time.time())
+            }
+        for key, last_used in self._used.items():
+            if key in written:
+                continue
+            elif key in index:
+                index[key]['last_used'] = last_used
+            else:
+                try:
+                    stat = self._path_for(key).stat()
+                except OSError:
+                    continue # Not persisted
+                index[key] = {
+                    'type': self.getattr(key, 'type'),
+                    'size': stat.st_size,
+                    'mtime': stat.st_mtime,
+                    'checksum': None,
+                    'last_used': last_used
+                }
+
+        to_evict = self._to_evict(index)
+        for key in to_evict:
+            del index[key]
+            if key in self._cache:
+                del self._cache[key]
+            self._remove(key)
+
+        if (
+            len(self._used) > 0 or
+            len(self._marked_for_removal) > 0 or
+            len(to_evict) > 0
+        ):
+            self._write(self._persist_dir / INDEX_FILE, pickle.dumps(index))
+        self._index = index
+        self._used = {}
+
+    def _scan_index(self) -> dict[str, dict[str, Any]]:
+        # Without an index, the type and checksum of each entry are unknown,
+        # and assume each entry was last used when it was last written
+        index = {}
+        for dir, dir_names, file_names in os.walk(self._persist_dir):
+            # Don't descend into reserved directories (eg. the quarantine)
+            dir_names[:] = [
+                name for name in dir_names
+                if not name.startswith('.')
+            ]
+            for name in file_names:
+                if name.startswith('.'):
+                    continue
+
+                path = Path(dir, name)
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue # Removed by another process, or a broken link
+                index[str(path.relative_to(self._persist_dir))] = {
+                    'type': None,
+                    'size': stat.st_size,
+                    'mtime': stat.st_mtime,
+                    'checksum': None,
+                    'last_used': stat.st_mtime
+                }
+        return index
+
+    def _has_limits(self):
+        return (
+            self._max_bytes is not None or
+            self._max_entries is not None or
+            self._max_age is not None
+        )
+
+    def _to_evict(self, index: dict[str, dict[str, Any]]):
+        if not self._has_limits():
+            return []
+
+        # Least recently used first
+        by_last_used = sorted(index, key=lambda key: index[key]['last_used'])
+        num_entries = len(by_last_used)
+        total_bytes = sum(record['size'] for record in index.values())
+        oldest_allowed = (
+            time.time() - self._max_age
+            if self._max_age is not None
+            else None
+        )
+
+        to_evict = []
+        for key in by_last_used:
+            last_used, size = index[key]['last_used'], index[key]['size']
+            if not (
+                (oldest_allowed is not None and last_used < oldest_allowed) or
+                (self._max_entries is not None and num_entries > self._max_entries) or
+                (self._max_bytes is not None and total_bytes > self._max_bytes)
+            ):
+                break
+
+            to_evict.append(key)
+            num_entries -= 1
+            total_bytes -= size
+        return to_evict
+
+    def _map(self, key_path: Path) -> mmap | bytes:
+        """
+        Map the file at the given path into memory read-only, so that it is
+        only read from disk as it is accessed.
+        """
+
+        with key_path.open('rb') as key_file:
+            try:
+                return mmap(key_file.fileno(), 0, access=ACCESS_READ)
+            except ValueError:
+                return b'' # Empty files cannot be mapped
+
     def _path_for(self, key):
         if len(key) > 0 and key[0] == '/':
             key = key[1:]
@@ -143,3 +840,206 @@ class Store:
             )
 
         return key_path_resolved.relative_to(self._persist_dir)
+
+class SQLiteStore(Store):
+    """
+    A store of entries, held in memory and persisted in a single SQLite
+    database file.
+
+    Behaves the same as `Store`, except that:
+
+    - the index is the metadata columns of the database, rather than a
+      separate file
+    - 'binary' entries are read as bytes, rather than memory-mapped
+    - quarantined entries are moved to a separate table in the database
+
+    Listing, removing, and evicting entries are single queries, rather than
+    walks of a directory tree, so this is faster than `Store` for stores with
+    many entries (see benchmarks/store_backends.py).
+    """
+
+    def __init__(self,
+            db_path='/tmp/store.sqlite',
+            *,
+            max_bytes: int | None = None,
+            max_entries: int | None = None,
+            max_age: float | None = None
+    ):
+        super().__init__(
+            Path(db_path).parent,
+            max_bytes=max_bytes,
+            max_entries=max_entries,
+            max_age=max_age
+        )
+        self._db_path = Path(db_path).resolve()
+        self._connect()
+
+    def size(self, key) -> int:
+        """Return the size of the persisted entry with the given key, if any."""
+
+        row = self._db.execute(
+            'SELECT size FROM entries WHERE key = ?', (key,)
+        ).fetchone()
+        return row[0] if row is not None else 0
+
+    def __str__(self):
+        return f'<SQLiteStore @ {self._db_path}>'
+
+    # Utils
+
+    def _connect(self):
+        # Transactions are managed by `_lock()`. Write-ahead logging allows
+        # other processes to read while one is persisting.
+        self._db = sqlite3.connect(
+            self._db_path, timeout=60, isolation_level=None
+        )
+        self._db.execute('PRAGMA journal_mode = WAL')
+        self._db.execute('PRAGMA synchronous = NORMAL')
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                type TEXT,
+                data BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                mtime REAL NOT NULL,
+                checksum TEXT,
+                last_used REAL NOT NULL
+            )
+        """)
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS quarantine (
+                key TEXT NOT NULL,
+                quarantined INTEGER NOT NULL,
+                type TEXT,
+                data BLOB NOT NULL
+            )
+        """)
+
+    def _persist(self) -> int:
+        to_write = self._serialise_dirty()
+
+        now = time.time()
+        with self._lock():
+            self._db.executemany(
+                'INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (
+                    (
+                        key, type, data, len(data), now,
+                        f'{zlib.crc32(data):08x}', self._used.get(key, now)
+                    )
+                    for key, (type, data) in to_write.items()
+                )
+            )
+
+            for key in self._marked_for_removal:
+                self._remove(key)
+
+            self._db.executemany(
+                'UPDATE entries SET last_used = ? WHERE key = ?',
+                (
+                    (last_used, key)
+                    for key, last_used in self._used.items()
+                    if key not in to_write
+                )
+            )
+
+            if self._has_limits():
+                for key in self._to_evict(self._read_index()):
+                    if key in self._cache:
+                        del self._cache[key]
+                    self._remove(key)
+
+        self._dirty = set()
+        self._marked_for_removal = set()
+        self._used = {}
+        self._index = None
+        return sum(len(data) for _, data in to_write.values())
+
+    def _after_fork(self):
+        # SQLite connections must not be used in both processes after a fork
+        # (see https://www.sqlite.org/howtocorrupt.html#fork), including to
+        # close them, so keep the parent's open until the child exits.
+        self._parent_db = self._db
+        self._connect()
+
+    @contextmanager
+    def _lock(self):
+        # Take the write lock on the database up-front, so that only one
+        # process persists at a time
+        self._db.execute('BEGIN IMMEDIATE')
+        try:
+            yield
+        except BaseException:
+            self._db.execute('ROLLBACK')
+            raise
+        self._db.execute('COMMIT')
+
+    def _list_persisted(self, prefix):
+        # As for directories in `Store`, list only the first part of each key
+        # after the prefix
+        return set(
+            prefix + key[len(prefix):].split('/', 1)[0]
+            for key, in self._db.execute(
+                'SELECT key FROM entries WHERE key >= ? AND key < ?',
+                (prefix, self._after_prefix(prefix))
+            )
+        )
+
+    def _read(self, key, type):
+        row = self._db.execute(
+            'SELECT type, data FROM entries WHERE key = ?', (key,)
+        ).fetchone()
+        if row is None:
+            raise KeyError(key)
+
+        persisted_type, data = row
+        self._stats['bytes_read'] += len(data)
+        if persisted_type is not None:
+            type = persisted_type
+        if type in _SERIALISERS:
+            _, deserialise = _SERIALISERS[type]
+            return deserialise(data)
+        elif type == 'binary':
+            return data
+        else:
+            return data.decode()
+
+    def _quarantine_persisted(self, key):
+        with self._lock():
+            self._db.execute(
+                """
+                INSERT INTO quarantine
+                SELECT key, ?, type, data FROM entries WHERE key = ?
+                """,
+                (time.time_ns(), key)
+            )
+            self._db.execute('DELETE FROM entries WHERE key = ?', (key,))
+        self._index = None
+
+    def _remove(self, key):
+        # Also remove entries 'in' the key, as for directories in `Store`
+        self._db.execute(
+            'DELETE FROM entries WHERE key = ? OR (key >= ? AND key < ?)',
+            (key, key+'/', self._after_prefix(key+'/'))
+        )
+
+    def _after_prefix(self, prefix):
+        # The first string after all strings starting with the given prefix, so
+        # that prefix queries are range queries on the primary key's index
+        if prefix == '':
+            return chr(0x10FFFF)
+        return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+    def _read_index(self, scan=True) -> dict[str, dict[str, Any]]:
+        return {
+            key: {
+                'type': type,
+                'size': size,
+                'mtime': mtime,
+                'checksum': checksum,
+                'last_used': last_used
+            }
+            for key, type, size, mtime, checksum, last_used in self._db.execute(
+                'SELECT key, type, size, mtime, checksum, last_used FROM entries'
+            )
+        }
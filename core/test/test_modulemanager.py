@@ -0,0 +1,68 @@
+from unittest import TestCase
+from unittest.mock import patch
+
+# Util
+import modules
+
+# Under Test
+from core.modulemanager import ModuleManager
+
+class TestModuleManager(TestCase):
+    def test_lazy_load_loads_dependency_closure_of_invoked_modules(self):
+        self.assertEqual(
+            self._lazily_loaded(['--cache', 'cache', 'list']),
+            {'cache'}
+        )
+        self.assertEqual(
+            self._lazily_loaded(['tr', '.']),
+            {'tr'}
+        )
+
+    def test_lazy_load_only_imports_loaded_modules(self):
+        with patch.object(
+            ModuleManager, '_import_mm_module',
+            autospec=True, side_effect=ModuleManager._import_mm_module
+        ) as import_mm_module:
+            self._lazily_loaded(['manifest', 'item', 'x'])
+
+        self.assertEqual(
+            sorted(
+                py_module_name
+                for _, package_name, py_module_name in (
+                    call_args.args for call_args in import_mm_module.call_args_list
+                )
+                if package_name == 'modules'
+            ),
+            ['cache', 'command_manifest', 'manifest', 'project_manifest', 'tr']
+        )
+
+    def test_lazy_load_loads_declared_plugins_of_loaded_modules(self):
+        # Plugins of manifest, but not other modules that use it
+        self.assertEqual(
+            self._lazily_loaded(['env', 'cd', 'x']),
+            {
+                'env', 'manifest', 'project-manifest', 'cache', 'tr',
+                'command-manifest'
+            }
+        )
+
+    def test_lazy_load_loads_all_modules_if_none_invoked(self):
+        self.assertEqual(
+            self._lazily_loaded(['--help']),
+            {
+                'cache', 'command-manifest', 'env', 'finance', 'info',
+                'manifest', 'project-manifest', 'tr'
+            }
+        )
+
+    def _lazily_loaded(self, cli_args):
+        with ModuleManager(
+            self._lazily_loaded,
+            'test',
+            mm_cli_args=['phase', 'list'],
+            lazy_load=True
+        ) as module_manager:
+            core_mods = set(module_manager._registered_mods)
+            module_manager.register_package(modules)
+            module_manager._load_lazy_modules(cli_args)
+            return set(module_manager._registered_mods) - core_mods
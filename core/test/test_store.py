@@ -0,0 +1,434 @@
+from multiprocessing import Pool
+import os
+import stat
+import tempfile
+import zlib
+from unittest import TestCase
+from unittest.mock import patch
+
+# Under Test
+from core.exceptions import LIMARException
+from core.store import (
+    LAST_USED_RESOLUTION, SQLiteStore, Store, add_serialiser, open_store
+)
+
+class TestStore(TestCase):
+    def setUp(self):
+        self._store_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self._store_dir.cleanup)
+
+    def test_persists_only_entries_that_were_set(self):
+        store = Store(self._store_dir.name)
+        store.setattr('a', 'type', 'pickle')
+        store.set('a', {'key': 'value'})
+        store.set('b', 'entry b')
+        self.assertEqual(store.persist(), self._size('a') + len(b'entry b'))
+        self.assertEqual(store.persist(), 0)
+
+        store = Store(self._store_dir.name)
+        store.setattr('a', 'type', 'pickle')
+        self.assertEqual(store.get('a'), {'key': 'value'})
+        self.assertEqual(store.get('b'), 'entry b')
+        store.set('b', 'new entry b')
+        self.assertEqual(store.flush(), len(b'new entry b'))
+
+        store = Store(self._store_dir.name)
+        self.assertEqual(store.get('b'), 'new entry b')
+
+    def test_persists_entries_with_the_default_file_mode(self):
+        store = Store(self._store_dir.name)
+        store.set('a', 'entry a')
+        store.flush()
+
+        umask = os.umask(0)
+        os.umask(umask)
+        for name in ('a', '.index'):
+            with self.subTest(file=name):
+                mode = os.stat(os.path.join(self._store_dir.name, name)).st_mode
+                self.assertEqual(stat.S_IMODE(mode), 0o666 & ~umask)
+
+    def test_serialisers(self):
+        values = {
+            'pickle': {'key': ('value', 1)},
+            'pickle-zlib': {'key': ('value', 1)},
+            'pickle-lzma': {'key': ('value', 1)},
+            'marshal': (('ref', (('tag', 'value'),)),)
+        }
+        store = Store(self._store_dir.name)
+        for type, value in values.items():
+            store.setattr(type, 'type', type)
+            store.set(type, value)
+        store.flush()
+
+        store = Store(self._store_dir.name)
+        for type, value in values.items():
+            store.setattr(type, 'type', type)
+            self.assertEqual(store.get(type), value)
+
+    def test_translates_newlines_in_text_entries(self):
+        data = b'line 1\r\nline 2\rline 3\n'
+        with open(os.path.join(self._store_dir.name, 'a'), 'wb') as file:
+            file.write(data)
+
+        store = Store(self._store_dir.name)
+        self.assertEqual(store.get('a'), 'line 1\nline 2\nline 3\n')
+        self.assertEqual(store.stats()['bytes_read'], len(data))
+
+    def test_add_serialiser_rejects_existing_types(self):
+        for type in ('pickle', 'binary'):
+            with self.assertRaises(LIMARException):
+                add_serialiser(type, lambda value: b'', lambda data: None)
+
+    def test_indexes_persisted_entries(self):
+        store = Store(self._store_dir.name)
+        store.setattr('a', 'type', 'pickle-zlib')
+        store.set('a', {'key': 'value'})
+        store.set('b', 'entry b')
+        self.assertIsNone(store.info('a'))
+        store.flush()
+
+        store = Store(self._store_dir.name)
+        info = store.info('a')
+        assert info is not None
+        self.assertEqual(info['type'], 'pickle-zlib')
+        self.assertEqual(info['size'], self._size('a'))
+        self.assertEqual(
+            info['mtime'],
+            os.path.getmtime(os.path.join(self._store_dir.name, 'a'))
+        )
+        with open(os.path.join(self._store_dir.name, 'a'), 'rb') as file:
+            self.assertEqual(info['checksum'], f'{zlib.crc32(file.read()):08x}')
+        self.assertEqual(store.info('b')['type'], 'text') # type: ignore
+
+        # Types are read from the index, not set
+        self.assertEqual(store.get('a'), {'key': 'value'})
+        self.assertEqual(store.get('b'), 'entry b')
+
+    def test_reindexes_entries_rewritten_by_other_stores(self):
+        store = Store(self._store_dir.name)
+        store.set('a', 'entry a')
+        store.flush()
+
+        store = Store(self._store_dir.name)
+        self.assertEqual(store.info('a')['type'], 'text') # type: ignore
+
+        other_store = Store(self._store_dir.name)
+        other_store.setattr('a', 'type', 'pickle')
+        other_store.set('a', {'key': 'value'})
+        other_store.flush()
+
+        self.assertEqual(store.get('a'), {'key': 'value'})
+
+    def test_flush_in_background(self):
+        store = Store(self._store_dir.name)
+        store.set('a', 'entry a')
+        _wait_for(store.flush_in_background())
+        self.assertEqual(store.list(), ['a'])
+
+        self.assertEqual(Store(self._store_dir.name).get('a'), 'entry a')
+
+    def test_quarantines_corrupt_entries(self):
+        with open(os.path.join(self._store_dir.name, 'a'), 'wb') as file:
+            file.write(b'not a pickle')
+
+        store = Store(self._store_dir.name)
+        store.setattr('a', 'type', 'pickle')
+        with self.assertRaises(KeyError):
+            store.get('a')
+
+        self.assertEqual(self._persisted(), [])
+        self.assertEqual(
+            len(os.listdir(os.path.join(self._store_dir.name, '.quarantine'))),
+            1
+        )
+
+    def test_raises_on_corrupt_entries_without_quarantining(self):
+        with open(os.path.join(self._store_dir.name, 'a'), 'wb') as file:
+            file.write(b'\xff not utf-8')
+
+        store = Store(self._store_dir.name, quarantine=False)
+        with self.assertRaises(UnicodeDecodeError):
+            store.get('a')
+
+        self.assertEqual(os.listdir(self._store_dir.name), ['a'])
+
+    def test_concurrent_processes(self):
+        num_processes = 8
+        with Pool(num_processes) as pool:
+            results = pool.starmap(
+                _write_and_read_concurrently,
+                [
+                    (self._store_dir.name, process, 20)
+                    for process in range(num_processes)
+                ]
+            )
+
+        for errors in results:
+            self.assertEqual(errors, [])
+        self.assertFalse(
+            os.path.exists(os.path.join(self._store_dir.name, '.quarantine'))
+        )
+
+        store = Store(self._store_dir.name)
+        self.assertEqual(
+            store.list(),
+            ['shared'] + [f'writer{i}' for i in range(num_processes)]
+        )
+        for key in store.list():
+            store.setattr(key, 'type', 'pickle')
+            self.assertTrue(_is_consistent(store.get(key)))
+
+    def test_evicts_least_recently_used_entries(self):
+        with patch('core.store.time.time', side_effect=range(100)):
+            store = Store(self._store_dir.name, max_entries=2)
+            store.set('a', 'entry a')
+            store.set('b', 'entry b')
+            store.flush()
+
+            store = Store(self._store_dir.name, max_entries=2)
+            store.get('a')
+            store.set('c', 'entry c')
+            store.flush()
+
+        self.assertEqual(self._persisted(), ['a', 'c'])
+        self.assertEqual(Store(self._store_dir.name).list(), ['a', 'c'])
+
+    def test_evicts_to_max_bytes(self):
+        store = Store(self._store_dir.name, max_bytes=10)
+        store.setattr('a', 'type', 'binary')
+        store.set('a', b'123456')
+        store.flush()
+
+        store = Store(self._store_dir.name, max_bytes=10)
+        store.setattr('b', 'type', 'binary')
+        store.set('b', b'123456')
+        store.flush()
+
+        self.assertEqual(self._persisted(), ['b'])
+
+    def test_evicts_entries_older_than_max_age(self):
+        with patch('core.store.time.time', return_value=1000):
+            store = Store(self._store_dir.name, max_age=100)
+            store.set('dir/a', 'entry a')
+            store.set('b', 'entry b')
+            store.flush()
+
+        with patch('core.store.time.time', return_value=1050):
+            store = Store(self._store_dir.name, max_age=100)
+            store.get('b')
+            store.flush()
+
+        with patch('core.store.time.time', return_value=1120):
+            store = Store(self._store_dir.name, max_age=100)
+            store.flush()
+
+        self.assertEqual(self._persisted(), ['b'])
+
+    def test_only_records_uses_after_last_used_resolution(self):
+        with patch('core.store.time.time', return_value=1000):
+            store = Store(self._store_dir.name)
+            store.set('a', 'entry a')
+            store.flush()
+        index_path = os.path.join(self._store_dir.name, '.index')
+        os.utime(index_path, (0, 0))
+
+        with patch('core.store.time.time', return_value=1010):
+            store = Store(self._store_dir.name)
+            store.get('a')
+            with patch.object(Store, '_lock') as lock:
+                store.flush()
+            lock.assert_not_called()
+        self.assertEqual(os.path.getmtime(index_path), 0)
+        self.assertEqual(Store(self._store_dir.name).info('a')['last_used'], 1000) # type: ignore
+
+        used = 1000 + LAST_USED_RESOLUTION
+        with patch('core.store.time.time', return_value=used):
+            store = Store(self._store_dir.name)
+            store.get('a')
+            store.flush()
+        self.assertEqual(Store(self._store_dir.name).info('a')['last_used'], used) # type: ignore
+
+    def test_untracked_entries_use_modification_time(self):
+        store = Store(self._store_dir.name)
+        store.set('a', 'entry a')
+        store.flush()
+        os.remove(os.path.join(self._store_dir.name, '.index'))
+        os.utime(os.path.join(self._store_dir.name, 'a'), (0, 0))
+
+        store = Store(self._store_dir.name, max_age=100)
+        store.set('b', 'entry b')
+        store.flush()
+
+        self.assertEqual(self._persisted(), ['b'])
+
+    def test_gets_without_scanning_for_an_index(self):
+        os.makedirs(os.path.join(self._store_dir.name, 'dir'))
+        for name in ('a', 'dir/b'):
+            with open(os.path.join(self._store_dir.name, name), 'w') as file:
+                file.write(f'entry {name}')
+
+        store = Store(self._store_dir.name)
+        with patch.object(Store, '_scan_index') as scan_index:
+            self.assertEqual(store.get('a'), 'entry a')
+            self.assertEqual(store.get('dir/b'), 'entry dir/b')
+        scan_index.assert_not_called()
+
+    def test_scans_for_an_index_outside_reserved_directories(self):
+        store = Store(self._store_dir.name)
+        store.set('a', 'entry a')
+        store.flush()
+        os.remove(os.path.join(self._store_dir.name, '.index'))
+        os.makedirs(os.path.join(self._store_dir.name, '.git', 'objects'))
+        with open(os.path.join(self._store_dir.name, '.git/objects/x'), 'w'):
+            pass
+
+        walked = []
+        os_walk = os.walk
+        def walk(top):
+            for dir, dir_names, file_names in os_walk(top):
+                walked.append(os.path.relpath(dir, self._store_dir.name))
+                yield dir, dir_names, file_names
+
+        with patch('core.store.os.walk', walk):
+            self.assertEqual(list(Store(self._store_dir.name).list_info()), ['a'])
+        self.assertEqual(walked, ['.'])
+
+    def _size(self, key):
+        return os.path.getsize(os.path.join(self._store_dir.name, key))
+
+    def _persisted(self):
+        paths = (
+            os.path.relpath(os.path.join(dir, name), self._store_dir.name)
+            for dir, _, names in os.walk(self._store_dir.name)
+            for name in names
+        )
+        return sorted(
+            path for path in paths
+            if not any(part.startswith('.') for part in path.split(os.sep))
+        )
+
+class TestSQLiteStore(TestCase):
+    def setUp(self):
+        self._store_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self._store_dir.cleanup)
+        self._db_path = os.path.join(self._store_dir.name, 'store.sqlite')
+
+    def test_open_store(self):
+        self.assertIsInstance(open_store('sqlite:'+self._db_path), SQLiteStore)
+        self.assertNotIsInstance(open_store(self._store_dir.name), SQLiteStore)
+
+    def test_persists_entries(self):
+        store = SQLiteStore(self._db_path)
+        store.setattr('objects/a', 'type', 'pickle')
+        store.set('objects/a', {'key': 'value'})
+        store.setattr('objects/b', 'type', 'binary')
+        store.set('objects/b', b'entry b')
+        store.set('c', 'entry c')
+        self.assertEqual(store.flush(), store.size('objects/a') + 14)
+
+        store = SQLiteStore(self._db_path)
+        self.assertEqual(store.list(), ['c', 'objects'])
+        self.assertEqual(store.list(dir='objects'), ['objects/a', 'objects/b'])
+        self.assertEqual(store.get('objects/a'), {'key': 'value'})
+        self.assertEqual(store.get('objects/b'), b'entry b')
+        self.assertEqual(store.get('c'), 'entry c')
+        self.assertEqual(store.info('objects/b')['type'], 'binary') # type: ignore
+
+        store.delete('objects')
+        store.flush()
+
+        store = SQLiteStore(self._db_path)
+        self.assertEqual(store.list(), ['c'])
+        with self.assertRaises(KeyError):
+            store.get('objects/a')
+
+    def test_quarantines_corrupt_entries(self):
+        store = SQLiteStore(self._db_path)
+        store.setattr('a', 'type', 'binary')
+        store.set('a', b'not a pickle')
+        store.flush()
+        store._db.execute("UPDATE entries SET type = 'pickle'")
+
+        store = SQLiteStore(self._db_path)
+        with self.assertRaises(KeyError):
+            store.get('a')
+        self.assertEqual(store.list(), [])
+        self.assertEqual(
+            store._db.execute('SELECT count(*) FROM quarantine').fetchone(),
+            (1,)
+        )
+
+    def test_flush_in_background(self):
+        store = SQLiteStore(self._db_path)
+        store.set('a', 'entry a')
+        _wait_for(store.flush_in_background())
+        self.assertEqual(store.list(), ['a'])
+
+        self.assertEqual(SQLiteStore(self._db_path).get('a'), 'entry a')
+
+    def test_evicts_least_recently_used_entries(self):
+        with patch('core.store.time.time', side_effect=range(100)):
+            store = SQLiteStore(self._db_path, max_entries=2)
+            store.set('a', 'entry a')
+            store.set('b', 'entry b')
+            store.flush()
+
+            store = SQLiteStore(self._db_path, max_entries=2)
+            store.get('a')
+            store.set('c', 'entry c')
+            store.flush()
+
+        self.assertEqual(SQLiteStore(self._db_path).list(), ['a', 'c'])
+
+    def test_concurrent_processes(self):
+        num_processes = 8
+        with Pool(num_processes) as pool:
+            results = pool.starmap(
+                _write_and_read_concurrently,
+                [
+                    ('sqlite:'+self._db_path, process, 20)
+                    for process in range(num_processes)
+                ]
+            )
+
+        for errors in results:
+            self.assertEqual(errors, [])
+
+        store = SQLiteStore(self._db_path)
+        self.assertEqual(
+            store.list(),
+            ['shared'] + [f'writer{i}' for i in range(num_processes)]
+        )
+        for key in store.list():
+            self.assertTrue(_is_consistent(store.get(key)))
+
+def _wait_for(pid: int):
+    _, status = os.waitpid(pid, 0)
+    assert os.waitstatus_to_exitcode(status) == 0, 'background flush failed'
+
+def _value(writer: int, iteration: int):
+    # Large enough that writes are not atomic at the OS level
+    return {'writer': writer, 'data': [(writer, iteration)] * 50_000}
+
+def _is_consistent(value):
+    return (
+        len(value['data']) == 50_000 and
+        all(item[0] == value['writer'] for item in value['data']) and
+        len(set(value['data'])) == 1
+    )
+
+def _write_and_read_concurrently(store_dir, writer, iterations):
+    errors = []
+    for iteration in range(iterations):
+        store = open_store(store_dir, max_entries=20)
+        for key in ('shared', f'writer{writer}'):
+            store.setattr(key, 'type', 'pickle')
+            try:
+                if not _is_consistent(store.get(key)):
+                    errors.append(f'inconsistent value for {key}')
+            except KeyError:
+                pass # Not yet written
+
+            store.set(key, _value(writer, iteration))
+        store.flush()
+    return errors
@@ -1,3 +1,5 @@
+import os
+
 from core.modulemanager import ModuleManager
 from core.modules.docs_utils.docs_arg import docs_for
 
@@ -8,7 +10,11 @@ def main():
     LIMAR is an information management tool.
     """
 
-    with ModuleManager(main, 'limar') as module_manager:
+    with ModuleManager(
+        main,
+        'limar',
+        lazy_load=os.environ.get('LIMAR__LAZY_LOAD_MODULES') == 'true'
+    ) as module_manager:
         module_manager.register_package(modules)
         module_manager.run()
 
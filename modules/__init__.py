@@ -1,2 +1,10 @@
 from core.utils import modules_adjacent_to
 __all__ = modules_adjacent_to(__file__)
+
+# Modules that only add manifest context modules, so are loaded along with the
+# manifest module if ModuleManager only loads the modules that each command
+# needs (see `register_package()`)
+PLUGINS = {
+    'project-manifest': ['manifest'],
+    'command-manifest': ['manifest']
+}
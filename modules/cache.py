@@ -1,4 +1,10 @@
-from core.store import Store
+from datetime import datetime
+import json
+import shlex
+import sys
+
+from core.exceptions import LIMARException
+from core.store import Store, open_store
 from core.modulemanager import ModuleAccessor
 from core.modules.docs_utils.docs_arg import docs_for
 
@@ -7,9 +13,19 @@ from typing import Any
 from core.envparse import EnvironmentParser
 from argparse import ArgumentParser, BooleanOptionalAction, Namespace
 
+OBJECTS_DIR = 'objects'
+REFS_DIR = 'refs'
+
 class CacheModule:
     """
     MM module to manage cached data.
+
+    Data that is derived from some content (eg. a parsed manifest) should be
+    cached in entries under `objects/`, named by a digest of that content, and
+    a named reference should be set to the entries for the current version of
+    that content (see `set_ref()`). Entries under `objects/` that are no longer
+    referenced are deleted automatically when a reference is changed, or by
+    `gc()`.
     """
 
     # Lifecycle
@@ -23,6 +39,11 @@ class CacheModule:
 
     def configure_env(self, *, parser: EnvironmentParser, **_):
         parser.add_variable('ROOT')
+        parser.add_variable('MAX_BYTES', type=int, default_is_none=True)
+        parser.add_variable('MAX_ENTRIES', type=int, default_is_none=True)
+        parser.add_variable('MAX_AGE_DAYS', type=float, default_is_none=True)
+        parser.add_variable('BACKGROUND_FLUSH', type=int, default=0)
+        parser.add_variable('STATS_FILE', default_is_none=True)
 
     def configure_root_args(self, *, parser: ArgumentParser, **_):
         parser.add_argument('--read-cache',
@@ -40,15 +61,26 @@ class CacheModule:
             this one if they are given.
             """)
 
+        parser.add_argument('--background-flush',
+            action=BooleanOptionalAction, default=None,
+            help="""
+            Persist the cache in a detached process on module stop, so that
+            LIMAR exits without waiting for it. Overrides
+            `LIMAR_CACHE_BACKGROUND_FLUSH` if given.
+            """)
+
         parser.add_argument('--cache-root', default=None,
-            help="""Override the cache root to the given value.""")
+            help="""
+            Override the cache root to the given value. Roots starting with
+            `sqlite:` are SQLite database files, rather than directories.
+            """)
 
     def configure_args(self, *, mod: Namespace, parser: ArgumentParser, **_):
         cache_subparsers = parser.add_subparsers(dest="cache_command")
 
         # Subcommands / List Cache Entires
         list_parser = cache_subparsers.add_parser('list',
-            epilog=docs_for(self.list))
+            epilog=docs_for(self.list_info))
         mod.docs.add_docs_arg(list_parser)
 
         # Subcommands / Show Cache Entry
@@ -72,6 +104,16 @@ class CacheModule:
             epilog=docs_for(self.clear_and_persist))
         mod.docs.add_docs_arg(clear_parser)
 
+        # Subcommands / Show Statistics
+        stats_parser = cache_subparsers.add_parser('stats',
+            epilog=docs_for(self.recorded_stats))
+        mod.docs.add_docs_arg(stats_parser)
+
+        # Subcommands / Collect Garbage
+        gc_parser = cache_subparsers.add_parser('gc',
+            epilog=docs_for(self.gc))
+        mod.docs.add_docs_arg(gc_parser)
+
     def configure(self, *,
             mod: Namespace,
             env: Namespace,
@@ -79,13 +121,20 @@ class CacheModule:
             **_
     ):
         self._mod = mod # For methods that aren't directly given it
+        self._stats_file = env.STATS_FILE
 
         # Create cache store
         if self._store is None:
-            if args.cache_root is not None:
-                self._store = Store(args.cache_root)
-            else:
-                self._store = Store(env.ROOT)
+            self._store = open_store(
+                args.cache_root if args.cache_root is not None else env.ROOT,
+                max_bytes=env.MAX_BYTES,
+                max_entries=env.MAX_ENTRIES,
+                max_age=(
+                    env.MAX_AGE_DAYS * 24 * 60 * 60
+                    if env.MAX_AGE_DAYS is not None
+                    else None
+                )
+            )
 
         # Enable/disable caching
         self._read_cache = (
@@ -102,6 +151,10 @@ class CacheModule:
                 else True
             )
         )
+        self._background_flush = (
+            args.background_flush if args.background_flush is not None
+            else env.BACKGROUND_FLUSH != 0
+        )
 
     def start(self, *_, **__):
         pass
@@ -110,7 +163,7 @@ class CacheModule:
         output = None
 
         if args.cache_command == 'list':
-            output = self.list()
+            output = self.list_info()
 
         elif args.cache_command == 'show':
             output = self.get(args.entry_name)
@@ -121,18 +174,38 @@ class CacheModule:
         elif args.cache_command == 'clear':
             output = self.clear_and_persist()
 
+        elif args.cache_command == 'gc':
+            output = self.gc()
+
+        elif args.cache_command == 'stats':
+            output = self.recorded_stats()
+
         return output
 
     def stop(self, *_, mod: Namespace, **__):
-        if self._write_cache:
+        if self._write_cache and self._background_flush:
             assert self._store is not None, 'CacheModule.stop() called before CacheModule.configure()'
-            self._store.flush()
-            mod.log.info(f"Flushed cache in {self.get_store_str()}")
+            pid = self._store.flush_in_background(
+                on_flushed=lambda: self._record_stats('background')
+            )
+            mod.log.info(
+                f"Flushing cache in {self.get_store_str()} in the background"
+                f" (process {pid})"
+            )
+        elif self._write_cache:
+            assert self._store is not None, 'CacheModule.stop() called before CacheModule.configure()'
+            bytes_written = self._store.flush()
+            mod.log.info(
+                f"Flushed cache in {self.get_store_str()} ({bytes_written}"
+                " bytes written)"
+            )
+            self._record_stats('foreground')
         else:
             mod.log.info(
                 f"Did not flush cache in {self.get_store_str()} (writing to"
                 " cache is disabled)"
             )
+            self._record_stats('disabled')
 
     # Invokation
     # --------------------
@@ -155,12 +228,48 @@ class CacheModule:
         return self._store.list(read_persistent=self._read_cache)
 
     @ModuleAccessor.invokable_as_service
-    def get(self, name):
-        """Get the contents of the cache entry with the given name."""
+    def list_info(self):
+        """
+        List all cache entries, including those in subdirectories of the cache,
+        with their type, size, modification time, checksum, and time of last
+        use, as recorded in the cache's index, without reading the entries.
+
+        Times are in ISO 8601 format. Metadata that is not recorded (eg. for
+        entries that have not been persisted) is None.
+        """
+
+        assert self._store is not None, f'{self.list_info.__name__}() called before {self.configure.__name__}()'
+
+        entries = {}
+        for name, info in self._store.list_info(
+            read_persistent=self._read_cache
+        ).items():
+            if info is None:
+                info = dict.fromkeys(
+                    ('type', 'size', 'mtime', 'checksum', 'last_used')
+                )
+            for time_key in ('mtime', 'last_used'):
+                if info[time_key] is not None:
+                    info[time_key] = datetime.fromtimestamp(info[time_key]) \
+                        .isoformat(timespec='seconds')
+            entries[name] = info
+        return entries
+
+    @ModuleAccessor.invokable_as_service
+    def get(self, name, type='pickle'):
+        """
+        Get the contents of the cache entry with the given name.
+
+        `type` is the type of the entry, and must be the same as when it was
+        set. It is only used if the entry's type is not recorded in the cache's
+        index (eg. if the index was deleted). 'pickle' entries are returned as
+        they were set. 'binary' entries are returned as a read-only,
+        memory-mapped buffer if they are read from disk.
+        """
 
         assert self._store is not None, f'{self.get.__name__}() called before {self.configure.__name__}()'
 
-        self._store.setattr(name, 'type', 'pickle')
+        self._store.setattr(name, 'type', type)
         data = self._store.get(name, read_persistent=self._read_cache)
         self._mod.log.info(
             f"Retrieved cached '{name}' from {self.get_store_str()} ("+(
@@ -171,19 +280,26 @@ class CacheModule:
         return data
 
     @ModuleAccessor.invokable_as_service
-    def set(self, name, data):
-        """Set the cache entry with the given name to the given data."""
+    def set(self, name, data, type='pickle'):
+        """
+        Set the cache entry with the given name to the given data.
+
+        `type` is the type of the entry. 'pickle' entries can be any picklable
+        data, and 'pickle-zlib' and 'pickle-lzma' entries are the same, but
+        compressed. 'marshal' entries must only contain built-in types. 'binary'
+        entries must be bytes-like.
+        """
 
         assert self._store is not None, f'{self.set.__name__}() called before {self.configure.__name__}()'
 
-        self._store.setattr(name, 'type', 'pickle')
+        self._store.setattr(name, 'type', type)
         self._store.set(name, data)
         self._mod.log.info(
             f"Cached '{name}' in {self.get_store_str()} (not yet persisted)"
         )
 
     @ModuleAccessor.invokable_as_service
-    def set_and_persist(self, name, data):
+    def set_and_persist(self, name, data, type='pickle'):
         """
         Set the cache entry with the given name to the given data, and persist
         if enabled.
@@ -191,10 +307,25 @@ class CacheModule:
 
         assert self._store is not None, f'{self.set_and_persist.__name__}() called before {self.configure.__name__}()'
 
-        self.set(name, data)
+        self.set(name, data, type)
         if self._write_cache:
             self._store.persist()
 
+    @ModuleAccessor.invokable_as_service
+    def quarantine(self, name):
+        """
+        Move the cache entry with the given name out of the cache, eg. because
+        it is corrupt, so that it can be inspected later.
+        """
+
+        assert self._store is not None, f'{self.quarantine.__name__}() called before {self.configure.__name__}()'
+
+        self._store.quarantine(name)
+        self._mod.log.warning(
+            f"Quarantined corrupt cache entry '{name}' from"
+            f" {self.get_store_str()}"
+        )
+
     @ModuleAccessor.invokable_as_service
     def delete(self, name):
         """Delete the cache entry with the given name."""
@@ -239,3 +370,166 @@ class CacheModule:
         self.clear()
         if self._write_cache:
             self._store.persist()
+
+    @ModuleAccessor.invokable_as_service
+    def get_ref(self, ref):
+        """
+        Get the names of the cache entries the reference with the given name
+        refers to.
+        """
+
+        assert self._store is not None, f'{self.get_ref.__name__}() called before {self.configure.__name__}()'
+
+        return self._get_ref(REFS_DIR+'/'+ref)
+
+    @ModuleAccessor.invokable_as_service
+    def set_ref(self, ref, entries):
+        """
+        Set the reference with the given name to refer to the cache entries
+        with the given names (which should be under `objects/`).
+
+        Entries the reference referred to before, that are not referred to by
+        any reference now, are deleted.
+        """
+
+        assert self._store is not None, f'{self.set_ref.__name__}() called before {self.configure.__name__}()'
+
+        key = REFS_DIR+'/'+ref
+        try:
+            superseded = set(self._get_ref(key)) - set(entries)
+        except KeyError:
+            superseded = set()
+
+        self._store.setattr(key, 'type', 'text')
+        self._store.set(key, ''.join(entry+'\n' for entry in entries))
+        self._mod.log.info(
+            f"Set cache ref '{ref}' in {self.get_store_str()} (not yet"
+            " persisted)"
+        )
+
+        if len(superseded) > 0:
+            for entry in superseded - self._referenced_entries():
+                self.delete(entry)
+
+    @ModuleAccessor.invokable_as_service
+    def stats(self):
+        """
+        Return statistics about the use of the cache in this run: the number of
+        hits and misses (and which entries were missed), the number of bytes
+        read and written, and the time spent reading (including deserialising)
+        and persisting entries, in seconds.
+        """
+
+        assert self._store is not None, f'{self.stats.__name__}() called before {self.configure.__name__}()'
+
+        return self._store.stats()
+
+    @ModuleAccessor.invokable_as_service
+    def recorded_stats(self):
+        """
+        Return the statistics recorded at the end of previous runs (see
+        `stats()`): those of the last run, and the totals across all recorded
+        runs.
+
+        Statistics are only recorded if `LIMAR_CACHE_STATS_FILE` is set. Each
+        run appends a JSON object to that file, on its own line.
+        """
+
+        if self._stats_file is None:
+            raise LIMARException(
+                "Cache statistics are not recorded: set LIMAR_CACHE_STATS_FILE"
+                " to record them"
+            )
+
+        try:
+            with open(self._stats_file) as stats_file:
+                runs = [json.loads(line) for line in stats_file if line.strip()]
+        except FileNotFoundError:
+            runs = []
+        except (OSError, ValueError) as e:
+            raise LIMARException(
+                f"Could not read cache statistics from '{self._stats_file}'"
+            ) from e
+
+        return {
+            'runs': len(runs),
+            'last_run': runs[-1] if len(runs) > 0 else None,
+            'total': {
+                stat: sum(run[stat] for run in runs)
+                for stat in (
+                    'hits', 'misses', 'bytes_read', 'bytes_written',
+                    'read_time', 'persist_time'
+                )
+            }
+        }
+
+    @ModuleAccessor.invokable_as_service
+    def gc(self):
+        """
+        Delete all cache entries under `objects/` that are not referred to by
+        any reference, persist if enabled, and return how many entries were
+        deleted and how many bytes on disk they used.
+        """
+
+        assert self._store is not None, f'{self.gc.__name__}() called before {self.configure.__name__}()'
+
+        referenced = self._referenced_entries()
+        deleted_entries = 0
+        reclaimed_bytes = 0
+        for entry in self._store.list(
+            read_persistent=self._read_cache,
+            dir=OBJECTS_DIR
+        ):
+            if entry not in referenced:
+                reclaimed_bytes += self._store.size(entry)
+                deleted_entries += 1
+                self.delete(entry)
+
+        if self._write_cache:
+            self._store.persist()
+        self._mod.log.info(
+            f"Deleted {deleted_entries} unreferenced cache entries from"
+            f" {self.get_store_str()}, reclaiming {reclaimed_bytes} bytes"
+        )
+        return {
+            'deleted_entries': deleted_entries,
+            'reclaimed_bytes': reclaimed_bytes
+        }
+
+    # Utils
+    # --------------------
+
+    def _record_stats(self, flush):
+        if self._stats_file is None:
+            return
+
+        summary = {
+            'time': datetime.now().isoformat(timespec='seconds'),
+            'command': shlex.join(sys.argv[1:]),
+            'store': self.get_store_str(),
+            'flush': flush,
+            **self.stats()
+        }
+        with open(self._stats_file, 'a') as stats_file:
+            stats_file.write(json.dumps(summary)+'\n')
+
+    def _get_ref(self, key):
+        assert self._store is not None, f'{self._get_ref.__name__}() called before {self.configure.__name__}()'
+
+        self._store.setattr(key, 'type', 'text')
+        return self._store.get(key, read_persistent=self._read_cache) \
+            .splitlines()
+
+    def _referenced_entries(self):
+        assert self._store is not None, f'{self._referenced_entries.__name__}() called before {self.configure.__name__}()'
+
+        referenced = set()
+        for key in self._store.list(
+            read_persistent=self._read_cache,
+            dir=REFS_DIR
+        ):
+            try:
+                referenced.update(self._get_ref(key))
+            except KeyError:
+                pass
+        return referenced
@@ -1,5 +1,6 @@
 from math import ceil
 from datetime import date, timedelta
+from hashlib import md5
 from dateutil.relativedelta import relativedelta, MO
 from frozendict import frozendict
 
@@ -7,6 +8,7 @@ from core.exceptions import LIMARException
 from core.modules.phase_utils.phase_system import PhaseSystem
 
 from modules.finance_utils.currency_amount import CurrencyAmount
+from modules.finance_utils.group_aggregation import GroupAggregation
 from modules.manifest_modules import (
     # Generic
     tags,
@@ -18,6 +20,7 @@ from modules.manifest_modules import (
 )
 
 # Types
+from core.envparse import EnvironmentParser
 from argparse import ArgumentParser, Namespace
 from typing import Any, Callable, Hashable
 from modules.manifest import Item, ItemSet
@@ -86,13 +89,37 @@ FINANCE_LIFECYCLE = PhaseSystem(
 class FinanceModule:
     """
     MM module for managing financial accounts and transactions.
+
+    Queries are run by one of two engines, chosen with the `ENGINE` environment
+    variable. Both give the same output:
+
+    - `dict` (the default) processes each transaction as a dict
+    - `columnar` loads the transactions into NumPy arrays (see
+      `TransactionTable`) and processes them with vectorised operations, which
+      is much faster for large numbers of transactions. It requires `numpy`.
+
+    When aggregating, the `dict` engine defers grouping until the aggregate
+    stage, then groups and aggregates in a single pass (see
+    `GroupAggregation`).
+
+    If the `MATERIALISE_AGGREGATES` environment variable is 1, then the results
+    of aggregate queries are kept in the cache, and repeated queries are
+    answered from there until the manifest changes. Results of sum and mean
+    queries are then updated by only running the query for the transactions
+    that were added or changed (see `AggregateContributions`).
     """
 
+    ENGINES = ('dict', 'columnar')
+
     # Lifecycle
     # --------------------------------------------------
 
     def dependencies(self):
-        return ['phase', 'manifest']
+        return ['phase', 'manifest', 'cache']
+
+    def configure_env(self, *, parser: EnvironmentParser, **_):
+        parser.add_variable('ENGINE', default='dict')
+        parser.add_variable('MATERIALISE_AGGREGATES', type=int, default=0)
 
     def configure_args(self, *, mod: Namespace, parser: ArgumentParser, **_):
         # Filter, Group, and Distribute (inc. window param); graphically:
@@ -115,9 +142,11 @@ class FinanceModule:
         #                     2023-02-08    2023-02-08
         #
         # In general, the smaller the period unit given, the less temporal drift
-        # there will be in the results, but the more inaccuracy there will be
-        # due to rounding error. Because of this trade-off, the user is required
-        # to select a period that is appropriate for their computation.
+        # there will be in the results, but the more each period's amount will
+        # be affected by rounding (to a whole unit of the currency, though the
+        # amounts of all of a transaction's periods always add up to its
+        # amount). Because of this trade-off, the user is required to select a
+        # period that is appropriate for their computation.
 
         parser.add_argument('-w', '--window', metavar='START_DATE:END_DATE',
             default=None,
@@ -179,7 +208,15 @@ class FinanceModule:
             another module. This option terminates this module call.
             """)
 
-    def configure(self, *, mod: Namespace, **_):
+    def configure(self, *, mod: Namespace, env: Namespace, **_):
+        if env.ENGINE not in self.ENGINES:
+            raise LIMARException(
+                f"Unsupported finance engine '{env.ENGINE}' (must be one of:"
+                f" {', '.join(self.ENGINES)})"
+            )
+        self._engine = env.ENGINE
+        self._materialise_aggregates = env.MATERIALISE_AGGREGATES != 0
+
         mod.phase.register_system(FINANCE_LIFECYCLE)
         mod.manifest.add_context_modules(
             tags.Tags,
@@ -201,28 +238,41 @@ class FinanceModule:
         # Start from where the forwarding chain left off
         output: Any = forwarded_data
 
-        # Fetch data
+        # Whether the output is already aggregated, from a materialised
+        # aggregate. If so, the phases up to aggregating do nothing.
+        materialised = False
+
+        # Fetch data (only the transactions that overlap the window, if given)
         if transition_to_phase(FINANCE_LIFECYCLE.PHASES.GET):
             output = mod.manifest.get_item_set('transaction')
+            if args.window is not None:
+                output = self._overlapping(
+                    mod, output, *self._parse_window(args.window)
+                )
+
+            if self._is_materialisable(args):
+                aggregation = self._get_materialised_aggregate(mod, args, output)
+                if aggregation is not None:
+                    output = aggregation
+                    materialised = True
 
         # Select the props we want from each item and set default cover
         # period where needed to the latest of the paid date or the cleared
         # date.
-        if transition_to_phase(FINANCE_LIFECYCLE.PHASES.PREPARE):
+        if (
+            transition_to_phase(FINANCE_LIFECYCLE.PHASES.PREPARE) and
+            not materialised
+        ):
             output = self._extract_and_prepare(output)
 
         # Filter out transactions not in the specified window and bound the
         # cover period of each transaction to the window.
-        if transition_to_phase(FINANCE_LIFECYCLE.PHASES.WINDOW):
+        if (
+            transition_to_phase(FINANCE_LIFECYCLE.PHASES.WINDOW) and
+            not materialised
+        ):
             if args.window is not None:
-                window_start, window_end = (
-                    date(*[
-                        int(component)
-                        for component in bound.split('-')
-                    ])
-                    for bound in args.window.split(':')
-                )
-
+                window_start, window_end = self._parse_window(args.window)
                 output = self._window(output, window_start, window_end)
             else:
                 output = self._infinite_window(output)
@@ -230,37 +280,50 @@ class FinanceModule:
         # Distribute transactions across their cover period
         if (
             args.distribute is not None and
-            transition_to_phase(FINANCE_LIFECYCLE.PHASES.DISTRIBUTE)
+            transition_to_phase(FINANCE_LIFECYCLE.PHASES.DISTRIBUTE) and
+            not materialised
         ):
             period_length = timedelta(days=int(args.distribute))
             output = self._distribute(output, period_length)
 
         # Undo the precision increase (aka. un-prepare)
-        if transition_to_phase(FINANCE_LIFECYCLE.PHASES.FINALISE):
+        if (
+            transition_to_phase(FINANCE_LIFECYCLE.PHASES.FINALISE) and
+            not materialised
+        ):
             output = self._finalise(output)
 
         # Filter transactions
         if (
             args.filter_transactions is not None and
-            transition_to_phase(FINANCE_LIFECYCLE.PHASES.FILTER_TRANSACTIONS)
+            transition_to_phase(FINANCE_LIFECYCLE.PHASES.FILTER_TRANSACTIONS) and
+            not materialised
         ):
             output = self._filter_transactions(output, args.filter_transactions)
 
         # Create a single group initially
-        if transition_to_phase(FINANCE_LIFECYCLE.PHASES.WRAP_IN_GROUP):
-            output = {frozendict(): output}
+        if (
+            transition_to_phase(FINANCE_LIFECYCLE.PHASES.WRAP_IN_GROUP) and
+            not materialised
+        ):
+            output = self._wrap_in_group(
+                output,
+                deferred=args.aggregate is not None
+            )
 
         # Group by account
         if (
             args.group_by_account is True and
-            transition_to_phase(FINANCE_LIFECYCLE.PHASES.GROUP_BY_ACCOUNT)
+            transition_to_phase(FINANCE_LIFECYCLE.PHASES.GROUP_BY_ACCOUNT) and
+            not materialised
         ):
             output = self._group_by_account(output)
 
         # Group by time
         if (
             args.group_by_time is not None and
-            transition_to_phase(FINANCE_LIFECYCLE.PHASES.GROUP_BY_TIME)
+            transition_to_phase(FINANCE_LIFECYCLE.PHASES.GROUP_BY_TIME) and
+            not materialised
         ):
             unit = args.group_by_time
             output = self._group_by_time(output, unit)
@@ -268,17 +331,31 @@ class FinanceModule:
         # Filter groups
         if (
             args.filter_groups is not None and
-            transition_to_phase(FINANCE_LIFECYCLE.PHASES.FILTER_GROUPS)
+            transition_to_phase(FINANCE_LIFECYCLE.PHASES.FILTER_GROUPS) and
+            not materialised
         ):
             output = self._filter_groups(output, args.filter_groups)
 
         # Aggregate the amounts in each group
         if (
             args.aggregate is not None and
-            transition_to_phase(FINANCE_LIFECYCLE.PHASES.AGGREGATE)
+            transition_to_phase(FINANCE_LIFECYCLE.PHASES.AGGREGATE) and
+            not materialised
         ):
             output = self._aggregate(output, args.aggregate)
 
+            if self._is_materialisable(args):
+                self._set_materialised_aggregate(mod, args, output)
+
+        # Convert the output of the columnar engine, or of grouping that was
+        # deferred to aggregation but not aggregated, to the dict engine's
+        # format
+        if (
+            self._is_columnar(output) or
+            isinstance(output, GroupAggregation)
+        ):
+            output = output.materialise()
+
         # Format
         if args.group_by_account is True or args.group_by_time is not None:
             if args.aggregate is not None:
@@ -338,41 +415,49 @@ class FinanceModule:
     # --------------------------------------------------
 
     def _extract_and_prepare(self, item_set: ItemSet) -> ItemSet:
+        if self._engine == 'columnar':
+            from modules.finance_utils.transaction_table import TransactionTable
+            return TransactionTable.from_transactions(item_set)
+
         return {
-            ref: {
-                'ref': item['ref'],
-                'from': item['from'],
-                'to': item['to'],
-                'paid': item['paid'],
-                'cleared': item['cleared'],
-                'coverStart': (
-                    item['coverStart']
-                    if item['coverStart'] is not None
-                    else max(
-                        default
-                        for default in (item['paid'], item['cleared'])
-                        if default is not None
-                    )
-                ),
-                'coverEnd': (
-                    item['coverEnd']
-                    if item['coverEnd'] is not None
-                    else max(
-                        default
-                        for default in (item['paid'], item['cleared'])
-                        if default is not None
-                    )
-                ),
-                # For retaining precision while doing calculations
-                'amount': CurrencyAmount(
-                    item['amount'].currency,
-                    item['amount'].amount * 100
-                ),
-                'for': item['for']
-            }
+            ref: self._prepare_item(item)
             for ref, item in item_set.items()
         }
 
+    @staticmethod
+    def _prepare_item(item: Item) -> Item:
+        return {
+            'ref': item['ref'],
+            'from': item['from'],
+            'to': item['to'],
+            'paid': item['paid'],
+            'cleared': item['cleared'],
+            'coverStart': (
+                item['coverStart']
+                if item['coverStart'] is not None
+                else max(
+                    default
+                    for default in (item['paid'], item['cleared'])
+                    if default is not None
+                )
+            ),
+            'coverEnd': (
+                item['coverEnd']
+                if item['coverEnd'] is not None
+                else max(
+                    default
+                    for default in (item['paid'], item['cleared'])
+                    if default is not None
+                )
+            ),
+            # For retaining precision while doing calculations
+            'amount': CurrencyAmount(
+                item['amount'].currency,
+                item['amount'].amount * 100
+            ),
+            'for': item['for']
+        }
+
     def _window(self, item_set, window_start, window_end) -> ItemSet:
         # Throw an error in case this was accidental. This would always
         # return zero results if we didn't catch it.
@@ -382,6 +467,9 @@ class FinanceModule:
                 f" '{window_end}'"
             )
 
+        if self._is_columnar(item_set):
+            return item_set.window(window_start, window_end)
+
         return {
             ref: dict(
                 item,
@@ -396,6 +484,9 @@ class FinanceModule:
         }
 
     def _infinite_window(self, item_set: ItemSet) -> ItemSet:
+        if self._is_columnar(item_set):
+            return item_set.infinite_window()
+
         return {
             ref: item | {
                 'coverStartWindowed': item['coverStart'],
@@ -437,7 +528,6 @@ class FinanceModule:
                 ),
                 item['coverEndWindowed']
             )
-            period_size = period_end - period_start + timedelta(days=1)
 
             item_set[f'{ref}[{i}]'] = item | {
                 'ref': f'{ref}[{i}]',
@@ -445,21 +535,42 @@ class FinanceModule:
                 'periodEnd': period_end,
                 'amount': CurrencyAmount(
                     item['amount'].currency,
-                    # WARNING: THIS MAY MAKE MONEY DISAPPEAR
-                    # But will be APPROXIMATELY accurate.
-                    int(
-                        item['amount'].amount
-                        * (period_size / cover_size)
+                    self._share_of_amount(
+                        item['amount'].amount,
+                        (period_end - item['coverStart']).days + 1,
+                        cover_size.days
+                    ) - self._share_of_amount(
+                        item['amount'].amount,
+                        (period_start - item['coverStart']).days,
+                        cover_size.days
                     )
                 )
             }
 
         return item_set
 
+    @staticmethod
+    def _share_of_amount(amount: int, days: int, cover_days: int) -> int:
+        """
+        Return the share of the given (prepared) amount that is distributed to
+        the first `days` days of a cover period that is `cover_days` days long.
+
+        Shares are rounded down to a whole unit of the currency, so finalising
+        doesn't round them again. The amount of each period is the share up to
+        its end minus the share up to its start, so the amounts of all periods
+        in a cover period add up to the whole amount, with each remaining unit
+        going to the period in which the unrounded share passes it.
+        """
+
+        return (amount // 100) * days // cover_days * 100
+
     def _distribute(self,
             item_set: ItemSet,
             period_length: timedelta
     ) -> ItemSet:
+        if self._is_columnar(item_set):
+            return item_set.distribute(period_length)
+
         return {
             ref: item
             for item_set in [
@@ -470,6 +581,9 @@ class FinanceModule:
         }
 
     def _finalise(self, item_set: ItemSet) -> ItemSet:
+        if self._is_columnar(item_set):
+            return item_set.finalise()
+
         return {
             ref: item | {
                 'amount': CurrencyAmount(
@@ -485,12 +599,27 @@ class FinanceModule:
             filter_str: str
     ) -> ItemSet:
         filter = self._parse_filter(filter_str)
+        if self._is_columnar(transactions):
+            return self._filter_columnar(transactions, filter)
+
         return {
             ref: item
             for ref, item in transactions.items()
             if self._filter_includes(filter, item)
         }
 
+    def _wrap_in_group(self,
+            item_set: ItemSet,
+            deferred: bool = False
+    ) -> ItemGroupSet:
+        if self._is_columnar(item_set):
+            return item_set.wrap_in_group()
+
+        if deferred:
+            return GroupAggregation(item_set)
+
+        return {frozendict(): item_set}
+
     def _group_group_by_account(self,
             item_group_ref: frozendict[str, Hashable],
             item_group: ItemGroup
@@ -526,6 +655,11 @@ class FinanceModule:
         return by_account
 
     def _group_by_account(self, groups: ItemGroupSet) -> ItemGroupSet:
+        if self._is_columnar(groups):
+            return groups.group_by_account()
+        if isinstance(groups, GroupAggregation):
+            return groups.group_by_account()
+
         return {
             new_item_group_ref: new_item_group
             for item_groups in [
@@ -542,21 +676,7 @@ class FinanceModule:
     ) -> ItemGroupSet:
         by_time = {}
         for ref, item in item_group.items():
-            start: date = item['periodStart']
-
-            start_aligned = start
-            start_aligned_str = start_aligned.strftime('%Y-%m-%d')
-            if unit == 'week':
-                start_aligned = start + relativedelta(weekday=MO(-1))
-                start_aligned_str = start_aligned.strftime(
-                    'wc. %Y-%m-%d'
-                )
-            elif unit == 'month':
-                start_aligned = start + relativedelta(day=1)
-                start_aligned_str = start_aligned.strftime('%Y-%m')
-            elif unit == 'year':
-                start_aligned = start + relativedelta(yearday=1)
-                start_aligned_str = start_aligned.strftime('%Y')
+            start_aligned_str = self._time_group_label(item['periodStart'], unit)
 
             time_ref = frozendict(**item_group_ref, date=start_aligned_str)
             if time_ref not in by_time:
@@ -565,7 +685,31 @@ class FinanceModule:
 
         return by_time
 
+    @staticmethod
+    def _time_group_label(start: date, unit: str) -> str:
+        start_aligned = start
+        start_aligned_str = start_aligned.strftime('%Y-%m-%d')
+        if unit == 'week':
+            start_aligned = start + relativedelta(weekday=MO(-1))
+            start_aligned_str = start_aligned.strftime(
+                'wc. %Y-%m-%d'
+            )
+        elif unit == 'month':
+            start_aligned = start + relativedelta(day=1)
+            start_aligned_str = start_aligned.strftime('%Y-%m')
+        elif unit == 'year':
+            start_aligned = start + relativedelta(yearday=1)
+            start_aligned_str = start_aligned.strftime('%Y')
+        return start_aligned_str
+
     def _group_by_time(self, groups: ItemGroupSet, unit: str) -> ItemGroupSet:
+        if self._is_columnar(groups):
+            return groups.group_by_time(unit)
+        if isinstance(groups, GroupAggregation):
+            return groups.group_by_time(
+                lambda start: self._time_group_label(start, unit)
+            )
+
         # Group and merge
         return {
             new_item_group_ref: new_item_group
@@ -581,6 +725,12 @@ class FinanceModule:
             filter_str: str
     ) -> ItemGroupSet:
         filter = self._parse_filter(filter_str)
+        if self._is_columnar(groups):
+            return self._filter_columnar(groups, filter)
+        if isinstance(groups, GroupAggregation):
+            return groups.filter_groups(
+                lambda item: self._filter_includes(filter, item)
+            )
 
         new_groups = {
             item_group_ref: {
@@ -601,6 +751,11 @@ class FinanceModule:
             groups: ItemGroupSet,
             aggregator: str
     ) -> dict[str, str]:
+        if self._is_columnar(groups):
+            return groups.aggregate(aggregator)
+        if isinstance(groups, GroupAggregation):
+            return groups.aggregate(aggregator)
+
         aggregator_fn = self._aggregators[aggregator]
 
         aggregation = {}
@@ -695,6 +850,257 @@ class FinanceModule:
             result = not result
         return result
 
+    def _filter_columnar(self, table: Any, filter: dict[str, str]) -> Any:
+        # All filters are true for an item if they are true for any of its
+        # accounts, so only check each account once.
+        filter_fn = self._item_filters[filter['name']]
+        return table.filter_accounts(
+            lambda account: filter_fn({'account': account}, filter['value']),
+            filter['negated']
+        )
+
+    # Indexes
+    # --------------------------------------------------
+
+    @staticmethod
+    def _parse_window(window: str) -> tuple[date, date]:
+        window_start, window_end = (
+            date(*[
+                int(component)
+                for component in bound.split('-')
+            ])
+            for bound in window.split(':')
+        )
+        return window_start, window_end
+
+    def _overlapping(self,
+            mod: Namespace,
+            item_set: ItemSet,
+            window_start: date,
+            window_end: date
+    ) -> ItemSet:
+        index = self._get_cover_index(mod, item_set)
+        return {
+            ref: item_set[ref]
+            for ref in index.overlapping(window_start, window_end)
+        }
+
+    def _get_cover_index(self, mod: Namespace, item_set: ItemSet):
+        from modules.finance_utils.cover_index import CoverIndex, FORMAT_VERSION
+
+        # The index is only valid for the version of the manifests (and context
+        # modules) it was built from, so is cached under their key. The cache
+        # ref keeps only the latest version.
+        cached_name = '.'.join([
+            'objects/finance', 'cover-index', mod.manifest.get_cache_key(),
+            f'v{FORMAT_VERSION}'
+        ])
+        try:
+            return mod.cache.get(cached_name)
+        except KeyError:
+            pass
+
+        index = CoverIndex.from_transactions(item_set)
+        mod.cache.set(cached_name, index)
+        mod.cache.set_ref('finance.cover-index', [cached_name])
+        return index
+
+    # Materialised Aggregates
+    # --------------------------------------------------
+
+    def _is_materialisable(self, args: Namespace) -> bool:
+        # Only the output of whole aggregate queries is materialised, not of
+        # ones limited to some phases.
+        return (
+            self._materialise_aggregates and
+            args.aggregate is not None and
+            args.min_phase is None and
+            args.max_phase is None
+        )
+
+    def _materialised_aggregate_names(self,
+            mod: Namespace,
+            args: Namespace
+    ) -> tuple[str, str, str]:
+        """
+        Return the name of the cache reference to the materialised aggregate
+        of the given query, and the names of the cache entries of its aggregate
+        and contributions for the loaded version of the manifest.
+        """
+
+        from modules.finance_utils.aggregate_contributions import FORMAT_VERSION
+
+        ref = 'finance.aggregate.'+md5(repr((
+            args.window,
+            args.distribute,
+            args.filter_transactions,
+            args.group_by_account,
+            args.group_by_time,
+            args.filter_groups,
+            args.aggregate
+        )).encode('utf-8')).hexdigest()
+        aggregation_name = '.'.join([
+            'objects/'+ref, mod.manifest.get_cache_key(), f'v{FORMAT_VERSION}'
+        ])
+        return ref, aggregation_name, aggregation_name+'.contributions'
+
+    def _get_materialised_aggregate(self,
+            mod: Namespace,
+            args: Namespace,
+            item_set: ItemSet
+    ) -> dict[str, dict[str, Any]] | None:
+        """
+        Return the output of the given aggregate query for the given
+        transactions, if it was materialised for the loaded version of the
+        manifest, or if it can be (re-)materialised without running the whole
+        query. Otherwise, return None.
+        """
+
+        from modules.finance_utils.aggregate_contributions import (
+            AggregateContributions,
+            INCREMENTAL_AGGREGATORS
+        )
+
+        ref, aggregation_name, contributions_name = (
+            self._materialised_aggregate_names(mod, args)
+        )
+        try:
+            previous_names = mod.cache.get_ref(ref)
+        except KeyError:
+            previous_names = []
+
+        if aggregation_name in previous_names:
+            try:
+                return mod.cache.get(aggregation_name)
+            except KeyError:
+                pass
+        if args.aggregate not in INCREMENTAL_AGGREGATORS:
+            return None
+
+        # Only run the query for the transactions that were added or changed
+        # (or all of them, if there are no previous contributions), but
+        # aggregate all of them.
+        previous = None
+        for name in previous_names:
+            if name.endswith('.contributions'):
+                try:
+                    previous = mod.cache.get(name)
+                except KeyError:
+                    pass
+
+        fingerprints, accounts_fingerprint = (
+            AggregateContributions.fingerprint(item_set)
+        )
+        if previous is not None:
+            changed_refs = previous.changed_refs(
+                fingerprints, accounts_fingerprint
+            )
+            contributions = previous.update(
+                fingerprints,
+                accounts_fingerprint,
+                self._contributions(
+                    {ref: item_set[ref] for ref in changed_refs},
+                    args
+                )
+            )
+            mod.log.debug(
+                f"Updated materialised aggregate for {len(changed_refs)} added"
+                " or changed transactions"
+            )
+        else:
+            contributions = AggregateContributions.from_contributions(
+                fingerprints,
+                accounts_fingerprint,
+                self._contributions(item_set, args)
+            )
+
+        aggregation = contributions.aggregate(
+            args.aggregate,
+            wrapped=(
+                args.group_by_account is False and
+                args.group_by_time is None and
+                args.filter_groups is None
+            )
+        )
+        self._set_materialised_aggregate(mod, args, aggregation, contributions)
+        return aggregation
+
+    def _set_materialised_aggregate(self,
+            mod: Namespace,
+            args: Namespace,
+            aggregation: dict[str, dict[str, Any]],
+            contributions: Any = None
+    ):
+        # The ref keeps only the latest version of each query's aggregate
+        ref, aggregation_name, contributions_name = (
+            self._materialised_aggregate_names(mod, args)
+        )
+        mod.cache.set(aggregation_name, aggregation)
+        entries = [aggregation_name]
+        if contributions is not None:
+            mod.cache.set(contributions_name, contributions)
+            entries.append(contributions_name)
+        mod.cache.set_ref(ref, entries)
+
+    def _contributions(self, item_set: ItemSet, args: Namespace):
+        """
+        Run the given query up to aggregating with the dict engine, and return
+        what each of the given transactions contributes to each group (see
+        `GroupAggregation.contributions()`).
+        """
+
+        transactions = {
+            ref: self._prepare_item(item)
+            for ref, item in item_set.items()
+        }
+
+        if args.window is not None:
+            window_start, window_end = self._parse_window(args.window)
+            transactions = self._window(transactions, window_start, window_end)
+        else:
+            transactions = self._infinite_window(transactions)
+
+        # Distribute each transaction separately, to know where each period
+        # came from
+        source_refs = {}
+        if args.distribute is not None:
+            period_length = timedelta(days=int(args.distribute))
+            periods = {}
+            for ref, item in transactions.items():
+                for period_ref, period in self._distribute_item(
+                    ref, item, period_length
+                ).items():
+                    periods[period_ref] = period
+                    source_refs[period_ref] = ref
+            transactions = periods
+
+        transactions = self._finalise(transactions)
+        if args.filter_transactions is not None:
+            transactions = self._filter_transactions(
+                transactions, args.filter_transactions
+            )
+
+        groups = self._wrap_in_group(transactions, deferred=True)
+        if args.group_by_account is True:
+            groups = self._group_by_account(groups)
+        if args.group_by_time is not None:
+            groups = self._group_by_time(groups, args.group_by_time)
+        if args.filter_groups is not None:
+            groups = self._filter_groups(groups, args.filter_groups)
+        contributions = groups.contributions(source_refs)
+        return {ref: contributions.get(ref, []) for ref in item_set}
+
+    # Engines
+    # --------------------------------------------------
+
+    def _is_columnar(self, data: Any) -> bool:
+        # Only import the columnar engine (and so numpy) if it's used
+        if self._engine != 'columnar':
+            return False
+
+        from modules.finance_utils.transaction_table import TransactionTable
+        return isinstance(data, TransactionTable)
+
     # Aggregators
     # --------------------------------------------------
 
@@ -0,0 +1,232 @@
+from hashlib import md5
+
+from frozendict import frozendict
+
+from core.exceptions import LIMARException
+from modules.finance_utils.currency_amount import CurrencyAmount
+
+# Types
+from typing import Any, Hashable
+from modules.manifest import ItemRef, ItemSet
+
+FORMAT_VERSION = 1
+
+# The aggregators whose aggregate of a group can be found from the aggregates
+# of any split of it, and so can be kept up to date per transaction
+INCREMENTAL_AGGREGATORS = ('sum', 'mean')
+
+# Group ref, currency, total amount, number of amounts, and whether the group
+# filter includes them
+Contribution = tuple[frozendict[str, Hashable], str, int, int, bool]
+
+class AggregateContributions:
+    """
+    What each transaction read by an aggregate finance query contributed to
+    each group, for aggregators in `INCREMENTAL_AGGREGATORS`.
+
+    Along with a fingerprint of each transaction (and of the accounts they are
+    from and to), this allows the query's aggregate to be updated to another
+    version of the manifest by only running the query for the transactions
+    that were added or changed, then re-aggregating the contributions.
+
+    Group refs are stored once, and referred to by index in the contributions.
+    """
+
+    def __init__(self,
+            fingerprints: dict[ItemRef, bytes],
+            accounts_fingerprint: bytes,
+            group_refs: list[frozendict[str, Hashable]],
+            contributions: dict[ItemRef, list[tuple[int, str, int, int, bool]]]
+    ):
+        self._fingerprints = fingerprints
+        self._accounts_fingerprint = accounts_fingerprint
+        self._group_refs = group_refs
+        self._contributions = contributions
+
+    @staticmethod
+    def fingerprint(item_set: ItemSet) -> tuple[dict[ItemRef, bytes], bytes]:
+        """
+        Return a fingerprint of each of the given transactions, and of the
+        accounts they are from and to, that change if they change.
+        """
+
+        fingerprints = {}
+        accounts = {}
+        for ref, item in item_set.items():
+            from_account, to_account = item['from'], item['to']
+            fingerprints[ref] = md5(repr((
+                from_account['ref'],
+                to_account['ref'],
+                item['paid'],
+                item['cleared'],
+                item['coverStart'],
+                item['coverEnd'],
+                item['amount'].currency,
+                item['amount'].amount,
+                item['for']
+            )).encode('utf-8')).digest()
+
+            for account in (from_account, to_account):
+                if account['ref'] not in accounts:
+                    accounts[account['ref']] = repr(account['tags'])
+
+        return (
+            fingerprints,
+            md5(repr(sorted(accounts.items())).encode('utf-8')).digest()
+        )
+
+    def changed_refs(self,
+            fingerprints: dict[ItemRef, bytes],
+            accounts_fingerprint: bytes
+    ) -> list[ItemRef]:
+        """
+        Return the refs of the transactions with the given fingerprints that
+        were added or changed since these contributions were found. If any
+        accounts changed, then all transactions may have changed.
+        """
+
+        if accounts_fingerprint != self._accounts_fingerprint:
+            return list(fingerprints)
+
+        return [
+            ref
+            for ref, fingerprint in fingerprints.items()
+            if self._fingerprints.get(ref) != fingerprint
+        ]
+
+    @staticmethod
+    def from_contributions(
+            fingerprints: dict[ItemRef, bytes],
+            accounts_fingerprint: bytes,
+            contributions: dict[ItemRef, list[Contribution]]
+    ) -> 'AggregateContributions':
+        """
+        Store the given contributions (as returned by
+        `GroupAggregation.contributions()`) of all transactions with the given
+        fingerprints.
+        """
+
+        return AggregateContributions(
+            fingerprints, accounts_fingerprint, [], {}
+        ).update(fingerprints, accounts_fingerprint, contributions)
+
+    def update(self,
+            fingerprints: dict[ItemRef, bytes],
+            accounts_fingerprint: bytes,
+            changed_contributions: dict[ItemRef, list[Contribution]]
+    ) -> 'AggregateContributions':
+        """
+        Return these contributions updated to the transactions with the given
+        fingerprints, given the contributions of the transactions returned by
+        `changed_refs()`. Transactions that no longer exist are removed.
+        """
+
+        group_refs = list(self._group_refs)
+        group_indexes = {
+            group_ref: index
+            for index, group_ref in enumerate(group_refs)
+        }
+        def group_index(group_ref: frozendict[str, Hashable]) -> int:
+            index = group_indexes.get(group_ref)
+            if index is None:
+                index = group_indexes[group_ref] = len(group_refs)
+                group_refs.append(group_ref)
+            return index
+
+        contributions = {
+            ref: (
+                [
+                    (group_index(group_ref), *contribution)
+                    for group_ref, *contribution in changed_contributions[ref]
+                ]
+                if ref in changed_contributions
+                else self._contributions[ref]
+            )
+            for ref in fingerprints
+        }
+        return AggregateContributions(
+            fingerprints, accounts_fingerprint, group_refs, contributions
+        )
+
+    def aggregate(self,
+            aggregator: str,
+            wrapped: bool
+    ) -> dict[str, dict[str, Any]]:
+        """
+        Aggregate the contributions to each group, in the same way as
+        `GroupAggregation.aggregate()`.
+
+        If `wrapped` is True, then the transactions were not grouped or
+        filtered, so are in a single group even if there are none of them.
+        """
+
+        if aggregator not in INCREMENTAL_AGGREGATORS:
+            raise KeyError(aggregator)
+
+        # Groups are ordered by the first contribution to their account, then
+        # by their first contribution, whether the group filter includes it or
+        # not.
+        group_accounts = [
+            group_ref.get('account')
+            for group_ref in self._group_refs
+        ]
+        account_ranks: dict[Hashable, int] = {}
+        totals: dict[int, list] = {}
+        for ref in self._fingerprints:
+            for index, currency, total, count, included in (
+                self._contributions[ref]
+            ):
+                group = totals.get(index)
+                if group is None:
+                    group = totals[index] = [None, None, 0, 0]
+                    account_ranks.setdefault(
+                        group_accounts[index], len(account_ranks)
+                    )
+                if not included:
+                    continue
+
+                if group[0] is None:
+                    group[0] = currency
+                elif currency != group[0] and group[1] is None:
+                    group[1] = currency
+                group[2] += total
+                group[3] += count
+
+        if wrapped and len(totals) == 0:
+            raise LIMARException(
+                "No currency found when aggregating item group"
+                f" '{frozendict()}'"
+            )
+
+        aggregation = {}
+        for index in sorted(
+            totals,
+            key=lambda index: account_ranks[group_accounts[index]]
+        ):
+            currency, other_currency, total, count = totals[index]
+            if count == 0:
+                continue
+
+            group_ref = self._group_refs[index]
+            if other_currency is not None:
+                raise LIMARException(
+                    f"Found different currencies '{currency}' and"
+                    f" '{other_currency}' when aggregating item group"
+                    f" '{group_ref}': Cannot aggregate amounts in different"
+                    " currencies"
+                )
+
+            aggregate_ref = ' / '.join([
+                str(val)
+                for val in group_ref.values()
+            ])
+            aggregation[aggregate_ref] = {
+                'ref': aggregate_ref,
+                **group_ref,
+                'amount': CurrencyAmount(
+                    currency,
+                    total if aggregator == 'sum' else total / count
+                )
+            }
+
+        return aggregation
@@ -0,0 +1,104 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date
+from itertools import accumulate
+
+# Types
+from modules.manifest import ItemRef, ItemSet
+
+FORMAT_VERSION = 1
+
+class CoverIndex:
+    """
+    An index of the cover periods of a set of transactions, for finding the
+    transactions that overlap a window without reading the others.
+
+    Cover periods (defaulted as in `FinanceModule._extract_and_prepare()`) are
+    stored as arrays of start and end ordinals, sorted by start, along with the
+    running maximum of the ends. Transactions that overlap a window start before
+    its end, so are before the position of the window end in the starts. Of
+    those, only ones after the first position at which the running maximum end
+    reaches the window start can end in or after the window, so only that range
+    of the ends is checked.
+
+    The index pickles to a few arrays and the refs of the transactions, so is
+    cheap to cache and load.
+    """
+
+    def __init__(self,
+            refs: list[ItemRef],
+            positions: array,
+            starts: array,
+            ends: array
+    ):
+        self._refs = refs
+        self._positions = positions
+        self._starts = starts
+        self._ends = ends
+        self._max_ends = array('l', accumulate(ends, max))
+
+    def __getstate__(self):
+        # The running maximum is quicker to recompute than to unpickle
+        return (self._refs, self._positions, self._starts, self._ends)
+
+    def __setstate__(self, state):
+        self.__init__(*state)
+
+    @staticmethod
+    def from_transactions(item_set: ItemSet) -> 'CoverIndex':
+        """Index the cover periods of all transactions in the given item set."""
+
+        refs = []
+        cover_periods = []
+        for position, (ref, item) in enumerate(item_set.items()):
+            default_cover = max(
+                default
+                for default in (item['paid'], item['cleared'])
+                if default is not None
+            )
+            refs.append(ref)
+            cover_periods.append((
+                (
+                    item['coverStart']
+                    if item['coverStart'] is not None
+                    else default_cover
+                ).toordinal(),
+                (
+                    item['coverEnd']
+                    if item['coverEnd'] is not None
+                    else default_cover
+                ).toordinal(),
+                position
+            ))
+        cover_periods.sort()
+
+        return CoverIndex(
+            refs,
+            array('l', (position for _, _, position in cover_periods)),
+            array('l', (start for start, _, _ in cover_periods)),
+            array('l', (end for _, end, _ in cover_periods))
+        )
+
+    def __len__(self):
+        return len(self._refs)
+
+    def overlapping(self, window_start: date, window_end: date) -> list[ItemRef]:
+        """
+        Return the refs of the transactions whose cover periods overlap the
+        given window (inclusive), in the order they were in the indexed item
+        set.
+        """
+
+        start = window_start.toordinal()
+        end = window_end.toordinal()
+
+        first = bisect_left(self._max_ends, start)
+        last = bisect_right(self._starts, end)
+        return [
+            self._refs[position]
+            for position in sorted(
+                self._positions[i]
+                for i in range(first, last)
+                if self._ends[i] >= start
+            )
+        ]
@@ -0,0 +1,374 @@
+import copy
+import random
+from datetime import date
+
+from frozendict import frozendict
+
+from core.exceptions import LIMARException
+from modules.finance_utils.currency_amount import CurrencyAmount
+
+# Types
+from typing import Any, Callable, Hashable, Iterator
+from modules.manifest import Item, ItemRef, ItemSet
+
+AGGREGATORS = ('sum', 'mean', 'median', 'min', 'max')
+
+# Group keys have the id of the group's account in the bits above these, and the
+# id of the group's time unit in these bits.
+UNIT_BITS = 32
+
+class GroupAggregation:
+    """
+    A set of transactions and how they are to be grouped, so that they can be
+    grouped and aggregated in a single pass.
+
+    Grouping by account or by time, and filtering groups, only record what to
+    do, so no groups or copies of transactions are created for them. Then
+    `aggregate()` streams the transactions once, giving each side (from or to)
+    of each transaction the integer key of the group it would be in, and adding
+    its amount to that group's running total, count, and minimum or maximum. For
+    medians, each group's amounts are kept, and the middle ones are selected
+    rather than sorted.
+
+    `aggregate()` returns the same aggregation, and `materialise()` returns the
+    same group set, that the dict engine in FinanceModule would have returned
+    from the same stages.
+    """
+
+    def __init__(self, transactions: ItemSet):
+        self._transactions = transactions
+        self._by_account = False
+        self._label: Callable[[date], str] | None = None
+        self._includes: Callable[[Item], bool] | None = None
+
+    def group_by_account(self) -> 'GroupAggregation':
+        """
+        Group the sides of each transaction by account, the from side with a
+        negated amount.
+        """
+
+        aggregation = copy.copy(self)
+        aggregation._by_account = True
+        return aggregation
+
+    def group_by_time(self, label: Callable[[date], str]) -> 'GroupAggregation':
+        """
+        Group the transactions in each group by the label the given function
+        gives the start of their period.
+        """
+
+        aggregation = copy.copy(self)
+        aggregation._label = label
+        return aggregation
+
+    def filter_groups(self,
+            includes: Callable[[Item], bool]
+    ) -> 'GroupAggregation':
+        """
+        Only include the transactions in each group that the given function
+        returns True for, and remove groups that are then empty.
+
+        If grouped by account, the function is given `{'account': account}`
+        rather than each transaction, so it must only depend on accounts.
+        """
+
+        aggregation = copy.copy(self)
+        aggregation._includes = includes
+        return aggregation
+
+    def aggregate(self, aggregator: str) -> dict[str, dict[str, Any]]:
+        """
+        Aggregate the amounts in each group, in the same way as
+        `FinanceModule._aggregate()`.
+        """
+
+        if aggregator not in AGGREGATORS:
+            raise KeyError(aggregator)
+
+        group_refs: dict[int, frozendict[str, Hashable]] = {}
+        groups: dict[int, _Group] = {}
+        for _, item, account, sign, included, key in self._stream(group_refs):
+            if not included:
+                continue
+
+            group = groups.get(key)
+            if group is None:
+                group = groups[key] = _Group(item['amount'].currency)
+            elif item['amount'].currency != group.currency:
+                if group.other_currency is None:
+                    group.other_currency = item['amount'].currency
+
+            amount = sign * item['amount'].amount
+            group.total += amount
+            group.count += 1
+            if aggregator == 'median':
+                group.amounts.append(amount)
+                group.entries.append((item, account, sign))
+            elif (
+                group.best_entry is None or
+                (aggregator == 'min' and amount < group.best_amount) or
+                (aggregator == 'max' and amount > group.best_amount)
+            ):
+                group.best_amount = amount
+                group.best_entry = (item, account, sign)
+
+        aggregation = {}
+        for key in self._ordered(group_refs):
+            group_ref = group_refs[key]
+            group = groups.get(key)
+            if group is None:
+                # Only a single group that wraps no transactions can be empty
+                # (if not filtered)
+                if self._includes is not None:
+                    continue
+                raise LIMARException(
+                    "No currency found when aggregating item group"
+                    f" '{group_ref}'"
+                )
+
+            if group.other_currency is not None:
+                raise LIMARException(
+                    f"Found different currencies '{group.currency}' and"
+                    f" '{group.other_currency}' when aggregating item group"
+                    f" '{group_ref}': Cannot aggregate amounts in different"
+                    " currencies"
+                )
+
+            if aggregator == 'sum':
+                value = group.total
+            elif aggregator == 'mean':
+                value = group.total / group.count
+            elif aggregator == 'median':
+                low, high = self._middle(group.amounts)
+                value = (
+                    self._entry(*group.entries[low]),
+                    self._entry(*group.entries[high])
+                )
+            else:
+                value = self._entry(*group.best_entry)
+
+            aggregate_ref = ' / '.join([
+                str(val)
+                for val in group_ref.values()
+            ])
+            aggregation[aggregate_ref] = {
+                'ref': aggregate_ref,
+                **group_ref,
+                'amount': CurrencyAmount(group.currency, value)
+            }
+
+        return aggregation
+
+    def contributions(self,
+            source_refs: dict[ItemRef, ItemRef]
+    ) -> dict[ItemRef, list[tuple[frozendict[str, Hashable], str, int, int, bool]]]:
+        """
+        Return the group ref, currency, total amount, and number of amounts
+        that each source transaction contributes to each group it is in, and
+        whether the group filter includes them, in the order the groups were
+        first contributed to.
+
+        `source_refs` maps the refs of transactions that came from other
+        transactions (eg. the periods of distributed transactions) to the refs
+        of those transactions.
+        """
+
+        group_refs: dict[int, frozendict[str, Hashable]] = {}
+        contributions: dict[ItemRef, dict[int, list]] = {}
+        for ref, item, _, sign, included, key in self._stream(group_refs):
+            source = contributions.setdefault(source_refs.get(ref, ref), {})
+            contribution = source.get(key)
+            if contribution is None:
+                contribution = source[key] = [
+                    group_refs[key], item['amount'].currency, 0, 0, included
+                ]
+            contribution[2] += sign * item['amount'].amount
+            contribution[3] += 1
+
+        return {
+            ref: [tuple(contribution) for contribution in by_group.values()]
+            for ref, by_group in contributions.items()
+        }
+
+    def materialise(self) -> dict[frozendict[str, Hashable], ItemSet]:
+        """Return the groups as a dict of group refs to item sets."""
+
+        group_refs: dict[int, frozendict[str, Hashable]] = {}
+        groups: dict[int, ItemSet] = {}
+        for ref, item, account, sign, included, key in self._stream(group_refs):
+            if included:
+                groups.setdefault(key, {})[ref] = self._entry(item, account, sign)
+
+        return {
+            group_refs[key]: groups.get(key, {})
+            for key in self._ordered(group_refs)
+            if key in groups or self._includes is None
+        }
+
+    # Utils
+    # --------------------
+
+    def _stream(self,
+            group_refs: dict[int, frozendict[str, Hashable]]
+    ) -> Iterator[tuple[str, Item, Item | None, int, bool, int]]:
+        """
+        Yield the ref, transaction, account (if grouped by account), and sign
+        (-1 for the from side, otherwise 1) of each side of each transaction,
+        whether the group filter includes it, and the key of its group.
+
+        Add the ref of each group to `group_refs` when its key is first yielded.
+        """
+
+        account_ids: dict[str, int] = {}
+        accounts_included: dict[str, bool] = {}
+        unit_ids: dict[str, int] = {}
+        unit_ids_by_start: dict[date, int] = {}
+        unit_labels: list[str] = []
+
+        if not self._by_account and self._label is None:
+            group_refs[0] = frozendict()
+
+        for ref, item in self._transactions.items():
+            unit_id = 0
+            if self._label is not None:
+                start = item['periodStart']
+                unit_id = unit_ids_by_start.get(start)
+                if unit_id is None:
+                    label = self._label(start)
+                    unit_id = unit_ids.get(label)
+                    if unit_id is None:
+                        unit_id = unit_ids[label] = len(unit_labels)
+                        unit_labels.append(label)
+                    unit_ids_by_start[start] = unit_id
+
+            if not self._by_account:
+                key = unit_id
+                if key not in group_refs:
+                    group_refs[key] = self._group_ref(None, unit_labels, key)
+                yield (
+                    ref, item, None, 1,
+                    self._includes is None or self._includes(item),
+                    key
+                )
+                continue
+
+            for account, sign in ((item['from'], -1), (item['to'], 1)):
+                account_ref = account['ref']
+                account_id = account_ids.get(account_ref)
+                if account_id is None:
+                    account_id = account_ids[account_ref] = len(account_ids)
+                    if self._includes is not None:
+                        accounts_included[account_ref] = self._includes(
+                            {'account': account}
+                        )
+
+                key = account_id << UNIT_BITS | unit_id
+                if key not in group_refs:
+                    group_refs[key] = self._group_ref(
+                        account_ref, unit_labels, unit_id
+                    )
+                yield (
+                    ref, item, account, sign,
+                    self._includes is None or accounts_included[account_ref],
+                    key
+                )
+
+    def _group_ref(self,
+            account_ref: str | None,
+            unit_labels: list[str],
+            unit_id: int
+    ) -> frozendict[str, Hashable]:
+        group_ref = {}
+        if account_ref is not None:
+            group_ref['account'] = account_ref
+        if self._label is not None:
+            group_ref['date'] = unit_labels[unit_id]
+        return frozendict(group_ref)
+
+    @staticmethod
+    def _ordered(group_refs: dict[int, frozendict[str, Hashable]]) -> list[int]:
+        # Grouping by account then by time orders groups by the first occurrence
+        # of their account, then by the first occurrence of their time unit in
+        # that account. Keys are in order of first occurrence, and the sort is
+        # stable.
+        return sorted(group_refs, key=lambda key: key >> UNIT_BITS)
+
+    @staticmethod
+    def _entry(item: Item, account: Item | None, sign: int) -> Item:
+        # As `FinanceModule._group_group_by_account()` creates them
+        if account is None:
+            return item
+
+        entry = dict(item)
+        entry['account'] = account
+        if sign < 0:
+            entry['amount'] = CurrencyAmount(
+                item['amount'].currency,
+                -item['amount'].amount
+            )
+        del entry['from']
+        del entry['to']
+        return entry
+
+    @staticmethod
+    def _middle(amounts: list[int]) -> tuple[int, int]:
+        """
+        Return the indexes of the lower and upper middle amounts, as they would
+        be in the amounts stably sorted.
+        """
+
+        # Make the amounts distinct, ordered by amount then index
+        num_amounts = len(amounts)
+        keys = [
+            amount * num_amounts + index
+            for index, amount in enumerate(amounts)
+        ]
+
+        low = _select(keys, (num_amounts + 1) // 2 - 1)
+        high = (
+            low
+            if num_amounts % 2 == 1
+            else min(key for key in keys if key > low)
+        )
+        return low % num_amounts, high % num_amounts
+
+class _Group:
+    """The running aggregates of a group."""
+
+    __slots__ = (
+        'currency',
+        'other_currency',
+        'total',
+        'count',
+        'best_amount',
+        'best_entry',
+        'amounts',
+        'entries'
+    )
+
+    def __init__(self, currency: str):
+        self.currency = currency
+        self.other_currency: str | None = None
+        self.total = 0
+        self.count = 0
+        self.best_amount = 0
+        self.best_entry: tuple[Item, Item | None, int] | None = None
+        self.amounts: list[int] = []
+        self.entries: list[tuple[Item, Item | None, int]] = []
+
+def _select(values: list[int], k: int) -> int:
+    """
+    Return the `k`th smallest (from 0) of the given distinct values, in linear
+    time on average (quickselect).
+    """
+
+    while True:
+        pivot = random.choice(values)
+        lower = [value for value in values if value < pivot]
+        if k < len(lower):
+            values = lower
+        elif k == len(lower):
+            return pivot
+        else:
+            values = [value for value in values if value > pivot]
+            k -= len(lower) + 1
@@ -0,0 +1,689 @@
+import copy
+from datetime import date, timedelta
+
+import numpy as np
+from dateutil.relativedelta import relativedelta, MO
+from frozendict import frozendict
+
+from core.exceptions import LIMARException
+from modules.finance_utils.currency_amount import CurrencyAmount
+
+# Types
+from typing import Any, Callable, Hashable
+from modules.manifest import Item, ItemSet
+
+# The fields of a transaction in the order the dict engine creates them in, and
+# so the order they are output in. Optional fields are only present after the
+# stage that adds them.
+FIELDS = (
+    'ref',
+    'from',
+    'to',
+    'paid',
+    'cleared',
+    'coverStart',
+    'coverEnd',
+    'amount',
+    'for',
+    'coverStartWindowed',
+    'coverEndWindowed',
+    'periodStart',
+    'periodEnd',
+    'account'
+)
+
+DATE_FIELDS = (
+    'paid',
+    'cleared',
+    'coverStart',
+    'coverEnd',
+    'coverStartWindowed',
+    'coverEndWindowed',
+    'periodStart',
+    'periodEnd'
+)
+
+# Stands in for a missing date (ordinals start at 1)
+NO_DATE = 0
+
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+class TransactionTable:
+    """
+    A set of transactions (and, once grouped, the groups they are in), stored
+    as columns of NumPy arrays.
+
+    Each row is one transaction, or one period of a distributed transaction, or
+    one side (from or to) of a transaction grouped by account. Row columns are
+    named after the transaction fields of the dict engine in FinanceModule and
+    hold:
+
+    - `source`: the index of the transaction the row came from
+    - `from`, `to`, `account`: account ids
+    - dates: ordinals (or `NO_DATE`)
+    - `amount`: amounts in 1/`precision` of the currency's lowest unit (ie.
+      hundredths until finalised, as in the dict engine)
+    - `currency`: currency ids
+    - `group`: group ids (only once wrapped in a group)
+
+    Once distributed, each row is a run of consecutive periods of a transaction,
+    rather than a single period, so that long cover periods don't need a row per
+    period unless one is needed. Runs are only split where their periods are
+    grouped differently, and only expanded to a row per period for stages that
+    need each period's amount (or for output). Runs have extra columns:
+
+    - `period`, `periods`: the index of the first period, and the number of
+      periods
+    - `periodStart`, `periodEnd`: the start of the first period, and the end of
+      the last period
+    - `units`: the amount of the transaction in the currency's lowest unit
+    - `sign`: whether the run's amount is negated (-1) or not (1)
+
+    Refs, `for` values, accounts, and currencies are stored once, and looked up
+    by index. Each stage returns a new TransactionTable, which shares any
+    columns the stage doesn't change. `materialise()` returns the same item set
+    (or group set) that the dict engine would have returned from the same
+    stages.
+    """
+
+    def __init__(self,
+            refs: list[str],
+            fors: list[Any],
+            accounts: list[Item],
+            currencies: list[str],
+            rows: dict[str, np.ndarray],
+            group_refs: list[frozendict[str, Hashable]] | None = None
+    ):
+        self._refs = refs
+        self._fors = fors
+        self._accounts = accounts
+        self._currencies = currencies
+        self._rows = rows
+        self._group_refs = group_refs
+        self._precision = 100
+        self._period_length: int | None = None
+
+    @staticmethod
+    def from_transactions(item_set: ItemSet) -> 'TransactionTable':
+        """
+        Load the given transactions, preparing them in the same way as
+        `FinanceModule._extract_and_prepare()`.
+        """
+
+        account_ids: dict[str, int] = {}
+        accounts: list[Item] = []
+        currency_ids: dict[str, int] = {}
+
+        def account_id(account: Item) -> int:
+            if account['ref'] not in account_ids:
+                account_ids[account['ref']] = len(accounts)
+                accounts.append(account)
+            return account_ids[account['ref']]
+
+        def ordinal(value: date | None) -> int:
+            return value.toordinal() if value is not None else NO_DATE
+
+        refs = []
+        fors = []
+        columns: dict[str, list[int]] = {
+            name: []
+            for name in (
+                'from', 'to', 'paid', 'cleared', 'coverStart', 'coverEnd',
+                'amount', 'currency'
+            )
+        }
+        for item in item_set.values():
+            default_cover = max(
+                default
+                for default in (item['paid'], item['cleared'])
+                if default is not None
+            )
+
+            refs.append(item['ref'])
+            fors.append(item['for'])
+            columns['from'].append(account_id(item['from']))
+            columns['to'].append(account_id(item['to']))
+            columns['paid'].append(ordinal(item['paid']))
+            columns['cleared'].append(ordinal(item['cleared']))
+            columns['coverStart'].append(ordinal(
+                item['coverStart']
+                if item['coverStart'] is not None
+                else default_cover
+            ))
+            columns['coverEnd'].append(ordinal(
+                item['coverEnd']
+                if item['coverEnd'] is not None
+                else default_cover
+            ))
+            columns['amount'].append(item['amount'].amount)
+            columns['currency'].append(currency_ids.setdefault(
+                item['amount'].currency, len(currency_ids)
+            ))
+
+        rows = {
+            name: np.array(values, dtype=np.int64)
+            for name, values in columns.items()
+        }
+        # For retaining precision while doing calculations
+        rows['amount'] *= 100
+        rows['source'] = np.arange(len(refs), dtype=np.int64)
+
+        return TransactionTable(refs, fors, accounts, list(currency_ids), rows)
+
+    # Stages
+    # --------------------
+
+    def window(self, window_start: date, window_end: date) -> 'TransactionTable':
+        """
+        Remove transactions not in the given window, and bound the cover period
+        of each transaction to the window.
+        """
+
+        start = window_start.toordinal()
+        end = window_end.toordinal()
+
+        table = self._take(
+            (self._rows['coverEnd'] >= start) &
+            (self._rows['coverStart'] <= end)
+        )
+        table._rows['coverStartWindowed'] = np.maximum(
+            table._rows['coverStart'], start
+        )
+        table._rows['coverEndWindowed'] = np.minimum(
+            table._rows['coverEnd'], end
+        )
+        return table
+
+    def infinite_window(self) -> 'TransactionTable':
+        """Bound the cover period of each transaction to itself."""
+
+        return self._with(
+            coverStartWindowed=self._rows['coverStart'],
+            coverEndWindowed=self._rows['coverEnd']
+        )
+
+    def distribute(self, period_length: timedelta) -> 'TransactionTable':
+        """
+        Distribute the amount of each transaction across its windowed cover
+        period, in the same way as `FinanceModule._distribute()`.
+        """
+
+        length = period_length.days
+        windowed_cover_size = (
+            self._rows['coverEndWindowed']
+            - self._rows['coverStartWindowed']
+            + 1 # To make end date inclusive
+        )
+
+        # One run of all periods per transaction
+        table = self._with(
+            period=np.zeros(self._num_rows(), dtype=np.int64),
+            periods=-(-windowed_cover_size // length),
+            units=self._rows['amount'] // self._precision,
+            sign=np.ones(self._num_rows(), dtype=np.int64)
+        )
+        table._period_length = length
+        return table._with_run_columns()
+
+    def finalise(self) -> 'TransactionTable':
+        """Undo the precision increase from loading the transactions."""
+
+        table = self._with(amount=self._rows['amount'] // self._precision)
+        table._precision = 1
+        return table
+
+    def filter_accounts(self,
+            account_filter: Callable[[Item], bool],
+            negated: bool
+    ) -> 'TransactionTable':
+        """
+        Remove rows where none of their accounts (from, to, or the account they
+        are grouped by) match the given filter, or (if negated) where any of
+        them do. Groups that are empty afterwards are removed.
+        """
+
+        matches = np.array(
+            [account_filter(account) for account in self._accounts],
+            dtype=bool
+        )
+        mask = np.zeros(self._num_rows(), dtype=bool)
+        for name in ('from', 'to', 'account'):
+            if name in self._rows:
+                mask |= matches[self._rows[name]]
+        if negated:
+            mask = ~mask
+
+        table = self._take(mask)
+        if table._group_refs is None:
+            return table
+
+        remaining, groups = np.unique(table._rows['group'], return_inverse=True)
+        table._rows['group'] = groups
+        table._group_refs = [table._group_refs[group] for group in remaining]
+        return table
+
+    def wrap_in_group(self) -> 'TransactionTable':
+        """Put all rows in a single group."""
+
+        table = self._with(group=np.zeros(self._num_rows(), dtype=np.int64))
+        table._group_refs = [frozendict()]
+        return table
+
+    def group_by_account(self) -> 'TransactionTable':
+        """
+        Split each row into a row from its from account (with a negated amount)
+        and a row to its to account, then group them by that account.
+        """
+
+        # Interleave the rows, as the dict engine groups each transaction's
+        # sides in turn.
+        table = self._take(np.repeat(np.arange(self._num_rows()), 2))
+        table._rows['account'] = np.stack(
+            (self._rows['from'], self._rows['to']), axis=1
+        ).ravel()
+        table._rows['amount'] = np.stack(
+            (-self._rows['amount'], self._rows['amount']), axis=1
+        ).ravel()
+        if 'sign' in self._rows:
+            table._rows['sign'] = np.stack(
+                (-self._rows['sign'], self._rows['sign']), axis=1
+            ).ravel()
+        del table._rows['from']
+        del table._rows['to']
+
+        return table._regroup(
+            'account',
+            table._rows['account'],
+            [account['ref'] for account in self._accounts]
+        )
+
+    def group_by_time(self, unit: str) -> 'TransactionTable':
+        """
+        Group rows by the given calendar unit of the start of their period,
+        splitting runs of periods that start in more than one unit.
+        """
+
+        first_start = self._rows['periodStart']
+        period = self._rows['period']
+        periods = self._rows['periods']
+        length = self._period_length
+        assert length is not None, (
+            f'{self.group_by_time.__name__}() called before'
+            f' {self.distribute.__name__}()'
+        )
+
+        # One row for each unit that each run starts periods in (some of which
+        # may not contain any period starts, if periods are longer than units)
+        first_unit = self._unit_of(first_start, unit)
+        last_unit = self._unit_of(first_start + (periods - 1) * length, unit)
+        num_units = last_unit - first_unit + 1
+        rows = np.repeat(np.arange(self._num_rows()), num_units)
+        units = (
+            np.repeat(first_unit, num_units)
+            + np.arange(len(rows))
+            - np.repeat(np.cumsum(num_units) - num_units, num_units)
+        )
+
+        # The periods that start in each unit
+        cover_start = self._rows['coverStartWindowed'][rows]
+        first_period = np.clip(
+            -((cover_start - self._unit_start(units, unit)) // length),
+            period[rows],
+            period[rows] + periods[rows]
+        )
+        next_period = np.clip(
+            -((cover_start - self._unit_start(units + 1, unit)) // length),
+            period[rows],
+            period[rows] + periods[rows]
+        )
+        split = next_period > first_period
+
+        table = self._take(rows[split])
+        table._rows['period'] = first_period[split]
+        table._rows['periods'] = next_period[split] - first_period[split]
+        table = table._with_run_columns()
+
+        unique_units, unit_ids = np.unique(units[split], return_inverse=True)
+        labels = [
+            self._align_to_unit(date.fromordinal(start), unit)
+            for start in self._unit_start(unique_units, unit).tolist()
+        ]
+        return table._regroup('date', unit_ids, labels)
+
+    def aggregate(self, aggregator: str) -> dict[str, dict[str, Any]]:
+        """
+        Aggregate the amounts in each group, in the same way as
+        `FinanceModule._aggregate()`.
+        """
+
+        assert self._group_refs is not None, (
+            f'{self.aggregate.__name__}() called before'
+            f' {self.wrap_in_group.__name__}()'
+        )
+
+        # These need the amount of each period
+        if aggregator in ('median', 'min', 'max'):
+            table = self._expand_runs()
+            if table is not self:
+                return table.aggregate(aggregator)
+
+        groups = self._rows['group']
+        amounts = self._rows['amount']
+        currencies = self._rows['currency']
+
+        # Groups are contiguous, so each group's rows are between its start and
+        # the next group's start.
+        group_starts = np.flatnonzero(np.diff(groups, prepend=-1))
+        group_sizes = np.diff(group_starts, append=len(groups))
+
+        # Only a single group that wraps no rows can be empty
+        if len(group_starts) < len(self._group_refs):
+            raise LIMARException(
+                "No currency found when aggregating item group"
+                f" '{self._group_refs[0]}'"
+            )
+        if len(group_starts) == 0:
+            return {}
+
+        mixed = np.flatnonzero(currencies != np.repeat(
+            currencies[group_starts], group_sizes
+        ))
+        if len(mixed) > 0:
+            row = int(mixed[0])
+            group = int(groups[row])
+            raise LIMARException(
+                f"Found different currencies"
+                f" '{self._currencies[currencies[group_starts[group]]]}' and"
+                f" '{self._currencies[currencies[row]]}' when aggregating item"
+                f" group '{self._group_refs[group]}': Cannot aggregate amounts"
+                " in different currencies"
+            )
+
+        if aggregator in ('sum', 'mean'):
+            sums = np.add.reduceat(amounts, group_starts).tolist()
+            counts = (
+                np.add.reduceat(self._rows['periods'], group_starts)
+                if 'periods' in self._rows
+                else group_sizes
+            )
+            values = (
+                sums
+                if aggregator == 'sum'
+                else [
+                    total / count
+                    for total, count in zip(sums, counts.tolist())
+                ]
+            )
+
+        elif aggregator in ('median', 'min', 'max'):
+            # Sort rows by amount within each group. The sort is stable, so ties
+            # are resolved to the first row, as for the dict engine.
+            by_amount = np.lexsort((
+                -amounts if aggregator == 'max' else amounts,
+                groups
+            ))
+            if aggregator == 'median':
+                middles = np.ceil(group_sizes / 2).astype(np.int64)
+                values = [
+                    (self._item(low), self._item(high))
+                    for low, high in zip(
+                        by_amount[group_starts + middles - 1].tolist(),
+                        by_amount[group_starts + group_sizes - middles].tolist()
+                    )
+                ]
+            else:
+                values = [
+                    self._item(row)
+                    for row in by_amount[group_starts].tolist()
+                ]
+
+        else:
+            raise KeyError(aggregator)
+
+        aggregation = {}
+        for group_ref, currency, value in zip(
+            self._group_refs,
+            currencies[group_starts].tolist(),
+            values
+        ):
+            aggregate_ref = ' / '.join([
+                str(val)
+                for val in group_ref.values()
+            ])
+            aggregation[aggregate_ref] = {
+                'ref': aggregate_ref,
+                **group_ref,
+                'amount': CurrencyAmount(self._currencies[currency], value)
+            }
+        return aggregation
+
+    def materialise(self) -> ItemSet | dict[frozendict[str, Hashable], ItemSet]:
+        """
+        Return the rows as an item set, or (if grouped) as a dict of group refs
+        to item sets.
+        """
+
+        table = self._expand_runs()
+        items = table._items()
+        if table._group_refs is None:
+            return {item['ref']: item for item in items}
+
+        groups: dict[frozendict[str, Hashable], ItemSet] = {
+            group_ref: {}
+            for group_ref in table._group_refs
+        }
+        for group, item in zip(table._rows['group'].tolist(), items):
+            groups[table._group_refs[group]][item['ref']] = item
+        return groups
+
+    # Utils
+    # --------------------
+
+    def _num_rows(self) -> int:
+        return len(self._rows['source'])
+
+    def _with(self, **rows: np.ndarray) -> 'TransactionTable':
+        table = copy.copy(self)
+        table._rows = {**self._rows, **rows}
+        return table
+
+    def _take(self, selection: np.ndarray) -> 'TransactionTable':
+        table = copy.copy(self)
+        table._rows = {
+            name: column[selection]
+            for name, column in self._rows.items()
+        }
+        return table
+
+    def _with_run_columns(self) -> 'TransactionTable':
+        """
+        Set the start, end, and amount of each run of periods from the periods
+        it contains. See `FinanceModule._share_of_amount()` for how amounts are
+        distributed.
+        """
+
+        assert self._period_length is not None, (
+            f'{self._with_run_columns.__name__}() called before'
+            f' {self.distribute.__name__}()'
+        )
+
+        rows = self._rows
+        period_start = (
+            rows['coverStartWindowed'] + rows['period'] * self._period_length
+        )
+        period_end = np.minimum(
+            period_start + rows['periods'] * self._period_length - 1,
+            rows['coverEndWindowed']
+        )
+
+        cover_start = rows['coverStart']
+        cover_size = rows['coverEnd'] - cover_start + 1
+        share_to_start = (
+            rows['units'] * (period_start - cover_start) // cover_size
+        )
+        share_to_end = (
+            rows['units'] * (period_end - cover_start + 1) // cover_size
+        )
+
+        return self._with(
+            periodStart=period_start,
+            periodEnd=period_end,
+            amount=(
+                rows['sign'] * (share_to_end - share_to_start) * self._precision
+            )
+        )
+
+    def _expand_runs(self) -> 'TransactionTable':
+        """Split each run of periods into a row per period."""
+
+        if 'periods' not in self._rows or np.all(self._rows['periods'] == 1):
+            return self
+
+        periods = self._rows['periods']
+        table = self._take(np.repeat(np.arange(self._num_rows()), periods))
+        table._rows['period'] = (
+            table._rows['period']
+            + np.arange(table._num_rows())
+            - np.repeat(np.cumsum(periods) - periods, periods)
+        )
+        table._rows['periods'] = np.ones(table._num_rows(), dtype=np.int64)
+        return table._with_run_columns()
+
+    def _regroup(self,
+            name: str,
+            label_ids: np.ndarray,
+            labels: list[Hashable]
+    ) -> 'TransactionTable':
+        """
+        Split each group by the given labels, ordering the new groups by parent
+        group, then by first row (as the dict engine does), and reordering rows
+        so that each group is contiguous.
+        """
+
+        assert self._group_refs is not None, (
+            f'{self._regroup.__name__}() called before'
+            f' {self.wrap_in_group.__name__}()'
+        )
+
+        keys = self._rows['group'] * len(labels) + label_ids
+        _, first_rows, key_groups = np.unique(
+            keys, return_index=True, return_inverse=True
+        )
+        group_order = np.argsort(first_rows, kind='stable')
+        first_rows = first_rows[group_order]
+        group_ranks = np.empty_like(group_order)
+        group_ranks[group_order] = np.arange(len(group_order))
+
+        groups = group_ranks[key_groups]
+        table = self._with(group=groups)._take(
+            np.argsort(groups, kind='stable')
+        )
+        table._group_refs = [
+            frozendict(
+                **self._group_refs[self._rows['group'][row]],
+                **{name: labels[label_ids[row]]}
+            )
+            for row in first_rows.tolist()
+        ]
+        return table
+
+    @staticmethod
+    def _unit_of(ordinals: np.ndarray, unit: str) -> np.ndarray:
+        """
+        Return the calendar unit that each of the given dates is in, numbered
+        so that consecutive units have consecutive numbers.
+        """
+
+        if unit == 'week':
+            return (ordinals - 1) // 7 # Ordinal 1 is a Monday
+        elif unit in ('month', 'year'):
+            return (
+                (ordinals - EPOCH_ORDINAL)
+                .astype('datetime64[D]')
+                .astype(f'datetime64[{unit[0].upper()}]')
+                .astype(np.int64)
+            )
+        return ordinals
+
+    @staticmethod
+    def _unit_start(units: np.ndarray, unit: str) -> np.ndarray:
+        """Return the ordinal of the first date in each of the given units."""
+
+        if unit == 'week':
+            return units * 7 + 1
+        elif unit in ('month', 'year'):
+            return (
+                units
+                .astype(f'datetime64[{unit[0].upper()}]')
+                .astype('datetime64[D]')
+                .astype(np.int64)
+                + EPOCH_ORDINAL
+            )
+        return units
+
+    @staticmethod
+    def _align_to_unit(start: date, unit: str) -> str:
+        if unit == 'week':
+            return (start + relativedelta(weekday=MO(-1))).strftime(
+                'wc. %Y-%m-%d'
+            )
+        elif unit == 'month':
+            return (start + relativedelta(day=1)).strftime('%Y-%m')
+        elif unit == 'year':
+            return (start + relativedelta(yearday=1)).strftime('%Y')
+        return start.strftime('%Y-%m-%d')
+
+    def _items(self, rows: np.ndarray | None = None) -> list[Item]:
+        columns = {
+            name: (
+                column.tolist()
+                if rows is None
+                else column[rows].tolist()
+            )
+            for name, column in self._rows.items()
+        }
+        sources = columns['source']
+
+        def dates(name: str):
+            return [
+                date.fromordinal(ordinal) if ordinal != NO_DATE else None
+                for ordinal in columns[name]
+            ]
+
+        values: dict[str, list[Any]] = {}
+        for name in FIELDS:
+            if name == 'ref':
+                values[name] = (
+                    [
+                        f'{self._refs[source]}[{period}]'
+                        for source, period in zip(sources, columns['period'])
+                    ]
+                    if 'period' in columns
+                    else [self._refs[source] for source in sources]
+                )
+            elif name == 'for':
+                values[name] = [self._fors[source] for source in sources]
+            elif name == 'amount':
+                values[name] = [
+                    CurrencyAmount(self._currencies[currency], amount)
+                    for currency, amount in zip(
+                        columns['currency'], columns['amount']
+                    )
+                ]
+            elif name not in columns:
+                continue
+            elif name in DATE_FIELDS:
+                values[name] = dates(name)
+            else:
+                values[name] = [
+                    self._accounts[account]
+                    for account in columns[name]
+                ]
+
+        return [
+            dict(zip(values.keys(), item_values))
+            for item_values in zip(*values.values())
+        ]
+
+    def _item(self, row: int) -> Item:
+        return self._items(np.array([row]))[0]
@@ -1,47 +1,65 @@
+from collections import ChainMap
 from hashlib import md5
-import re
+import os
 import random
+import re
 
 from core.store import Store
 from core.modulemanager import ModuleAccessor
 from core.exceptions import LIMARException
 from core.modules.phase_utils.phase_system import PhaseSystem
+from modules.manifest_utils.ref_index import RefIndex
+from modules.manifest_utils.bitset import bitset_from_ids, ids_in_bitset
 
 # Types
 from core.modules.log import LogModule
 from core.envparse import EnvironmentParser
 from argparse import ArgumentParser, Namespace
-from typing import Any, Callable, Iterable
+from collections.abc import MutableMapping
+from typing import Any, Callable
 
 ItemRef = str
 ItemSetRef = str | tuple[str, str] # (tag_name, tag_value)
 
-Item = dict[str, Any]
+Item = MutableMapping[str, Any] # Usually a ManifestItem
 ItemSet = dict[ItemRef, Item]
 ItemSetSet = dict[ItemSetRef, ItemSet]
 
 ContextModule = Any
 
 class ManifestItemTags:
-    def __init__(self, add_callback=None, remove_callback=None):
+    """
+    The tags of an item while its manifest is being built.
+
+    If given, `add_callback(item_ref, tags)` and `remove_callback(item_ref,
+    names)` are called whenever tags are added or removed. The callbacks are
+    usually shared by all items in a manifest, so only the item's ref is stored
+    per item.
+    """
+
+    __slots__ = ('_tags', '_item_ref', '_add_callback', '_remove_callback')
+
+    def __init__(self,
+            add_callback=None,
+            remove_callback=None,
+            item_ref: 'ItemRef | None' = None
+    ):
         self._tags = {}
+        self._item_ref = item_ref
         self._add_callback = add_callback
         self._remove_callback = remove_callback
 
     def add(self, *names, **tags):
-        for name, value in tags.items():
-            self._tags[name] = value
-            if self._add_callback is not None:
-                self._add_callback(tags)
-
-        if len(names) > 0:
-            self.add(**{name: None for name in names})
+        tags = {**{name: None for name in names}, **tags}
+        self._tags.update(tags)
+        if self._add_callback is not None and len(tags) > 0:
+            self._add_callback(self._item_ref, tags)
 
     def remove(self, *names):
         for name in names:
             del self._tags[name]
-            if self._remove_callback is not None:
-                self._remove_callback(names)
+        if self._remove_callback is not None and len(names) > 0:
+            self._remove_callback(self._item_ref, names)
 
     def get(self, name, default=None):
         return self._tags.get(name, default)
@@ -55,6 +73,90 @@ class ManifestItemTags:
     def __contains__(self, value):
         return value in self._tags
 
+class ManifestItem(MutableMapping):
+    """
+    A manifest item.
+
+    Behaves like a dict with a `ref` key, a `tags` key, and any extra props that
+    context modules set on the item, but stores them in slots (only creating a
+    dict for extra props if there are any) to keep large manifests compact.
+    """
+
+    __slots__ = ('ref', 'tags', 'props')
+
+    def __init__(self,
+            ref: ItemRef,
+            tags: Any = None,
+            props: dict[str, Any] | None = None
+    ):
+        self.ref = ref
+        self.tags = tags if tags is not None else {}
+        self.props = props
+
+    def raw(self) -> dict[str, Any]:
+        """Return this item as a dict."""
+
+        return {
+            'ref': self.ref,
+            'tags': self.tags,
+            **(self.props if self.props is not None else {})
+        }
+
+    def __getitem__(self, key):
+        if key == 'ref':
+            return self.ref
+        if key == 'tags':
+            return self.tags
+        if self.props is None:
+            raise KeyError(key)
+        return self.props[key]
+
+    def __setitem__(self, key, value):
+        if key == 'ref':
+            self.ref = value
+        elif key == 'tags':
+            self.tags = value
+        else:
+            if self.props is None:
+                self.props = {}
+            self.props[key] = value
+
+    def __delitem__(self, key):
+        if key in ('ref', 'tags') or self.props is None:
+            raise KeyError(key)
+        del self.props[key]
+        if len(self.props) == 0:
+            self.props = None
+
+    def __contains__(self, key):
+        return (
+            key == 'ref' or
+            key == 'tags' or
+            (self.props is not None and key in self.props)
+        )
+
+    def __iter__(self):
+        yield 'ref'
+        yield 'tags'
+        if self.props is not None:
+            yield from self.props
+
+    def __len__(self):
+        return 2 + (len(self.props) if self.props is not None else 0)
+
+    def __or__(self, other):
+        return self.raw() | dict(other)
+
+    def __ror__(self, other):
+        return dict(other) | self.raw()
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({self.raw()!r})'
+
+    def __reduce__(self):
+        # Much more compact than the default pickled form for slotted classes
+        return (self.__class__, (self.ref, self.tags, self.props))
+
 class Manifest:
 
     TAG_OPT_CONTINUOUS = 'continuous'
@@ -126,6 +228,19 @@ class Manifest:
         self._contexts = []
         self._stage = self.STAGES.initialising
 
+          # Shared by all items' tags (a new bound method object is created each
+          # time a method is accessed, so only create them once).
+        self._on_add_item_tags_callback = self._on_add_item_tags
+        self._on_remove_item_tags_callback = self._on_remove_item_tags
+
+          # Item ids are dense (in declaration order), so that item sets can be
+          # represented as bitsets of item ids when computing new item sets.
+          # Ids of initial items, and bitsets of item sets, are created on first
+          # use, as initial items may be loaded lazily (see `_item_ids`).
+        self._item_ids_by_ref: dict[ItemRef, int] | None = None
+        self._item_refs_by_id: list[ItemRef] | None = None
+        self._item_set_bitsets: dict[ItemSetRef, int] = {}
+
     @staticmethod
     def from_raw(
             logger: LogModule,
@@ -178,7 +293,7 @@ class Manifest:
 
         # Finalise - tag set
         for item in self._items.values():
-            item['tags'] = item['tags'].raw()
+            item.tags = item.tags.raw()
 
         self._stage = self.STAGES.exited
 
@@ -263,10 +378,13 @@ class Manifest:
 
     # Util for _declare_item()
     def _on_add_item_tags(self, item_ref, tags):
+        item_bit = 1 << self._item_ids[item_ref]
         for tag_name, tag_value in tags.items():
             if tag_name not in self._item_sets.keys():
                 self._item_sets[tag_name] = {}
             self._item_sets[tag_name][item_ref] = self._items[item_ref]
+            if tag_name in self._item_set_bitsets:
+                self._item_set_bitsets[tag_name] |= item_bit
 
             if (
                 tag_value is not None and
@@ -279,15 +397,21 @@ class Manifest:
                 if indexed_tag not in self._item_sets.keys():
                     self._item_sets[indexed_tag] = {}
                 self._item_sets[indexed_tag][item_ref] = self._items[item_ref]
+                if indexed_tag in self._item_set_bitsets:
+                    self._item_set_bitsets[indexed_tag] |= item_bit
 
     # Util for _declare_item()
     def _on_remove_item_tags(self, item_ref, names):
+        item_bit = 1 << self._item_ids[item_ref]
         for tag_name in names:
             if item_ref in self._item_sets[tag_name].keys():
                 del self._item_sets[tag_name][item_ref]
+            if tag_name in self._item_set_bitsets:
+                self._item_set_bitsets[tag_name] &= ~item_bit
 
             if len(self._item_sets[tag_name]) == 0:
                 del self._item_sets[tag_name]
+                self._item_set_bitsets.pop(tag_name, None)
 
     def declare_item(self, ref: ItemRef, tags = None):
         if (
@@ -307,18 +431,20 @@ class Manifest:
             )
 
         # Store
-        item = {
-            'ref': ref,
-            'tags': ManifestItemTags(
+        item = ManifestItem(
+            ref,
+            ManifestItemTags(
                 # If any context module updates this item's tags, also update
                 # all relevant indexes.
-                lambda tags: self._on_add_item_tags(ref, tags),
-                lambda tags: self._on_remove_item_tags(ref, tags)
+                self._on_add_item_tags_callback,
+                self._on_remove_item_tags_callback,
+                item_ref=ref
             )
-        }
+        )
 
           # Add to main item set
         self._items[ref] = item
+        self._add_item_id(ref)
 
           # Add all declared tags
         if tags is not None:
@@ -336,75 +462,171 @@ class Manifest:
             [item]
         )
 
-    # Util for _declare_item_set()
-    def _get_item(self, ref: str):
-        return (
-            self._items[ref]
-            if ref in self._items
-            else None
-        )
+    # Util for _declare_item()
+    def _add_item_id(self, ref: ItemRef):
+        if self._item_ids_by_ref is None:
+            return # Will be created from all items (including this one)
+
+        self._item_ids[ref] = len(self._item_refs)
+        self._item_refs.append(ref)
+
+    @property
+    def _item_ids(self) -> dict[ItemRef, int]:
+        if self._item_ids_by_ref is None:
+            self._create_item_ids()
+        assert self._item_ids_by_ref is not None
+        return self._item_ids_by_ref
+
+    @property
+    def _item_refs(self) -> list[ItemRef]:
+        if self._item_refs_by_id is None:
+            self._create_item_ids()
+        assert self._item_refs_by_id is not None
+        return self._item_refs_by_id
+
+    def _create_item_ids(self):
+        self._item_refs_by_id = list(self._items.keys())
+        self._item_ids_by_ref = {
+            ref: item_id
+            for item_id, ref in enumerate(self._item_refs_by_id)
+        }
 
     # Util for _declare_item_set()
-    def _get_item_set(self, ref: str, value: str | None = None):
-        if ref not in self._item_sets:
-            return None
-        elif value is None:
-            return self._item_sets[ref]
-        else:
-            return self._item_sets[(ref, value)]
+    def _item_set_bitset(self, ref: ItemSetRef) -> int:
+        if ref not in self._item_set_bitsets:
+            self._item_set_bitsets[ref] = bitset_from_ids(
+                self._item_ids[item_ref]
+                for item_ref in self._item_sets[ref].keys()
+            )
+        return self._item_set_bitsets[ref]
 
     # Util for _declare_item_set()
-    def _compute_set(self, ops_btree) -> ItemSet:
-        # Base Case: Empty set
-        if ops_btree is None:
-            return {}
+    def _item_set_from_bitset(self, bitset: int) -> ItemSet:
+        return {
+            self._item_refs[item_id]: self._items[self._item_refs[item_id]]
+            for item_id in ids_in_bitset(bitset)
+        }
 
-        # Base Case: Declared or tag item set or item
-        if type(ops_btree) is str:
-            item_set = self._get_item_set(ops_btree)
-            if item_set is not None:
-                return item_set
+    # Util for _declare_item_set()
+    def _compute_bitset(self, ops_btree) -> int:
+        return self._evaluate_item_set_plan(self._plan_item_set(ops_btree))
 
-            item = self._get_item(ops_btree)
-            if item is not None:
-                return {item['ref']: item}
+    # Util for _compute_bitset()
+    def _plan_item_set(self, ops_btree) -> tuple[int, str | None, Any]:
+        """
+        Plan how to evaluate the given item set expression tree.
+
+        Return a plan node of the form `(max_size, operator, operands)`, where
+        `max_size` is an upper bound on the number of items in the node's
+        result. For leaf nodes, `operator` is None and `operands` is the node's
+        bitset. Otherwise, `operands` is a list of plan nodes. Chains of the
+        same associative operator (`&` or `|`) are flattened into a single node,
+        and the operands of `&` nodes are ordered smallest-first.
+        """
 
-            return {} # Empty item set
+        # Base Case: Empty set
+        if ops_btree is None:
+            return (0, None, 0)
+
+        # Base Case: Declared or tag item set, item, or tag item set with
+        # indexed value
+        if type(ops_btree) is str or type(ops_btree) is tuple:
+            bitset = 0
+            if ops_btree in self._item_sets:
+                bitset = self._item_set_bitset(ops_btree)
+            elif type(ops_btree) is str and ops_btree in self._item_ids:
+                bitset = 1 << self._item_ids[ops_btree]
+            return (bitset.bit_count(), None, bitset)
+
+        # Recursive Case: Unary operation
+        operator = ops_btree['operator']
+        if operator == '!':
+            operand = self._plan_item_set(ops_btree['operand'])
+            max_size = len(self._item_refs)
+            if operand[1] is None:
+                max_size -= operand[0] # Exact for leaves
+            return (max_size, operator, [operand])
 
-        # Base Case: Tag item set with indexed value
-        if type(ops_btree) is tuple:
-            item_set = self._get_item_set(*ops_btree)
-            if item_set is not None:
-                return item_set
+        # Recursive Case: Binary operation
+        left = self._plan_item_set(ops_btree['left'])
+        right = self._plan_item_set(ops_btree['right'])
+
+        if operator == '&':
+            operands = sorted(
+                [
+                    *(left[2] if left[1] == '&' else [left]),
+                    *(right[2] if right[1] == '&' else [right])
+                ],
+                key=lambda operand: operand[0]
+            )
+            return (operands[0][0], operator, operands)
 
-            return {} # Empty item set
+        elif operator == '|':
+            operands = [
+                *(left[2] if left[1] == '|' else [left]),
+                *(right[2] if right[1] == '|' else [right])
+            ]
+            return (
+                min(sum(operand[0] for operand in operands), len(self._item_refs)),
+                operator,
+                operands
+            )
 
-        # Recursive Case: Binary operation
-        left_item_set = self._compute_set(ops_btree['left'])
-        right_item_set = self._compute_set(ops_btree['right'])
-
-        if ops_btree['operator'] == '&':
-            return {
-                item_set_name: left_item_set[item_set_name]
-                for item_set_name in left_item_set.keys() & right_item_set.keys()
-            }
-
-        elif ops_btree['operator'] == '|':
-            return {
-                item_set_name: (
-                    left_item_set[item_set_name]
-                    if item_set_name in left_item_set
-                    else right_item_set[item_set_name]
-                )
-                for item_set_name in left_item_set.keys() | right_item_set.keys()
-            }
+        elif operator == '-':
+            return (left[0], operator, [left, right])
 
         else:
             raise LIMARException(
-                f"Unsupported set operator '{ops_btree['operator']}' when"
-                " computing item set"
+                f"Unsupported set operator '{operator}' when computing item set"
             )
 
+    # Util for _compute_bitset()
+    def _evaluate_item_set_plan(self, plan: tuple[int, str | None, Any]) -> int:
+        max_size, operator, operands = plan
+
+        # Base Case: Leaf
+        if operator is None:
+            return operands
+
+        # Base Case: Known to be empty, so don't evaluate operands
+        if max_size == 0:
+            return 0
+
+        # Recursive Case: Operation
+        if operator == '&':
+            # Smallest operand first, so the result shrinks as fast as possible
+            # and evaluation can stop as soon as the result is empty.
+            bitset = self._evaluate_item_set_plan(operands[0])
+            for operand in operands[1:]:
+                if bitset == 0:
+                    break
+                if operand[1] == '!':
+                    # `a & !b` is `a - b`, which avoids building `!b`
+                    bitset &= ~self._evaluate_item_set_plan(operand[2][0])
+                else:
+                    bitset &= self._evaluate_item_set_plan(operand)
+            return bitset
+
+        elif operator == '|':
+            all_items = (1 << len(self._item_refs)) - 1
+            bitset = 0
+            for operand in operands:
+                bitset |= self._evaluate_item_set_plan(operand)
+                if bitset == all_items:
+                    break
+            return bitset
+
+        elif operator == '-':
+            left, right = operands
+            bitset = self._evaluate_item_set_plan(left)
+            if bitset == 0:
+                return 0
+            return bitset & ~self._evaluate_item_set_plan(right)
+
+        else: # operator == '!'
+            all_items = (1 << len(self._item_refs)) - 1
+            return all_items & ~self._evaluate_item_set_plan(operands[0])
+
     def declare_item_set(self, ref: ItemSetRef, ops_btree):
         if (
             self._stage != self.STAGES.entered and
@@ -423,11 +645,13 @@ class Manifest:
             )
 
         # Compute
-        item_set = self._compute_set(ops_btree)
+        bitset = self._compute_bitset(ops_btree)
+        item_set = self._item_set_from_bitset(bitset)
 
         # Store
           # Add to main item sets
         self._item_sets[ref] = item_set
+        self._item_set_bitsets[ref] = bitset
 
           # Add to all active contexts
         for context in self._contexts:
@@ -453,6 +677,11 @@ class Manifest:
     def item(self, ref: ItemRef) -> Item:
         return self._items[ref]
 
+    def item_id(self, ref: ItemRef) -> int:
+        """Return the position of the given item in declaration order."""
+
+        return self._item_ids[ref]
+
     def item_set(self, ref: ItemSetRef) -> ItemSet:
         return self._item_sets[ref]
 
@@ -553,9 +782,17 @@ class ManifestModule:
     includes. An implicit item set exists for each unique tag associated with
     any item, which includes all items with that tag. Item set expressions
     consist of the names of items, implicit item sets, and explicit item sets,
-    with each name separated by either the `&` (and/intersection) or `|`
-    (or/union) operators to combine the referenced sets in the relevant ways.
-    Nested item set expressions with operators between them are also supported.
+    with each name separated by either the `&` (and/intersection), `|`
+    (or/union), or `-` (difference) operators to combine the referenced sets in
+    the relevant ways. Binary operators all have the same precedence and are
+    evaluated left-to-right. The `-` operator must not be directly followed by a
+    name (eg. `a - b` or `a -[b]`, not `a -b`), as `-b` is itself a valid name.
+    Conversely, a lone `-` is always the difference operator, so a name or tag
+    value that is just `-` must be wrapped in triple quotes.
+    Any name or nested expression may also be prefixed by `!` (complement), which
+    selects all items in the manifest that are not in the referenced set, and
+    which binds more tightly than the binary operators. Nested item set
+    expressions with operators between them are also supported.
 
     All items are declared in a single global scope. They must all have
     different refs, even across files. All items in a file up to the declaration
@@ -611,7 +848,8 @@ class ManifestModule:
         equivalent to it returning False.
 
     It may define any of the following method-based hooks (at least one must be
-    defined to make the context module do anything):
+    defined to make the context module do anything). Items passed to these hooks
+    are ManifestItem objects, which can be used like dicts:
 
     - `on_enter_manifest()`
       - TODO
@@ -662,6 +900,8 @@ class ManifestModule:
 
     # Can now declare a set containing items declared above it.
     item-set-example [thing-typeB | other]
+    item-set-example2 [thing - thing-typeA]
+    item-set-example3 [!thing & !other]
 
     # Items can be anything - contexts may add data to them, possibly pulling it
     # from various sources. Other MM modules that use ManifestModule may also
@@ -690,6 +930,8 @@ class ManifestModule:
     ```
     """
 
+    PARSERS = ('native', 'antlr')
+
     # Lifecycle
     # --------------------
 
@@ -698,9 +940,12 @@ class ManifestModule:
 
         self._ctx_mod_factories: dict[str, list[Callable[[], Any]]] = {}
         self._manifest_names: list[str] = []
+        self._manifest_digests: dict[str, str] = {}
 
         self._manifests: list[Manifest] = []
         self._global_manifest: Manifest | None = None
+        self._item_index: RefIndex | None = None
+        self._item_set_index: RefIndex | None = None
 
         # Internal caches
         self._all_tags_data = None
@@ -712,6 +957,8 @@ class ManifestModule:
     def configure_env(self, *, parser: EnvironmentParser, **_):
         parser.add_variable('ROOT')
         parser.add_variable('DEFAULT_ITEM_SET', default_is_none=True)
+        parser.add_variable('PARSER', default='native')
+        parser.add_variable('PARSE_WORKERS', type=int, default=0)
 
     def configure_args(self, *, mod: Namespace, parser: ArgumentParser, **_):
         # Subcommands
@@ -807,23 +1054,40 @@ class ManifestModule:
         mod.phase.register_system(MANIFEST_LIFECYCLE)
 
         if self._manifest_store is None:
-            self._manifest_store = Store(env.ROOT)
+            # Manifests are the user's files, so must never be moved
+            self._manifest_store = Store(env.ROOT, quarantine=False)
 
         self._default_item_set = env.DEFAULT_ITEM_SET
 
+        if env.PARSER not in self.PARSERS:
+            raise LIMARException(
+                f"Unsupported manifest parser '{env.PARSER}' (must be one of:"
+                f" {', '.join(self.PARSERS)})"
+            )
+        self._parser = env.PARSER
+        self._parse_workers = env.PARSE_WORKERS or os.cpu_count() or 1
+
     def start(self, *_, mod: Namespace, **__):
-        for manifest_name in self._manifest_names:
-            self._load_manifest(manifest_name)
+        self._load_manifests()
 
-        all_items = {}
-        for manifest in self._manifests:
-            for ref, item in manifest.items().items():
-                if ref in all_items:
-                    raise LIMARException(
-                        f"Manifest item with ref '{ref}' already declared in"
-                        " another manifest"
-                    )
-                all_items[ref] = item
+        # Items and item sets loaded from the cache are only decoded when they
+        # are first accessed, so combine them without accessing them.
+        if len(self._manifests) == 1:
+            all_items = self._manifests[0].items()
+        else:
+            all_item_refs = set()
+            for manifest in self._manifests:
+                for ref in manifest.items().keys():
+                    if ref in all_item_refs:
+                        raise LIMARException(
+                            f"Manifest item with ref '{ref}' already declared"
+                            " in another manifest"
+                        )
+                    all_item_refs.add(ref)
+            all_items = ChainMap(*reversed([ # Iterated last to first
+                manifest.items()
+                for manifest in self._manifests
+            ]))
 
         all_item_sets = {}
         for manifest in self._manifests:
@@ -833,7 +1097,7 @@ class ManifestModule:
                         f"Manifest item set with ref '{ref}' already declared"
                         " in another manifest. Merging into existing item set."
                     )
-                    all_item_sets[ref].update(item_set)
+                    all_item_sets[ref] = ChainMap(item_set, all_item_sets[ref])
                 else:
                     all_item_sets[ref] = item_set
 
@@ -843,76 +1107,221 @@ class ManifestModule:
             all_item_sets
         )
 
-    def _load_manifest(self, name):
-        assert self._manifest_store is not None, 'ManifestModule._load_manifest() called before ManifestModule.configure()'
-        try:
-            manifest_text = self._manifest_store.get(name+'.manifest.txt')
-        except KeyError:
-            self._mod.log.trace(
-                f"Manifest '{name}' not found. Skipping."
-            )
-            return
+    def _load_manifests(self):
+        assert self._manifest_store is not None, 'ManifestModule._load_manifests() called before ManifestModule.configure()'
 
-        # Determine cache filename for this version of the manifest file
-        digest = md5(manifest_text.encode('utf-8')).hexdigest()
-        cached_name = '.'.join([name, 'manifest', digest, 'pickle'])
+        from modules.manifest_utils.compiled_manifest import CompiledManifest
+
+        # Loaded manifests, in the order of `_manifest_names` (None if not yet
+        # parsed)
+        manifests: dict[str, Manifest | None] = {}
+        to_parse: list[tuple[str, str, str, bytes | None]] = []
+        for name in self._manifest_names:
+            try:
+                manifest_text = self._manifest_store.get(name+'.manifest.txt')
+            except KeyError:
+                self._mod.log.trace(
+                    f"Manifest '{name}' not found. Skipping."
+                )
+                continue
+            except UnicodeDecodeError as e:
+                raise LIMARException(
+                    f"Could not decode manifest '{name}' as UTF-8: {e}"
+                ) from e
 
-        # Try cache
+            # Try cache (the compiled manifest is memory-mapped, so only the
+            # parts of it that are used are read)
+            digest = md5(manifest_text.encode('utf-8')).hexdigest()
+            self._manifest_digests[name] = digest
+            cached_name = self._compiled_cache_name(name, digest)
+            try:
+                compiled = CompiledManifest(
+                    self._mod.cache.get(cached_name, type='binary')
+                )
+            except KeyError:
+                compiled = None
+            except ValueError:
+                self._mod.cache.quarantine(cached_name)
+                compiled = None
+
+            if compiled is not None:
+                manifests[name] = Manifest.from_raw(
+                    self._mod.log,
+                    compiled.raw()
+                )
+            else:
+                manifests[name] = None
+                to_parse.append((
+                    name,
+                    manifest_text,
+                    digest,
+                    self._get_cached_blocks(name)
+                ))
+
+        # Parse the rest
+        if len(to_parse) > 1 and self._parse_workers > 1:
+            parsed = self._parse_manifests_in_parallel(to_parse)
+        else:
+            parsed = self._parse_manifests(to_parse)
+        for name, manifest in parsed:
+            manifests[name] = manifest
+
+        # Add Manifests
+        for manifest in manifests.values():
+            assert manifest is not None, 'All manifests are loaded or parsed'
+            self._manifests.append(manifest)
+
+    # Cache entries for each version of each manifest are named by the digest of
+    # its text, and the `<name>.manifest` cache ref refers to the entries for
+    # the version last parsed, so that the entries for previous versions are
+    # deleted when it is reparsed.
+    #
+    # Compiled manifests also depend on which context modules were added (which
+    # can vary if only some modules are loaded), so are also named by a digest
+    # of those. Parsed blocks are only the declarations in the text, so don't.
+
+    def _compiled_cache_name(self, name: str, digest: str):
+        from modules.manifest_utils.compiled_manifest import FORMAT_VERSION
+        return '.'.join([
+            'objects/'+name, 'manifest', digest, self._context_modules_digest(),
+            f'v{FORMAT_VERSION}', 'compiled'
+        ])
+
+    def _context_modules_digest(self):
+        return md5(repr(sorted(
+            (context_type, module.__module__, module.__qualname__)
+            for context_type, modules in self._ctx_mod_factories.items()
+            for module in modules
+        )).encode('utf-8')).hexdigest()
+
+    def _blocks_cache_name(self, name: str, digest: str):
+        from modules.manifest_lang.incremental import FORMAT_VERSION
+        return '.'.join([
+            'objects/'+name, 'manifest', digest, f'v{FORMAT_VERSION}', 'blocks'
+        ])
+
+    def _get_cached_blocks(self, name: str) -> bytes | None:
+        # The parsed blocks of the last version of the manifest that was
+        # parsed, for reparsing only what has changed since then
+        if self._parser == 'antlr':
+            return None
+
+        # Any digest will do
+        prefix, suffix = self._blocks_cache_name(name, '*').split('*')
         try:
-            manifest = Manifest.from_raw(
-                self._mod.log,
-                self._mod.cache.get(cached_name)
+            blocks_name = next(
+                entry
+                for entry in self._mod.cache.get_ref(name+'.manifest')
+                if entry.startswith(prefix) and entry.endswith(suffix)
             )
+            return bytes(self._mod.cache.get(blocks_name, type='binary'))
+        except (KeyError, StopIteration):
+            return None
 
-        except KeyError:
-            # Import Deps (these are slow to import, so only (re)parse the
-            # manifest if needed)
-            from antlr4 import InputStream, CommonTokenStream, ParseTreeWalker
-            from modules.manifest_lang.build.ManifestLexer import ManifestLexer
-            from modules.manifest_lang.build.ManifestParser import ManifestParser
-            from modules.manifest_lang.manifest_listener import ManifestListenerImpl
-
-            # Create Context Modules
-            context_modules = {
-                context_type: [
-                    mod_factory()
-                    for mod_factory in ctx_mod_factories
-                ]
-                for context_type, ctx_mod_factories in
-                    self._ctx_mod_factories.items()
-            }
-
-            # Setup Parser
-            input_stream = InputStream(manifest_text)
-            lexer = ManifestLexer(input_stream)
-            tokens = CommonTokenStream(lexer)
-            parser = ManifestParser(tokens)
-            tree = parser.manifest()
-
-            # Start Builder
-            manifest = Manifest(
-                self._mod.log,
-                None,
-                None,
-                [name],
-                context_modules
+    def _cache_parsed_manifest(self,
+            name: str,
+            digest: str,
+            compiled: bytes | None,
+            blocks: bytes | None
+    ):
+        entries = []
+        if compiled is not None:
+            entries.append(self._compiled_cache_name(name, digest))
+            self._mod.cache.set(entries[-1], compiled, type='binary')
+        if blocks is not None:
+            entries.append(self._blocks_cache_name(name, digest))
+            self._mod.cache.set(entries[-1], blocks, type='binary')
+
+        # Keep this version compiled with other context modules, so that
+        # alternating between commands that load different modules doesn't
+        # reparse it every time
+        prefix = f'objects/{name}.manifest.{digest}.'
+        try:
+            entries.extend(
+                entry
+                for entry in self._mod.cache.get_ref(name+'.manifest')
+                if entry.startswith(prefix) and entry not in entries
             )
+        except KeyError:
+            pass
+
+        self._mod.cache.set_ref(name+'.manifest', entries)
 
-            # Parse
-            listener = ManifestListenerImpl(self._mod.log, manifest)
-            walker = ParseTreeWalker()
-            walker.walk(listener, tree)
+    def _parse_manifests(self, to_parse: list[tuple[str, str, str, bytes | None]]):
+        from modules.manifest_lang.parse import parse_manifest
+        from modules.manifest_utils.compiled_manifest import compile_manifest
 
-            # Log
-            self._mod.log.info(
-                f"Loaded manifest '{name}' from '{self._manifest_store}'"
+        for name, manifest_text, digest, previous_blocks in to_parse:
+            manifest, blocks = parse_manifest(
+                self._mod.log,
+                name,
+                manifest_text,
+                self._parser,
+                self._ctx_mod_factories,
+                previous_blocks
             )
+            self._log_parsed_manifest(name)
 
             # Cache Results
-            self._mod.cache.set(cached_name, manifest.raw())
+            try:
+                compiled = compile_manifest(manifest.raw())
+            except TypeError as e:
+                compiled = None
+                self._mod.log.warning(
+                    f"Manifest '{name}' could not be cached: {e}"
+                )
+            self._cache_parsed_manifest(name, digest, compiled, blocks)
+
+            yield name, manifest
+
+    def _parse_manifests_in_parallel(
+            self,
+            to_parse: list[tuple[str, str, str, bytes | None]]
+    ):
+        from concurrent.futures import ProcessPoolExecutor
+        from modules.manifest_lang.parse import parse_manifest_in_worker
+        from modules.manifest_utils.compiled_manifest import CompiledManifest
+
+        with ProcessPoolExecutor(
+            min(len(to_parse), self._parse_workers)
+        ) as executor:
+            futures = [
+                executor.submit(
+                    parse_manifest_in_worker,
+                    name,
+                    manifest_text,
+                    self._parser,
+                    self._ctx_mod_factories,
+                    previous_blocks
+                )
+                for name, manifest_text, _, previous_blocks in to_parse
+            ]
+
+            # Handle results in order, so that logs and errors are the same as
+            # when parsing sequentially
+            for (name, _, digest, _), future in zip(to_parse, futures):
+                compiled, raw, blocks, log_records = future.result()
+                for method, messages in log_records:
+                    getattr(self._mod.log, method)(*messages)
+                self._log_parsed_manifest(name)
+
+                # Cache Results
+                if compiled is not None:
+                    raw = CompiledManifest(compiled).raw()
+                else:
+                    self._mod.log.warning(
+                        f"Manifest '{name}' could not be cached: it contains"
+                        " non-string tags or item set refs"
+                    )
+                self._cache_parsed_manifest(name, digest, compiled, blocks)
+
+                yield name, Manifest.from_raw(self._mod.log, raw)
 
-        # Add Manifest
-        self._manifests.append(manifest)
+    def _log_parsed_manifest(self, name: str):
+        self._mod.log.info(
+            f"Loaded manifest '{name}' from '{self._manifest_store}' (using"
+            f" {self._parser} parser)"
+        )
 
     def __call__(self, *, mod: Namespace, args: Namespace, **_):
         mod.log.trace(f"manifest(args={args})")
@@ -928,19 +1337,30 @@ class ManifestModule:
                 item_set = self.get_item_set(args.item_set)
                 output = self.get_item(args.pattern, item_set=item_set)
 
+            is_flattened = False
             if transition_to_phase(
                 MANIFEST_LIFECYCLE.PHASES.FLATTEN, not args.output_is_forward
             ):
-                output = self._list_flattened_items(
+                output = self._tabulate_flattened_items(
                     {'': output},
                     filter_tags=self._filter_str_to_list(args.tags),
                     filter_extra_props=self._filter_str_to_list(args.properties)
                 )
+                is_flattened = True
+            elif output is not None:
+                # Not all consumers of forwarded data (eg. jq) support mappings
+                # other than dicts
+                output = dict(output)
 
             if transition_to_phase(
                 MANIFEST_LIFECYCLE.PHASES.TABULATE, not args.output_is_forward
             ):
-                output = mod.tr.tabulate(output, obj_mapping='all')
+                if is_flattened:
+                    output = mod.tr.tabulate(output)
+                else:
+                    output = mod.tr.tabulate(output, obj_mapping='all')
+            elif is_flattened:
+                output = self._table_to_flattened_items(output)
 
             if transition_to_phase(
                 MANIFEST_LIFECYCLE.PHASES.RENDER, not args.output_is_forward
@@ -956,19 +1376,30 @@ class ManifestModule:
                 else:
                     output = self.get_item_set(args.pattern)
 
+            is_flattened = False
             if transition_to_phase(
                 MANIFEST_LIFECYCLE.PHASES.FLATTEN, not args.output_is_forward
             ):
-                output = self._list_flattened_items(
+                output = self._tabulate_flattened_items(
                     output,
                     filter_tags=self._filter_str_to_list(args.tags),
                     filter_extra_props=self._filter_str_to_list(args.properties)
                 )
+                is_flattened = True
+            elif output is not None:
+                # Not all consumers of forwarded data (eg. jq) support mappings
+                # other than dicts
+                output = {ref: dict(item) for ref, item in output.items()}
 
             if transition_to_phase(
                 MANIFEST_LIFECYCLE.PHASES.TABULATE, not args.output_is_forward
             ):
-                output = mod.tr.tabulate(output, obj_mapping='all')
+                if is_flattened:
+                    output = mod.tr.tabulate(output)
+                else:
+                    output = mod.tr.tabulate(output, obj_mapping='all')
+            elif is_flattened:
+                output = self._table_to_flattened_items(output)
 
             if transition_to_phase(
                 MANIFEST_LIFECYCLE.PHASES.RENDER, not args.output_is_forward
@@ -1020,28 +1451,19 @@ class ManifestModule:
     def declare_item_set(self, ref: str, item_set_spec):
         assert self._global_manifest is not None, '_global_manifest is initialised in STARTING phase, but this method is only run during RUNNING phase'
 
-        # This is effectively parsing a fragment of a manifest, rather than a
-        # whole manifest, but this way makes sure it goes through exactly the
-        # same process as parsing a real manifest, just with no contexts.
-
-        # Import Deps (these are slow to import, so only (re)parse the
-        # manifest if needed)
-        from antlr4 import InputStream, CommonTokenStream, ParseTreeWalker
-        from modules.manifest_lang.build.ManifestLexer import ManifestLexer
-        from modules.manifest_lang.build.ManifestParser import ManifestParser
-        from modules.manifest_lang.manifest_listener import ManifestListenerImpl
-
-        # Setup Parser
-        input_stream = InputStream(f'"""{ref}""" [{item_set_spec}]')
-        lexer = ManifestLexer(input_stream)
-        tokens = CommonTokenStream(lexer)
-        parser = ManifestParser(tokens)
-        tree = parser.itemSet()
-
-        # Parse
-        listener = ManifestListenerImpl(self._mod.log, self._global_manifest)
-        walker = ParseTreeWalker()
-        walker.walk(listener, tree)
+        # Specs are compiled natively (and cached) whichever parser is used for
+        # manifest files, as this is run for most queries, and importing and
+        # setting up ANTLR4 would dominate the time taken for small manifests.
+        from modules.manifest_lang.native_parser import compile_item_set_spec
+        self._global_manifest.declare_item_set(
+            ref,
+            compile_item_set_spec(item_set_spec)
+        )
+
+        # Index (if already created - otherwise it will include this item set
+        # when it is created)
+        if self._item_set_index is not None:
+            self._item_set_index.add(ref)
 
     @ModuleAccessor.invokable_as_service
     def get_item_set(self, pattern: str | None = None) -> ItemSet:
@@ -1059,23 +1481,30 @@ class ManifestModule:
             else:
                 item_set = self._global_manifest.item_set(self._default_item_set)
         else:
-            item_set_regex = re.compile(pattern)
-            try:
-                item_set = next(
-                    item
-                    for ref, item in self._global_manifest.item_sets().items()
-                    if (
-                        (type(ref) == str and item_set_regex.search(ref)) or
-                        (type(ref) == tuple and item_set_regex.search(ref[0]))
-                    )
-                )
-            except (KeyError, StopIteration) as e:
+            ref = self._get_item_set_index().search(pattern)
+            if ref is None:
                 raise LIMARException(
                     f"item set not found from pattern '{pattern}'"
-                ) from e
+                )
+            item_set = self._global_manifest.item_sets()[ref]
 
         return item_set
 
+    @ModuleAccessor.invokable_as_service
+    def get_cache_key(self) -> str:
+        """
+        Return a key that identifies the versions of all loaded manifests (and
+        the context modules they were loaded with), for naming cache entries of
+        data derived from them.
+        """
+
+        assert self._global_manifest is not None, '_global_manifest is initialised in STARTING phase, but this method is only run during RUNNING phase'
+
+        return md5(repr((
+            sorted(self._manifest_digests.items()),
+            self._context_modules_digest()
+        )).encode('utf-8')).hexdigest()
+
     @ModuleAccessor.invokable_as_service
     def get_item(self,
             pattern: str,
@@ -1093,27 +1522,54 @@ class ManifestModule:
             ")"
         )
 
+        all_items = self._global_manifest.items()
         if item_set is None:
-            item_set = self._global_manifest.items()
-
-        item_regex = re.compile(pattern)
-        try:
-            item = next(
-                value
-                for name, value in self._global_manifest.items().items()
-                if item_regex.search(name)
+            item_set = all_items
+
+        if item_set is not all_items and self._item_index is None:
+            # Don't index all items just to search some of them
+            regex = re.compile(pattern)
+            refs = [ref for ref in item_set.keys() if regex.search(ref)]
+            if len(refs) > 1: # Item set may not be in declaration order
+                refs.sort(key=self._global_manifest.item_id)
+            ref = refs[0] if len(refs) > 0 else None
+        else:
+            ref = self._get_item_index().search(
+                pattern,
+                among=None if item_set is all_items else item_set
             )
-            self._mod.log.debug('found:', item)
-        except StopIteration:
+        if ref is None:
             raise LIMARException(
                 f"item not found from pattern '{pattern}'"
             )
 
+        item = item_set[ref]
+        self._mod.log.debug('found:', item)
         return item
 
     # Utils
     # --------------------
 
+    # Indexes are created on first use, as creating them takes time
+    # proportional to the size of the manifest.
+
+    def _get_item_index(self) -> RefIndex:
+        assert self._global_manifest is not None, '_global_manifest is initialised in STARTING phase, but this method is only run during RUNNING phase'
+
+        if self._item_index is None:
+            self._item_index = RefIndex(self._global_manifest.items().keys())
+        return self._item_index
+
+    def _get_item_set_index(self) -> RefIndex:
+        assert self._global_manifest is not None, '_global_manifest is initialised in STARTING phase, but this method is only run during RUNNING phase'
+
+        if self._item_set_index is None:
+            self._item_set_index = RefIndex(
+                self._global_manifest.item_sets().keys(),
+                text_of=lambda ref: ref[0] if type(ref) == tuple else ref
+            )
+        return self._item_set_index
+
     # Transformation Stage
 
     def _filter_str_to_list(self, list_: str) -> list[str] | None:
@@ -1124,66 +1580,65 @@ class ManifestModule:
         else:
             return list_.split(',')
 
-    def _list_flattened_items(self,
+    def _tabulate_flattened_items(self,
             item_set: ItemSet,
             filter_tags: list[str] | None = None,
             filter_extra_props: list[str] | None = None
-    ) -> list[dict[str, Any]]:
-        return [
-            self._flatten_item(
-                item,
-                self._all_tags(item_set),
-                self._all_extra_props(item_set),
-                filter_tags=filter_tags,
-                filter_extra_props=filter_extra_props
-            )
-            for item in item_set.values()
-        ]
+    ) -> list[list[Any]]:
+        """
+        Flatten the given item set into a table (a list[list[Any]]) with a
+        header row, then one row per item.
 
-    def _flatten_item(self,
-            item: Item,
-            all_tags: list[str] | None = None,
-            all_extra_props: list[str] | None = None,
-            filter_tags: list[str] | None = None,
-            filter_extra_props: list[str] | None = None
-    ) -> dict[str, Any]:
-        all_tags_computed: Iterable[str] = []
-        if all_tags is not None:
-            all_tags_computed = all_tags
-        elif 'tags' in item:
-            all_tags_computed = item['tags']
-
-        all_extra_props_computed: Iterable[str] = []
-        if all_extra_props is not None:
-            all_extra_props_computed = all_extra_props
-        else:
-            all_extra_props_computed = [
-                key
-                for key in item.keys()
-                if key not in ['ref', 'tags']
-            ]
+        There is one column for the item's ref, one for each tag (prefixed with
+        `:`), and one for each extra property (prefixed with `.`) of any item in
+        the item set, optionally filtered to the given tags and extra props.
 
-        return {
-            'ref': item['ref'],
-            **(
-                {
-                    f':{tag}': self._format_item_tag(item, tag)
-                    for tag in all_tags_computed
-                    if filter_tags is None or tag in filter_tags
-                }
-                if filter_tags is None or len(filter_tags) > 0
-                else {}
+        The column schema is computed once for the whole item set, then the
+        table is built one column at a time.
+        """
+
+        items = list(item_set.values())
+
+        tags = [
+            tag
+            for tag in self._all_tags(item_set)
+            if filter_tags is None or tag in filter_tags
+        ]
+        extra_props = [
+            prop
+            for prop in self._all_extra_props(item_set)
+            if filter_extra_props is None or prop in filter_extra_props
+        ]
+
+        headers = [
+            'ref',
+            *(f':{tag}' for tag in tags),
+            *(f'.{prop}' for prop in extra_props)
+        ]
+        columns = [
+            [item['ref'] for item in items],
+            *(
+                [self._format_item_tag(item, tag) for item in items]
+                for tag in tags
             ),
-            **(
-                {
-                    f'.{prop}': self._format_item_prop(item, prop)
-                    for prop in all_extra_props_computed
-                    if filter_extra_props is None or prop in filter_extra_props
-                }
-                if filter_extra_props is None or len(filter_extra_props) > 0
-                else {}
+            *(
+                [self._format_item_prop(item, prop) for item in items]
+                for prop in extra_props
             )
-        }
+        ]
+
+        return [headers, *(list(row) for row in zip(*columns))]
+
+    def _table_to_flattened_items(self,
+            table: list[list[Any]]
+    ) -> list[dict[str, Any]]:
+        """
+        Convert a table from `_tabulate_flattened_items()` into a list of
+        flattened items (one dict per row, keyed by the table's headers).
+        """
+
+        headers, *rows = table
+        return [dict(zip(headers, row)) for row in rows]
 
     def _format_item_tag(self, item, tag):
         if 'tags' in item and tag in item['tags']:
@@ -57,6 +57,7 @@ itemSet : ref SPACE setOpen itemSetSpec setClose ;
 itemSetSpec : ref                                     #itemSetSpec_ref
             | tag                                     #itemSetSpec_tag
             | setOpen itemSetSpec setClose            #itemSetSpec_group
+            | setComplementOperator itemSetSpec       #itemSetSpec_complement
             | itemSetSpec setItemOperator itemSetSpec #itemSetSpec_op
             ;
 ref : literalBlock | NAME | PATH ;
@@ -85,8 +86,9 @@ dataItemSeparator : SPACE? (
 setOpen : SET_OPEN comment? NEWLINE? SPACE? ;
 setClose : NEWLINE? SPACE? SET_CLOSE comment? ;
 setItemOperator : (comment? NEWLINE)?
-                  SPACE? SET_ITEM_OPERATOR
+                  SPACE? operator=(SET_ITEM_OPERATOR | SET_DIFFERENCE_OPERATOR)
                   (comment? NEWLINE)? SPACE? ;
+setComplementOperator : SET_COMPLEMENT_OPERATOR SPACE? ;
 
 comment : SPACE? COMMENT_OPEN commentContent ;
 commentContent : literalBlock | toEndOfLine ;
@@ -98,6 +100,7 @@ toEndOfItem : ~( NEWLINE
                | SPACE
                | DATA_ITEM_SEPARATOR
                | SET_ITEM_OPERATOR
+               | SET_DIFFERENCE_OPERATOR
                | DATA_CLOSE
                | SET_CLOSE
                )* ;
@@ -130,6 +133,10 @@ DATA_ITEM_SEPARATOR : ',' ;
 SET_OPEN : '[' ;
 SET_CLOSE : ']' ;
 SET_ITEM_OPERATOR : [&|] ;
+// A lone '-' (ie. not part of a NAME or PATH), as this is declared first. It is
+// never a name, ref, or part of a value, so is always the difference operator.
+SET_DIFFERENCE_OPERATOR : '-' ;
+SET_COMPLEMENT_OPERATOR : '!' ;
 
 KEY_VALUE_SEPARATOR : ':' ;
 
@@ -0,0 +1,109 @@
+# Generated from ./Manifest.g4 by ANTLR 4.13.2
+from antlr4 import *
+from io import StringIO
+import sys
+if sys.version_info[1] > 5:
+    from typing import TextIO
+else:
+    from typing.io import TextIO
+
+
+def serializedATN():
+    return [
+        4,0,19,109,6,-1,2,0,7,0,2,1,7,1,2,2,7,2,2,3,7,3,2,4,7,4,2,5,7,5,
+        2,6,7,6,2,7,7,7,2,8,7,8,2,9,7,9,2,10,7,10,2,11,7,11,2,12,7,12,2,
+        13,7,13,2,14,7,14,2,15,7,15,2,16,7,16,2,17,7,17,2,18,7,18,2,19,7,
+        19,2,20,7,20,2,21,7,21,2,22,7,22,1,0,1,0,1,1,4,1,51,8,1,11,1,12,
+        1,52,1,2,1,2,1,3,1,3,1,4,1,4,1,5,1,5,1,6,1,6,1,7,1,7,1,8,1,8,1,9,
+        1,9,1,10,1,10,1,11,1,11,1,12,1,12,1,13,1,13,1,14,1,14,1,15,1,15,
+        1,15,1,15,1,16,4,16,86,8,16,11,16,12,16,87,1,17,4,17,91,8,17,11,
+        17,12,17,92,1,18,1,18,1,19,3,19,98,8,19,1,19,1,19,3,19,102,8,19,
+        1,20,1,20,1,21,1,21,1,22,1,22,0,0,23,1,1,3,2,5,3,7,4,9,5,11,6,13,
+        7,15,8,17,9,19,10,21,11,23,12,25,13,27,14,29,15,31,16,33,17,35,18,
+        37,19,39,0,41,0,43,0,45,0,1,0,4,2,0,38,38,124,124,2,0,9,9,32,32,
+        5,0,45,45,48,57,65,90,95,95,97,122,5,0,39,39,45,57,65,90,95,95,97,
+        122,109,0,1,1,0,0,0,0,3,1,0,0,0,0,5,1,0,0,0,0,7,1,0,0,0,0,9,1,0,
+        0,0,0,11,1,0,0,0,0,13,1,0,0,0,0,15,1,0,0,0,0,17,1,0,0,0,0,19,1,0,
+        0,0,0,21,1,0,0,0,0,23,1,0,0,0,0,25,1,0,0,0,0,27,1,0,0,0,0,29,1,0,
+        0,0,0,31,1,0,0,0,0,33,1,0,0,0,0,35,1,0,0,0,0,37,1,0,0,0,1,47,1,0,
+        0,0,3,50,1,0,0,0,5,54,1,0,0,0,7,56,1,0,0,0,9,58,1,0,0,0,11,60,1,
+        0,0,0,13,62,1,0,0,0,15,64,1,0,0,0,17,66,1,0,0,0,19,68,1,0,0,0,21,
+        70,1,0,0,0,23,72,1,0,0,0,25,74,1,0,0,0,27,76,1,0,0,0,29,78,1,0,0,
+        0,31,80,1,0,0,0,33,85,1,0,0,0,35,90,1,0,0,0,37,94,1,0,0,0,39,101,
+        1,0,0,0,41,103,1,0,0,0,43,105,1,0,0,0,45,107,1,0,0,0,47,48,3,39,
+        19,0,48,2,1,0,0,0,49,51,3,41,20,0,50,49,1,0,0,0,51,52,1,0,0,0,52,
+        50,1,0,0,0,52,53,1,0,0,0,53,4,1,0,0,0,54,55,5,35,0,0,55,6,1,0,0,
+        0,56,57,5,64,0,0,57,8,1,0,0,0,58,59,5,123,0,0,59,10,1,0,0,0,60,61,
+        5,125,0,0,61,12,1,0,0,0,62,63,5,40,0,0,63,14,1,0,0,0,64,65,5,41,
+        0,0,65,16,1,0,0,0,66,67,5,44,0,0,67,18,1,0,0,0,68,69,5,91,0,0,69,
+        20,1,0,0,0,70,71,5,93,0,0,71,22,1,0,0,0,72,73,7,0,0,0,73,24,1,0,
+        0,0,74,75,5,45,0,0,75,26,1,0,0,0,76,77,5,33,0,0,77,28,1,0,0,0,78,
+        79,5,58,0,0,79,30,1,0,0,0,80,81,5,34,0,0,81,82,5,34,0,0,82,83,5,
+        34,0,0,83,32,1,0,0,0,84,86,3,43,21,0,85,84,1,0,0,0,86,87,1,0,0,0,
+        87,85,1,0,0,0,87,88,1,0,0,0,88,34,1,0,0,0,89,91,3,45,22,0,90,89,
+        1,0,0,0,91,92,1,0,0,0,92,90,1,0,0,0,92,93,1,0,0,0,93,36,1,0,0,0,
+        94,95,9,0,0,0,95,38,1,0,0,0,96,98,5,13,0,0,97,96,1,0,0,0,97,98,1,
+        0,0,0,98,99,1,0,0,0,99,102,5,10,0,0,100,102,5,13,0,0,101,97,1,0,
+        0,0,101,100,1,0,0,0,102,40,1,0,0,0,103,104,7,1,0,0,104,42,1,0,0,
+        0,105,106,7,2,0,0,106,44,1,0,0,0,107,108,7,3,0,0,108,46,1,0,0,0,
+        6,0,52,87,92,97,101,0
+    ]
+
+class ManifestLexer(Lexer):
+
+    atn = ATNDeserializer().deserialize(serializedATN())
+
+    decisionsToDFA = [ DFA(ds, i) for i, ds in enumerate(atn.decisionToState) ]
+
+    NEWLINE = 1
+    SPACE = 2
+    COMMENT_OPEN = 3
+    CONTEXT_OPEN = 4
+    BLOCK_OPEN = 5
+    BLOCK_CLOSE = 6
+    DATA_OPEN = 7
+    DATA_CLOSE = 8
+    DATA_ITEM_SEPARATOR = 9
+    SET_OPEN = 10
+    SET_CLOSE = 11
+    SET_ITEM_OPERATOR = 12
+    SET_DIFFERENCE_OPERATOR = 13
+    SET_COMPLEMENT_OPERATOR = 14
+    KEY_VALUE_SEPARATOR = 15
+    LITERAL_WRAPPER = 16
+    NAME = 17
+    PATH = 18
+    OTHER = 19
+
+    channelNames = [ u"DEFAULT_TOKEN_CHANNEL", u"HIDDEN" ]
+
+    modeNames = [ "DEFAULT_MODE" ]
+
+    literalNames = [ "<INVALID>",
+            "'#'", "'@'", "'{'", "'}'", "'('", "')'", "','", "'['", "']'", 
+            "'-'", "'!'", "':'", "'\"\"\"'" ]
+
+    symbolicNames = [ "<INVALID>",
+            "NEWLINE", "SPACE", "COMMENT_OPEN", "CONTEXT_OPEN", "BLOCK_OPEN", 
+            "BLOCK_CLOSE", "DATA_OPEN", "DATA_CLOSE", "DATA_ITEM_SEPARATOR", 
+            "SET_OPEN", "SET_CLOSE", "SET_ITEM_OPERATOR", "SET_DIFFERENCE_OPERATOR", 
+            "SET_COMPLEMENT_OPERATOR", "KEY_VALUE_SEPARATOR", "LITERAL_WRAPPER", 
+            "NAME", "PATH", "OTHER" ]
+
+    ruleNames = [ "NEWLINE", "SPACE", "COMMENT_OPEN", "CONTEXT_OPEN", "BLOCK_OPEN", 
+                  "BLOCK_CLOSE", "DATA_OPEN", "DATA_CLOSE", "DATA_ITEM_SEPARATOR", 
+                  "SET_OPEN", "SET_CLOSE", "SET_ITEM_OPERATOR", "SET_DIFFERENCE_OPERATOR", 
+                  "SET_COMPLEMENT_OPERATOR", "KEY_VALUE_SEPARATOR", "LITERAL_WRAPPER", 
+                  "NAME", "PATH", "OTHER", "NEWLINE_CHAR", "SPACE_CHAR", 
+                  "NAME_CHAR", "PATH_CHAR" ]
+
+    grammarFileName = "Manifest.g4"
+
+    def __init__(self, input=None, output:TextIO = sys.stdout):
+        super().__init__(input, output)
+        self.checkVersion("4.13.2")
+        self._interp = LexerATNSimulator(self, self.atn, self.decisionsToDFA, PredictionContextCache())
+        self._actions = None
+        self._predicates = None
+
+
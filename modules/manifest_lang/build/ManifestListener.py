@@ -0,0 +1,336 @@
+# Generated from ./Manifest.g4 by ANTLR 4.13.2
+from antlr4 import *
+if "." in __name__:
+    from .ManifestParser import ManifestParser
+else:
+    from ManifestParser import ManifestParser
+
+# This class defines a complete listener for a parse tree produced by ManifestParser.
+class ManifestListener(ParseTreeListener):
+
+    # Enter a parse tree produced by ManifestParser#manifest.
+    def enterManifest(self, ctx:ManifestParser.ManifestContext):
+        pass
+
+    # Exit a parse tree produced by ManifestParser#manifest.
+    def exitManifest(self, ctx:ManifestParser.ManifestContext):
+        pass
+
+
+    # Enter a parse tree produced by ManifestParser#explScopedContext.
+    def enterExplScopedContext(self, ctx:ManifestParser.ExplScopedContextContext):
+        pass
+
+    # Exit a parse tree produced by ManifestParser#explScopedContext.
+    def exitExplScopedContext(self, ctx:ManifestParser.ExplScopedContextContext):
+        pass
+
+
+    # Enter a parse tree produced by ManifestParser#implScopedContext.
+    def enterImplScopedContext(self, ctx:ManifestParser.ImplScopedContextContext):
+        pass
+
+    # Exit a parse tree produced by ManifestParser#implScopedContext.
+    def exitImplScopedContext(self, ctx:ManifestParser.ImplScopedContextContext):
+        pass
+
+
+    # Enter a parse tree produced by ManifestParser#contextHeader.
+    def enterContextHeader(self, ctx:ManifestParser.ContextHeaderContext):
+        pass
+
+    # Exit a parse tree produced by ManifestParser#contextHeader.
+    def exitContextHeader(self, ctx:ManifestParser.ContextHeaderContext):
+        pass
+
+
+    # Enter a parse tree produced by ManifestParser#contextOpt.
+    def enterContextOpt(self, ctx:ManifestParser.ContextOptContext):
+        pass
+
+    # Exit a parse tree produced by ManifestParser#contextOpt.
+    def exitContextOpt(self, ctx:ManifestParser.ContextOptContext):
+        pass
+
+
+    # Enter a parse tree produced by ManifestParser#declaration.
+    def enterDeclaration(self, ctx:ManifestParser.DeclarationContext):
+        pass
+
+    # Exit a parse tree produced by ManifestParser#declaration.
+    def exitDeclaration(self, ctx:ManifestParser.DeclarationContext):
+        pass
+
+
+    # Enter a parse tree produced by ManifestParser#tagDecl.
+    def enterTagDecl(self, ctx:ManifestParser.TagDeclContext):
+        pass
+
+    # Exit a parse tree produced by ManifestParser#tagDecl.
+    def exitTagDecl(self, ctx:ManifestParser.TagDeclContext):
+        pass
+
+
+    # Enter a parse tree produced by ManifestParser#item.
+    def enterItem(self, ctx:ManifestParser.ItemContext):
+        pass
+
+    # Exit a parse tree produced by ManifestParser#item.
+    def exitItem(self, ctx:ManifestParser.ItemContext):
+        pass
+
+
+    # Enter a parse tree produced by ManifestParser#itemSet.
+    def enterItemSet(self, ctx:ManifestParser.ItemSetContext):
+        pass
+
+    # Exit a parse tree produced by ManifestParser#itemSet.
+    def exitItemSet(self, ctx:ManifestParser.ItemSetContext):
+        pass
+
+
+    # Enter a parse tree produced by ManifestParser#itemSetSpec_op.
+    def enterItemSetSpec_op(self, ctx:ManifestParser.ItemSetSpec_opContext):
+        pass
+
+    # Exit a parse tree produced by ManifestParser#itemSetSpec_op.
+    def exitItemSetSpec_op(self, ctx:ManifestParser.ItemSetSpec_opContext):
+        pass
+
+
+    # Enter a parse tree produced by ManifestParser#itemSetSpec_ref.
+    def enterItemSetSpec_ref(self, ctx:ManifestParser.ItemSetSpec_refContext):
+        pass
+
+    # Exit a parse tree produced by ManifestParser#itemSetSpec_ref.
+    def exitItemSetSpec_ref(self, ctx:ManifestParser.ItemSetSpec_refContext):
+        pass
+
+
+    # Enter a parse tree produced by ManifestParser#itemSetSpec_group.
+    def enterItemSetSpec_group(self, ctx:ManifestParser.ItemSetSpec_groupContext):
+        pass
+
+    # Exit a parse tree produced by ManifestParser#itemSetSpec_group.
+    def exitItemSetSpec_group(self, ctx:ManifestParser.ItemSetSpec_groupContext):
+        pass
+
+
+    # Enter a parse tree produced by ManifestParser#itemSetSpec_complement.
+    def enterItemSetSpec_complement(self, ctx:ManifestParser.ItemSetSpec_complementContext):
+        pass
+
+    # Exit a parse tree produced by ManifestParser#itemSetSpec_complement.
+    def exitItemSetSpec_complement(self, ctx:ManifestParser.ItemSetSpec_complementContext):
+        pass
+
+
+    # Enter a parse tree produced by ManifestParser#itemSetSpec_tag.
+    def enterItemSetSpec_tag(self, ctx:ManifestParser.ItemSetSpec_tagContext):
+        pass
+
+    # Exit a parse tree produced by ManifestParser#itemSetSpec_tag.
+    def exitItemSetSpec_tag(self, ctx:ManifestParser.ItemSetSpec_tagContext):
+        pass
+
+
+    # Enter a parse tree produced by ManifestParser#ref.
+    def enterRef(self, ctx:ManifestParser.RefContext):
+        pass
+
+    # Exit a parse tree produced by ManifestParser#ref.
+    def exitRef(self, ctx:ManifestParser.RefContext):
+        pass
+
+
+    # Enter a parse tree produced by ManifestParser#tag.
+    def enterTag(self, ctx:ManifestParser.TagContext):
+        pass
+
+    # Exit a parse tree produced by ManifestParser#tag.
+    def exitTag(self, ctx:ManifestParser.TagContext):
+        pass
+
+
+    # Enter a parse tree produced by ManifestParser#kvPair.
+    def enterKvPair(self, ctx:ManifestParser.KvPairContext):
+        pass
+
+    # Exit a parse tree produced by ManifestParser#kvPair.
+    def exitKvPair(self, ctx:ManifestParser.KvPairContext):
+        pass
+
+
+    # Enter a parse tree produced by ManifestParser#name.
+    def enterName(self, ctx:ManifestParser.NameContext):
+        pass
+
+    # Exit a parse tree produced by ManifestParser#name.
+    def exitName(self, ctx:ManifestParser.NameContext):
+        pass
+
+
+    # Enter a parse tree produced by ManifestParser#value.
+    def enterValue(self, ctx:ManifestParser.ValueContext):
+        pass
+
+    # Exit a parse tree produced by ManifestParser#value.
+    def exitValue(self, ctx:ManifestParser.ValueContext):
+        pass
+
+
+    # Enter a parse tree produced by ManifestParser#kvSeparator.
+    def enterKvSeparator(self, ctx:ManifestParser.KvSeparatorContext):
+        pass
+
+    # Exit a parse tree produced by ManifestParser#kvSeparator.
+    def exitKvSeparator(self, ctx:ManifestParser.KvSeparatorContext):
+        pass
+
+
+    # Enter a parse tree produced by ManifestParser#blockOpen.
+    def enterBlockOpen(self, ctx:ManifestParser.BlockOpenContext):
+        pass
+
+    # Exit a parse tree produced by ManifestParser#blockOpen.
+    def exitBlockOpen(self, ctx:ManifestParser.BlockOpenContext):
+        pass
+
+
+    # Enter a parse tree produced by ManifestParser#blockClose.
+    def enterBlockClose(self, ctx:ManifestParser.BlockCloseContext):
+        pass
+
+    # Exit a parse tree produced by ManifestParser#blockClose.
+    def exitBlockClose(self, ctx:ManifestParser.BlockCloseContext):
+        pass
+
+
+    # Enter a parse tree produced by ManifestParser#blockItemSeparator.
+    def enterBlockItemSeparator(self, ctx:ManifestParser.BlockItemSeparatorContext):
+        pass
+
+    # Exit a parse tree produced by ManifestParser#blockItemSeparator.
+    def exitBlockItemSeparator(self, ctx:ManifestParser.BlockItemSeparatorContext):
+        pass
+
+
+    # Enter a parse tree produced by ManifestParser#dataOpen.
+    def enterDataOpen(self, ctx:ManifestParser.DataOpenContext):
+        pass
+
+    # Exit a parse tree produced by ManifestParser#dataOpen.
+    def exitDataOpen(self, ctx:ManifestParser.DataOpenContext):
+        pass
+
+
+    # Enter a parse tree produced by ManifestParser#dataClose.
+    def enterDataClose(self, ctx:ManifestParser.DataCloseContext):
+        pass
+
+    # Exit a parse tree produced by ManifestParser#dataClose.
+    def exitDataClose(self, ctx:ManifestParser.DataCloseContext):
+        pass
+
+
+    # Enter a parse tree produced by ManifestParser#dataItemSeparator.
+    def enterDataItemSeparator(self, ctx:ManifestParser.DataItemSeparatorContext):
+        pass
+
+    # Exit a parse tree produced by ManifestParser#dataItemSeparator.
+    def exitDataItemSeparator(self, ctx:ManifestParser.DataItemSeparatorContext):
+        pass
+
+
+    # Enter a parse tree produced by ManifestParser#setOpen.
+    def enterSetOpen(self, ctx:ManifestParser.SetOpenContext):
+        pass
+
+    # Exit a parse tree produced by ManifestParser#setOpen.
+    def exitSetOpen(self, ctx:ManifestParser.SetOpenContext):
+        pass
+
+
+    # Enter a parse tree produced by ManifestParser#setClose.
+    def enterSetClose(self, ctx:ManifestParser.SetCloseContext):
+        pass
+
+    # Exit a parse tree produced by ManifestParser#setClose.
+    def exitSetClose(self, ctx:ManifestParser.SetCloseContext):
+        pass
+
+
+    # Enter a parse tree produced by ManifestParser#setItemOperator.
+    def enterSetItemOperator(self, ctx:ManifestParser.SetItemOperatorContext):
+        pass
+
+    # Exit a parse tree produced by ManifestParser#setItemOperator.
+    def exitSetItemOperator(self, ctx:ManifestParser.SetItemOperatorContext):
+        pass
+
+
+    # Enter a parse tree produced by ManifestParser#setComplementOperator.
+    def enterSetComplementOperator(self, ctx:ManifestParser.SetComplementOperatorContext):
+        pass
+
+    # Exit a parse tree produced by ManifestParser#setComplementOperator.
+    def exitSetComplementOperator(self, ctx:ManifestParser.SetComplementOperatorContext):
+        pass
+
+
+    # Enter a parse tree produced by ManifestParser#comment.
+    def enterComment(self, ctx:ManifestParser.CommentContext):
+        pass
+
+    # Exit a parse tree produced by ManifestParser#comment.
+    def exitComment(self, ctx:ManifestParser.CommentContext):
+        pass
+
+
+    # Enter a parse tree produced by ManifestParser#commentContent.
+    def enterCommentContent(self, ctx:ManifestParser.CommentContentContext):
+        pass
+
+    # Exit a parse tree produced by ManifestParser#commentContent.
+    def exitCommentContent(self, ctx:ManifestParser.CommentContentContext):
+        pass
+
+
+    # Enter a parse tree produced by ManifestParser#toEndOfItem.
+    def enterToEndOfItem(self, ctx:ManifestParser.ToEndOfItemContext):
+        pass
+
+    # Exit a parse tree produced by ManifestParser#toEndOfItem.
+    def exitToEndOfItem(self, ctx:ManifestParser.ToEndOfItemContext):
+        pass
+
+
+    # Enter a parse tree produced by ManifestParser#toEndOfLine.
+    def enterToEndOfLine(self, ctx:ManifestParser.ToEndOfLineContext):
+        pass
+
+    # Exit a parse tree produced by ManifestParser#toEndOfLine.
+    def exitToEndOfLine(self, ctx:ManifestParser.ToEndOfLineContext):
+        pass
+
+
+    # Enter a parse tree produced by ManifestParser#literalBlock.
+    def enterLiteralBlock(self, ctx:ManifestParser.LiteralBlockContext):
+        pass
+
+    # Exit a parse tree produced by ManifestParser#literalBlock.
+    def exitLiteralBlock(self, ctx:ManifestParser.LiteralBlockContext):
+        pass
+
+
+    # Enter a parse tree produced by ManifestParser#literal.
+    def enterLiteral(self, ctx:ManifestParser.LiteralContext):
+        pass
+
+    # Exit a parse tree produced by ManifestParser#literal.
+    def exitLiteral(self, ctx:ManifestParser.LiteralContext):
+        pass
+
+
+
+del ManifestParser
\ No newline at end of file
@@ -0,0 +1,3101 @@
+# Generated from ./Manifest.g4 by ANTLR 4.13.2
+# encoding: utf-8
+from antlr4 import *
+from io import StringIO
+import sys
+if sys.version_info[1] > 5:
+	from typing import TextIO
+else:
+	from typing.io import TextIO
+
+def serializedATN():
+    return [
+        4,1,19,448,2,0,7,0,2,1,7,1,2,2,7,2,2,3,7,3,2,4,7,4,2,5,7,5,2,6,7,
+        6,2,7,7,7,2,8,7,8,2,9,7,9,2,10,7,10,2,11,7,11,2,12,7,12,2,13,7,13,
+        2,14,7,14,2,15,7,15,2,16,7,16,2,17,7,17,2,18,7,18,2,19,7,19,2,20,
+        7,20,2,21,7,21,2,22,7,22,2,23,7,23,2,24,7,24,2,25,7,25,2,26,7,26,
+        2,27,7,27,2,28,7,28,2,29,7,29,2,30,7,30,2,31,7,31,1,0,1,0,1,0,1,
+        0,3,0,69,8,0,1,0,4,0,72,8,0,11,0,12,0,73,1,0,3,0,77,8,0,5,0,79,8,
+        0,10,0,12,0,82,9,0,1,1,1,1,3,1,86,8,1,1,1,1,1,5,1,90,8,1,10,1,12,
+        1,93,9,1,1,1,3,1,96,8,1,1,1,1,1,3,1,100,8,1,1,1,5,1,103,8,1,10,1,
+        12,1,106,9,1,1,1,3,1,109,8,1,1,1,1,1,4,1,113,8,1,11,1,12,1,114,1,
+        1,1,1,4,1,119,8,1,11,1,12,1,120,5,1,123,8,1,10,1,12,1,126,9,1,1,
+        1,1,1,1,2,1,2,3,2,132,8,2,1,2,1,2,3,2,136,8,2,1,2,1,2,1,2,1,2,3,
+        2,142,8,2,1,2,1,2,3,2,146,8,2,1,2,1,2,1,2,1,2,1,2,1,2,5,2,154,8,
+        2,10,2,12,2,157,9,2,1,3,1,3,1,3,3,3,162,8,3,1,3,1,3,1,3,1,3,3,3,
+        168,8,3,5,3,170,8,3,10,3,12,3,173,9,3,1,3,1,3,1,3,1,3,1,3,3,3,180,
+        8,3,5,3,182,8,3,10,3,12,3,185,9,3,1,3,1,3,5,3,189,8,3,10,3,12,3,
+        192,9,3,1,3,1,3,3,3,196,8,3,1,3,5,3,199,8,3,10,3,12,3,202,9,3,1,
+        3,1,3,3,3,206,8,3,1,4,1,4,3,4,210,8,4,1,5,1,5,1,5,3,5,215,8,5,1,
+        5,3,5,218,8,5,1,6,1,6,1,6,1,6,1,6,1,6,1,6,1,6,5,6,228,8,6,10,6,12,
+        6,231,9,6,1,6,1,6,3,6,235,8,6,1,7,1,7,1,7,1,7,1,7,1,7,1,7,5,7,244,
+        8,7,10,7,12,7,247,9,7,1,7,1,7,3,7,251,8,7,1,8,1,8,1,8,1,8,1,8,1,
+        8,1,9,1,9,1,9,1,9,1,9,1,9,1,9,1,9,1,9,1,9,3,9,269,8,9,1,9,1,9,1,
+        9,1,9,5,9,275,8,9,10,9,12,9,278,9,9,1,10,1,10,1,10,3,10,283,8,10,
+        1,11,1,11,1,12,1,12,1,12,1,12,3,12,291,8,12,1,13,1,13,3,13,295,8,
+        13,1,14,1,14,3,14,299,8,14,1,15,3,15,302,8,15,1,15,1,15,3,15,306,
+        8,15,1,16,1,16,3,16,310,8,16,1,16,3,16,313,8,16,1,16,3,16,316,8,
+        16,1,17,3,17,319,8,17,1,17,3,17,322,8,17,1,17,1,17,3,17,326,8,17,
+        1,18,3,18,329,8,18,1,18,1,18,3,18,333,8,18,1,19,1,19,3,19,337,8,
+        19,1,19,3,19,340,8,19,1,19,3,19,343,8,19,1,20,3,20,346,8,20,1,20,
+        3,20,349,8,20,1,20,1,20,3,20,353,8,20,1,21,3,21,356,8,21,1,21,1,
+        21,3,21,360,8,21,1,21,1,21,1,21,3,21,365,8,21,1,21,3,21,368,8,21,
+        1,21,3,21,371,8,21,1,22,1,22,3,22,375,8,22,1,22,3,22,378,8,22,1,
+        22,3,22,381,8,22,1,23,3,23,384,8,23,1,23,3,23,387,8,23,1,23,1,23,
+        3,23,391,8,23,1,24,3,24,394,8,24,1,24,3,24,397,8,24,1,24,3,24,400,
+        8,24,1,24,1,24,3,24,404,8,24,1,24,3,24,407,8,24,1,24,3,24,410,8,
+        24,1,25,1,25,3,25,414,8,25,1,26,3,26,417,8,26,1,26,1,26,1,26,1,27,
+        1,27,3,27,424,8,27,1,28,5,28,427,8,28,10,28,12,28,430,9,28,1,29,
+        5,29,433,8,29,10,29,12,29,436,9,29,1,30,1,30,1,30,1,30,1,31,5,31,
+        443,8,31,10,31,12,31,446,9,31,1,31,0,1,18,32,0,2,4,6,8,10,12,14,
+        16,18,20,22,24,26,28,30,32,34,36,38,40,42,44,46,48,50,52,54,56,58,
+        60,62,0,4,1,0,12,13,3,0,1,2,8,9,11,13,1,0,1,1,1,0,16,16,506,0,80,
+        1,0,0,0,2,83,1,0,0,0,4,129,1,0,0,0,6,158,1,0,0,0,8,207,1,0,0,0,10,
+        214,1,0,0,0,12,219,1,0,0,0,14,236,1,0,0,0,16,252,1,0,0,0,18,268,
+        1,0,0,0,20,282,1,0,0,0,22,284,1,0,0,0,24,286,1,0,0,0,26,294,1,0,
+        0,0,28,298,1,0,0,0,30,301,1,0,0,0,32,307,1,0,0,0,34,318,1,0,0,0,
+        36,328,1,0,0,0,38,334,1,0,0,0,40,345,1,0,0,0,42,355,1,0,0,0,44,372,
+        1,0,0,0,46,383,1,0,0,0,48,396,1,0,0,0,50,411,1,0,0,0,52,416,1,0,
+        0,0,54,423,1,0,0,0,56,428,1,0,0,0,58,434,1,0,0,0,60,437,1,0,0,0,
+        62,444,1,0,0,0,64,69,3,2,1,0,65,69,3,4,2,0,66,69,3,10,5,0,67,69,
+        3,52,26,0,68,64,1,0,0,0,68,65,1,0,0,0,68,66,1,0,0,0,68,67,1,0,0,
+        0,69,76,1,0,0,0,70,72,5,1,0,0,71,70,1,0,0,0,72,73,1,0,0,0,73,71,
+        1,0,0,0,73,74,1,0,0,0,74,77,1,0,0,0,75,77,5,0,0,1,76,71,1,0,0,0,
+        76,75,1,0,0,0,77,79,1,0,0,0,78,68,1,0,0,0,79,82,1,0,0,0,80,78,1,
+        0,0,0,80,81,1,0,0,0,81,1,1,0,0,0,82,80,1,0,0,0,83,85,3,6,3,0,84,
+        86,5,2,0,0,85,84,1,0,0,0,85,86,1,0,0,0,86,87,1,0,0,0,87,91,3,32,
+        16,0,88,90,5,1,0,0,89,88,1,0,0,0,90,93,1,0,0,0,91,89,1,0,0,0,91,
+        92,1,0,0,0,92,124,1,0,0,0,93,91,1,0,0,0,94,96,5,2,0,0,95,94,1,0,
+        0,0,95,96,1,0,0,0,96,99,1,0,0,0,97,100,3,2,1,0,98,100,3,4,2,0,99,
+        97,1,0,0,0,99,98,1,0,0,0,100,104,1,0,0,0,101,103,5,1,0,0,102,101,
+        1,0,0,0,103,106,1,0,0,0,104,102,1,0,0,0,104,105,1,0,0,0,105,123,
+        1,0,0,0,106,104,1,0,0,0,107,109,5,2,0,0,108,107,1,0,0,0,108,109,
+        1,0,0,0,109,110,1,0,0,0,110,112,3,10,5,0,111,113,5,1,0,0,112,111,
+        1,0,0,0,113,114,1,0,0,0,114,112,1,0,0,0,114,115,1,0,0,0,115,123,
+        1,0,0,0,116,118,3,52,26,0,117,119,5,1,0,0,118,117,1,0,0,0,119,120,
+        1,0,0,0,120,118,1,0,0,0,120,121,1,0,0,0,121,123,1,0,0,0,122,95,1,
+        0,0,0,122,108,1,0,0,0,122,116,1,0,0,0,123,126,1,0,0,0,124,122,1,
+        0,0,0,124,125,1,0,0,0,125,127,1,0,0,0,126,124,1,0,0,0,127,128,3,
+        34,17,0,128,3,1,0,0,0,129,131,3,6,3,0,130,132,3,52,26,0,131,130,
+        1,0,0,0,131,132,1,0,0,0,132,133,1,0,0,0,133,155,5,1,0,0,134,136,
+        5,2,0,0,135,134,1,0,0,0,135,136,1,0,0,0,136,137,1,0,0,0,137,138,
+        3,2,1,0,138,139,5,1,0,0,139,154,1,0,0,0,140,142,5,2,0,0,141,140,
+        1,0,0,0,141,142,1,0,0,0,142,143,1,0,0,0,143,154,3,4,2,0,144,146,
+        5,2,0,0,145,144,1,0,0,0,145,146,1,0,0,0,146,147,1,0,0,0,147,148,
+        3,10,5,0,148,149,5,1,0,0,149,154,1,0,0,0,150,151,3,52,26,0,151,152,
+        5,1,0,0,152,154,1,0,0,0,153,135,1,0,0,0,153,141,1,0,0,0,153,145,
+        1,0,0,0,153,150,1,0,0,0,154,157,1,0,0,0,155,153,1,0,0,0,155,156,
+        1,0,0,0,156,5,1,0,0,0,157,155,1,0,0,0,158,159,5,4,0,0,159,205,5,
+        17,0,0,160,162,5,2,0,0,161,160,1,0,0,0,161,162,1,0,0,0,162,163,1,
+        0,0,0,163,171,3,38,19,0,164,165,3,52,26,0,165,167,5,1,0,0,166,168,
+        5,2,0,0,167,166,1,0,0,0,167,168,1,0,0,0,168,170,1,0,0,0,169,164,
+        1,0,0,0,170,173,1,0,0,0,171,169,1,0,0,0,171,172,1,0,0,0,172,174,
+        1,0,0,0,173,171,1,0,0,0,174,190,3,8,4,0,175,183,3,42,21,0,176,177,
+        3,52,26,0,177,179,5,1,0,0,178,180,5,2,0,0,179,178,1,0,0,0,179,180,
+        1,0,0,0,180,182,1,0,0,0,181,176,1,0,0,0,182,185,1,0,0,0,183,181,
+        1,0,0,0,183,184,1,0,0,0,184,186,1,0,0,0,185,183,1,0,0,0,186,187,
+        3,8,4,0,187,189,1,0,0,0,188,175,1,0,0,0,189,192,1,0,0,0,190,188,
+        1,0,0,0,190,191,1,0,0,0,191,200,1,0,0,0,192,190,1,0,0,0,193,195,
+        5,1,0,0,194,196,5,2,0,0,195,194,1,0,0,0,195,196,1,0,0,0,196,197,
+        1,0,0,0,197,199,3,52,26,0,198,193,1,0,0,0,199,202,1,0,0,0,200,198,
+        1,0,0,0,200,201,1,0,0,0,201,203,1,0,0,0,202,200,1,0,0,0,203,204,
+        3,40,20,0,204,206,1,0,0,0,205,161,1,0,0,0,205,206,1,0,0,0,206,7,
+        1,0,0,0,207,209,3,24,12,0,208,210,3,52,26,0,209,208,1,0,0,0,209,
+        210,1,0,0,0,210,9,1,0,0,0,211,215,3,12,6,0,212,215,3,14,7,0,213,
+        215,3,16,8,0,214,211,1,0,0,0,214,212,1,0,0,0,214,213,1,0,0,0,215,
+        217,1,0,0,0,216,218,3,52,26,0,217,216,1,0,0,0,217,218,1,0,0,0,218,
+        11,1,0,0,0,219,220,5,15,0,0,220,234,3,20,10,0,221,222,5,2,0,0,222,
+        223,3,38,19,0,223,229,3,22,11,0,224,225,3,42,21,0,225,226,3,22,11,
+        0,226,228,1,0,0,0,227,224,1,0,0,0,228,231,1,0,0,0,229,227,1,0,0,
+        0,229,230,1,0,0,0,230,232,1,0,0,0,231,229,1,0,0,0,232,233,3,40,20,
+        0,233,235,1,0,0,0,234,221,1,0,0,0,234,235,1,0,0,0,235,13,1,0,0,0,
+        236,250,3,20,10,0,237,238,5,2,0,0,238,239,3,38,19,0,239,245,3,22,
+        11,0,240,241,3,42,21,0,241,242,3,22,11,0,242,244,1,0,0,0,243,240,
+        1,0,0,0,244,247,1,0,0,0,245,243,1,0,0,0,245,246,1,0,0,0,246,248,
+        1,0,0,0,247,245,1,0,0,0,248,249,3,40,20,0,249,251,1,0,0,0,250,237,
+        1,0,0,0,250,251,1,0,0,0,251,15,1,0,0,0,252,253,3,20,10,0,253,254,
+        5,2,0,0,254,255,3,44,22,0,255,256,3,18,9,0,256,257,3,46,23,0,257,
+        17,1,0,0,0,258,259,6,9,-1,0,259,269,3,20,10,0,260,269,3,22,11,0,
+        261,262,3,44,22,0,262,263,3,18,9,0,263,264,3,46,23,0,264,269,1,0,
+        0,0,265,266,3,50,25,0,266,267,3,18,9,2,267,269,1,0,0,0,268,258,1,
+        0,0,0,268,260,1,0,0,0,268,261,1,0,0,0,268,265,1,0,0,0,269,276,1,
+        0,0,0,270,271,10,1,0,0,271,272,3,48,24,0,272,273,3,18,9,2,273,275,
+        1,0,0,0,274,270,1,0,0,0,275,278,1,0,0,0,276,274,1,0,0,0,276,277,
+        1,0,0,0,277,19,1,0,0,0,278,276,1,0,0,0,279,283,3,60,30,0,280,283,
+        5,17,0,0,281,283,5,18,0,0,282,279,1,0,0,0,282,280,1,0,0,0,282,281,
+        1,0,0,0,283,21,1,0,0,0,284,285,3,24,12,0,285,23,1,0,0,0,286,290,
+        3,26,13,0,287,288,3,30,15,0,288,289,3,28,14,0,289,291,1,0,0,0,290,
+        287,1,0,0,0,290,291,1,0,0,0,291,25,1,0,0,0,292,295,3,60,30,0,293,
+        295,5,17,0,0,294,292,1,0,0,0,294,293,1,0,0,0,295,27,1,0,0,0,296,
+        299,3,60,30,0,297,299,3,56,28,0,298,296,1,0,0,0,298,297,1,0,0,0,
+        299,29,1,0,0,0,300,302,5,2,0,0,301,300,1,0,0,0,301,302,1,0,0,0,302,
+        303,1,0,0,0,303,305,5,15,0,0,304,306,5,2,0,0,305,304,1,0,0,0,305,
+        306,1,0,0,0,306,31,1,0,0,0,307,309,5,5,0,0,308,310,3,52,26,0,309,
+        308,1,0,0,0,309,310,1,0,0,0,310,312,1,0,0,0,311,313,5,1,0,0,312,
+        311,1,0,0,0,312,313,1,0,0,0,313,315,1,0,0,0,314,316,5,2,0,0,315,
+        314,1,0,0,0,315,316,1,0,0,0,316,33,1,0,0,0,317,319,5,1,0,0,318,317,
+        1,0,0,0,318,319,1,0,0,0,319,321,1,0,0,0,320,322,5,2,0,0,321,320,
+        1,0,0,0,321,322,1,0,0,0,322,323,1,0,0,0,323,325,5,6,0,0,324,326,
+        3,52,26,0,325,324,1,0,0,0,325,326,1,0,0,0,326,35,1,0,0,0,327,329,
+        3,52,26,0,328,327,1,0,0,0,328,329,1,0,0,0,329,330,1,0,0,0,330,332,
+        5,1,0,0,331,333,5,2,0,0,332,331,1,0,0,0,332,333,1,0,0,0,333,37,1,
+        0,0,0,334,336,5,7,0,0,335,337,3,52,26,0,336,335,1,0,0,0,336,337,
+        1,0,0,0,337,339,1,0,0,0,338,340,5,1,0,0,339,338,1,0,0,0,339,340,
+        1,0,0,0,340,342,1,0,0,0,341,343,5,2,0,0,342,341,1,0,0,0,342,343,
+        1,0,0,0,343,39,1,0,0,0,344,346,5,1,0,0,345,344,1,0,0,0,345,346,1,
+        0,0,0,346,348,1,0,0,0,347,349,5,2,0,0,348,347,1,0,0,0,348,349,1,
+        0,0,0,349,350,1,0,0,0,350,352,5,8,0,0,351,353,3,52,26,0,352,351,
+        1,0,0,0,352,353,1,0,0,0,353,41,1,0,0,0,354,356,5,2,0,0,355,354,1,
+        0,0,0,355,356,1,0,0,0,356,367,1,0,0,0,357,368,5,9,0,0,358,360,3,
+        52,26,0,359,358,1,0,0,0,359,360,1,0,0,0,360,361,1,0,0,0,361,368,
+        5,1,0,0,362,364,5,9,0,0,363,365,3,52,26,0,364,363,1,0,0,0,364,365,
+        1,0,0,0,365,366,1,0,0,0,366,368,5,1,0,0,367,357,1,0,0,0,367,359,
+        1,0,0,0,367,362,1,0,0,0,368,370,1,0,0,0,369,371,5,2,0,0,370,369,
+        1,0,0,0,370,371,1,0,0,0,371,43,1,0,0,0,372,374,5,10,0,0,373,375,
+        3,52,26,0,374,373,1,0,0,0,374,375,1,0,0,0,375,377,1,0,0,0,376,378,
+        5,1,0,0,377,376,1,0,0,0,377,378,1,0,0,0,378,380,1,0,0,0,379,381,
+        5,2,0,0,380,379,1,0,0,0,380,381,1,0,0,0,381,45,1,0,0,0,382,384,5,
+        1,0,0,383,382,1,0,0,0,383,384,1,0,0,0,384,386,1,0,0,0,385,387,5,
+        2,0,0,386,385,1,0,0,0,386,387,1,0,0,0,387,388,1,0,0,0,388,390,5,
+        11,0,0,389,391,3,52,26,0,390,389,1,0,0,0,390,391,1,0,0,0,391,47,
+        1,0,0,0,392,394,3,52,26,0,393,392,1,0,0,0,393,394,1,0,0,0,394,395,
+        1,0,0,0,395,397,5,1,0,0,396,393,1,0,0,0,396,397,1,0,0,0,397,399,
+        1,0,0,0,398,400,5,2,0,0,399,398,1,0,0,0,399,400,1,0,0,0,400,401,
+        1,0,0,0,401,406,7,0,0,0,402,404,3,52,26,0,403,402,1,0,0,0,403,404,
+        1,0,0,0,404,405,1,0,0,0,405,407,5,1,0,0,406,403,1,0,0,0,406,407,
+        1,0,0,0,407,409,1,0,0,0,408,410,5,2,0,0,409,408,1,0,0,0,409,410,
+        1,0,0,0,410,49,1,0,0,0,411,413,5,14,0,0,412,414,5,2,0,0,413,412,
+        1,0,0,0,413,414,1,0,0,0,414,51,1,0,0,0,415,417,5,2,0,0,416,415,1,
+        0,0,0,416,417,1,0,0,0,417,418,1,0,0,0,418,419,5,3,0,0,419,420,3,
+        54,27,0,420,53,1,0,0,0,421,424,3,60,30,0,422,424,3,58,29,0,423,421,
+        1,0,0,0,423,422,1,0,0,0,424,55,1,0,0,0,425,427,8,1,0,0,426,425,1,
+        0,0,0,427,430,1,0,0,0,428,426,1,0,0,0,428,429,1,0,0,0,429,57,1,0,
+        0,0,430,428,1,0,0,0,431,433,8,2,0,0,432,431,1,0,0,0,433,436,1,0,
+        0,0,434,432,1,0,0,0,434,435,1,0,0,0,435,59,1,0,0,0,436,434,1,0,0,
+        0,437,438,5,16,0,0,438,439,3,62,31,0,439,440,5,16,0,0,440,61,1,0,
+        0,0,441,443,8,3,0,0,442,441,1,0,0,0,443,446,1,0,0,0,444,442,1,0,
+        0,0,444,445,1,0,0,0,445,63,1,0,0,0,446,444,1,0,0,0,81,68,73,76,80,
+        85,91,95,99,104,108,114,120,122,124,131,135,141,145,153,155,161,
+        167,171,179,183,190,195,200,205,209,214,217,229,234,245,250,268,
+        276,282,290,294,298,301,305,309,312,315,318,321,325,328,332,336,
+        339,342,345,348,352,355,359,364,367,370,374,377,380,383,386,390,
+        393,396,399,403,406,409,413,416,423,428,434,444
+    ]
+
+class ManifestParser ( Parser ):
+
+    grammarFileName = "Manifest.g4"
+
+    atn = ATNDeserializer().deserialize(serializedATN())
+
+    decisionsToDFA = [ DFA(ds, i) for i, ds in enumerate(atn.decisionToState) ]
+
+    sharedContextCache = PredictionContextCache()
+
+    literalNames = [ "<INVALID>", "<INVALID>", "<INVALID>", "'#'", "'@'", 
+                     "'{'", "'}'", "'('", "')'", "','", "'['", "']'", "<INVALID>", 
+                     "'-'", "'!'", "':'", "'\"\"\"'" ]
+
+    symbolicNames = [ "<INVALID>", "NEWLINE", "SPACE", "COMMENT_OPEN", "CONTEXT_OPEN", 
+                      "BLOCK_OPEN", "BLOCK_CLOSE", "DATA_OPEN", "DATA_CLOSE", 
+                      "DATA_ITEM_SEPARATOR", "SET_OPEN", "SET_CLOSE", "SET_ITEM_OPERATOR", 
+                      "SET_DIFFERENCE_OPERATOR", "SET_COMPLEMENT_OPERATOR", 
+                      "KEY_VALUE_SEPARATOR", "LITERAL_WRAPPER", "NAME", 
+                      "PATH", "OTHER" ]
+
+    RULE_manifest = 0
+    RULE_explScopedContext = 1
+    RULE_implScopedContext = 2
+    RULE_contextHeader = 3
+    RULE_contextOpt = 4
+    RULE_declaration = 5
+    RULE_tagDecl = 6
+    RULE_item = 7
+    RULE_itemSet = 8
+    RULE_itemSetSpec = 9
+    RULE_ref = 10
+    RULE_tag = 11
+    RULE_kvPair = 12
+    RULE_name = 13
+    RULE_value = 14
+    RULE_kvSeparator = 15
+    RULE_blockOpen = 16
+    RULE_blockClose = 17
+    RULE_blockItemSeparator = 18
+    RULE_dataOpen = 19
+    RULE_dataClose = 20
+    RULE_dataItemSeparator = 21
+    RULE_setOpen = 22
+    RULE_setClose = 23
+    RULE_setItemOperator = 24
+    RULE_setComplementOperator = 25
+    RULE_comment = 26
+    RULE_commentContent = 27
+    RULE_toEndOfItem = 28
+    RULE_toEndOfLine = 29
+    RULE_literalBlock = 30
+    RULE_literal = 31
+
+    ruleNames =  [ "manifest", "explScopedContext", "implScopedContext", 
+                   "contextHeader", "contextOpt", "declaration", "tagDecl", 
+                   "item", "itemSet", "itemSetSpec", "ref", "tag", "kvPair", 
+                   "name", "value", "kvSeparator", "blockOpen", "blockClose", 
+                   "blockItemSeparator", "dataOpen", "dataClose", "dataItemSeparator", 
+                   "setOpen", "setClose", "setItemOperator", "setComplementOperator", 
+                   "comment", "commentContent", "toEndOfItem", "toEndOfLine", 
+                   "literalBlock", "literal" ]
+
+    EOF = Token.EOF
+    NEWLINE=1
+    SPACE=2
+    COMMENT_OPEN=3
+    CONTEXT_OPEN=4
+    BLOCK_OPEN=5
+    BLOCK_CLOSE=6
+    DATA_OPEN=7
+    DATA_CLOSE=8
+    DATA_ITEM_SEPARATOR=9
+    SET_OPEN=10
+    SET_CLOSE=11
+    SET_ITEM_OPERATOR=12
+    SET_DIFFERENCE_OPERATOR=13
+    SET_COMPLEMENT_OPERATOR=14
+    KEY_VALUE_SEPARATOR=15
+    LITERAL_WRAPPER=16
+    NAME=17
+    PATH=18
+    OTHER=19
+
+    def __init__(self, input:TokenStream, output:TextIO = sys.stdout):
+        super().__init__(input, output)
+        self.checkVersion("4.13.2")
+        self._interp = ParserATNSimulator(self, self.atn, self.decisionsToDFA, self.sharedContextCache)
+        self._predicates = None
+
+
+
+
+    class ManifestContext(ParserRuleContext):
+        __slots__ = 'parser'
+
+        def __init__(self, parser, parent:ParserRuleContext=None, invokingState:int=-1):
+            super().__init__(parent, invokingState)
+            self.parser = parser
+
+        def explScopedContext(self, i:int=None):
+            if i is None:
+                return self.getTypedRuleContexts(ManifestParser.ExplScopedContextContext)
+            else:
+                return self.getTypedRuleContext(ManifestParser.ExplScopedContextContext,i)
+
+
+        def implScopedContext(self, i:int=None):
+            if i is None:
+                return self.getTypedRuleContexts(ManifestParser.ImplScopedContextContext)
+            else:
+                return self.getTypedRuleContext(ManifestParser.ImplScopedContextContext,i)
+
+
+        def declaration(self, i:int=None):
+            if i is None:
+                return self.getTypedRuleContexts(ManifestParser.DeclarationContext)
+            else:
+                return self.getTypedRuleContext(ManifestParser.DeclarationContext,i)
+
+
+        def comment(self, i:int=None):
+            if i is None:
+                return self.getTypedRuleContexts(ManifestParser.CommentContext)
+            else:
+                return self.getTypedRuleContext(ManifestParser.CommentContext,i)
+
+
+        def EOF(self, i:int=None):
+            if i is None:
+                return self.getTokens(ManifestParser.EOF)
+            else:
+                return self.getToken(ManifestParser.EOF, i)
+
+        def NEWLINE(self, i:int=None):
+            if i is None:
+                return self.getTokens(ManifestParser.NEWLINE)
+            else:
+                return self.getToken(ManifestParser.NEWLINE, i)
+
+        def getRuleIndex(self):
+            return ManifestParser.RULE_manifest
+
+        def enterRule(self, listener:ParseTreeListener):
+            if hasattr( listener, "enterManifest" ):
+                listener.enterManifest(self)
+
+        def exitRule(self, listener:ParseTreeListener):
+            if hasattr( listener, "exitManifest" ):
+                listener.exitManifest(self)
+
+
+
+
+    def manifest(self):
+
+        localctx = ManifestParser.ManifestContext(self, self._ctx, self.state)
+        self.enterRule(localctx, 0, self.RULE_manifest)
+        self._la = 0 # Token type
+        try:
+            self.enterOuterAlt(localctx, 1)
+            self.state = 80
+            self._errHandler.sync(self)
+            _la = self._input.LA(1)
+            while (((_la) & ~0x3f) == 0 and ((1 << _la) & 491548) != 0):
+                self.state = 68
+                self._errHandler.sync(self)
+                la_ = self._interp.adaptivePredict(self._input,0,self._ctx)
+                if la_ == 1:
+                    self.state = 64
+                    self.explScopedContext()
+                    pass
+
+                elif la_ == 2:
+                    self.state = 65
+                    self.implScopedContext()
+                    pass
+
+                elif la_ == 3:
+                    self.state = 66
+                    self.declaration()
+                    pass
+
+                elif la_ == 4:
+                    self.state = 67
+                    self.comment()
+                    pass
+
+
+                self.state = 76
+                self._errHandler.sync(self)
+                token = self._input.LA(1)
+                if token in [1]:
+                    self.state = 71 
+                    self._errHandler.sync(self)
+                    _la = self._input.LA(1)
+                    while True:
+                        self.state = 70
+                        self.match(ManifestParser.NEWLINE)
+                        self.state = 73 
+                        self._errHandler.sync(self)
+                        _la = self._input.LA(1)
+                        if not (_la==1):
+                            break
+
+                    pass
+                elif token in [-1]:
+                    self.state = 75
+                    self.match(ManifestParser.EOF)
+                    pass
+                else:
+                    raise NoViableAltException(self)
+
+                self.state = 82
+                self._errHandler.sync(self)
+                _la = self._input.LA(1)
+
+        except RecognitionException as re:
+            localctx.exception = re
+            self._errHandler.reportError(self, re)
+            self._errHandler.recover(self, re)
+        finally:
+            self.exitRule()
+        return localctx
+
+
+    class ExplScopedContextContext(ParserRuleContext):
+        __slots__ = 'parser'
+
+        def __init__(self, parser, parent:ParserRuleContext=None, invokingState:int=-1):
+            super().__init__(parent, invokingState)
+            self.parser = parser
+
+        def contextHeader(self):
+            return self.getTypedRuleContext(ManifestParser.ContextHeaderContext,0)
+
+
+        def blockOpen(self):
+            return self.getTypedRuleContext(ManifestParser.BlockOpenContext,0)
+
+
+        def blockClose(self):
+            return self.getTypedRuleContext(ManifestParser.BlockCloseContext,0)
+
+
+        def SPACE(self, i:int=None):
+            if i is None:
+                return self.getTokens(ManifestParser.SPACE)
+            else:
+                return self.getToken(ManifestParser.SPACE, i)
+
+        def NEWLINE(self, i:int=None):
+            if i is None:
+                return self.getTokens(ManifestParser.NEWLINE)
+            else:
+                return self.getToken(ManifestParser.NEWLINE, i)
+
+        def declaration(self, i:int=None):
+            if i is None:
+                return self.getTypedRuleContexts(ManifestParser.DeclarationContext)
+            else:
+                return self.getTypedRuleContext(ManifestParser.DeclarationContext,i)
+
+
+        def comment(self, i:int=None):
+            if i is None:
+                return self.getTypedRuleContexts(ManifestParser.CommentContext)
+            else:
+                return self.getTypedRuleContext(ManifestParser.CommentContext,i)
+
+
+        def explScopedContext(self, i:int=None):
+            if i is None:
+                return self.getTypedRuleContexts(ManifestParser.ExplScopedContextContext)
+            else:
+                return self.getTypedRuleContext(ManifestParser.ExplScopedContextContext,i)
+
+
+        def implScopedContext(self, i:int=None):
+            if i is None:
+                return self.getTypedRuleContexts(ManifestParser.ImplScopedContextContext)
+            else:
+                return self.getTypedRuleContext(ManifestParser.ImplScopedContextContext,i)
+
+
+        def getRuleIndex(self):
+            return ManifestParser.RULE_explScopedContext
+
+        def enterRule(self, listener:ParseTreeListener):
+            if hasattr( listener, "enterExplScopedContext" ):
+                listener.enterExplScopedContext(self)
+
+        def exitRule(self, listener:ParseTreeListener):
+            if hasattr( listener, "exitExplScopedContext" ):
+                listener.exitExplScopedContext(self)
+
+
+
+
+    def explScopedContext(self):
+
+        localctx = ManifestParser.ExplScopedContextContext(self, self._ctx, self.state)
+        self.enterRule(localctx, 2, self.RULE_explScopedContext)
+        self._la = 0 # Token type
+        try:
+            self.enterOuterAlt(localctx, 1)
+            self.state = 83
+            self.contextHeader()
+            self.state = 85
+            self._errHandler.sync(self)
+            _la = self._input.LA(1)
+            if _la==2:
+                self.state = 84
+                self.match(ManifestParser.SPACE)
+
+
+            self.state = 87
+            self.blockOpen()
+            self.state = 91
+            self._errHandler.sync(self)
+            _alt = self._interp.adaptivePredict(self._input,5,self._ctx)
+            while _alt!=2 and _alt!=ATN.INVALID_ALT_NUMBER:
+                if _alt==1:
+                    self.state = 88
+                    self.match(ManifestParser.NEWLINE) 
+                self.state = 93
+                self._errHandler.sync(self)
+                _alt = self._interp.adaptivePredict(self._input,5,self._ctx)
+
+            self.state = 124
+            self._errHandler.sync(self)
+            _alt = self._interp.adaptivePredict(self._input,13,self._ctx)
+            while _alt!=2 and _alt!=ATN.INVALID_ALT_NUMBER:
+                if _alt==1:
+                    self.state = 122
+                    self._errHandler.sync(self)
+                    la_ = self._interp.adaptivePredict(self._input,12,self._ctx)
+                    if la_ == 1:
+                        self.state = 95
+                        self._errHandler.sync(self)
+                        _la = self._input.LA(1)
+                        if _la==2:
+                            self.state = 94
+                            self.match(ManifestParser.SPACE)
+
+
+                        self.state = 99
+                        self._errHandler.sync(self)
+                        la_ = self._interp.adaptivePredict(self._input,7,self._ctx)
+                        if la_ == 1:
+                            self.state = 97
+                            self.explScopedContext()
+                            pass
+
+                        elif la_ == 2:
+                            self.state = 98
+                            self.implScopedContext()
+                            pass
+
+
+                        self.state = 104
+                        self._errHandler.sync(self)
+                        _alt = self._interp.adaptivePredict(self._input,8,self._ctx)
+                        while _alt!=2 and _alt!=ATN.INVALID_ALT_NUMBER:
+                            if _alt==1:
+                                self.state = 101
+                                self.match(ManifestParser.NEWLINE) 
+                            self.state = 106
+                            self._errHandler.sync(self)
+                            _alt = self._interp.adaptivePredict(self._input,8,self._ctx)
+
+                        pass
+
+                    elif la_ == 2:
+                        self.state = 108
+                        self._errHandler.sync(self)
+                        _la = self._input.LA(1)
+                        if _la==2:
+                            self.state = 107
+                            self.match(ManifestParser.SPACE)
+
+
+                        self.state = 110
+                        self.declaration()
+                        self.state = 112 
+                        self._errHandler.sync(self)
+                        _alt = 1
+                        while _alt!=2 and _alt!=ATN.INVALID_ALT_NUMBER:
+                            if _alt == 1:
+                                self.state = 111
+                                self.match(ManifestParser.NEWLINE)
+
+                            else:
+                                raise NoViableAltException(self)
+                            self.state = 114 
+                            self._errHandler.sync(self)
+                            _alt = self._interp.adaptivePredict(self._input,10,self._ctx)
+
+                        pass
+
+                    elif la_ == 3:
+                        self.state = 116
+                        self.comment()
+                        self.state = 118 
+                        self._errHandler.sync(self)
+                        _alt = 1
+                        while _alt!=2 and _alt!=ATN.INVALID_ALT_NUMBER:
+                            if _alt == 1:
+                                self.state = 117
+                                self.match(ManifestParser.NEWLINE)
+
+                            else:
+                                raise NoViableAltException(self)
+                            self.state = 120 
+                            self._errHandler.sync(self)
+                            _alt = self._interp.adaptivePredict(self._input,11,self._ctx)
+
+                        pass
+
+             
+                self.state = 126
+                self._errHandler.sync(self)
+                _alt = self._interp.adaptivePredict(self._input,13,self._ctx)
+
+            self.state = 127
+            self.blockClose()
+        except RecognitionException as re:
+            localctx.exception = re
+            self._errHandler.reportError(self, re)
+            self._errHandler.recover(self, re)
+        finally:
+            self.exitRule()
+        return localctx
+
+
+    class ImplScopedContextContext(ParserRuleContext):
+        __slots__ = 'parser'
+
+        def __init__(self, parser, parent:ParserRuleContext=None, invokingState:int=-1):
+            super().__init__(parent, invokingState)
+            self.parser = parser
+
+        def contextHeader(self):
+            return self.getTypedRuleContext(ManifestParser.ContextHeaderContext,0)
+
+
+        def NEWLINE(self, i:int=None):
+            if i is None:
+                return self.getTokens(ManifestParser.NEWLINE)
+            else:
+                return self.getToken(ManifestParser.NEWLINE, i)
+
+        def comment(self, i:int=None):
+            if i is None:
+                return self.getTypedRuleContexts(ManifestParser.CommentContext)
+            else:
+                return self.getTypedRuleContext(ManifestParser.CommentContext,i)
+
+
+        def explScopedContext(self, i:int=None):
+            if i is None:
+                return self.getTypedRuleContexts(ManifestParser.ExplScopedContextContext)
+            else:
+                return self.getTypedRuleContext(ManifestParser.ExplScopedContextContext,i)
+
+
+        def implScopedContext(self, i:int=None):
+            if i is None:
+                return self.getTypedRuleContexts(ManifestParser.ImplScopedContextContext)
+            else:
+                return self.getTypedRuleContext(ManifestParser.ImplScopedContextContext,i)
+
+
+        def declaration(self, i:int=None):
+            if i is None:
+                return self.getTypedRuleContexts(ManifestParser.DeclarationContext)
+            else:
+                return self.getTypedRuleContext(ManifestParser.DeclarationContext,i)
+
+
+        def SPACE(self, i:int=None):
+            if i is None:
+                return self.getTokens(ManifestParser.SPACE)
+            else:
+                return self.getToken(ManifestParser.SPACE, i)
+
+        def getRuleIndex(self):
+            return ManifestParser.RULE_implScopedContext
+
+        def enterRule(self, listener:ParseTreeListener):
+            if hasattr( listener, "enterImplScopedContext" ):
+                listener.enterImplScopedContext(self)
+
+        def exitRule(self, listener:ParseTreeListener):
+            if hasattr( listener, "exitImplScopedContext" ):
+                listener.exitImplScopedContext(self)
+
+
+
+
+    def implScopedContext(self):
+
+        localctx = ManifestParser.ImplScopedContextContext(self, self._ctx, self.state)
+        self.enterRule(localctx, 4, self.RULE_implScopedContext)
+        self._la = 0 # Token type
+        try:
+            self.enterOuterAlt(localctx, 1)
+            self.state = 129
+            self.contextHeader()
+            self.state = 131
+            self._errHandler.sync(self)
+            _la = self._input.LA(1)
+            if _la==2 or _la==3:
+                self.state = 130
+                self.comment()
+
+
+            self.state = 133
+            self.match(ManifestParser.NEWLINE)
+            self.state = 155
+            self._errHandler.sync(self)
+            _alt = self._interp.adaptivePredict(self._input,19,self._ctx)
+            while _alt!=2 and _alt!=ATN.INVALID_ALT_NUMBER:
+                if _alt==1:
+                    self.state = 153
+                    self._errHandler.sync(self)
+                    la_ = self._interp.adaptivePredict(self._input,18,self._ctx)
+                    if la_ == 1:
+                        self.state = 135
+                        self._errHandler.sync(self)
+                        _la = self._input.LA(1)
+                        if _la==2:
+                            self.state = 134
+                            self.match(ManifestParser.SPACE)
+
+
+                        self.state = 137
+                        self.explScopedContext()
+                        self.state = 138
+                        self.match(ManifestParser.NEWLINE)
+                        pass
+
+                    elif la_ == 2:
+                        self.state = 141
+                        self._errHandler.sync(self)
+                        _la = self._input.LA(1)
+                        if _la==2:
+                            self.state = 140
+                            self.match(ManifestParser.SPACE)
+
+
+                        self.state = 143
+                        self.implScopedContext()
+                        pass
+
+                    elif la_ == 3:
+                        self.state = 145
+                        self._errHandler.sync(self)
+                        _la = self._input.LA(1)
+                        if _la==2:
+                            self.state = 144
+                            self.match(ManifestParser.SPACE)
+
+
+                        self.state = 147
+                        self.declaration()
+                        self.state = 148
+                        self.match(ManifestParser.NEWLINE)
+                        pass
+
+                    elif la_ == 4:
+                        self.state = 150
+                        self.comment()
+                        self.state = 151
+                        self.match(ManifestParser.NEWLINE)
+                        pass
+
+             
+                self.state = 157
+                self._errHandler.sync(self)
+                _alt = self._interp.adaptivePredict(self._input,19,self._ctx)
+
+        except RecognitionException as re:
+            localctx.exception = re
+            self._errHandler.reportError(self, re)
+            self._errHandler.recover(self, re)
+        finally:
+            self.exitRule()
+        return localctx
+
+
+    class ContextHeaderContext(ParserRuleContext):
+        __slots__ = 'parser'
+
+        def __init__(self, parser, parent:ParserRuleContext=None, invokingState:int=-1):
+            super().__init__(parent, invokingState)
+            self.parser = parser
+            self.typeName = None # Token
+
+        def CONTEXT_OPEN(self):
+            return self.getToken(ManifestParser.CONTEXT_OPEN, 0)
+
+        def NAME(self):
+            return self.getToken(ManifestParser.NAME, 0)
+
+        def dataOpen(self):
+            return self.getTypedRuleContext(ManifestParser.DataOpenContext,0)
+
+
+        def contextOpt(self, i:int=None):
+            if i is None:
+                return self.getTypedRuleContexts(ManifestParser.ContextOptContext)
+            else:
+                return self.getTypedRuleContext(ManifestParser.ContextOptContext,i)
+
+
+        def dataClose(self):
+            return self.getTypedRuleContext(ManifestParser.DataCloseContext,0)
+
+
+        def SPACE(self, i:int=None):
+            if i is None:
+                return self.getTokens(ManifestParser.SPACE)
+            else:
+                return self.getToken(ManifestParser.SPACE, i)
+
+        def comment(self, i:int=None):
+            if i is None:
+                return self.getTypedRuleContexts(ManifestParser.CommentContext)
+            else:
+                return self.getTypedRuleContext(ManifestParser.CommentContext,i)
+
+
+        def NEWLINE(self, i:int=None):
+            if i is None:
+                return self.getTokens(ManifestParser.NEWLINE)
+            else:
+                return self.getToken(ManifestParser.NEWLINE, i)
+
+        def dataItemSeparator(self, i:int=None):
+            if i is None:
+                return self.getTypedRuleContexts(ManifestParser.DataItemSeparatorContext)
+            else:
+                return self.getTypedRuleContext(ManifestParser.DataItemSeparatorContext,i)
+
+
+        def getRuleIndex(self):
+            return ManifestParser.RULE_contextHeader
+
+        def enterRule(self, listener:ParseTreeListener):
+            if hasattr( listener, "enterContextHeader" ):
+                listener.enterContextHeader(self)
+
+        def exitRule(self, listener:ParseTreeListener):
+            if hasattr( listener, "exitContextHeader" ):
+                listener.exitContextHeader(self)
+
+
+
+
+    def contextHeader(self):
+
+        localctx = ManifestParser.ContextHeaderContext(self, self._ctx, self.state)
+        self.enterRule(localctx, 6, self.RULE_contextHeader)
+        self._la = 0 # Token type
+        try:
+            self.enterOuterAlt(localctx, 1)
+            self.state = 158
+            self.match(ManifestParser.CONTEXT_OPEN)
+            self.state = 159
+            localctx.typeName = self.match(ManifestParser.NAME)
+            self.state = 205
+            self._errHandler.sync(self)
+            la_ = self._interp.adaptivePredict(self._input,28,self._ctx)
+            if la_ == 1:
+                self.state = 161
+                self._errHandler.sync(self)
+                _la = self._input.LA(1)
+                if _la==2:
+                    self.state = 160
+                    self.match(ManifestParser.SPACE)
+
+
+                self.state = 163
+                self.dataOpen()
+                self.state = 171
+                self._errHandler.sync(self)
+                _la = self._input.LA(1)
+                while _la==2 or _la==3:
+                    self.state = 164
+                    self.comment()
+                    self.state = 165
+                    self.match(ManifestParser.NEWLINE)
+                    self.state = 167
+                    self._errHandler.sync(self)
+                    la_ = self._interp.adaptivePredict(self._input,21,self._ctx)
+                    if la_ == 1:
+                        self.state = 166
+                        self.match(ManifestParser.SPACE)
+
+
+                    self.state = 173
+                    self._errHandler.sync(self)
+                    _la = self._input.LA(1)
+
+                self.state = 174
+                self.contextOpt()
+                self.state = 190
+                self._errHandler.sync(self)
+                _alt = self._interp.adaptivePredict(self._input,25,self._ctx)
+                while _alt!=2 and _alt!=ATN.INVALID_ALT_NUMBER:
+                    if _alt==1:
+                        self.state = 175
+                        self.dataItemSeparator()
+                        self.state = 183
+                        self._errHandler.sync(self)
+                        _la = self._input.LA(1)
+                        while _la==2 or _la==3:
+                            self.state = 176
+                            self.comment()
+                            self.state = 177
+                            self.match(ManifestParser.NEWLINE)
+                            self.state = 179
+                            self._errHandler.sync(self)
+                            la_ = self._interp.adaptivePredict(self._input,23,self._ctx)
+                            if la_ == 1:
+                                self.state = 178
+                                self.match(ManifestParser.SPACE)
+
+
+                            self.state = 185
+                            self._errHandler.sync(self)
+                            _la = self._input.LA(1)
+
+                        self.state = 186
+                        self.contextOpt() 
+                    self.state = 192
+                    self._errHandler.sync(self)
+                    _alt = self._interp.adaptivePredict(self._input,25,self._ctx)
+
+                self.state = 200
+                self._errHandler.sync(self)
+                _alt = self._interp.adaptivePredict(self._input,27,self._ctx)
+                while _alt!=2 and _alt!=ATN.INVALID_ALT_NUMBER:
+                    if _alt==1:
+                        self.state = 193
+                        self.match(ManifestParser.NEWLINE)
+                        self.state = 195
+                        self._errHandler.sync(self)
+                        la_ = self._interp.adaptivePredict(self._input,26,self._ctx)
+                        if la_ == 1:
+                            self.state = 194
+                            self.match(ManifestParser.SPACE)
+
+
+                        self.state = 197
+                        self.comment() 
+                    self.state = 202
+                    self._errHandler.sync(self)
+                    _alt = self._interp.adaptivePredict(self._input,27,self._ctx)
+
+                self.state = 203
+                self.dataClose()
+
+
+        except RecognitionException as re:
+            localctx.exception = re
+            self._errHandler.reportError(self, re)
+            self._errHandler.recover(self, re)
+        finally:
+            self.exitRule()
+        return localctx
+
+
+    class ContextOptContext(ParserRuleContext):
+        __slots__ = 'parser'
+
+        def __init__(self, parser, parent:ParserRuleContext=None, invokingState:int=-1):
+            super().__init__(parent, invokingState)
+            self.parser = parser
+
+        def kvPair(self):
+            return self.getTypedRuleContext(ManifestParser.KvPairContext,0)
+
+
+        def comment(self):
+            return self.getTypedRuleContext(ManifestParser.CommentContext,0)
+
+
+        def getRuleIndex(self):
+            return ManifestParser.RULE_contextOpt
+
+        def enterRule(self, listener:ParseTreeListener):
+            if hasattr( listener, "enterContextOpt" ):
+                listener.enterContextOpt(self)
+
+        def exitRule(self, listener:ParseTreeListener):
+            if hasattr( listener, "exitContextOpt" ):
+                listener.exitContextOpt(self)
+
+
+
+
+    def contextOpt(self):
+
+        localctx = ManifestParser.ContextOptContext(self, self._ctx, self.state)
+        self.enterRule(localctx, 8, self.RULE_contextOpt)
+        try:
+            self.enterOuterAlt(localctx, 1)
+            self.state = 207
+            self.kvPair()
+            self.state = 209
+            self._errHandler.sync(self)
+            la_ = self._interp.adaptivePredict(self._input,29,self._ctx)
+            if la_ == 1:
+                self.state = 208
+                self.comment()
+
+
+        except RecognitionException as re:
+            localctx.exception = re
+            self._errHandler.reportError(self, re)
+            self._errHandler.recover(self, re)
+        finally:
+            self.exitRule()
+        return localctx
+
+
+    class DeclarationContext(ParserRuleContext):
+        __slots__ = 'parser'
+
+        def __init__(self, parser, parent:ParserRuleContext=None, invokingState:int=-1):
+            super().__init__(parent, invokingState)
+            self.parser = parser
+
+        def tagDecl(self):
+            return self.getTypedRuleContext(ManifestParser.TagDeclContext,0)
+
+
+        def item(self):
+            return self.getTypedRuleContext(ManifestParser.ItemContext,0)
+
+
+        def itemSet(self):
+            return self.getTypedRuleContext(ManifestParser.ItemSetContext,0)
+
+
+        def comment(self):
+            return self.getTypedRuleContext(ManifestParser.CommentContext,0)
+
+
+        def getRuleIndex(self):
+            return ManifestParser.RULE_declaration
+
+        def enterRule(self, listener:ParseTreeListener):
+            if hasattr( listener, "enterDeclaration" ):
+                listener.enterDeclaration(self)
+
+        def exitRule(self, listener:ParseTreeListener):
+            if hasattr( listener, "exitDeclaration" ):
+                listener.exitDeclaration(self)
+
+
+
+
+    def declaration(self):
+
+        localctx = ManifestParser.DeclarationContext(self, self._ctx, self.state)
+        self.enterRule(localctx, 10, self.RULE_declaration)
+        self._la = 0 # Token type
+        try:
+            self.enterOuterAlt(localctx, 1)
+            self.state = 214
+            self._errHandler.sync(self)
+            la_ = self._interp.adaptivePredict(self._input,30,self._ctx)
+            if la_ == 1:
+                self.state = 211
+                self.tagDecl()
+                pass
+
+            elif la_ == 2:
+                self.state = 212
+                self.item()
+                pass
+
+            elif la_ == 3:
+                self.state = 213
+                self.itemSet()
+                pass
+
+
+            self.state = 217
+            self._errHandler.sync(self)
+            _la = self._input.LA(1)
+            if _la==2 or _la==3:
+                self.state = 216
+                self.comment()
+
+
+        except RecognitionException as re:
+            localctx.exception = re
+            self._errHandler.reportError(self, re)
+            self._errHandler.recover(self, re)
+        finally:
+            self.exitRule()
+        return localctx
+
+
+    class TagDeclContext(ParserRuleContext):
+        __slots__ = 'parser'
+
+        def __init__(self, parser, parent:ParserRuleContext=None, invokingState:int=-1):
+            super().__init__(parent, invokingState)
+            self.parser = parser
+
+        def KEY_VALUE_SEPARATOR(self):
+            return self.getToken(ManifestParser.KEY_VALUE_SEPARATOR, 0)
+
+        def ref(self):
+            return self.getTypedRuleContext(ManifestParser.RefContext,0)
+
+
+        def SPACE(self):
+            return self.getToken(ManifestParser.SPACE, 0)
+
+        def dataOpen(self):
+            return self.getTypedRuleContext(ManifestParser.DataOpenContext,0)
+
+
+        def tag(self, i:int=None):
+            if i is None:
+                return self.getTypedRuleContexts(ManifestParser.TagContext)
+            else:
+                return self.getTypedRuleContext(ManifestParser.TagContext,i)
+
+
+        def dataClose(self):
+            return self.getTypedRuleContext(ManifestParser.DataCloseContext,0)
+
+
+        def dataItemSeparator(self, i:int=None):
+            if i is None:
+                return self.getTypedRuleContexts(ManifestParser.DataItemSeparatorContext)
+            else:
+                return self.getTypedRuleContext(ManifestParser.DataItemSeparatorContext,i)
+
+
+        def getRuleIndex(self):
+            return ManifestParser.RULE_tagDecl
+
+        def enterRule(self, listener:ParseTreeListener):
+            if hasattr( listener, "enterTagDecl" ):
+                listener.enterTagDecl(self)
+
+        def exitRule(self, listener:ParseTreeListener):
+            if hasattr( listener, "exitTagDecl" ):
+                listener.exitTagDecl(self)
+
+
+
+
+    def tagDecl(self):
+
+        localctx = ManifestParser.TagDeclContext(self, self._ctx, self.state)
+        self.enterRule(localctx, 12, self.RULE_tagDecl)
+        try:
+            self.enterOuterAlt(localctx, 1)
+            self.state = 219
+            self.match(ManifestParser.KEY_VALUE_SEPARATOR)
+            self.state = 220
+            self.ref()
+            self.state = 234
+            self._errHandler.sync(self)
+            la_ = self._interp.adaptivePredict(self._input,33,self._ctx)
+            if la_ == 1:
+                self.state = 221
+                self.match(ManifestParser.SPACE)
+                self.state = 222
+                self.dataOpen()
+                self.state = 223
+                self.tag()
+                self.state = 229
+                self._errHandler.sync(self)
+                _alt = self._interp.adaptivePredict(self._input,32,self._ctx)
+                while _alt!=2 and _alt!=ATN.INVALID_ALT_NUMBER:
+                    if _alt==1:
+                        self.state = 224
+                        self.dataItemSeparator()
+                        self.state = 225
+                        self.tag() 
+                    self.state = 231
+                    self._errHandler.sync(self)
+                    _alt = self._interp.adaptivePredict(self._input,32,self._ctx)
+
+                self.state = 232
+                self.dataClose()
+
+
+        except RecognitionException as re:
+            localctx.exception = re
+            self._errHandler.reportError(self, re)
+            self._errHandler.recover(self, re)
+        finally:
+            self.exitRule()
+        return localctx
+
+
+    class ItemContext(ParserRuleContext):
+        __slots__ = 'parser'
+
+        def __init__(self, parser, parent:ParserRuleContext=None, invokingState:int=-1):
+            super().__init__(parent, invokingState)
+            self.parser = parser
+
+        def ref(self):
+            return self.getTypedRuleContext(ManifestParser.RefContext,0)
+
+
+        def SPACE(self):
+            return self.getToken(ManifestParser.SPACE, 0)
+
+        def dataOpen(self):
+            return self.getTypedRuleContext(ManifestParser.DataOpenContext,0)
+
+
+        def tag(self, i:int=None):
+            if i is None:
+                return self.getTypedRuleContexts(ManifestParser.TagContext)
+            else:
+                return self.getTypedRuleContext(ManifestParser.TagContext,i)
+
+
+        def dataClose(self):
+            return self.getTypedRuleContext(ManifestParser.DataCloseContext,0)
+
+
+        def dataItemSeparator(self, i:int=None):
+            if i is None:
+                return self.getTypedRuleContexts(ManifestParser.DataItemSeparatorContext)
+            else:
+                return self.getTypedRuleContext(ManifestParser.DataItemSeparatorContext,i)
+
+
+        def getRuleIndex(self):
+            return ManifestParser.RULE_item
+
+        def enterRule(self, listener:ParseTreeListener):
+            if hasattr( listener, "enterItem" ):
+                listener.enterItem(self)
+
+        def exitRule(self, listener:ParseTreeListener):
+            if hasattr( listener, "exitItem" ):
+                listener.exitItem(self)
+
+
+
+
+    def item(self):
+
+        localctx = ManifestParser.ItemContext(self, self._ctx, self.state)
+        self.enterRule(localctx, 14, self.RULE_item)
+        try:
+            self.enterOuterAlt(localctx, 1)
+            self.state = 236
+            self.ref()
+            self.state = 250
+            self._errHandler.sync(self)
+            la_ = self._interp.adaptivePredict(self._input,35,self._ctx)
+            if la_ == 1:
+                self.state = 237
+                self.match(ManifestParser.SPACE)
+                self.state = 238
+                self.dataOpen()
+                self.state = 239
+                self.tag()
+                self.state = 245
+                self._errHandler.sync(self)
+                _alt = self._interp.adaptivePredict(self._input,34,self._ctx)
+                while _alt!=2 and _alt!=ATN.INVALID_ALT_NUMBER:
+                    if _alt==1:
+                        self.state = 240
+                        self.dataItemSeparator()
+                        self.state = 241
+                        self.tag() 
+                    self.state = 247
+                    self._errHandler.sync(self)
+                    _alt = self._interp.adaptivePredict(self._input,34,self._ctx)
+
+                self.state = 248
+                self.dataClose()
+
+
+        except RecognitionException as re:
+            localctx.exception = re
+            self._errHandler.reportError(self, re)
+            self._errHandler.recover(self, re)
+        finally:
+            self.exitRule()
+        return localctx
+
+
+    class ItemSetContext(ParserRuleContext):
+        __slots__ = 'parser'
+
+        def __init__(self, parser, parent:ParserRuleContext=None, invokingState:int=-1):
+            super().__init__(parent, invokingState)
+            self.parser = parser
+
+        def ref(self):
+            return self.getTypedRuleContext(ManifestParser.RefContext,0)
+
+
+        def SPACE(self):
+            return self.getToken(ManifestParser.SPACE, 0)
+
+        def setOpen(self):
+            return self.getTypedRuleContext(ManifestParser.SetOpenContext,0)
+
+
+        def itemSetSpec(self):
+            return self.getTypedRuleContext(ManifestParser.ItemSetSpecContext,0)
+
+
+        def setClose(self):
+            return self.getTypedRuleContext(ManifestParser.SetCloseContext,0)
+
+
+        def getRuleIndex(self):
+            return ManifestParser.RULE_itemSet
+
+        def enterRule(self, listener:ParseTreeListener):
+            if hasattr( listener, "enterItemSet" ):
+                listener.enterItemSet(self)
+
+        def exitRule(self, listener:ParseTreeListener):
+            if hasattr( listener, "exitItemSet" ):
+                listener.exitItemSet(self)
+
+
+
+
+    def itemSet(self):
+
+        localctx = ManifestParser.ItemSetContext(self, self._ctx, self.state)
+        self.enterRule(localctx, 16, self.RULE_itemSet)
+        try:
+            self.enterOuterAlt(localctx, 1)
+            self.state = 252
+            self.ref()
+            self.state = 253
+            self.match(ManifestParser.SPACE)
+            self.state = 254
+            self.setOpen()
+            self.state = 255
+            self.itemSetSpec(0)
+            self.state = 256
+            self.setClose()
+        except RecognitionException as re:
+            localctx.exception = re
+            self._errHandler.reportError(self, re)
+            self._errHandler.recover(self, re)
+        finally:
+            self.exitRule()
+        return localctx
+
+
+    class ItemSetSpecContext(ParserRuleContext):
+        __slots__ = 'parser'
+
+        def __init__(self, parser, parent:ParserRuleContext=None, invokingState:int=-1):
+            super().__init__(parent, invokingState)
+            self.parser = parser
+
+
+        def getRuleIndex(self):
+            return ManifestParser.RULE_itemSetSpec
+
+     
+        def copyFrom(self, ctx:ParserRuleContext):
+            super().copyFrom(ctx)
+
+
+    class ItemSetSpec_opContext(ItemSetSpecContext):
+
+        def __init__(self, parser, ctx:ParserRuleContext): # actually a ManifestParser.ItemSetSpecContext
+            super().__init__(parser)
+            self.copyFrom(ctx)
+
+        def itemSetSpec(self, i:int=None):
+            if i is None:
+                return self.getTypedRuleContexts(ManifestParser.ItemSetSpecContext)
+            else:
+                return self.getTypedRuleContext(ManifestParser.ItemSetSpecContext,i)
+
+        def setItemOperator(self):
+            return self.getTypedRuleContext(ManifestParser.SetItemOperatorContext,0)
+
+
+        def enterRule(self, listener:ParseTreeListener):
+            if hasattr( listener, "enterItemSetSpec_op" ):
+                listener.enterItemSetSpec_op(self)
+
+        def exitRule(self, listener:ParseTreeListener):
+            if hasattr( listener, "exitItemSetSpec_op" ):
+                listener.exitItemSetSpec_op(self)
+
+
+    class ItemSetSpec_refContext(ItemSetSpecContext):
+
+        def __init__(self, parser, ctx:ParserRuleContext): # actually a ManifestParser.ItemSetSpecContext
+            super().__init__(parser)
+            self.copyFrom(ctx)
+
+        def ref(self):
+            return self.getTypedRuleContext(ManifestParser.RefContext,0)
+
+
+        def enterRule(self, listener:ParseTreeListener):
+            if hasattr( listener, "enterItemSetSpec_ref" ):
+                listener.enterItemSetSpec_ref(self)
+
+        def exitRule(self, listener:ParseTreeListener):
+            if hasattr( listener, "exitItemSetSpec_ref" ):
+                listener.exitItemSetSpec_ref(self)
+
+
+    class ItemSetSpec_groupContext(ItemSetSpecContext):
+
+        def __init__(self, parser, ctx:ParserRuleContext): # actually a ManifestParser.ItemSetSpecContext
+            super().__init__(parser)
+            self.copyFrom(ctx)
+
+        def setOpen(self):
+            return self.getTypedRuleContext(ManifestParser.SetOpenContext,0)
+
+        def itemSetSpec(self):
+            return self.getTypedRuleContext(ManifestParser.ItemSetSpecContext,0)
+
+        def setClose(self):
+            return self.getTypedRuleContext(ManifestParser.SetCloseContext,0)
+
+
+        def enterRule(self, listener:ParseTreeListener):
+            if hasattr( listener, "enterItemSetSpec_group" ):
+                listener.enterItemSetSpec_group(self)
+
+        def exitRule(self, listener:ParseTreeListener):
+            if hasattr( listener, "exitItemSetSpec_group" ):
+                listener.exitItemSetSpec_group(self)
+
+
+    class ItemSetSpec_complementContext(ItemSetSpecContext):
+
+        def __init__(self, parser, ctx:ParserRuleContext): # actually a ManifestParser.ItemSetSpecContext
+            super().__init__(parser)
+            self.copyFrom(ctx)
+
+        def setComplementOperator(self):
+            return self.getTypedRuleContext(ManifestParser.SetComplementOperatorContext,0)
+
+        def itemSetSpec(self):
+            return self.getTypedRuleContext(ManifestParser.ItemSetSpecContext,0)
+
+
+        def enterRule(self, listener:ParseTreeListener):
+            if hasattr( listener, "enterItemSetSpec_complement" ):
+                listener.enterItemSetSpec_complement(self)
+
+        def exitRule(self, listener:ParseTreeListener):
+            if hasattr( listener, "exitItemSetSpec_complement" ):
+                listener.exitItemSetSpec_complement(self)
+
+
+    class ItemSetSpec_tagContext(ItemSetSpecContext):
+
+        def __init__(self, parser, ctx:ParserRuleContext): # actually a ManifestParser.ItemSetSpecContext
+            super().__init__(parser)
+            self.copyFrom(ctx)
+
+        def tag(self):
+            return self.getTypedRuleContext(ManifestParser.TagContext,0)
+
+
+        def enterRule(self, listener:ParseTreeListener):
+            if hasattr( listener, "enterItemSetSpec_tag" ):
+                listener.enterItemSetSpec_tag(self)
+
+        def exitRule(self, listener:ParseTreeListener):
+            if hasattr( listener, "exitItemSetSpec_tag" ):
+                listener.exitItemSetSpec_tag(self)
+
+
+
+    def itemSetSpec(self, _p:int=0):
+        _parentctx = self._ctx
+        _parentState = self.state
+        localctx = ManifestParser.ItemSetSpecContext(self, self._ctx, _parentState)
+        _prevctx = localctx
+        _startState = 18
+        self.enterRecursionRule(localctx, 18, self.RULE_itemSetSpec, _p)
+        try:
+            self.enterOuterAlt(localctx, 1)
+            self.state = 268
+            self._errHandler.sync(self)
+            la_ = self._interp.adaptivePredict(self._input,36,self._ctx)
+            if la_ == 1:
+                localctx = ManifestParser.ItemSetSpec_refContext(self, localctx)
+                self._ctx = localctx
+                _prevctx = localctx
+
+                self.state = 259
+                self.ref()
+                pass
+
+            elif la_ == 2:
+                localctx = ManifestParser.ItemSetSpec_tagContext(self, localctx)
+                self._ctx = localctx
+                _prevctx = localctx
+                self.state = 260
+                self.tag()
+                pass
+
+            elif la_ == 3:
+                localctx = ManifestParser.ItemSetSpec_groupContext(self, localctx)
+                self._ctx = localctx
+                _prevctx = localctx
+                self.state = 261
+                self.setOpen()
+                self.state = 262
+                self.itemSetSpec(0)
+                self.state = 263
+                self.setClose()
+                pass
+
+            elif la_ == 4:
+                localctx = ManifestParser.ItemSetSpec_complementContext(self, localctx)
+                self._ctx = localctx
+                _prevctx = localctx
+                self.state = 265
+                self.setComplementOperator()
+                self.state = 266
+                self.itemSetSpec(2)
+                pass
+
+
+            self._ctx.stop = self._input.LT(-1)
+            self.state = 276
+            self._errHandler.sync(self)
+            _alt = self._interp.adaptivePredict(self._input,37,self._ctx)
+            while _alt!=2 and _alt!=ATN.INVALID_ALT_NUMBER:
+                if _alt==1:
+                    if self._parseListeners is not None:
+                        self.triggerExitRuleEvent()
+                    _prevctx = localctx
+                    localctx = ManifestParser.ItemSetSpec_opContext(self, ManifestParser.ItemSetSpecContext(self, _parentctx, _parentState))
+                    self.pushNewRecursionContext(localctx, _startState, self.RULE_itemSetSpec)
+                    self.state = 270
+                    if not self.precpred(self._ctx, 1):
+                        from antlr4.error.Errors import FailedPredicateException
+                        raise FailedPredicateException(self, "self.precpred(self._ctx, 1)")
+                    self.state = 271
+                    self.setItemOperator()
+                    self.state = 272
+                    self.itemSetSpec(2) 
+                self.state = 278
+                self._errHandler.sync(self)
+                _alt = self._interp.adaptivePredict(self._input,37,self._ctx)
+
+        except RecognitionException as re:
+            localctx.exception = re
+            self._errHandler.reportError(self, re)
+            self._errHandler.recover(self, re)
+        finally:
+            self.unrollRecursionContexts(_parentctx)
+        return localctx
+
+
+    class RefContext(ParserRuleContext):
+        __slots__ = 'parser'
+
+        def __init__(self, parser, parent:ParserRuleContext=None, invokingState:int=-1):
+            super().__init__(parent, invokingState)
+            self.parser = parser
+
+        def literalBlock(self):
+            return self.getTypedRuleContext(ManifestParser.LiteralBlockContext,0)
+
+
+        def NAME(self):
+            return self.getToken(ManifestParser.NAME, 0)
+
+        def PATH(self):
+            return self.getToken(ManifestParser.PATH, 0)
+
+        def getRuleIndex(self):
+            return ManifestParser.RULE_ref
+
+        def enterRule(self, listener:ParseTreeListener):
+            if hasattr( listener, "enterRef" ):
+                listener.enterRef(self)
+
+        def exitRule(self, listener:ParseTreeListener):
+            if hasattr( listener, "exitRef" ):
+                listener.exitRef(self)
+
+
+
+
+    def ref(self):
+
+        localctx = ManifestParser.RefContext(self, self._ctx, self.state)
+        self.enterRule(localctx, 20, self.RULE_ref)
+        try:
+            self.state = 282
+            self._errHandler.sync(self)
+            token = self._input.LA(1)
+            if token in [16]:
+                self.enterOuterAlt(localctx, 1)
+                self.state = 279
+                self.literalBlock()
+                pass
+            elif token in [17]:
+                self.enterOuterAlt(localctx, 2)
+                self.state = 280
+                self.match(ManifestParser.NAME)
+                pass
+            elif token in [18]:
+                self.enterOuterAlt(localctx, 3)
+                self.state = 281
+                self.match(ManifestParser.PATH)
+                pass
+            else:
+                raise NoViableAltException(self)
+
+        except RecognitionException as re:
+            localctx.exception = re
+            self._errHandler.reportError(self, re)
+            self._errHandler.recover(self, re)
+        finally:
+            self.exitRule()
+        return localctx
+
+
+    class TagContext(ParserRuleContext):
+        __slots__ = 'parser'
+
+        def __init__(self, parser, parent:ParserRuleContext=None, invokingState:int=-1):
+            super().__init__(parent, invokingState)
+            self.parser = parser
+
+        def kvPair(self):
+            return self.getTypedRuleContext(ManifestParser.KvPairContext,0)
+
+
+        def getRuleIndex(self):
+            return ManifestParser.RULE_tag
+
+        def enterRule(self, listener:ParseTreeListener):
+            if hasattr( listener, "enterTag" ):
+                listener.enterTag(self)
+
+        def exitRule(self, listener:ParseTreeListener):
+            if hasattr( listener, "exitTag" ):
+                listener.exitTag(self)
+
+
+
+
+    def tag(self):
+
+        localctx = ManifestParser.TagContext(self, self._ctx, self.state)
+        self.enterRule(localctx, 22, self.RULE_tag)
+        try:
+            self.enterOuterAlt(localctx, 1)
+            self.state = 284
+            self.kvPair()
+        except RecognitionException as re:
+            localctx.exception = re
+            self._errHandler.reportError(self, re)
+            self._errHandler.recover(self, re)
+        finally:
+            self.exitRule()
+        return localctx
+
+
+    class KvPairContext(ParserRuleContext):
+        __slots__ = 'parser'
+
+        def __init__(self, parser, parent:ParserRuleContext=None, invokingState:int=-1):
+            super().__init__(parent, invokingState)
+            self.parser = parser
+
+        def name(self):
+            return self.getTypedRuleContext(ManifestParser.NameContext,0)
+
+
+        def kvSeparator(self):
+            return self.getTypedRuleContext(ManifestParser.KvSeparatorContext,0)
+
+
+        def value(self):
+            return self.getTypedRuleContext(ManifestParser.ValueContext,0)
+
+
+        def getRuleIndex(self):
+            return ManifestParser.RULE_kvPair
+
+        def enterRule(self, listener:ParseTreeListener):
+            if hasattr( listener, "enterKvPair" ):
+                listener.enterKvPair(self)
+
+        def exitRule(self, listener:ParseTreeListener):
+            if hasattr( listener, "exitKvPair" ):
+                listener.exitKvPair(self)
+
+
+
+
+    def kvPair(self):
+
+        localctx = ManifestParser.KvPairContext(self, self._ctx, self.state)
+        self.enterRule(localctx, 24, self.RULE_kvPair)
+        try:
+            self.enterOuterAlt(localctx, 1)
+            self.state = 286
+            self.name()
+            self.state = 290
+            self._errHandler.sync(self)
+            la_ = self._interp.adaptivePredict(self._input,39,self._ctx)
+            if la_ == 1:
+                self.state = 287
+                self.kvSeparator()
+                self.state = 288
+                self.value()
+
+
+        except RecognitionException as re:
+            localctx.exception = re
+            self._errHandler.reportError(self, re)
+            self._errHandler.recover(self, re)
+        finally:
+            self.exitRule()
+        return localctx
+
+
+    class NameContext(ParserRuleContext):
+        __slots__ = 'parser'
+
+        def __init__(self, parser, parent:ParserRuleContext=None, invokingState:int=-1):
+            super().__init__(parent, invokingState)
+            self.parser = parser
+
+        def literalBlock(self):
+            return self.getTypedRuleContext(ManifestParser.LiteralBlockContext,0)
+
+
+        def NAME(self):
+            return self.getToken(ManifestParser.NAME, 0)
+
+        def getRuleIndex(self):
+            return ManifestParser.RULE_name
+
+        def enterRule(self, listener:ParseTreeListener):
+            if hasattr( listener, "enterName" ):
+                listener.enterName(self)
+
+        def exitRule(self, listener:ParseTreeListener):
+            if hasattr( listener, "exitName" ):
+                listener.exitName(self)
+
+
+
+
+    def name(self):
+
+        localctx = ManifestParser.NameContext(self, self._ctx, self.state)
+        self.enterRule(localctx, 26, self.RULE_name)
+        try:
+            self.enterOuterAlt(localctx, 1)
+            self.state = 294
+            self._errHandler.sync(self)
+            token = self._input.LA(1)
+            if token in [16]:
+                self.state = 292
+                self.literalBlock()
+                pass
+            elif token in [17]:
+                self.state = 293
+                self.match(ManifestParser.NAME)
+                pass
+            else:
+                raise NoViableAltException(self)
+
+        except RecognitionException as re:
+            localctx.exception = re
+            self._errHandler.reportError(self, re)
+            self._errHandler.recover(self, re)
+        finally:
+            self.exitRule()
+        return localctx
+
+
+    class ValueContext(ParserRuleContext):
+        __slots__ = 'parser'
+
+        def __init__(self, parser, parent:ParserRuleContext=None, invokingState:int=-1):
+            super().__init__(parent, invokingState)
+            self.parser = parser
+
+        def literalBlock(self):
+            return self.getTypedRuleContext(ManifestParser.LiteralBlockContext,0)
+
+
+        def toEndOfItem(self):
+            return self.getTypedRuleContext(ManifestParser.ToEndOfItemContext,0)
+
+
+        def getRuleIndex(self):
+            return ManifestParser.RULE_value
+
+        def enterRule(self, listener:ParseTreeListener):
+            if hasattr( listener, "enterValue" ):
+                listener.enterValue(self)
+
+        def exitRule(self, listener:ParseTreeListener):
+            if hasattr( listener, "exitValue" ):
+                listener.exitValue(self)
+
+
+
+
+    def value(self):
+
+        localctx = ManifestParser.ValueContext(self, self._ctx, self.state)
+        self.enterRule(localctx, 28, self.RULE_value)
+        try:
+            self.enterOuterAlt(localctx, 1)
+            self.state = 298
+            self._errHandler.sync(self)
+            la_ = self._interp.adaptivePredict(self._input,41,self._ctx)
+            if la_ == 1:
+                self.state = 296
+                self.literalBlock()
+                pass
+
+            elif la_ == 2:
+                self.state = 297
+                self.toEndOfItem()
+                pass
+
+
+        except RecognitionException as re:
+            localctx.exception = re
+            self._errHandler.reportError(self, re)
+            self._errHandler.recover(self, re)
+        finally:
+            self.exitRule()
+        return localctx
+
+
+    class KvSeparatorContext(ParserRuleContext):
+        __slots__ = 'parser'
+
+        def __init__(self, parser, parent:ParserRuleContext=None, invokingState:int=-1):
+            super().__init__(parent, invokingState)
+            self.parser = parser
+
+        def KEY_VALUE_SEPARATOR(self):
+            return self.getToken(ManifestParser.KEY_VALUE_SEPARATOR, 0)
+
+        def SPACE(self, i:int=None):
+            if i is None:
+                return self.getTokens(ManifestParser.SPACE)
+            else:
+                return self.getToken(ManifestParser.SPACE, i)
+
+        def getRuleIndex(self):
+            return ManifestParser.RULE_kvSeparator
+
+        def enterRule(self, listener:ParseTreeListener):
+            if hasattr( listener, "enterKvSeparator" ):
+                listener.enterKvSeparator(self)
+
+        def exitRule(self, listener:ParseTreeListener):
+            if hasattr( listener, "exitKvSeparator" ):
+                listener.exitKvSeparator(self)
+
+
+
+
+    def kvSeparator(self):
+
+        localctx = ManifestParser.KvSeparatorContext(self, self._ctx, self.state)
+        self.enterRule(localctx, 30, self.RULE_kvSeparator)
+        self._la = 0 # Token type
+        try:
+            self.enterOuterAlt(localctx, 1)
+            self.state = 301
+            self._errHandler.sync(self)
+            _la = self._input.LA(1)
+            if _la==2:
+                self.state = 300
+                self.match(ManifestParser.SPACE)
+
+
+            self.state = 303
+            self.match(ManifestParser.KEY_VALUE_SEPARATOR)
+            self.state = 305
+            self._errHandler.sync(self)
+            la_ = self._interp.adaptivePredict(self._input,43,self._ctx)
+            if la_ == 1:
+                self.state = 304
+                self.match(ManifestParser.SPACE)
+
+
+        except RecognitionException as re:
+            localctx.exception = re
+            self._errHandler.reportError(self, re)
+            self._errHandler.recover(self, re)
+        finally:
+            self.exitRule()
+        return localctx
+
+
+    class BlockOpenContext(ParserRuleContext):
+        __slots__ = 'parser'
+
+        def __init__(self, parser, parent:ParserRuleContext=None, invokingState:int=-1):
+            super().__init__(parent, invokingState)
+            self.parser = parser
+
+        def BLOCK_OPEN(self):
+            return self.getToken(ManifestParser.BLOCK_OPEN, 0)
+
+        def comment(self):
+            return self.getTypedRuleContext(ManifestParser.CommentContext,0)
+
+
+        def NEWLINE(self):
+            return self.getToken(ManifestParser.NEWLINE, 0)
+
+        def SPACE(self):
+            return self.getToken(ManifestParser.SPACE, 0)
+
+        def getRuleIndex(self):
+            return ManifestParser.RULE_blockOpen
+
+        def enterRule(self, listener:ParseTreeListener):
+            if hasattr( listener, "enterBlockOpen" ):
+                listener.enterBlockOpen(self)
+
+        def exitRule(self, listener:ParseTreeListener):
+            if hasattr( listener, "exitBlockOpen" ):
+                listener.exitBlockOpen(self)
+
+
+
+
+    def blockOpen(self):
+
+        localctx = ManifestParser.BlockOpenContext(self, self._ctx, self.state)
+        self.enterRule(localctx, 32, self.RULE_blockOpen)
+        try:
+            self.enterOuterAlt(localctx, 1)
+            self.state = 307
+            self.match(ManifestParser.BLOCK_OPEN)
+            self.state = 309
+            self._errHandler.sync(self)
+            la_ = self._interp.adaptivePredict(self._input,44,self._ctx)
+            if la_ == 1:
+                self.state = 308
+                self.comment()
+
+
+            self.state = 312
+            self._errHandler.sync(self)
+            la_ = self._interp.adaptivePredict(self._input,45,self._ctx)
+            if la_ == 1:
+                self.state = 311
+                self.match(ManifestParser.NEWLINE)
+
+
+            self.state = 315
+            self._errHandler.sync(self)
+            la_ = self._interp.adaptivePredict(self._input,46,self._ctx)
+            if la_ == 1:
+                self.state = 314
+                self.match(ManifestParser.SPACE)
+
+
+        except RecognitionException as re:
+            localctx.exception = re
+            self._errHandler.reportError(self, re)
+            self._errHandler.recover(self, re)
+        finally:
+            self.exitRule()
+        return localctx
+
+
+    class BlockCloseContext(ParserRuleContext):
+        __slots__ = 'parser'
+
+        def __init__(self, parser, parent:ParserRuleContext=None, invokingState:int=-1):
+            super().__init__(parent, invokingState)
+            self.parser = parser
+
+        def BLOCK_CLOSE(self):
+            return self.getToken(ManifestParser.BLOCK_CLOSE, 0)
+
+        def NEWLINE(self):
+            return self.getToken(ManifestParser.NEWLINE, 0)
+
+        def SPACE(self):
+            return self.getToken(ManifestParser.SPACE, 0)
+
+        def comment(self):
+            return self.getTypedRuleContext(ManifestParser.CommentContext,0)
+
+
+        def getRuleIndex(self):
+            return ManifestParser.RULE_blockClose
+
+        def enterRule(self, listener:ParseTreeListener):
+            if hasattr( listener, "enterBlockClose" ):
+                listener.enterBlockClose(self)
+
+        def exitRule(self, listener:ParseTreeListener):
+            if hasattr( listener, "exitBlockClose" ):
+                listener.exitBlockClose(self)
+
+
+
+
+    def blockClose(self):
+
+        localctx = ManifestParser.BlockCloseContext(self, self._ctx, self.state)
+        self.enterRule(localctx, 34, self.RULE_blockClose)
+        self._la = 0 # Token type
+        try:
+            self.enterOuterAlt(localctx, 1)
+            self.state = 318
+            self._errHandler.sync(self)
+            _la = self._input.LA(1)
+            if _la==1:
+                self.state = 317
+                self.match(ManifestParser.NEWLINE)
+
+
+            self.state = 321
+            self._errHandler.sync(self)
+            _la = self._input.LA(1)
+            if _la==2:
+                self.state = 320
+                self.match(ManifestParser.SPACE)
+
+
+            self.state = 323
+            self.match(ManifestParser.BLOCK_CLOSE)
+            self.state = 325
+            self._errHandler.sync(self)
+            la_ = self._interp.adaptivePredict(self._input,49,self._ctx)
+            if la_ == 1:
+                self.state = 324
+                self.comment()
+
+
+        except RecognitionException as re:
+            localctx.exception = re
+            self._errHandler.reportError(self, re)
+            self._errHandler.recover(self, re)
+        finally:
+            self.exitRule()
+        return localctx
+
+
+    class BlockItemSeparatorContext(ParserRuleContext):
+        __slots__ = 'parser'
+
+        def __init__(self, parser, parent:ParserRuleContext=None, invokingState:int=-1):
+            super().__init__(parent, invokingState)
+            self.parser = parser
+
+        def NEWLINE(self):
+            return self.getToken(ManifestParser.NEWLINE, 0)
+
+        def comment(self):
+            return self.getTypedRuleContext(ManifestParser.CommentContext,0)
+
+
+        def SPACE(self):
+            return self.getToken(ManifestParser.SPACE, 0)
+
+        def getRuleIndex(self):
+            return ManifestParser.RULE_blockItemSeparator
+
+        def enterRule(self, listener:ParseTreeListener):
+            if hasattr( listener, "enterBlockItemSeparator" ):
+                listener.enterBlockItemSeparator(self)
+
+        def exitRule(self, listener:ParseTreeListener):
+            if hasattr( listener, "exitBlockItemSeparator" ):
+                listener.exitBlockItemSeparator(self)
+
+
+
+
+    def blockItemSeparator(self):
+
+        localctx = ManifestParser.BlockItemSeparatorContext(self, self._ctx, self.state)
+        self.enterRule(localctx, 36, self.RULE_blockItemSeparator)
+        self._la = 0 # Token type
+        try:
+            self.enterOuterAlt(localctx, 1)
+            self.state = 328
+            self._errHandler.sync(self)
+            _la = self._input.LA(1)
+            if _la==2 or _la==3:
+                self.state = 327
+                self.comment()
+
+
+            self.state = 330
+            self.match(ManifestParser.NEWLINE)
+            self.state = 332
+            self._errHandler.sync(self)
+            _la = self._input.LA(1)
+            if _la==2:
+                self.state = 331
+                self.match(ManifestParser.SPACE)
+
+
+        except RecognitionException as re:
+            localctx.exception = re
+            self._errHandler.reportError(self, re)
+            self._errHandler.recover(self, re)
+        finally:
+            self.exitRule()
+        return localctx
+
+
+    class DataOpenContext(ParserRuleContext):
+        __slots__ = 'parser'
+
+        def __init__(self, parser, parent:ParserRuleContext=None, invokingState:int=-1):
+            super().__init__(parent, invokingState)
+            self.parser = parser
+
+        def DATA_OPEN(self):
+            return self.getToken(ManifestParser.DATA_OPEN, 0)
+
+        def comment(self):
+            return self.getTypedRuleContext(ManifestParser.CommentContext,0)
+
+
+        def NEWLINE(self):
+            return self.getToken(ManifestParser.NEWLINE, 0)
+
+        def SPACE(self):
+            return self.getToken(ManifestParser.SPACE, 0)
+
+        def getRuleIndex(self):
+            return ManifestParser.RULE_dataOpen
+
+        def enterRule(self, listener:ParseTreeListener):
+            if hasattr( listener, "enterDataOpen" ):
+                listener.enterDataOpen(self)
+
+        def exitRule(self, listener:ParseTreeListener):
+            if hasattr( listener, "exitDataOpen" ):
+                listener.exitDataOpen(self)
+
+
+
+
+    def dataOpen(self):
+
+        localctx = ManifestParser.DataOpenContext(self, self._ctx, self.state)
+        self.enterRule(localctx, 38, self.RULE_dataOpen)
+        self._la = 0 # Token type
+        try:
+            self.enterOuterAlt(localctx, 1)
+            self.state = 334
+            self.match(ManifestParser.DATA_OPEN)
+            self.state = 336
+            self._errHandler.sync(self)
+            la_ = self._interp.adaptivePredict(self._input,52,self._ctx)
+            if la_ == 1:
+                self.state = 335
+                self.comment()
+
+
+            self.state = 339
+            self._errHandler.sync(self)
+            _la = self._input.LA(1)
+            if _la==1:
+                self.state = 338
+                self.match(ManifestParser.NEWLINE)
+
+
+            self.state = 342
+            self._errHandler.sync(self)
+            la_ = self._interp.adaptivePredict(self._input,54,self._ctx)
+            if la_ == 1:
+                self.state = 341
+                self.match(ManifestParser.SPACE)
+
+
+        except RecognitionException as re:
+            localctx.exception = re
+            self._errHandler.reportError(self, re)
+            self._errHandler.recover(self, re)
+        finally:
+            self.exitRule()
+        return localctx
+
+
+    class DataCloseContext(ParserRuleContext):
+        __slots__ = 'parser'
+
+        def __init__(self, parser, parent:ParserRuleContext=None, invokingState:int=-1):
+            super().__init__(parent, invokingState)
+            self.parser = parser
+
+        def DATA_CLOSE(self):
+            return self.getToken(ManifestParser.DATA_CLOSE, 0)
+
+        def NEWLINE(self):
+            return self.getToken(ManifestParser.NEWLINE, 0)
+
+        def SPACE(self):
+            return self.getToken(ManifestParser.SPACE, 0)
+
+        def comment(self):
+            return self.getTypedRuleContext(ManifestParser.CommentContext,0)
+
+
+        def getRuleIndex(self):
+            return ManifestParser.RULE_dataClose
+
+        def enterRule(self, listener:ParseTreeListener):
+            if hasattr( listener, "enterDataClose" ):
+                listener.enterDataClose(self)
+
+        def exitRule(self, listener:ParseTreeListener):
+            if hasattr( listener, "exitDataClose" ):
+                listener.exitDataClose(self)
+
+
+
+
+    def dataClose(self):
+
+        localctx = ManifestParser.DataCloseContext(self, self._ctx, self.state)
+        self.enterRule(localctx, 40, self.RULE_dataClose)
+        self._la = 0 # Token type
+        try:
+            self.enterOuterAlt(localctx, 1)
+            self.state = 345
+            self._errHandler.sync(self)
+            _la = self._input.LA(1)
+            if _la==1:
+                self.state = 344
+                self.match(ManifestParser.NEWLINE)
+
+
+            self.state = 348
+            self._errHandler.sync(self)
+            _la = self._input.LA(1)
+            if _la==2:
+                self.state = 347
+                self.match(ManifestParser.SPACE)
+
+
+            self.state = 350
+            self.match(ManifestParser.DATA_CLOSE)
+            self.state = 352
+            self._errHandler.sync(self)
+            la_ = self._interp.adaptivePredict(self._input,57,self._ctx)
+            if la_ == 1:
+                self.state = 351
+                self.comment()
+
+
+        except RecognitionException as re:
+            localctx.exception = re
+            self._errHandler.reportError(self, re)
+            self._errHandler.recover(self, re)
+        finally:
+            self.exitRule()
+        return localctx
+
+
+    class DataItemSeparatorContext(ParserRuleContext):
+        __slots__ = 'parser'
+
+        def __init__(self, parser, parent:ParserRuleContext=None, invokingState:int=-1):
+            super().__init__(parent, invokingState)
+            self.parser = parser
+
+        def DATA_ITEM_SEPARATOR(self):
+            return self.getToken(ManifestParser.DATA_ITEM_SEPARATOR, 0)
+
+        def NEWLINE(self):
+            return self.getToken(ManifestParser.NEWLINE, 0)
+
+        def SPACE(self, i:int=None):
+            if i is None:
+                return self.getTokens(ManifestParser.SPACE)
+            else:
+                return self.getToken(ManifestParser.SPACE, i)
+
+        def comment(self):
+            return self.getTypedRuleContext(ManifestParser.CommentContext,0)
+
+
+        def getRuleIndex(self):
+            return ManifestParser.RULE_dataItemSeparator
+
+        def enterRule(self, listener:ParseTreeListener):
+            if hasattr( listener, "enterDataItemSeparator" ):
+                listener.enterDataItemSeparator(self)
+
+        def exitRule(self, listener:ParseTreeListener):
+            if hasattr( listener, "exitDataItemSeparator" ):
+                listener.exitDataItemSeparator(self)
+
+
+
+
+    def dataItemSeparator(self):
+
+        localctx = ManifestParser.DataItemSeparatorContext(self, self._ctx, self.state)
+        self.enterRule(localctx, 42, self.RULE_dataItemSeparator)
+        self._la = 0 # Token type
+        try:
+            self.enterOuterAlt(localctx, 1)
+            self.state = 355
+            self._errHandler.sync(self)
+            la_ = self._interp.adaptivePredict(self._input,58,self._ctx)
+            if la_ == 1:
+                self.state = 354
+                self.match(ManifestParser.SPACE)
+
+
+            self.state = 367
+            self._errHandler.sync(self)
+            la_ = self._interp.adaptivePredict(self._input,61,self._ctx)
+            if la_ == 1:
+                self.state = 357
+                self.match(ManifestParser.DATA_ITEM_SEPARATOR)
+                pass
+
+            elif la_ == 2:
+                self.state = 359
+                self._errHandler.sync(self)
+                _la = self._input.LA(1)
+                if _la==2 or _la==3:
+                    self.state = 358
+                    self.comment()
+
+
+                self.state = 361
+                self.match(ManifestParser.NEWLINE)
+                pass
+
+            elif la_ == 3:
+                self.state = 362
+                self.match(ManifestParser.DATA_ITEM_SEPARATOR)
+                self.state = 364
+                self._errHandler.sync(self)
+                _la = self._input.LA(1)
+                if _la==2 or _la==3:
+                    self.state = 363
+                    self.comment()
+
+
+                self.state = 366
+                self.match(ManifestParser.NEWLINE)
+                pass
+
+
+            self.state = 370
+            self._errHandler.sync(self)
+            la_ = self._interp.adaptivePredict(self._input,62,self._ctx)
+            if la_ == 1:
+                self.state = 369
+                self.match(ManifestParser.SPACE)
+
+
+        except RecognitionException as re:
+            localctx.exception = re
+            self._errHandler.reportError(self, re)
+            self._errHandler.recover(self, re)
+        finally:
+            self.exitRule()
+        return localctx
+
+
+    class SetOpenContext(ParserRuleContext):
+        __slots__ = 'parser'
+
+        def __init__(self, parser, parent:ParserRuleContext=None, invokingState:int=-1):
+            super().__init__(parent, invokingState)
+            self.parser = parser
+
+        def SET_OPEN(self):
+            return self.getToken(ManifestParser.SET_OPEN, 0)
+
+        def comment(self):
+            return self.getTypedRuleContext(ManifestParser.CommentContext,0)
+
+
+        def NEWLINE(self):
+            return self.getToken(ManifestParser.NEWLINE, 0)
+
+        def SPACE(self):
+            return self.getToken(ManifestParser.SPACE, 0)
+
+        def getRuleIndex(self):
+            return ManifestParser.RULE_setOpen
+
+        def enterRule(self, listener:ParseTreeListener):
+            if hasattr( listener, "enterSetOpen" ):
+                listener.enterSetOpen(self)
+
+        def exitRule(self, listener:ParseTreeListener):
+            if hasattr( listener, "exitSetOpen" ):
+                listener.exitSetOpen(self)
+
+
+
+
+    def setOpen(self):
+
+        localctx = ManifestParser.SetOpenContext(self, self._ctx, self.state)
+        self.enterRule(localctx, 44, self.RULE_setOpen)
+        self._la = 0 # Token type
+        try:
+            self.enterOuterAlt(localctx, 1)
+            self.state = 372
+            self.match(ManifestParser.SET_OPEN)
+            self.state = 374
+            self._errHandler.sync(self)
+            la_ = self._interp.adaptivePredict(self._input,63,self._ctx)
+            if la_ == 1:
+                self.state = 373
+                self.comment()
+
+
+            self.state = 377
+            self._errHandler.sync(self)
+            _la = self._input.LA(1)
+            if _la==1:
+                self.state = 376
+                self.match(ManifestParser.NEWLINE)
+
+
+            self.state = 380
+            self._errHandler.sync(self)
+            _la = self._input.LA(1)
+            if _la==2:
+                self.state = 379
+                self.match(ManifestParser.SPACE)
+
+
+        except RecognitionException as re:
+            localctx.exception = re
+            self._errHandler.reportError(self, re)
+            self._errHandler.recover(self, re)
+        finally:
+            self.exitRule()
+        return localctx
+
+
+    class SetCloseContext(ParserRuleContext):
+        __slots__ = 'parser'
+
+        def __init__(self, parser, parent:ParserRuleContext=None, invokingState:int=-1):
+            super().__init__(parent, invokingState)
+            self.parser = parser
+
+        def SET_CLOSE(self):
+            return self.getToken(ManifestParser.SET_CLOSE, 0)
+
+        def NEWLINE(self):
+            return self.getToken(ManifestParser.NEWLINE, 0)
+
+        def SPACE(self):
+            return self.getToken(ManifestParser.SPACE, 0)
+
+        def comment(self):
+            return self.getTypedRuleContext(ManifestParser.CommentContext,0)
+
+
+        def getRuleIndex(self):
+            return ManifestParser.RULE_setClose
+
+        def enterRule(self, listener:ParseTreeListener):
+            if hasattr( listener, "enterSetClose" ):
+                listener.enterSetClose(self)
+
+        def exitRule(self, listener:ParseTreeListener):
+            if hasattr( listener, "exitSetClose" ):
+                listener.exitSetClose(self)
+
+
+
+
+    def setClose(self):
+
+        localctx = ManifestParser.SetCloseContext(self, self._ctx, self.state)
+        self.enterRule(localctx, 46, self.RULE_setClose)
+        self._la = 0 # Token type
+        try:
+            self.enterOuterAlt(localctx, 1)
+            self.state = 383
+            self._errHandler.sync(self)
+            _la = self._input.LA(1)
+            if _la==1:
+                self.state = 382
+                self.match(ManifestParser.NEWLINE)
+
+
+            self.state = 386
+            self._errHandler.sync(self)
+            _la = self._input.LA(1)
+            if _la==2:
+                self.state = 385
+                self.match(ManifestParser.SPACE)
+
+
+            self.state = 388
+            self.match(ManifestParser.SET_CLOSE)
+            self.state = 390
+            self._errHandler.sync(self)
+            la_ = self._interp.adaptivePredict(self._input,68,self._ctx)
+            if la_ == 1:
+                self.state = 389
+                self.comment()
+
+
+        except RecognitionException as re:
+            localctx.exception = re
+            self._errHandler.reportError(self, re)
+            self._errHandler.recover(self, re)
+        finally:
+            self.exitRule()
+        return localctx
+
+
+    class SetItemOperatorContext(ParserRuleContext):
+        __slots__ = 'parser'
+
+        def __init__(self, parser, parent:ParserRuleContext=None, invokingState:int=-1):
+            super().__init__(parent, invokingState)
+            self.parser = parser
+            self.operator = None # Token
+
+        def SET_ITEM_OPERATOR(self):
+            return self.getToken(ManifestParser.SET_ITEM_OPERATOR, 0)
+
+        def SET_DIFFERENCE_OPERATOR(self):
+            return self.getToken(ManifestParser.SET_DIFFERENCE_OPERATOR, 0)
+
+        def NEWLINE(self, i:int=None):
+            if i is None:
+                return self.getTokens(ManifestParser.NEWLINE)
+            else:
+                return self.getToken(ManifestParser.NEWLINE, i)
+
+        def SPACE(self, i:int=None):
+            if i is None:
+                return self.getTokens(ManifestParser.SPACE)
+            else:
+                return self.getToken(ManifestParser.SPACE, i)
+
+        def comment(self, i:int=None):
+            if i is None:
+                return self.getTypedRuleContexts(ManifestParser.CommentContext)
+            else:
+                return self.getTypedRuleContext(ManifestParser.CommentContext,i)
+
+
+        def getRuleIndex(self):
+            return ManifestParser.RULE_setItemOperator
+
+        def enterRule(self, listener:ParseTreeListener):
+            if hasattr( listener, "enterSetItemOperator" ):
+                listener.enterSetItemOperator(self)
+
+        def exitRule(self, listener:ParseTreeListener):
+            if hasattr( listener, "exitSetItemOperator" ):
+                listener.exitSetItemOperator(self)
+
+
+
+
+    def setItemOperator(self):
+
+        localctx = ManifestParser.SetItemOperatorContext(self, self._ctx, self.state)
+        self.enterRule(localctx, 48, self.RULE_setItemOperator)
+        self._la = 0 # Token type
+        try:
+            self.enterOuterAlt(localctx, 1)
+            self.state = 396
+            self._errHandler.sync(self)
+            la_ = self._interp.adaptivePredict(self._input,70,self._ctx)
+            if la_ == 1:
+                self.state = 393
+                self._errHandler.sync(self)
+                _la = self._input.LA(1)
+                if _la==2 or _la==3:
+                    self.state = 392
+                    self.comment()
+
+
+                self.state = 395
+                self.match(ManifestParser.NEWLINE)
+
+
+            self.state = 399
+            self._errHandler.sync(self)
+            _la = self._input.LA(1)
+            if _la==2:
+                self.state = 398
+                self.match(ManifestParser.SPACE)
+
+
+            self.state = 401
+            localctx.operator = self._input.LT(1)
+            _la = self._input.LA(1)
+            if not(_la==12 or _la==13):
+                localctx.operator = self._errHandler.recoverInline(self)
+            else:
+                self._errHandler.reportMatch(self)
+                self.consume()
+            self.state = 406
+            self._errHandler.sync(self)
+            la_ = self._interp.adaptivePredict(self._input,73,self._ctx)
+            if la_ == 1:
+                self.state = 403
+                self._errHandler.sync(self)
+                _la = self._input.LA(1)
+                if _la==2 or _la==3:
+                    self.state = 402
+                    self.comment()
+
+
+                self.state = 405
+                self.match(ManifestParser.NEWLINE)
+
+
+            self.state = 409
+            self._errHandler.sync(self)
+            _la = self._input.LA(1)
+            if _la==2:
+                self.state = 408
+                self.match(ManifestParser.SPACE)
+
+
+        except RecognitionException as re:
+            localctx.exception = re
+            self._errHandler.reportError(self, re)
+            self._errHandler.recover(self, re)
+        finally:
+            self.exitRule()
+        return localctx
+
+
+    class SetComplementOperatorContext(ParserRuleContext):
+        __slots__ = 'parser'
+
+        def __init__(self, parser, parent:ParserRuleContext=None, invokingState:int=-1):
+            super().__init__(parent, invokingState)
+            self.parser = parser
+
+        def SET_COMPLEMENT_OPERATOR(self):
+            return self.getToken(ManifestParser.SET_COMPLEMENT_OPERATOR, 0)
+
+        def SPACE(self):
+            return self.getToken(ManifestParser.SPACE, 0)
+
+        def getRuleIndex(self):
+            return ManifestParser.RULE_setComplementOperator
+
+        def enterRule(self, listener:ParseTreeListener):
+            if hasattr( listener, "enterSetComplementOperator" ):
+                listener.enterSetComplementOperator(self)
+
+        def exitRule(self, listener:ParseTreeListener):
+            if hasattr( listener, "exitSetComplementOperator" ):
+                listener.exitSetComplementOperator(self)
+
+
+
+
+    def setComplementOperator(self):
+
+        localctx = ManifestParser.SetComplementOperatorContext(self, self._ctx, self.state)
+        self.enterRule(localctx, 50, self.RULE_setComplementOperator)
+        self._la = 0 # Token type
+        try:
+            self.enterOuterAlt(localctx, 1)
+            self.state = 411
+            self.match(ManifestParser.SET_COMPLEMENT_OPERATOR)
+            self.state = 413
+            self._errHandler.sync(self)
+            _la = self._input.LA(1)
+            if _la==2:
+                self.state = 412
+                self.match(ManifestParser.SPACE)
+
+
+        except RecognitionException as re:
+            localctx.exception = re
+            self._errHandler.reportError(self, re)
+            self._errHandler.recover(self, re)
+        finally:
+            self.exitRule()
+        return localctx
+
+
+    class CommentContext(ParserRuleContext):
+        __slots__ = 'parser'
+
+        def __init__(self, parser, parent:ParserRuleContext=None, invokingState:int=-1):
+            super().__init__(parent, invokingState)
+            self.parser = parser
+
+        def COMMENT_OPEN(self):
+            return self.getToken(ManifestParser.COMMENT_OPEN, 0)
+
+        def commentContent(self):
+            return self.getTypedRuleContext(ManifestParser.CommentContentContext,0)
+
+
+        def SPACE(self):
+            return self.getToken(ManifestParser.SPACE, 0)
+
+        def getRuleIndex(self):
+            return ManifestParser.RULE_comment
+
+        def enterRule(self, listener:ParseTreeListener):
+            if hasattr( listener, "enterComment" ):
+                listener.enterComment(self)
+
+        def exitRule(self, listener:ParseTreeListener):
+            if hasattr( listener, "exitComment" ):
+                listener.exitComment(self)
+
+
+
+
+    def comment(self):
+
+        localctx = ManifestParser.CommentContext(self, self._ctx, self.state)
+        self.enterRule(localctx, 52, self.RULE_comment)
+        self._la = 0 # Token type
+        try:
+            self.enterOuterAlt(localctx, 1)
+            self.state = 416
+            self._errHandler.sync(self)
+            _la = self._input.LA(1)
+            if _la==2:
+                self.state = 415
+                self.match(ManifestParser.SPACE)
+
+
+            self.state = 418
+            self.match(ManifestParser.COMMENT_OPEN)
+            self.state = 419
+            self.commentContent()
+        except RecognitionException as re:
+            localctx.exception = re
+            self._errHandler.reportError(self, re)
+            self._errHandler.recover(self, re)
+        finally:
+            self.exitRule()
+        return localctx
+
+
+    class CommentContentContext(ParserRuleContext):
+        __slots__ = 'parser'
+
+        def __init__(self, parser, parent:ParserRuleContext=None, invokingState:int=-1):
+            super().__init__(parent, invokingState)
+            self.parser = parser
+
+        def literalBlock(self):
+            return self.getTypedRuleContext(ManifestParser.LiteralBlockContext,0)
+
+
+        def toEndOfLine(self):
+            return self.getTypedRuleContext(ManifestParser.ToEndOfLineContext,0)
+
+
+        def getRuleIndex(self):
+            return ManifestParser.RULE_commentContent
+
+        def enterRule(self, listener:ParseTreeListener):
+            if hasattr( listener, "enterCommentContent" ):
+                listener.enterCommentContent(self)
+
+        def exitRule(self, listener:ParseTreeListener):
+            if hasattr( listener, "exitCommentContent" ):
+                listener.exitCommentContent(self)
+
+
+
+
+    def commentContent(self):
+
+        localctx = ManifestParser.CommentContentContext(self, self._ctx, self.state)
+        self.enterRule(localctx, 54, self.RULE_commentContent)
+        try:
+            self.state = 423
+            self._errHandler.sync(self)
+            la_ = self._interp.adaptivePredict(self._input,77,self._ctx)
+            if la_ == 1:
+                self.enterOuterAlt(localctx, 1)
+                self.state = 421
+                self.literalBlock()
+                pass
+
+            elif la_ == 2:
+                self.enterOuterAlt(localctx, 2)
+                self.state = 422
+                self.toEndOfLine()
+                pass
+
+
+        except RecognitionException as re:
+            localctx.exception = re
+            self._errHandler.reportError(self, re)
+            self._errHandler.recover(self, re)
+        finally:
+            self.exitRule()
+        return localctx
+
+
+    class ToEndOfItemContext(ParserRuleContext):
+        __slots__ = 'parser'
+
+        def __init__(self, parser, parent:ParserRuleContext=None, invokingState:int=-1):
+            super().__init__(parent, invokingState)
+            self.parser = parser
+
+        def NEWLINE(self, i:int=None):
+            if i is None:
+                return self.getTokens(ManifestParser.NEWLINE)
+            else:
+                return self.getToken(ManifestParser.NEWLINE, i)
+
+        def SPACE(self, i:int=None):
+            if i is None:
+                return self.getTokens(ManifestParser.SPACE)
+            else:
+                return self.getToken(ManifestParser.SPACE, i)
+
+        def DATA_ITEM_SEPARATOR(self, i:int=None):
+            if i is None:
+                return self.getTokens(ManifestParser.DATA_ITEM_SEPARATOR)
+            else:
+                return self.getToken(ManifestParser.DATA_ITEM_SEPARATOR, i)
+
+        def SET_ITEM_OPERATOR(self, i:int=None):
+            if i is None:
+                return self.getTokens(ManifestParser.SET_ITEM_OPERATOR)
+            else:
+                return self.getToken(ManifestParser.SET_ITEM_OPERATOR, i)
+
+        def DATA_CLOSE(self, i:int=None):
+            if i is None:
+                return self.getTokens(ManifestParser.DATA_CLOSE)
+            else:
+                return self.getToken(ManifestParser.DATA_CLOSE, i)
+
+        def SET_CLOSE(self, i:int=None):
+            if i is None:
+                return self.getTokens(ManifestParser.SET_CLOSE)
+            else:
+                return self.getToken(ManifestParser.SET_CLOSE, i)
+
+        def getRuleIndex(self):
+            return ManifestParser.RULE_toEndOfItem
+
+        def enterRule(self, listener:ParseTreeListener):
+            if hasattr( listener, "enterToEndOfItem" ):
+                listener.enterToEndOfItem(self)
+
+        def exitRule(self, listener:ParseTreeListener):
+            if hasattr( listener, "exitToEndOfItem" ):
+                listener.exitToEndOfItem(self)
+
+
+
+
+    def toEndOfItem(self):
+
+        localctx = ManifestParser.ToEndOfItemContext(self, self._ctx, self.state)
+        self.enterRule(localctx, 56, self.RULE_toEndOfItem)
+        self._la = 0 # Token type
+        try:
+            self.enterOuterAlt(localctx, 1)
+            self.state = 428
+            self._errHandler.sync(self)
+            _alt = self._interp.adaptivePredict(self._input,78,self._ctx)
+            while _alt!=2 and _alt!=ATN.INVALID_ALT_NUMBER:
+                if _alt==1:
+                    self.state = 425
+                    _la = self._input.LA(1)
+                    if _la <= 0 or (((_la) & ~0x3f) == 0 and ((1 << _la) & 15110) != 0):
+                        self._errHandler.recoverInline(self)
+                    else:
+                        self._errHandler.reportMatch(self)
+                        self.consume() 
+                self.state = 430
+                self._errHandler.sync(self)
+                _alt = self._interp.adaptivePredict(self._input,78,self._ctx)
+
+        except RecognitionException as re:
+            localctx.exception = re
+            self._errHandler.reportError(self, re)
+            self._errHandler.recover(self, re)
+        finally:
+            self.exitRule()
+        return localctx
+
+
+    class ToEndOfLineContext(ParserRuleContext):
+        __slots__ = 'parser'
+
+        def __init__(self, parser, parent:ParserRuleContext=None, invokingState:int=-1):
+            super().__init__(parent, invokingState)
+            self.parser = parser
+
+        def NEWLINE(self, i:int=None):
+            if i is None:
+                return self.getTokens(ManifestParser.NEWLINE)
+            else:
+                return self.getToken(ManifestParser.NEWLINE, i)
+
+        def getRuleIndex(self):
+            return ManifestParser.RULE_toEndOfLine
+
+        def enterRule(self, listener:ParseTreeListener):
+            if hasattr( listener, "enterToEndOfLine" ):
+                listener.enterToEndOfLine(self)
+
+        def exitRule(self, listener:ParseTreeListener):
+            if hasattr( listener, "exitToEndOfLine" ):
+                listener.exitToEndOfLine(self)
+
+
+
+
+    def toEndOfLine(self):
+
+        localctx = ManifestParser.ToEndOfLineContext(self, self._ctx, self.state)
+        self.enterRule(localctx, 58, self.RULE_toEndOfLine)
+        self._la = 0 # Token type
+        try:
+            self.enterOuterAlt(localctx, 1)
+            self.state = 434
+            self._errHandler.sync(self)
+            _alt = self._interp.adaptivePredict(self._input,79,self._ctx)
+            while _alt!=2 and _alt!=ATN.INVALID_ALT_NUMBER:
+                if _alt==1:
+                    self.state = 431
+                    _la = self._input.LA(1)
+                    if _la <= 0 or _la==1:
+                        self._errHandler.recoverInline(self)
+                    else:
+                        self._errHandler.reportMatch(self)
+                        self.consume() 
+                self.state = 436
+                self._errHandler.sync(self)
+                _alt = self._interp.adaptivePredict(self._input,79,self._ctx)
+
+        except RecognitionException as re:
+            localctx.exception = re
+            self._errHandler.reportError(self, re)
+            self._errHandler.recover(self, re)
+        finally:
+            self.exitRule()
+        return localctx
+
+
+    class LiteralBlockContext(ParserRuleContext):
+        __slots__ = 'parser'
+
+        def __init__(self, parser, parent:ParserRuleContext=None, invokingState:int=-1):
+            super().__init__(parent, invokingState)
+            self.parser = parser
+
+        def LITERAL_WRAPPER(self, i:int=None):
+            if i is None:
+                return self.getTokens(ManifestParser.LITERAL_WRAPPER)
+            else:
+                return self.getToken(ManifestParser.LITERAL_WRAPPER, i)
+
+        def literal(self):
+            return self.getTypedRuleContext(ManifestParser.LiteralContext,0)
+
+
+        def getRuleIndex(self):
+            return ManifestParser.RULE_literalBlock
+
+        def enterRule(self, listener:ParseTreeListener):
+            if hasattr( listener, "enterLiteralBlock" ):
+                listener.enterLiteralBlock(self)
+
+        def exitRule(self, listener:ParseTreeListener):
+            if hasattr( listener, "exitLiteralBlock" ):
+                listener.exitLiteralBlock(self)
+
+
+
+
+    def literalBlock(self):
+
+        localctx = ManifestParser.LiteralBlockContext(self, self._ctx, self.state)
+        self.enterRule(localctx, 60, self.RULE_literalBlock)
+        try:
+            self.enterOuterAlt(localctx, 1)
+            self.state = 437
+            self.match(ManifestParser.LITERAL_WRAPPER)
+            self.state = 438
+            self.literal()
+            self.state = 439
+            self.match(ManifestParser.LITERAL_WRAPPER)
+        except RecognitionException as re:
+            localctx.exception = re
+            self._errHandler.reportError(self, re)
+            self._errHandler.recover(self, re)
+        finally:
+            self.exitRule()
+        return localctx
+
+
+    class LiteralContext(ParserRuleContext):
+        __slots__ = 'parser'
+
+        def __init__(self, parser, parent:ParserRuleContext=None, invokingState:int=-1):
+            super().__init__(parent, invokingState)
+            self.parser = parser
+
+        def LITERAL_WRAPPER(self, i:int=None):
+            if i is None:
+                return self.getTokens(ManifestParser.LITERAL_WRAPPER)
+            else:
+                return self.getToken(ManifestParser.LITERAL_WRAPPER, i)
+
+        def getRuleIndex(self):
+            return ManifestParser.RULE_literal
+
+        def enterRule(self, listener:ParseTreeListener):
+            if hasattr( listener, "enterLiteral" ):
+                listener.enterLiteral(self)
+
+        def exitRule(self, listener:ParseTreeListener):
+            if hasattr( listener, "exitLiteral" ):
+                listener.exitLiteral(self)
+
+
+
+
+    def literal(self):
+
+        localctx = ManifestParser.LiteralContext(self, self._ctx, self.state)
+        self.enterRule(localctx, 62, self.RULE_literal)
+        self._la = 0 # Token type
+        try:
+            self.enterOuterAlt(localctx, 1)
+            self.state = 444
+            self._errHandler.sync(self)
+            _la = self._input.LA(1)
+            while (((_la) & ~0x3f) == 0 and ((1 << _la) & 983038) != 0):
+                self.state = 441
+                _la = self._input.LA(1)
+                if _la <= 0 or _la==16:
+                    self._errHandler.recoverInline(self)
+                else:
+                    self._errHandler.reportMatch(self)
+                    self.consume()
+                self.state = 446
+                self._errHandler.sync(self)
+                _la = self._input.LA(1)
+
+        except RecognitionException as re:
+            localctx.exception = re
+            self._errHandler.reportError(self, re)
+            self._errHandler.recover(self, re)
+        finally:
+            self.exitRule()
+        return localctx
+
+
+
+    def sempred(self, localctx:RuleContext, ruleIndex:int, predIndex:int):
+        if self._predicates == None:
+            self._predicates = dict()
+        self._predicates[9] = self.itemSetSpec_sempred
+        pred = self._predicates.get(ruleIndex, None)
+        if pred is None:
+            raise Exception("No predicate with index:" + str(ruleIndex))
+        else:
+            return pred(localctx, predIndex)
+
+    def itemSetSpec_sempred(self, localctx:ItemSetSpecContext, predIndex:int):
+            if predIndex == 0:
+                return self.precpred(self._ctx, 1)
+         
+
+
+
+
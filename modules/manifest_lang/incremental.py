@@ -0,0 +1,343 @@
+from contextlib import contextmanager
+import gc
+from hashlib import md5
+import pickle
+
+from core.exceptions import LIMARException
+from modules.manifest_lang.native_parser import (
+    NativeManifestParser,
+    is_parseable_line,
+    warn_unparsed_content
+)
+
+# Types
+from typing import Any
+from core.modules.log import LogModule
+from modules.manifest import Manifest
+
+Declaration = tuple[str, tuple[Any, ...]]
+
+# The version of the format of pickled ParsedManifests
+FORMAT_VERSION = 2
+
+class ManifestBlock:
+    """
+    The declarations made by one top-level element (a context, declaration, or
+    comment) of a manifest, along with the length and digest of its text
+    (including any newlines after it).
+
+    A block is self-contained if where it ends does not depend on the text
+    after it. Implicit contexts are not self-contained, as they end at the first
+    line that is not one of their declarations. Even so, where the grammar is
+    ambiguous, parsing a block may have looked at the text after it to decide
+    how to parse it. The lookahead is how many characters after the block that
+    parsing it looked at (one more than there were if it looked at the end of
+    the text).
+    """
+
+    __slots__ = (
+        'length', 'digest', 'is_self_contained', 'lookahead', 'declarations'
+    )
+
+    def __init__(self,
+            length: int,
+            digest: bytes,
+            is_self_contained: bool,
+            lookahead: int,
+            declarations: list[Declaration]
+    ):
+        self.length = length
+        self.digest = digest
+        self.is_self_contained = is_self_contained
+        self.lookahead = lookahead
+        self.declarations = declarations
+
+    def __reduce__(self):
+        # Much faster to pickle and unpickle than the default for slots
+        return (
+            ManifestBlock,
+            (
+                self.length,
+                self.digest,
+                self.is_self_contained,
+                self.lookahead,
+                self.declarations
+            )
+        )
+
+class ParsedManifest:
+    """
+    The blocks of a manifest, in order, and the length and digest of any text
+    after them that could not be parsed.
+    """
+
+    __slots__ = ('blocks', 'unparsed_length', 'unparsed_digest')
+
+    def __init__(self,
+            blocks: list[ManifestBlock],
+            unparsed_length: int,
+            unparsed_digest: bytes
+    ):
+        self.blocks = blocks
+        self.unparsed_length = unparsed_length
+        self.unparsed_digest = unparsed_digest
+
+    def replay(self, manifest: Manifest):
+        """
+        Enter the given manifest, make all declarations in this parsed manifest
+        in it, then exit it.
+        """
+
+        manifest.enter()
+        for block in self.blocks:
+            for method, args in block.declarations:
+                getattr(manifest, method)(*args)
+        manifest.exit()
+
+class DeclarationRecorder:
+    """
+    Stands in for a Manifest while parsing, recording the declarations made in
+    it so that they can be replayed into a real Manifest later.
+    """
+
+    def __init__(self):
+        self.declarations: list[Declaration] = []
+
+    def enter_context(self, *args):
+        self.declarations.append(('enter_context', args))
+
+    def exit_context(self, *args):
+        self.declarations.append(('exit_context', args))
+
+    def declare_tag(self, *args):
+        self.declarations.append(('declare_tag', args))
+
+    def declare_item(self, *args):
+        self.declarations.append(('declare_item', args))
+
+    def declare_item_set(self, *args):
+        self.declarations.append(('declare_item_set', args))
+
+def dumps(parsed: ParsedManifest) -> bytes:
+    """Pickle the given parsed manifest."""
+
+    with _gc_paused():
+        return pickle.dumps(parsed)
+
+def loads(data: bytes) -> ParsedManifest:
+    """
+    Unpickle a parsed manifest. Raises ValueError if the data is not a pickled
+    parsed manifest.
+    """
+
+    # Unpickling creates many small container objects, which would otherwise
+    # trigger the garbage collector many times over for no gain.
+    with _gc_paused():
+        try:
+            parsed = pickle.loads(data)
+        except (pickle.UnpicklingError, EOFError) as e:
+            raise ValueError('data is not a pickled parsed manifest') from e
+
+    if not isinstance(parsed, ParsedManifest):
+        raise ValueError('data is not a pickled parsed manifest')
+    return parsed
+
+def parse_manifest_blocks(
+        logger: LogModule,
+        text: str,
+        previous: ParsedManifest | None = None
+) -> ParsedManifest:
+    """
+    Parse the given manifest text into blocks using the native parser.
+
+    If the previously parsed version of the manifest is given, then reuse its
+    blocks wherever they are unchanged at the start and end of the text, and
+    only parse the text between them. This gives the same result as parsing the
+    whole text, but is much faster for small edits to large manifests (eg.
+    appending a few transactions to a finance manifest).
+    """
+
+    prefix, start = _unchanged_prefix(text, previous)
+    suffix, end, unparsed_length = _unchanged_suffix(text, previous, start)
+
+    if end < len(text):
+        # Parse as if the text ended at the unchanged suffix. If the parse
+        # looked past the end of that (eg. for the end of a literal block), then
+        # it may not be the same as parsing the whole text.
+        try:
+            blocks, parsed_to, is_self_contained, reach = _parse_blocks(
+                text, start, end
+            )
+        except LIMARException:
+            reach = None
+
+        if reach is not None and reach <= end:
+            # If the parse ends exactly at the suffix after a newline, and not
+            # in a block that may extend into the suffix, then reuse the suffix
+            if (
+                parsed_to == end and
+                is_self_contained and
+                (end == start or text[end-1] in '\r\n')
+            ):
+                if unparsed_length > 0:
+                    warn_unparsed_content(logger, text, len(text) - unparsed_length)
+                return ParsedManifest(
+                    prefix + blocks + suffix,
+                    unparsed_length,
+                    previous.unparsed_digest # type: ignore (end < len(text) requires a previous manifest)
+                )
+
+            # If the parse stopped before the suffix, then the rest is unparsed
+            if parsed_to < end:
+                warn_unparsed_content(logger, text, parsed_to)
+                return ParsedManifest(
+                    prefix + blocks,
+                    len(text) - parsed_to,
+                    _digest(text[parsed_to:])
+                )
+
+    blocks, parsed_to, _, _ = _parse_blocks(text, start, len(text))
+    if parsed_to < len(text):
+        warn_unparsed_content(logger, text, parsed_to)
+    return ParsedManifest(
+        prefix + blocks,
+        len(text) - parsed_to,
+        _digest(text[parsed_to:])
+    )
+
+def _unchanged_prefix(
+        text: str,
+        previous: ParsedManifest | None
+) -> tuple[list[ManifestBlock], int]:
+    blocks = []
+    start = 0
+    if previous is None:
+        return blocks, start
+
+    # For each block whose parse looked past its end, the number of blocks up
+    # to it, and the furthest offset that parsing them looked at
+    reach = 0
+    reaches: list[tuple[int, int]] = []
+    for block in previous.blocks:
+        end = start + block.length
+        if not (
+            block.is_self_contained and
+            end <= len(text) and
+            # The block must end in the same place when parsing the new text,
+            # ie. at EOF, or after the same newlines (not one fewer or more).
+            (
+                end == len(text) or
+                (text[end-1] in '\r\n' and text[end] not in '\r\n')
+            ) and
+            _digest(text[start:end]) == block.digest
+        ):
+            break
+
+        blocks.append(block)
+        start = end
+        if block.lookahead > 0:
+            reach = max(reach, end + block.lookahead)
+            reaches.append((len(blocks), reach))
+
+    # Parsing the last block may have depended on whether the line after it
+    # could be parsed, which it could (it started another block, or was EOF),
+    # unless it was unparsed, but then that would be within its lookahead.
+    if len(blocks) > 0 and not is_parseable_line(text, start):
+        start -= blocks.pop().length
+
+    # Parsing the blocks must not have looked at any of the changed text
+    while True:
+        while len(reaches) > 0 and reaches[-1][0] > len(blocks):
+            reaches.pop()
+        if len(reaches) == 0 or reaches[-1][1] <= start:
+            break
+        start -= blocks.pop().length
+
+    return blocks, start
+
+def _unchanged_suffix(
+        text: str,
+        previous: ParsedManifest | None,
+        start: int
+) -> tuple[list[ManifestBlock], int, int]:
+    blocks = []
+    end = len(text)
+    if previous is None:
+        return blocks, end, 0
+
+    unparsed_start = end - previous.unparsed_length
+    if (
+        unparsed_start < start or
+        _digest(text[unparsed_start:]) != previous.unparsed_digest
+    ):
+        return blocks, end, 0
+    end = unparsed_start
+
+    for block in reversed(previous.blocks):
+        block_start = end - block.length
+        if (
+            block_start < start or
+            _digest(text[block_start:end]) != block.digest
+        ):
+            break
+
+        blocks.append(block)
+        end = block_start
+
+    # The new text must be parsed up to the start of a line
+    while end > start and text[end-1] not in '\r\n':
+        if len(blocks) == 0:
+            return [], len(text), 0
+        end += blocks.pop().length
+
+    # Whether the parse would stop at unparsed text depends on the text before
+    # it (eg. blank lines are skipped after a block, but not at the start of
+    # the text), so it can only be reused along with the block before it.
+    if len(blocks) == 0:
+        return [], len(text), 0
+
+    blocks.reverse()
+    return blocks, end, previous.unparsed_length
+
+def _parse_blocks(
+        text: str,
+        start: int,
+        end: int
+) -> tuple[list[ManifestBlock], int, bool, int]:
+    recorder = DeclarationRecorder()
+    parser = NativeManifestParser(
+        manifest=recorder # type: ignore (duck-typed)
+    )
+
+    blocks = []
+    parsed_to = start
+    is_self_contained = True
+    reach = start
+    for next_start, is_self_contained, element_reach in parser.parse_elements(
+        text, start, end
+    ):
+        blocks.append(ManifestBlock(
+            next_start - parsed_to,
+            _digest(text[parsed_to:next_start]),
+            is_self_contained,
+            max(element_reach - next_start, 0),
+            recorder.declarations
+        ))
+        recorder.declarations = []
+        parsed_to = next_start
+        reach = max(reach, element_reach)
+
+    return blocks, parsed_to, is_self_contained, reach
+
+def _digest(text: str) -> bytes:
+    return md5(text.encode()).digest()
+
+@contextmanager
+def _gc_paused():
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
@@ -89,8 +89,19 @@ class ManifestListenerImpl(ManifestListener):
         tag = self._get_kvpair_content(ctx.tag().kvPair())
         self._set_stack.append((tag.name, tag.value))
 
+    def exitItemSetSpec_complement(self,
+            ctx: ManifestParser.ItemSetSpec_complementContext
+    ):
+        self._set_stack = [
+            *self._set_stack[:-1],
+            {
+                'operator': '!',
+                'operand': self._set_stack[-1]
+            }
+        ]
+
     def exitItemSetSpec_op(self, ctx: ManifestParser.ItemSetSpec_opContext):
-        operator = ctx.setItemOperator().SET_ITEM_OPERATOR().getText()
+        operator = ctx.setItemOperator().operator.text # type: ignore (dynamic)
         self._set_stack = [
             *self._set_stack[:-2],
             {
@@ -0,0 +1,990 @@
+from functools import lru_cache
+import re
+import textwrap
+
+from core.exceptions import LIMARException
+
+# Types
+from modules.manifest import Manifest
+from core.modules.log import LogModule
+
+# Token Types
+# --------------------------------------------------
+
+# Named after the tokens in `Manifest.g4`
+NEWLINE = 'NEWLINE'
+SPACE = 'SPACE'
+COMMENT_OPEN = 'COMMENT_OPEN'
+CONTEXT_OPEN = 'CONTEXT_OPEN'
+BLOCK_OPEN = 'BLOCK_OPEN'
+BLOCK_CLOSE = 'BLOCK_CLOSE'
+DATA_OPEN = 'DATA_OPEN'
+DATA_CLOSE = 'DATA_CLOSE'
+DATA_ITEM_SEPARATOR = 'DATA_ITEM_SEPARATOR'
+SET_OPEN = 'SET_OPEN'
+SET_CLOSE = 'SET_CLOSE'
+SET_ITEM_OPERATOR = 'SET_ITEM_OPERATOR'
+SET_DIFFERENCE_OPERATOR = 'SET_DIFFERENCE_OPERATOR'
+SET_COMPLEMENT_OPERATOR = 'SET_COMPLEMENT_OPERATOR'
+KEY_VALUE_SEPARATOR = 'KEY_VALUE_SEPARATOR'
+LITERAL_WRAPPER = 'LITERAL_WRAPPER'
+NAME = 'NAME'
+PATH = 'PATH'
+OTHER = 'OTHER'
+EOF = 'EOF'
+
+_PUNCTUATION = {
+    '#': COMMENT_OPEN,
+    '@': CONTEXT_OPEN,
+    '{': BLOCK_OPEN,
+    '}': BLOCK_CLOSE,
+    '(': DATA_OPEN,
+    ')': DATA_CLOSE,
+    ',': DATA_ITEM_SEPARATOR,
+    '[': SET_OPEN,
+    ']': SET_CLOSE,
+    '&': SET_ITEM_OPERATOR,
+    '|': SET_ITEM_OPERATOR,
+    '!': SET_COMPLEMENT_OPERATOR,
+    ':': KEY_VALUE_SEPARATOR
+}
+
+# NAME and PATH tokens are the longest run of PATH_CHARs. The run is a NAME if
+# it only contains NAME_CHARs, as NAME is declared first in the grammar (which
+# ANTLR uses to break ties between equal-length matches). For the same reason,
+# a lone '-' is a SET_DIFFERENCE_OPERATOR.
+_TOKEN_REGEX = re.compile(
+    r'(\r\n|\n|\r)'
+    r'|([\t ]+)'
+    r'|(""")'
+    r"|([A-Za-z0-9_\-.'/]+)"
+    r'|(.)',
+    re.DOTALL
+)
+_NAME_REGEX = re.compile(r'[A-Za-z0-9_\-]+')
+_NEWLINE_REGEX = re.compile(r'\r|\n')
+
+# Tokens that terminate the `toEndOfItem` rule
+_END_OF_ITEM = frozenset((
+    NEWLINE,
+    SPACE,
+    DATA_ITEM_SEPARATOR,
+    SET_ITEM_OPERATOR,
+    SET_DIFFERENCE_OPERATOR,
+    DATA_CLOSE,
+    SET_CLOSE,
+    EOF
+))
+
+# Tokens within a `toEndOfItem` value that could instead start what follows it
+# (a comment)
+_VALUE_ENDINGS = frozenset((COMMENT_OPEN,))
+
+# Tokens within a comment (ie. within `toEndOfLine`) that could instead start
+# what follows the comment, for comments in each position of the grammar that
+# can be followed by more than a NEWLINE
+_AFTER_DATA_OPEN_COMMENT = frozenset((
+    SPACE, COMMENT_OPEN, LITERAL_WRAPPER, NAME
+))
+_AFTER_CONTEXT_OPT_COMMENT = frozenset((
+    SPACE, COMMENT_OPEN, DATA_ITEM_SEPARATOR, DATA_CLOSE
+))
+_AFTER_DATA_CLOSE_COMMENT = frozenset((SPACE, COMMENT_OPEN, BLOCK_OPEN))
+_AFTER_BLOCK_COMMENT = frozenset((
+    SPACE, COMMENT_OPEN, CONTEXT_OPEN, KEY_VALUE_SEPARATOR, LITERAL_WRAPPER,
+    NAME, PATH, BLOCK_CLOSE
+))
+_AFTER_SET_OPEN_COMMENT = frozenset((
+    SPACE, LITERAL_WRAPPER, NAME, PATH, SET_OPEN, SET_COMPLEMENT_OPERATOR
+))
+_AFTER_SET_CLOSE_COMMENT = frozenset((
+    SPACE, COMMENT_OPEN, SET_ITEM_OPERATOR, SET_DIFFERENCE_OPERATOR, SET_CLOSE
+))
+
+_SET_OPERATORS = frozenset((SET_ITEM_OPERATOR, SET_DIFFERENCE_OPERATOR))
+
+# Tokens that can start a line (after any indentation), other than NEWLINE
+_LINE_START = frozenset((
+    CONTEXT_OPEN, KEY_VALUE_SEPARATOR, LITERAL_WRAPPER, NAME, PATH,
+    COMMENT_OPEN, BLOCK_CLOSE, EOF
+))
+
+# Tokens that can start a `ref` or a `name`
+_REF_START = frozenset((LITERAL_WRAPPER, NAME, PATH))
+_NAME_START = frozenset((LITERAL_WRAPPER, NAME))
+
+class NativeManifestParser:
+    """
+    A hand-written recursive-descent parser for the manifest language.
+
+    Recognises the same language as the ANTLR4 grammar in `Manifest.g4` and
+    drives the given Manifest in the same way (and in the same order) as walking
+    the ANTLR4 parse tree with `ManifestListenerImpl`, but without importing
+    ANTLR4 or building a parse tree.
+
+    Unlike the ANTLR4 parser, syntax errors are not recovered from. Instead, a
+    LIMARException is raised that gives the location of the error.
+
+    Where the grammar is ambiguous (eg. where a comment or a value could end
+    early, before a `)` or a `#` on the same line), ANTLR4's adaptive prediction
+    picks the first alternative that completes the parse. The native parser
+    emulates this by backtracking over those choices within each declaration,
+    context opening, and comment line, but only looks as far as the start of
+    the next line to check that an alternative completes the parse. So where
+    ANTLR4 would end a comment early (or continue it over several lines, with a
+    literal block) because of something further on, the native parser may
+    instead raise an error, or stop parsing with a warning.
+
+    For details of the expected structure of a manifest file, see the Manifest
+    MM module's docstring.
+    """
+
+    def __init__(self,
+            logger: LogModule | None = None,
+            manifest: Manifest | None = None
+    ):
+        # Neither are needed to compile item set specs
+        self._logger = logger
+        self._manifest = manifest
+
+    # Entry Points
+    # --------------------------------------------------
+
+    def parse_manifest(self, text: str):
+        """Parse the given text as a `manifest`."""
+
+        assert self._logger is not None and self._manifest is not None, 'a logger and manifest are required to parse a manifest'
+        self._manifest.enter()
+        parsed_to = 0
+        for parsed_to, _, _ in self.parse_elements(text):
+            pass
+        if parsed_to < len(text):
+            # The ANTLR4 parser silently stops here, so do the same, but let
+            # the user know about it.
+            warn_unparsed_content(self._logger, text, parsed_to)
+        self._manifest.exit()
+
+    def parse_elements(self, text: str, start: int = 0, end: int | None = None):
+        """
+        Parse the given text from the given offset (which must be the start of
+        a line) as the top-level elements (contexts, declarations, and comments)
+        of a `manifest`, without entering or exiting the manifest.
+
+        If `end` is given (which must also be the start of a line), then parse
+        the text as if it ended there.
+
+        After parsing each element, yield the offset the next element starts at
+        (after any newlines), whether the element is self-contained, ie.
+        whether it would be parsed the same regardless of the text that follows
+        it, and how far into the text its parse looked. Only implicitly-scoped
+        contexts are not self-contained, as they extend over all of the
+        declarations that follow them. How far the parse looked is an offset,
+        which is one past the end of the text if the parse depended on the text
+        ending there. It does not cover whether the line after the element
+        could be parsed, which the parse may also depend on (see
+        `is_parseable_line()`).
+
+        Stop at the first line that does not start an element. If that is not
+        the end of the text, then the rest of the text was not parsed.
+        """
+
+        assert self._manifest is not None, 'a manifest is required to parse a manifest'
+        self._tokenise(text, start, end)
+
+        while True:
+            self._reach = self._pos
+            type = self._types[self._pos]
+            is_self_contained = True
+            if type == CONTEXT_OPEN:
+                is_self_contained = self._context()
+            elif type == KEY_VALUE_SEPARATOR or type in _REF_START:
+                self._declaration()
+            elif type == COMMENT_OPEN or (
+                type == SPACE and self._la(1) == COMMENT_OPEN
+            ):
+                self._attempt(self._comment_line)
+            else:
+                break
+
+            if self._types[self._pos] != EOF:
+                self._match(NEWLINE)
+                self._skip(NEWLINE)
+            yield self._offsets[self._pos], is_self_contained, self._reach_offset()
+
+    def parse_item_set(self, text: str):
+        """
+        Parse the given text as a single `itemSet`, declaring it in the
+        (already-entered) manifest.
+        """
+
+        assert self._manifest is not None, 'a manifest is required to parse an item set'
+        self._tokenise(text)
+        ref, ops_btree = self._attempt(self._item_set_only)
+        self._manifest.declare_item_set(ref, ops_btree)
+
+    def parse_item_set_spec(self, text: str):
+        """
+        Parse the given text as the body of an `itemSet` (ie. an `itemSetSpec`
+        with the same surrounding whitespace and comments allowed as between
+        the brackets of an item set), and return its operator b-tree.
+
+        Does not use the manifest.
+        """
+
+        self._tokenise(f'[{text}]')
+        return self._attempt(self._item_set_spec_only)
+
+    # Rules
+    # --------------------------------------------------
+
+    # explScopedContext / implScopedContext
+    def _context(self, is_in_block: bool = False):
+        # The lines after the context's opening are within it
+        self._depth += 1
+        context_type, context_opts, is_expl_scoped = self._attempt(
+            self._context_opening
+        )
+        self._manifest.enter_context(context_type, context_opts)
+
+        # explScopedContext
+        if is_expl_scoped:
+            self._skip(NEWLINE)
+            while True:
+                type = self._types[self._pos]
+                offset = 0
+                if type == SPACE:
+                    offset = 1
+                    type = self._la(1)
+
+                if type == CONTEXT_OPEN:
+                    self._pos += offset
+                    self._context(is_in_block=True)
+                    self._skip(NEWLINE)
+                elif type == KEY_VALUE_SEPARATOR or type in _REF_START:
+                    self._pos += offset
+                    self._declaration()
+                    self._match(NEWLINE)
+                    self._skip(NEWLINE)
+                elif type == COMMENT_OPEN:
+                    self._attempt(self._comment_line)
+                    self._match(NEWLINE)
+                    self._skip(NEWLINE)
+                else:
+                    break
+            # A block can only be followed by more on the same line if it is
+            # within another block
+            self._depth -= 1
+            self._attempt(
+                self._block_close if is_in_block else self._block_close_line
+            )
+            self._manifest.exit_context()
+
+        # implScopedContext
+        else:
+            self._match_newline_or_eof()
+            while True:
+                type = self._types[self._pos]
+                offset = 0
+                if type == SPACE:
+                    offset = 1
+                    type = self._la(1)
+
+                if type == CONTEXT_OPEN:
+                    self._pos += offset
+                    if self._context():
+                        self._match_newline_or_eof()
+                elif type == KEY_VALUE_SEPARATOR or type in _REF_START:
+                    self._pos += offset
+                    self._declaration()
+                    self._match_newline_or_eof()
+                elif type == COMMENT_OPEN:
+                    self._attempt(self._comment_line)
+                    self._match_newline_or_eof()
+                else:
+                    break
+            self._depth -= 1
+            self._manifest.exit_context()
+            return False
+
+        return True
+
+    def _context_opening(self):
+        # contextHeader (SPACE? blockOpen | comment? NEWLINE)
+        context_type, context_opts = self._context_header()
+
+        if (
+            self._types[self._pos] == BLOCK_OPEN or (
+                self._types[self._pos] == SPACE and
+                self._la(1) == BLOCK_OPEN
+            )
+        ):
+            self._skip(SPACE)
+            self._block_open()
+            return context_type, context_opts, True
+
+        self._optional_comment()
+        self._expect_end_of_line()
+        return context_type, context_opts, False
+
+    def _context_header(self):
+        self._match(CONTEXT_OPEN)
+        context_type = self._text_of(self._match(NAME))
+
+        context_opts = {}
+        if (
+            self._types[self._pos] == DATA_OPEN or (
+                self._types[self._pos] == SPACE and
+                self._la(1) == DATA_OPEN
+            )
+        ):
+            self._skip(SPACE)
+            for name, value in self._data(is_context_header=True):
+                context_opts[name] = value
+
+        return context_type, context_opts
+
+    def _declaration(self):
+        declare, ref, data = self._attempt(self._declaration_body)
+        declare(ref, data)
+
+    def _declaration_body(self):
+        # Returns the Manifest method to declare it with, and its arguments
+        if self._types[self._pos] == KEY_VALUE_SEPARATOR:
+            declaration = (self._manifest.declare_tag, *self._tag_decl())
+        elif self._is_item_set():
+            declaration = (self._manifest.declare_item_set, *self._item_set())
+        else:
+            declaration = (self._manifest.declare_item, *self._item())
+        self._optional_comment()
+        self._expect_end_of_line()
+        return declaration
+
+    def _tag_decl(self):
+        self._match(KEY_VALUE_SEPARATOR)
+        ref = self._ref()
+        return ref, self._tags()
+
+    def _item(self):
+        ref = self._ref()
+        return ref, self._tags()
+
+    def _tags(self):
+        tags = {}
+        if self._types[self._pos] == SPACE and self._la(1) == DATA_OPEN:
+            self._match(SPACE)
+            for name, value in self._data(is_context_header=False):
+                tags[name] = value
+        return tags
+
+    def _is_item_set(self):
+        # ref SPACE SET_OPEN
+        end = self._end_of_ref(self._pos)
+        return (
+            end is not None and
+            self._types[end] == SPACE and
+            self._types[end + 1] == SET_OPEN
+        )
+
+    def _item_set(self):
+        ref = self._ref()
+        self._match(SPACE)
+        self._set_open()
+        ops_btree = self._item_set_spec()
+        self._set_close()
+        return ref, ops_btree
+
+    def _item_set_only(self):
+        item_set = self._item_set()
+        if self._types[self._pos] != EOF:
+            self._error('end of item set')
+        return item_set
+
+    def _item_set_spec_only(self):
+        self._set_open()
+        ops_btree = self._item_set_spec()
+        self._set_close()
+        if self._types[self._pos] != EOF:
+            self._error('end of item set spec')
+        return ops_btree
+
+    def _item_set_spec(self):
+        # Left-associative, with all operators at the same precedence (as
+        # ANTLR4 does with the left-recursive `itemSetSpec` rule).
+        left = self._item_set_spec_primary()
+        while self._is_set_item_operator():
+            operator = self._set_item_operator()
+            right = self._item_set_spec_primary()
+            left = {
+                'operator': operator,
+                'left': left,
+                'right': right
+            }
+        return left
+
+    def _item_set_spec_primary(self):
+        type = self._types[self._pos]
+        if type == SET_COMPLEMENT_OPERATOR:
+            # Binds tighter than the binary operators (as ANTLR4 does with
+            # prefix alternatives of a left-recursive rule).
+            self._pos += 1
+            self._skip(SPACE)
+            return {
+                'operator': '!',
+                'operand': self._item_set_spec_primary()
+            }
+
+        if type == SET_OPEN:
+            self._set_open()
+            ops_btree = self._item_set_spec()
+            self._set_close()
+            return ops_btree
+
+        # A tag without a value is indistinguishable from a ref, in which case
+        # ANTLR4 picks the first alternative (ie. a ref).
+        if type in _NAME_START:
+            end = self._end_of_ref(self._pos)
+            if end is not None and (
+                self._types[end] == KEY_VALUE_SEPARATOR or (
+                    self._types[end] == SPACE and
+                    self._types[end + 1] == KEY_VALUE_SEPARATOR
+                )
+            ):
+                return self._kv_pair()
+
+        return self._ref()
+
+    def _data(self, is_context_header: bool):
+        """
+        Parse a bracketed list of key-value pairs (`contextHeader` options or
+        `item`/`tagDecl` tags) and return a list of (name, value) tuples.
+        """
+
+        kv_pairs = []
+
+        # dataOpen
+        self._match(DATA_OPEN)
+        self._optional_comment(_AFTER_DATA_OPEN_COMMENT)
+        self._skip_one(NEWLINE)
+        self._skip(SPACE)
+        if is_context_header:
+            self._comment_lines()
+
+        kv_pairs.append(self._kv_pair())
+        if is_context_header:
+            self._optional_comment(_AFTER_CONTEXT_OPT_COMMENT)
+
+        while True:
+            saved_pos = self._pos
+            if not self._data_item_separator():
+                break
+            if is_context_header:
+                self._comment_lines()
+            if self._types[self._pos] not in _NAME_START:
+                self._pos = saved_pos
+                break
+
+            kv_pairs.append(self._kv_pair())
+            if is_context_header:
+                self._optional_comment(_AFTER_CONTEXT_OPT_COMMENT)
+
+        # dataClose
+        if is_context_header:
+            while (
+                self._types[self._pos] == NEWLINE and
+                self._is_comment_at(self._pos + 1)
+            ):
+                self._match(NEWLINE)
+                self._comment(_AFTER_CONTEXT_OPT_COMMENT)
+        self._skip_one(NEWLINE)
+        self._skip(SPACE)
+        self._match(DATA_CLOSE)
+        self._optional_comment(_AFTER_DATA_CLOSE_COMMENT)
+
+        return kv_pairs
+
+    def _data_item_separator(self):
+        # SPACE? (',' | comment? NEWLINE | ',' comment? NEWLINE) SPACE?
+        start = self._pos
+        self._skip(SPACE)
+        if self._types[self._pos] == DATA_ITEM_SEPARATOR:
+            self._pos += 1
+            if self._is_comment_at(self._pos):
+                self._comment()
+                self._match(NEWLINE)
+            else:
+                self._skip_one(NEWLINE)
+        else:
+            self._optional_comment()
+            if self._types[self._pos] != NEWLINE:
+                self._pos = start
+                return False
+            self._pos += 1
+        self._skip(SPACE)
+        return True
+
+    def _comment_lines(self):
+        # (comment NEWLINE SPACE?)*
+        while self._is_comment_at(self._pos):
+            self._comment()
+            self._match(NEWLINE)
+            self._skip(SPACE)
+
+    def _kv_pair(self):
+        name = self._name()
+
+        value = None
+        if (
+            self._types[self._pos] == KEY_VALUE_SEPARATOR or (
+                self._types[self._pos] == SPACE and
+                self._la(1) == KEY_VALUE_SEPARATOR
+            )
+        ):
+            self._skip(SPACE)
+            self._match(KEY_VALUE_SEPARATOR)
+            self._skip(SPACE)
+            value = self._value()
+
+        return (name, value)
+
+    def _ref(self):
+        type = self._types[self._pos]
+        if type == LITERAL_WRAPPER:
+            return self._literal_block()
+        elif type == NAME or type == PATH:
+            self._pos += 1
+            return self._texts[self._pos - 1]
+        else:
+            self._error('a ref')
+
+    def _name(self):
+        type = self._types[self._pos]
+        if type == LITERAL_WRAPPER:
+            return self._literal_block()
+        elif type == NAME:
+            self._pos += 1
+            return self._texts[self._pos - 1]
+        else:
+            self._error('a name')
+
+    def _value(self):
+        # literalBlock | toEndOfItem
+        if (
+            self._types[self._pos] == LITERAL_WRAPPER and
+            self._end_of_literal_block(self._pos) is not None and
+            self._choose() == 0
+        ):
+            return self._literal_block()
+
+        # toEndOfItem, which may end early before a comment
+        types = self._types
+        start = self._pos
+        while types[self._pos] not in _END_OF_ITEM:
+            if types[self._pos] in _VALUE_ENDINGS and self._choose() == 1:
+                break
+            self._pos += 1
+        return self._source[self._offsets[start]:self._offsets[self._pos]]
+
+    def _literal_block(self):
+        start = self._pos
+        end = self._end_of_literal_block(start)
+        if end is None:
+            self._error(f"a closing '\"\"\"' for the literal block")
+        self._pos = end
+        literal = self._source[self._offsets[start + 1]:self._offsets[end - 1]]
+        return textwrap.dedent(literal).strip('\n')
+
+    def _block_open(self):
+        # '{' comment? NEWLINE? SPACE?
+        self._match(BLOCK_OPEN)
+        self._optional_comment(_AFTER_BLOCK_COMMENT)
+        self._skip_one(NEWLINE)
+        self._skip(SPACE)
+
+    def _block_close(self):
+        # NEWLINE? SPACE? '}' comment?
+        self._skip_one(NEWLINE)
+        self._skip(SPACE)
+        self._match(BLOCK_CLOSE)
+        self._optional_comment()
+
+    def _block_close_line(self):
+        # blockClose, at the end of a line
+        self._block_close()
+        self._expect_end_of_line()
+
+    def _set_open(self):
+        # '[' comment? NEWLINE? SPACE?
+        self._match(SET_OPEN)
+        self._optional_comment(_AFTER_SET_OPEN_COMMENT)
+        self._skip_one(NEWLINE)
+        self._skip(SPACE)
+
+    def _set_close(self):
+        # NEWLINE? SPACE? ']' comment?
+        self._skip_one(NEWLINE)
+        self._skip(SPACE)
+        self._match(SET_CLOSE)
+        self._optional_comment(_AFTER_SET_CLOSE_COMMENT)
+
+    def _is_set_item_operator(self):
+        if self._is_comment_at(self._pos):
+            return any(
+                self._is_set_item_operator_at(end)
+                for end in self._ends_of_comment(self._pos)
+                if self._types[end] == NEWLINE
+            )
+        return self._is_set_item_operator_at(self._pos)
+
+    def _is_set_item_operator_at(self, pos: int):
+        # NEWLINE? SPACE? [&|-]
+        if self._types[pos] == NEWLINE:
+            pos += 1
+        if self._types[pos] == SPACE:
+            pos += 1
+        self._look_at(pos)
+        return self._types[pos] in _SET_OPERATORS
+
+    def _set_item_operator(self):
+        # (comment? NEWLINE)? SPACE? [&|-] (comment? NEWLINE)? SPACE?
+        self._optional_comment()
+        self._skip_one(NEWLINE)
+        self._skip(SPACE)
+        if self._types[self._pos] not in _SET_OPERATORS:
+            self._error(SET_ITEM_OPERATOR)
+        operator = self._text_of(self._pos)
+        self._pos += 1
+        if self._is_comment_at(self._pos):
+            self._comment()
+            self._match(NEWLINE)
+        else:
+            self._skip_one(NEWLINE)
+        self._skip(SPACE)
+        return operator
+
+    def _optional_comment(self, follow: frozenset[str] = frozenset()):
+        if self._is_comment_at(self._pos):
+            self._comment(follow)
+
+    def _comment(self, follow: frozenset[str] = frozenset()):
+        # SPACE? '#' (literalBlock | toEndOfLine)
+        #
+        # `follow` is the set of tokens (other than NEWLINE) that could follow
+        # the comment in the current position, before which it may end early.
+        if not self._is_comment_at(self._pos):
+            self._error('a comment')
+        self._skip_one(SPACE)
+        self._pos += 1
+
+        types = self._types
+        if (
+            types[self._pos] == LITERAL_WRAPPER and
+            self._end_of_literal_block(self._pos) is not None and
+            self._choose() == 0
+        ):
+            self._pos = self._end_of_literal_block(self._pos)
+            return
+
+        while types[self._pos] != NEWLINE and types[self._pos] != EOF:
+            if types[self._pos] in follow and self._choose() == 1:
+                break
+            self._pos += 1
+
+    def _comment_line(self):
+        # comment, on its own line
+        self._comment()
+        self._expect_end_of_line()
+
+    # Lookahead
+    # --------------------------------------------------
+
+    def _la(self, offset: int):
+        pos = self._pos + offset
+        if pos >= len(self._types):
+            return EOF
+        return self._types[pos]
+
+    def _is_comment_at(self, pos: int):
+        if self._types[pos] == SPACE:
+            pos += 1
+        return self._types[pos] == COMMENT_OPEN
+
+    def _ends_of_comment(self, pos: int):
+        # Where a comment at the given position ends if its content is a
+        # literal block (if it can be), and where it ends otherwise
+        types = self._types
+        if types[pos] == SPACE:
+            pos += 1
+        pos += 1
+        if types[pos] == LITERAL_WRAPPER:
+            end = self._end_of_literal_block(pos)
+            if end is not None:
+                yield end
+        while types[pos] != NEWLINE and types[pos] != EOF:
+            pos += 1
+        yield pos
+
+    def _is_parseable_at(self, pos: int):
+        # Whether the next line from the given position (which must follow a
+        # rule passed to `_attempt()`) starts with something that can be parsed
+        types = self._types
+        while types[pos] == NEWLINE:
+            pos += 1
+        if types[pos] == SPACE:
+            # Only comments can be indented outside of a context
+            if self._depth == 0:
+                is_parseable = types[pos + 1] == COMMENT_OPEN
+            else:
+                is_parseable = types[pos + 1] in _LINE_START
+        else:
+            is_parseable = types[pos] in _LINE_START
+
+        # Only whether the next line is parseable matters, and that is checked
+        # separately when it is (see `is_parseable_line()`), so only record
+        # looking at a line that is not.
+        if not is_parseable:
+            self._look_at(pos + 1)
+        return is_parseable
+
+    def _end_of_ref(self, pos: int):
+        type = self._types[pos]
+        if type == LITERAL_WRAPPER:
+            return self._end_of_literal_block(pos)
+        elif type == NAME or type == PATH:
+            return pos + 1
+        return None
+
+    def _end_of_literal_block(self, pos: int):
+        # The index of the token after the closing LITERAL_WRAPPER, if any
+        try:
+            end = self._types.index(LITERAL_WRAPPER, pos + 1) + 1
+        except ValueError:
+            self._look_at(len(self._types) - 1)
+            return None
+        self._look_at(end - 1)
+        return end
+
+    def _look_at(self, pos: int):
+        # Record that the current element's parse depends on the token at the
+        # given position. Only looking further ahead than the tokens it consumes
+        # (and the one after them) needs to be recorded.
+        if pos > self._reach:
+            self._reach = pos
+
+    def _reach_offset(self):
+        # The offset of the end of the furthest token that the current element's
+        # parse depended on, or one past the end of the text for EOF
+        pos = min(self._reach, len(self._types) - 1)
+        if self._types[pos] == EOF:
+            return self._offsets[pos] + 1
+        return self._offsets[pos] + len(self._texts[pos])
+
+    # Backtracking
+    # --------------------------------------------------
+
+    def _attempt(self, rule):
+        """
+        Parse the given rule (which must not drive the manifest) from the
+        current position, and return its result.
+
+        Each time the rule raises a syntax error, or leaves the parser before
+        something that cannot be parsed, the last choice it made (see
+        `_choose()`) that still has an alternative is switched to it, and the
+        rule is parsed again. If there are no choices left to switch, then
+        return the first result that the rule did parse, or raise the first
+        syntax error if it never did.
+        """
+
+        start = self._pos
+        choices = self._choices = []
+        first_error = None
+        fallback = None
+        while True:
+            self._pos = start
+            self._choice_index = 0
+            try:
+                result = rule()
+                if self._is_parseable_at(self._pos):
+                    return result
+                if fallback is None:
+                    fallback = (result, self._pos)
+            except LIMARException as e:
+                if first_error is None:
+                    first_error = e
+
+            del choices[self._choice_index:]
+            while choices and choices[-1] == 1:
+                choices.pop()
+            if not choices:
+                if fallback is None:
+                    raise first_error
+                result, self._pos = fallback
+                return result
+            choices[-1] = 1
+
+    def _choose(self):
+        """
+        Choose between the preferred alternative (0) and the other alternative
+        (1) at an ambiguous point in the current attempt.
+        """
+
+        index = self._choice_index
+        self._choice_index += 1
+        if index == len(self._choices):
+            self._choices.append(0)
+        return self._choices[index]
+
+    # Matching
+    # --------------------------------------------------
+
+    def _match(self, type: str):
+        if self._types[self._pos] != type:
+            self._error(type)
+        self._pos += 1
+        return self._pos - 1
+
+    def _expect_end_of_line(self):
+        if self._types[self._pos] != NEWLINE and self._types[self._pos] != EOF:
+            self._error(NEWLINE)
+
+    def _match_newline_or_eof(self):
+        # The ANTLR4 parser recovers from a missing newline at the end of the
+        # file by assuming it's there, so do the same.
+        if self._types[self._pos] != EOF:
+            self._match(NEWLINE)
+
+    def _skip(self, type: str):
+        types = self._types
+        while types[self._pos] == type:
+            self._pos += 1
+
+    def _skip_one(self, type: str):
+        if self._types[self._pos] == type:
+            self._pos += 1
+
+    # Tokens
+    # --------------------------------------------------
+
+    def _tokenise(self, text: str, start: int = 0, end: int | None = None):
+        if end is None:
+            end = len(text)
+
+        types = []
+        offsets = []
+        texts = []
+        for match in _TOKEN_REGEX.finditer(text, start, end):
+            group = match.lastindex
+            token_text = match.group()
+            if group == 1:
+                type = NEWLINE
+            elif group == 2:
+                type = SPACE
+            elif group == 3:
+                type = LITERAL_WRAPPER
+            elif group == 4:
+                if token_text == '-':
+                    type = SET_DIFFERENCE_OPERATOR
+                elif _NAME_REGEX.fullmatch(token_text):
+                    type = NAME
+                else:
+                    type = PATH
+            else:
+                type = _PUNCTUATION.get(token_text, OTHER)
+            types.append(type)
+            offsets.append(match.start())
+            texts.append(token_text)
+
+        # Sentinel EOF, so that lookahead past the end never needs bounds checks
+        types.extend((EOF, EOF))
+        offsets.extend((end, end))
+        texts.extend(('', ''))
+
+        self._source = text
+        self._types = types
+        self._offsets = offsets
+        self._texts = texts
+        self._pos = 0
+        self._depth = 0
+        self._reach = 0
+
+    def _text_of(self, pos: int):
+        return self._texts[pos]
+
+    def _location_of(self, pos: int):
+        return _location_of(self._source, self._offsets[pos])
+
+    def _error(self, expected: str):
+        # The token after the error may have been looked at to get here
+        self._look_at(self._pos + 1)
+        line, column = self._location_of(self._pos)
+        found = (
+            'end of file'
+            if self._types[self._pos] == EOF
+            else repr(self._texts[self._pos])
+        )
+        raise LIMARException(
+            f"Syntax error in manifest at line {line}, column {column}: expected"
+            f" {expected}, found {found}"
+        )
+
+# Compiled Item Set Specs
+# --------------------------------------------------
+
+@lru_cache(maxsize=256)
+def compile_item_set_spec(spec: str):
+    """
+    Return the operator b-tree for the given `itemSetSpec` text.
+
+    Results are cached by spec text, so repeated runtime queries are not
+    re-parsed. The returned b-tree is shared between callers, so must not be
+    modified.
+    """
+
+    return NativeManifestParser().parse_item_set_spec(spec)
+
+# Utils
+# --------------------------------------------------
+
+def _location_of(text: str, offset: int) -> tuple[int, int]:
+    # The (1-based) line and column of the given offset (which must not be
+    # within a '\r\n'), where a line ends at any NEWLINE token (ie. '\r\n',
+    # '\n', or '\r')
+    line = (
+        text.count('\n', 0, offset) +
+        text.count('\r', 0, offset) -
+        text.count('\r\n', 0, offset)
+    ) + 1
+    line_start = max(
+        text.rfind('\n', 0, offset),
+        text.rfind('\r', 0, offset)
+    ) + 1
+    return line, offset - line_start + 1
+
+def is_parseable_line(text: str, offset: int) -> bool:
+    """
+    Return whether the line at the given offset (which must be the start of a
+    non-blank line, or the end of the text) starts with something that can be
+    parsed at the top level of a manifest.
+
+    Where the grammar is ambiguous, the native parser's choice for an element
+    can depend on this for the line after the element.
+    """
+
+    line_end = _NEWLINE_REGEX.search(text, offset)
+    parser = NativeManifestParser()
+    parser._tokenise(
+        text, offset, line_end.start() if line_end is not None else len(text)
+    )
+    return parser._is_parseable_at(0)
+
+def warn_unparsed_content(logger: LogModule, text: str, offset: int):
+    """
+    Warn that the given manifest text was not parsed from the given offset
+    onwards.
+    """
+
+    line, _ = _location_of(text, offset)
+    logger.warning(
+        f"Manifest content from line {line} onwards was not parsed (a"
+        " declaration, context, or comment was expected at the start of"
+        " the line)"
+    )
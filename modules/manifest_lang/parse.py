@@ -0,0 +1,168 @@
+from modules.manifest import Manifest
+
+# Types
+from typing import Any, Callable
+from core.modules.log import LogModule
+
+ContextModuleFactories = dict[str, list[Callable[[], Any]]]
+
+def parse_manifest(
+        logger: LogModule,
+        name: str,
+        manifest_text: str,
+        parser: str,
+        ctx_mod_factories: ContextModuleFactories,
+        previous_blocks: bytes | None = None
+) -> tuple[Manifest, bytes | None]:
+    """
+    Parse the given text of the root manifest with the given name using the
+    given parser ('native' or 'antlr'), with new context modules from the given
+    factories, and return the resulting (exited) Manifest.
+
+    When using the native parser, also return the parsed blocks of the
+    manifest (see `parse_manifest_blocks()`), pickled. If the pickled blocks of
+    the previous version of the manifest are given, then only the parts of the
+    manifest that have changed since then are reparsed.
+    """
+
+    # Create Context Modules
+    context_modules = {
+        context_type: [
+            mod_factory()
+            for mod_factory in mod_factories
+        ]
+        for context_type, mod_factories in ctx_mod_factories.items()
+    }
+
+    # Start Builder
+    manifest = Manifest(
+        logger,
+        None,
+        None,
+        [name],
+        context_modules
+    )
+
+    # Parse
+    if parser == 'antlr':
+        _parse_with_antlr(logger, manifest, manifest_text)
+        return manifest, None
+    else:
+        blocks = _parse_natively(
+            logger, manifest, manifest_text, previous_blocks
+        )
+        return manifest, blocks
+
+def parse_manifest_in_worker(
+        name: str,
+        manifest_text: str,
+        parser: str,
+        ctx_mod_factories: ContextModuleFactories,
+        previous_blocks: bytes | None = None
+) -> tuple[
+    bytes | None,
+    dict[str, Any] | None,
+    bytes | None,
+    list[tuple[str, list[str]]]
+]:
+    """
+    Parse a root manifest as `parse_manifest()` does, but in a worker process.
+
+    Return the compiled manifest (or, if it cannot be compiled, the raw
+    manifest), the pickled blocks of the manifest (if any), and the messages
+    logged while parsing it as (method name, messages) pairs, so that they can
+    be logged by the calling process.
+    """
+
+    from modules.manifest_utils.compiled_manifest import compile_manifest
+
+    logger = RecordingLogger()
+    manifest, blocks = parse_manifest(
+        logger, # type: ignore (duck-typed)
+        name,
+        manifest_text,
+        parser,
+        ctx_mod_factories,
+        previous_blocks
+    )
+
+    try:
+        return compile_manifest(manifest.raw()), None, blocks, logger.records
+    except TypeError:
+        return None, manifest.raw(), blocks, logger.records
+
+class RecordingLogger:
+    """
+    Stands in for the log module in worker processes, recording messages to be
+    logged by the calling process.
+
+    Messages are recorded as strings, as that is how they are logged.
+    """
+
+    def __init__(self):
+        self.records: list[tuple[str, list[str]]] = []
+
+    def _record(self, method: str, objs):
+        self.records.append((method, [str(obj) for obj in objs]))
+
+    def error(self, *objs):
+        self._record('error', objs)
+
+    def warning(self, *objs):
+        self._record('warning', objs)
+
+    def info(self, *objs):
+        self._record('info', objs)
+
+    def debug(self, *objs):
+        self._record('debug', objs)
+
+    def trace(self, *objs):
+        self._record('trace', objs)
+
+def _parse_natively(
+        logger: LogModule,
+        manifest: Manifest,
+        manifest_text: str,
+        previous_blocks: bytes | None
+) -> bytes:
+    from modules.manifest_lang.incremental import (
+        dumps,
+        loads,
+        parse_manifest_blocks
+    )
+
+    previous = None
+    if previous_blocks is not None:
+        try:
+            previous = loads(previous_blocks)
+        except ValueError:
+            pass
+
+    parsed = parse_manifest_blocks(logger, manifest_text, previous)
+
+    # Pickle before replaying, as the declared tags, etc. may be modified by
+    # context modules.
+    blocks = dumps(parsed)
+    parsed.replay(manifest)
+    return blocks
+
+def _parse_with_antlr(logger: LogModule, manifest: Manifest, manifest_text: str):
+    # Import Deps (these are slow to import, so only (re)parse the manifest if
+    # needed)
+    from antlr4 import InputStream, CommonTokenStream, ParseTreeWalker
+    from modules.manifest_lang.build.ManifestLexer import ManifestLexer
+    from modules.manifest_lang.build.ManifestParser import ManifestParser
+    from modules.manifest_lang.manifest_listener import ManifestListenerImpl
+
+    # Setup Parser
+    input_stream = InputStream(manifest_text)
+    lexer = ManifestLexer(input_stream)
+    tokens = CommonTokenStream(lexer)
+    parser = ManifestParser(tokens)
+    tree = parser.manifest()
+
+    # Parse
+    listener = ManifestListenerImpl(logger, manifest)
+    walker = ParseTreeWalker()
+    walker.walk(listener, tree)
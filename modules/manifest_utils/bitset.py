@@ -0,0 +1,27 @@
+from typing import Iterable, Iterator
+
+# Bitsets are plain Python ints, where bit N is set if the element with id N is
+# in the set. Python's arbitrary-precision ints make union, intersection, etc.
+# single (C-level) operations over the whole set.
+
+def bitset_from_ids(ids: Iterable[int]) -> int:
+    """Return the bitset containing the given ids."""
+
+    # Setting bits one at a time in an int copies the whole int each time, so
+    # build the bitset as bytes, then convert it in one go.
+    bitmap = bytearray()
+    for id_ in ids:
+        byte_index = id_ >> 3
+        if byte_index >= len(bitmap):
+            bitmap.extend(bytes(byte_index - len(bitmap) + 1))
+        bitmap[byte_index] |= 1 << (id_ & 7)
+    return int.from_bytes(bitmap, 'little')
+
+def ids_in_bitset(bitset: int) -> Iterator[int]:
+    """Yield the ids in the given bitset in ascending order."""
+
+    bits = bin(bitset)[:1:-1] # Least significant bit first, without '0b'
+    id_ = bits.find('1')
+    while id_ != -1:
+        yield id_
+        id_ = bits.find('1', id_ + 1)
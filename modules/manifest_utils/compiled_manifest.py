@@ -0,0 +1,439 @@
+from bisect import bisect_left
+from collections.abc import Mapping
+import io
+import pickle
+import struct
+
+from modules.manifest import ManifestItem
+
+# Types
+from typing import Any, Iterator
+from modules.manifest import ItemRef, ItemSetRef
+
+# Format
+# --------------------------------------------------
+
+# A compiled manifest is a single buffer, laid out as:
+#
+#   header      - _HEADER (including the offset of each section)
+#   strings     - (num_strings + 1) string offsets (Q), then the UTF-8 data of
+#                 all strings. The first `num_items` strings are the item refs,
+#                 in declaration order, so item N's ref is string N.
+#   items       - num_items _ITEM records (item N's tags and props)
+#   tags        - num_tags _TAG records (tag name and value), grouped by item
+#   item sets   - num_item_sets _ITEM_SET records (ref and member range)
+#   members     - item ids (I) of the members of all item sets, grouped by item
+#                 set
+#   ref index   - item ids (I) of all items, sorted by ref, so that items can be
+#                 looked up by ref without decoding all refs
+#   props       - pickled extra props of items, where references to items in
+#                 the same manifest are stored as item ids
+#
+# All integers are little-endian. Offsets are from the start of the buffer,
+# except for props offsets, which are from the start of the props section.
+
+FORMAT_VERSION = 1
+
+_MAGIC = b'LIMARMF\x00'
+_HEADER = struct.Struct('<8sIIIII9Q') # ... section offsets, then total size
+_ITEM = struct.Struct('<IIQQ') # tags start, tags count, props offset, length
+_TAG = struct.Struct('<II') # name string, value string (or _NO_STRING)
+_ITEM_SET = struct.Struct('<IIQQ') # name string, value string (or _NO_STRING),
+                                   # members start, members count
+_STRING_RANGE = struct.Struct('<QQ') # Overlapping pairs of string offsets
+_ITEM_ID = struct.Struct('<I')
+_NO_STRING = 0xFFFFFFFF
+
+# Compile
+# --------------------------------------------------
+
+def compile_manifest(raw: dict[str, Any]) -> bytes:
+    """
+    Compile the given raw manifest (as returned by `Manifest.raw()` after the
+    manifest has been exited) to the compiled manifest format.
+
+    Raise a TypeError if any tag name or value, or any part of an item set ref,
+    is not a string, as these cannot be represented in the compiled format.
+    """
+
+    items = raw['items']
+    item_sets = raw['item_sets']
+
+    item_ids = {ref: item_id for item_id, ref in enumerate(items.keys())}
+    string_ids: dict[str, int] = {}
+    strings: list[str] = []
+    def string_id(string):
+        if type(string) is not str:
+            raise TypeError(
+                f"Cannot compile manifest containing non-string value {string!r}"
+            )
+        if string not in string_ids:
+            string_ids[string] = len(strings)
+            strings.append(string)
+        return string_ids[string]
+
+    for ref in items.keys():
+        string_id(ref)
+
+    # Items (and their tags and props)
+    item_records = bytearray()
+    tag_records = bytearray()
+    props_data = io.BytesIO()
+    num_tags = 0
+    for item in items.values():
+        tags = item['tags']
+        for name, value in tags.items():
+            tag_records += _TAG.pack(
+                string_id(name),
+                _NO_STRING if value is None else string_id(value)
+            )
+
+        props = {
+            key: value
+            for key, value in item.items()
+            if key not in ('ref', 'tags')
+        }
+        props_offset = props_data.tell()
+        if len(props) > 0:
+            _ItemPickler(props_data, item_ids).dump(props)
+
+        item_records += _ITEM.pack(
+            num_tags,
+            len(tags),
+            props_offset,
+            props_data.tell() - props_offset
+        )
+        num_tags += len(tags)
+
+    # Item sets
+    item_set_records = bytearray()
+    member_records = bytearray()
+    num_members = 0
+    for ref, item_set in item_sets.items():
+        if type(ref) is tuple:
+            name_id, value_id = (string_id(part) for part in ref)
+        else:
+            name_id, value_id = string_id(ref), _NO_STRING
+
+        members = [item_ids[item_ref] for item_ref in item_set.keys()]
+        member_records += struct.pack(f'<{len(members)}I', *members)
+        item_set_records += _ITEM_SET.pack(
+            name_id, value_id, num_members, len(members)
+        )
+        num_members += len(members)
+
+    # Strings
+    string_data = bytearray()
+    string_offsets = [0]
+    for string in strings:
+        string_data += string.encode('utf-8')
+        string_offsets.append(len(string_data))
+
+    # Layout
+    sections = [
+        struct.pack(f'<{len(string_offsets)}Q', *string_offsets),
+        string_data,
+        item_records,
+        tag_records,
+        item_set_records,
+        member_records,
+        struct.pack(
+            f'<{len(items)}I',
+            *sorted(item_ids.values(), key=lambda item_id: strings[item_id])
+        ),
+        props_data.getvalue()
+    ]
+    offsets = []
+    offset = _HEADER.size
+    for section in sections:
+        offsets.append(offset)
+        offset += len(section)
+
+    return b''.join([
+        _HEADER.pack(
+            _MAGIC,
+            FORMAT_VERSION,
+            len(strings),
+            len(items),
+            num_tags,
+            len(item_sets),
+            *offsets,
+            offset
+        ),
+        *sections
+    ])
+
+class _ItemPickler(pickle.Pickler):
+    def __init__(self, file, item_ids: dict[ItemRef, int]):
+        super().__init__(file)
+        self._item_ids = item_ids
+
+    def persistent_id(self, obj):
+        # Store references to items by id, so that they are shared with the
+        # items (and item sets) they refer to when loaded.
+        if isinstance(obj, ManifestItem) and obj.ref in self._item_ids:
+            return self._item_ids[obj.ref]
+        return None
+
+# Load
+# --------------------------------------------------
+
+class CompiledManifest:
+    """
+    A read-only view of a compiled manifest in the given buffer (eg. a
+    memory-mapped file).
+
+    Only the item set refs are read up-front. Each item is decoded the first
+    time it is accessed, so loading a manifest does not decode items that are not
+    used.
+    """
+
+    def __init__(self, buffer):
+        try:
+            self._load(buffer)
+        except struct.error as e:
+            raise ValueError('Buffer is not a valid compiled manifest') from e
+
+    def _load(self, buffer):
+        if len(buffer) < _HEADER.size:
+            raise ValueError('Buffer is too small to be a compiled manifest')
+        (
+            magic,
+            version,
+            _num_strings,
+            num_items,
+            _num_tags,
+            num_item_sets,
+            string_offsets_offset,
+            self._string_data_offset,
+            self._items_offset,
+            self._tags_offset,
+            item_sets_offset,
+            self._members_offset,
+            self._ref_index_offset,
+            self._props_offset,
+            size
+        ) = _HEADER.unpack_from(buffer)
+        if magic != _MAGIC or version != FORMAT_VERSION:
+            raise ValueError(
+                'Buffer is not a compiled manifest in format version'
+                f' {FORMAT_VERSION}'
+            )
+        if len(buffer) != size:
+            raise ValueError(
+                f'Compiled manifest is {len(buffer)} bytes, but should be'
+                f' {size} bytes'
+            )
+
+        self._buffer = buffer
+        self._string_offsets_offset = string_offsets_offset
+
+        self._items = CompiledItems(self, num_items)
+        self._item_sets: dict[ItemSetRef, CompiledItemSet] = {}
+        for item_set_record in _ITEM_SET.iter_unpack(
+            buffer[
+                item_sets_offset :
+                item_sets_offset + num_item_sets * _ITEM_SET.size
+            ]
+        ):
+            name_id, value_id, members_start, members_count = item_set_record
+            ref: ItemSetRef = (
+                self._string(name_id)
+                if value_id == _NO_STRING
+                else (self._string(name_id), self._string(value_id))
+            )
+            self._item_sets[ref] = CompiledItemSet(
+                self, members_start, members_count
+            )
+
+    def raw(self) -> dict[str, Any]:
+        """
+        Return this manifest in the same structure as `Manifest.raw()`, so that
+        it can be passed to `Manifest.from_raw()`.
+        """
+
+        return {
+            'items': self._items,
+            'item_sets': self._item_sets
+        }
+
+    # Decoding
+
+    def _string(self, string_id: int) -> str:
+        start, end = _STRING_RANGE.unpack_from(
+            self._buffer, self._string_offsets_offset + string_id * 8
+        )
+        return str(
+            self._buffer[
+                self._string_data_offset + start :
+                self._string_data_offset + end
+            ],
+            'utf-8'
+        )
+
+    def _item_refs(self, num_items: int) -> list[ItemRef]:
+        # Item refs are the first strings, so decode them all at once. If they
+        # are all ASCII, then byte offsets are also character offsets.
+        offsets = struct.unpack_from(
+            f'<{num_items + 1}Q', self._buffer, self._string_offsets_offset
+        )
+        text = str(
+            self._buffer[
+                self._string_data_offset + offsets[0] :
+                self._string_data_offset + offsets[-1]
+            ],
+            'utf-8'
+        )
+        if len(text) != offsets[-1] - offsets[0]:
+            return [self._string(item_id) for item_id in range(num_items)]
+        return [
+            text[start:end]
+            for start, end in zip(offsets, offsets[1:])
+        ]
+
+    def _item(self, item_id: int) -> ManifestItem:
+        tags_start, tags_count, props_offset, props_length = _ITEM.unpack_from(
+            self._buffer, self._items_offset + item_id * _ITEM.size
+        )
+
+        tags = {}
+        tags_offset = self._tags_offset + tags_start * _TAG.size
+        for name_id, value_id in _TAG.iter_unpack(
+            self._buffer[tags_offset : tags_offset + tags_count * _TAG.size]
+        ):
+            tags[self._string(name_id)] = (
+                None if value_id == _NO_STRING else self._string(value_id)
+            )
+
+        return ManifestItem(self._items.ref_of(item_id), tags)
+
+    def _props(self, item_id: int) -> dict[str, Any] | None:
+        _, _, props_offset, props_length = _ITEM.unpack_from(
+            self._buffer, self._items_offset + item_id * _ITEM.size
+        )
+        if props_length == 0:
+            return None
+
+        start = self._props_offset + props_offset
+        return _ItemUnpickler(
+            io.BytesIO(self._buffer[start : start + props_length]),
+            self._items
+        ).load()
+
+    def _ref_index_entry(self, position: int) -> int:
+        return _ITEM_ID.unpack_from(
+            self._buffer, self._ref_index_offset + position * _ITEM_ID.size
+        )[0]
+
+    def _members(self, start: int, count: int) -> tuple[int, ...]:
+        return struct.unpack_from(
+            f'<{count}I', self._buffer, self._members_offset + start * _ITEM_ID.size
+        )
+
+class _ItemUnpickler(pickle.Unpickler):
+    def __init__(self, file, items: 'CompiledItems'):
+        super().__init__(file)
+        self._items = items
+
+    def persistent_load(self, pid):
+        return self._items.by_id(pid)
+
+class CompiledItems(Mapping):
+    """
+    The items of a CompiledManifest, in declaration order. Items are looked up
+    by binary search of the ref index, so all refs are only decoded if the items
+    are iterated over. Each item is decoded (and then kept) the first time it is
+    accessed.
+    """
+
+    def __init__(self, manifest: CompiledManifest, num_items: int):
+        self._manifest = manifest
+        self._num_items = num_items
+        self._refs: list[ItemRef] | None = None
+        self._decoded: dict[int, ManifestItem] = {}
+
+    def ref_of(self, item_id: int) -> ItemRef:
+        if self._refs is None:
+            return self._manifest._string(item_id)
+        return self._refs[item_id]
+
+    def by_id(self, item_id: int) -> ManifestItem:
+        try:
+            return self._decoded[item_id]
+        except KeyError:
+            pass
+
+        # Keep the item before decoding its props, as they may refer back to it
+        item = self._manifest._item(item_id)
+        self._decoded[item_id] = item
+        item.props = self._manifest._props(item_id)
+        return item
+
+    def id_of(self, ref: ItemRef) -> int | None:
+        """Return the id of the item with the given ref, or None if not found."""
+
+        if type(ref) is not str:
+            return None
+        position = bisect_left(
+            range(self._num_items),
+            ref,
+            key=lambda position: self.ref_of(
+                self._manifest._ref_index_entry(position)
+            )
+        )
+        if position == self._num_items:
+            return None
+        item_id = self._manifest._ref_index_entry(position)
+        return item_id if self.ref_of(item_id) == ref else None
+
+    def __getitem__(self, ref: ItemRef) -> ManifestItem:
+        item_id = self.id_of(ref)
+        if item_id is None:
+            raise KeyError(ref)
+        return self.by_id(item_id)
+
+    def __contains__(self, ref):
+        return self.id_of(ref) is not None
+
+    def __iter__(self) -> Iterator[ItemRef]:
+        if self._refs is None:
+            self._refs = self._manifest._item_refs(self._num_items)
+        return iter(self._refs)
+
+    def __len__(self):
+        return self._num_items
+
+class CompiledItemSet(Mapping):
+    """
+    An item set of a CompiledManifest. Its items are decoded the first time they
+    are accessed.
+    """
+
+    def __init__(self, manifest: CompiledManifest, start: int, count: int):
+        self._manifest = manifest
+        self._items = manifest._items
+        self._start = start
+        self._count = count
+        self._refs: dict[ItemRef, int] | None = None
+
+    def _member_refs(self) -> dict[ItemRef, int]:
+        if self._refs is None:
+            self._refs = {
+                self._items.ref_of(item_id): item_id
+                for item_id in self._manifest._members(
+                    self._start, self._count
+                )
+            }
+        return self._refs
+
+    def __getitem__(self, ref: ItemRef) -> ManifestItem:
+        return self._items.by_id(self._member_refs()[ref])
+
+    def __contains__(self, ref):
+        return ref in self._member_refs()
+
+    def __iter__(self) -> Iterator[ItemRef]:
+        return iter(self._member_refs())
+
+    def __len__(self):
+        return self._count
@@ -0,0 +1,246 @@
+from bisect import bisect_left, insort
+import re
+from typing import Any, Callable, Container, Hashable, Iterable
+
+try:
+    from re import _parser as sre_parser # Python >= 3.11
+except ImportError:
+    import sre_parse as sre_parser # type: ignore
+
+# Flags that change which strings a literal (or anchored literal) can match
+_UNINDEXABLE_FLAGS = re.IGNORECASE | re.MULTILINE | re.VERBOSE
+
+class RefPattern:
+    """
+    The parts of a regex pattern that can be looked up in a RefIndex.
+
+    - `exact` is the literal that the pattern matches exactly (eg. `^abc$`)
+    - `prefix` is the literal that the pattern is anchored to the start of the
+      string with (eg. `^abc.*`)
+    - `literals` are the literal strings that any string matching the pattern
+      must contain (eg. `abc` and `def` for `abc.*def`)
+    """
+
+    def __init__(self,
+            exact: str | None = None,
+            prefix: str | None = None,
+            literals: list[str] | None = None
+    ):
+        self.exact = exact
+        self.prefix = prefix
+        self.literals = literals if literals is not None else []
+
+    @staticmethod
+    def from_regex(regex: re.Pattern) -> 'RefPattern':
+        """
+        Analyse the top-level sequence of the given compiled regex. Anything
+        more complex than a literal or an anchor (eg. repeats, groups, or
+        alternations) ends the current literal, but is otherwise ignored, so the
+        result is always a necessary (but not sufficient) condition for a
+        match.
+        """
+
+        if not isinstance(regex.pattern, str) or regex.flags & _UNINDEXABLE_FLAGS:
+            return RefPattern()
+
+        tokens = list(sre_parser.parse(regex.pattern))
+
+        anchored_start = (
+            len(tokens) > 0 and
+            str(tokens[0][0]) == 'AT' and
+            str(tokens[0][1]) in ('AT_BEGINNING', 'AT_BEGINNING_STRING')
+        )
+        anchored_end = (
+            len(tokens) > 1 and
+            str(tokens[-1][0]) == 'AT' and
+            str(tokens[-1][1]) in ('AT_END', 'AT_END_STRING')
+        )
+
+        literals = []
+        prefix = None
+        is_all_literal = True
+        run: list[str] = []
+        run_start = 0
+        for index, (op, arg) in enumerate(tokens):
+            if str(op) == 'LITERAL':
+                if len(run) == 0:
+                    run_start = index
+                run.append(chr(arg))
+                continue
+
+            if len(run) > 0:
+                literals.append(''.join(run))
+                if anchored_start and run_start == 1:
+                    prefix = literals[-1]
+                run = []
+
+            is_anchor = (
+                (index == 0 and anchored_start) or
+                (index == len(tokens) - 1 and anchored_end)
+            )
+            if not is_anchor:
+                is_all_literal = False
+
+        if len(run) > 0:
+            literals.append(''.join(run))
+            if anchored_start and run_start == 1:
+                prefix = literals[-1]
+
+        exact = None
+        if anchored_start and anchored_end and is_all_literal:
+            exact = ''.join(literals)
+
+        return RefPattern(exact, prefix, literals)
+
+class RefIndex:
+    """
+    An index of refs (in declaration order) for finding the first ref that
+    matches a regex pattern (as per `re.search()`) without scanning every ref.
+
+    Each ref is indexed by its text, which is given by `text_of(ref)` (or is
+    the ref itself if `text_of` is not given). The index consists of:
+
+    - An exact-text hash, for fully anchored literal patterns (eg. `^abc$`).
+    - A sorted list of texts, for patterns anchored to a literal prefix (eg.
+      `^abc`). Like a trie, this finds all texts with a given prefix, but is
+      much smaller and quicker to build for the number of refs in a manifest.
+    - A trigram index, for pre-filtering refs to only those containing all of
+      the literals that the pattern requires.
+
+    Patterns that cannot use any of these fall back to scanning all refs. All
+    candidates are checked against the full regex, so the index only affects
+    how many refs are checked, not the result.
+    """
+
+    def __init__(self,
+            refs: Iterable[Hashable] = (),
+            text_of: Callable[[Any], str] | None = None
+    ):
+        self._text_of = text_of if text_of is not None else (lambda ref: ref)
+
+        self._refs: list[Hashable] = []
+        self._texts: list[str] = []
+        self._positions: dict[Hashable, int] = {}
+
+        self._exact: dict[str, list[int]] = {}
+        self._sorted: list[tuple[str, int]] = []
+        self._trigrams: dict[str, set[int]] = {}
+
+        for ref in refs:
+            self._add(ref)
+        self._sorted = sorted(zip(self._texts, range(len(self._texts))))
+
+    def __len__(self):
+        return len(self._refs)
+
+    def add(self, ref: Hashable):
+        """Add the given ref to the end of the index, if not already present."""
+
+        position = self._add(ref)
+        if position is not None:
+            insort(self._sorted, (self._texts[position], position))
+
+    def search(self,
+            pattern: str | re.Pattern,
+            among: Container[Hashable] | None = None
+    ) -> Hashable | None:
+        """
+        Return the first ref (in the order they were added) whose text matches
+        the given pattern, or None if no refs match.
+
+        If `among` is given, then only consider refs that are in it.
+        """
+
+        regex = re.compile(pattern)
+        candidates = self._candidates(RefPattern.from_regex(regex))
+
+        if among is not None:
+            if candidates is None or (
+                hasattr(among, '__len__') and
+                len(among) < len(candidates) # type: ignore
+            ):
+                among_positions = sorted(
+                    self._positions[ref]
+                    for ref in among # type: ignore
+                    if ref in self._positions
+                )
+                if candidates is not None:
+                    candidate_set = set(candidates)
+                    among_positions = [
+                        position
+                        for position in among_positions
+                        if position in candidate_set
+                    ]
+                candidates = among_positions
+            else:
+                candidates = [
+                    position
+                    for position in candidates
+                    if self._refs[position] in among
+                ]
+
+        if candidates is None:
+            candidates = range(len(self._refs)) # type: ignore
+
+        for position in candidates: # type: ignore
+            if regex.search(self._texts[position]):
+                return self._refs[position]
+        return None
+
+    # Utils
+
+    def _add(self, ref: Hashable) -> int | None:
+        if ref in self._positions:
+            return None
+
+        position = len(self._refs)
+        text = self._text_of(ref)
+
+        self._refs.append(ref)
+        self._texts.append(text)
+        self._positions[ref] = position
+
+        self._exact.setdefault(text, []).append(position)
+        for trigram in self._trigrams_of(text):
+            self._trigrams.setdefault(trigram, set()).add(position)
+
+        return position
+
+    def _candidates(self, ref_pattern: RefPattern) -> list[int] | None:
+        """
+        Return the sorted positions of all refs that could match the given
+        pattern, or None if all refs could match.
+        """
+
+        if ref_pattern.exact is not None:
+            # `$` also matches before a trailing newline
+            return sorted([
+                *self._exact.get(ref_pattern.exact, []),
+                *self._exact.get(ref_pattern.exact + '\n', [])
+            ])
+
+        if ref_pattern.prefix is not None:
+            positions = []
+            start = bisect_left(self._sorted, (ref_pattern.prefix,))
+            for text, position in self._sorted[start:]:
+                if not text.startswith(ref_pattern.prefix):
+                    break
+                positions.append(position)
+            return sorted(positions)
+
+        trigrams = {
+            trigram
+            for literal in ref_pattern.literals
+            for trigram in self._trigrams_of(literal)
+        }
+        if len(trigrams) == 0:
+            return None
+
+        postings = sorted(
+            (self._trigrams.get(trigram, set()) for trigram in trigrams),
+            key=len
+        )
+        return sorted(set.intersection(*postings))
+
+    def _trigrams_of(self, text: str) -> set[str]:
+        return {text[i:i+3] for i in range(len(text) - 2)}
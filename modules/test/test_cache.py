@@ -0,0 +1,148 @@
+import os
+import re
+import tempfile
+from argparse import Namespace
+from unittest import TestCase
+from unittest.mock import Mock
+
+# Util
+from core.store import Store
+
+# Under Test
+from modules.cache import CacheModule
+
+class TestCache(TestCase):
+    def setUp(self):
+        self._cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self._cache_dir.cleanup)
+
+    def test_set_ref_deletes_superseded_entries(self):
+        cache = self._cache_module()
+        cache.set('objects/a.v1', b'version 1', type='binary')
+        cache.set('objects/shared', b'shared', type='binary')
+        cache.set_ref('a', ['objects/a.v1', 'objects/shared'])
+        cache.set('objects/b.v1', b'version 1', type='binary')
+        cache.set_ref('b', ['objects/b.v1', 'objects/shared'])
+        self._flush(cache)
+
+        cache = self._cache_module()
+        cache.set('objects/a.v2', b'version 2', type='binary')
+        cache.set_ref('a', ['objects/a.v2'])
+        self._flush(cache)
+
+        cache = self._cache_module()
+        self.assertEqual(cache.get_ref('a'), ['objects/a.v2'])
+        self.assertEqual(
+            cache._store.list(dir='objects'),
+            ['objects/a.v2', 'objects/b.v1', 'objects/shared']
+        )
+
+    def test_gc(self):
+        cache = self._cache_module()
+        cache.set('objects/a.v1', b'version 1', type='binary')
+        cache.set('objects/a.v2', b'v2', type='binary')
+        cache.set_ref('a', ['objects/a.v2'])
+        cache.set('unmanaged', 'not collected', type='text')
+        self._flush(cache)
+
+        cache = self._cache_module()
+        self.assertEqual(
+            cache.gc(),
+            {'deleted_entries': 1, 'reclaimed_bytes': len(b'version 1')}
+        )
+        self.assertEqual(
+            sorted(os.listdir(os.path.join(self._cache_dir.name, 'objects'))),
+            ['a.v2']
+        )
+        self.assertIn('unmanaged', cache.list())
+
+    def test_clear(self):
+        cache = self._cache_module()
+        cache.set('objects/a.v1', b'version 1', type='binary')
+        cache.set_ref('a', ['objects/a.v1'])
+        self._flush(cache)
+
+        cache = self._cache_module()
+        cache.clear_and_persist()
+
+        self.assertEqual(cache.list(), [])
+
+    def test_list_info(self):
+        cache = self._cache_module()
+        cache.set('objects/a.v1', b'version 1', type='binary')
+        cache.set_ref('a', ['objects/a.v1'])
+        self._flush(cache)
+
+        cache = self._cache_module()
+        cache.set('unpersisted', 'not yet persisted', type='text')
+        entries = cache.list_info()
+
+        self.assertEqual(
+            list(entries),
+            ['objects/a.v1', 'refs/a', 'unpersisted']
+        )
+        self.assertEqual(entries['objects/a.v1']['type'], 'binary')
+        self.assertEqual(entries['objects/a.v1']['size'], len(b'version 1'))
+        self.assertEqual(entries['refs/a']['type'], 'text')
+        self.assertEqual(entries['unpersisted']['type'], None)
+
+    def test_background_flush(self):
+        cache = self._cache_module(background_flush=True)
+        cache.set('a', 'entry a', type='text')
+        mod = Mock()
+        cache.stop(mod=mod)
+
+        # Wait for the flush
+        pid = int(re.findall(r'process (\d+)', mod.log.info.call_args.args[0])[0])
+        _, status = os.waitpid(pid, 0)
+        self.assertEqual(os.waitstatus_to_exitcode(status), 0)
+
+        cache = self._cache_module()
+        self.assertEqual(cache.get('a'), 'entry a')
+
+    def test_stats(self):
+        stats_file = os.path.join(self._cache_dir.name, 'stats.jsonl')
+
+        cache = self._cache_module(stats_file=stats_file)
+        cache.set('a', 'entry a', type='text')
+        cache.stop(mod=Mock())
+
+        cache = self._cache_module(stats_file=stats_file)
+        cache.get('a')
+        with self.assertRaises(KeyError):
+            cache.get('b')
+        stats = cache.stats()
+        self.assertEqual(stats['hits'], 1)
+        self.assertEqual(stats['misses'], 1)
+        self.assertEqual(stats['missed_entries'], ['b'])
+        self.assertEqual(stats['bytes_read'], len(b'entry a'))
+        cache.stop(mod=Mock())
+
+        recorded_stats = self._cache_module(stats_file=stats_file) \
+            .recorded_stats()
+        self.assertEqual(recorded_stats['runs'], 2)
+        self.assertEqual(recorded_stats['last_run']['missed_entries'], ['b'])
+        self.assertEqual(recorded_stats['last_run']['flush'], 'foreground')
+        self.assertEqual(recorded_stats['total']['hits'], 1)
+        self.assertEqual(
+            recorded_stats['total']['bytes_written'],
+            len(b'entry a')
+        )
+
+    def _cache_module(self, background_flush=None, stats_file=None):
+        cache = CacheModule(Store(self._cache_dir.name))
+        cache.configure(
+            mod=Mock(),
+            env=Mock(BACKGROUND_FLUSH=0, STATS_FILE=stats_file),
+            args=Namespace(
+                read_cache=None,
+                write_cache=None,
+                cache=None,
+                background_flush=background_flush,
+                cache_root=None
+            )
+        )
+        return cache
+
+    def _flush(self, cache):
+        cache._store.flush()
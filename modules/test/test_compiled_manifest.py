@@ -0,0 +1,96 @@
+import os
+import tempfile
+from unittest import TestCase
+from unittest.mock import Mock
+
+# Util
+from core.store import Store
+from modules.manifest import Manifest, ManifestItem
+from modules.manifest_lang.native_parser import NativeManifestParser
+
+# Under Test
+from modules.manifest_utils.compiled_manifest import (
+    CompiledManifest,
+    compile_manifest
+)
+
+FIXTURES_DIR = os.path.join(
+    os.path.dirname(__file__), 'fixtures', 'manifests'
+)
+
+class TestCompiledManifest(TestCase):
+    def test_fixtures_round_trip(self):
+        for fixture in sorted(os.listdir(FIXTURES_DIR)):
+            with self.subTest(fixture=fixture):
+                with open(os.path.join(FIXTURES_DIR, fixture)) as file:
+                    manifest = Manifest(Mock())
+                    NativeManifestParser(Mock(), manifest).parse_manifest(
+                        file.read()
+                    )
+                raw = manifest.raw()
+
+                compiled = CompiledManifest(compile_manifest(raw)).raw()
+
+                self.assertEqual(list(compiled['items']), list(raw['items']))
+                self.assertEqual(
+                    list(compiled['item_sets']),
+                    list(raw['item_sets'])
+                )
+                self.assertEqual(dict(compiled['items']), raw['items'])
+                for ref, item_set in raw['item_sets'].items():
+                    self.assertEqual(dict(compiled['item_sets'][ref]), item_set)
+
+    def test_items_are_decoded_lazily(self):
+        itemA = ManifestItem('itemA', {'tagA': None})
+        itemB = ManifestItem('itemB', {'tagB': 'value'}, {'parent': itemA})
+        compiled = CompiledManifest(compile_manifest({
+            'items': {'itemA': itemA, 'itemB': itemB},
+            'item_sets': {('tagB', 'value'): {'itemB': itemB}}
+        })).raw()
+        items = compiled['items']
+
+        self.assertEqual(len(items._decoded), 0)
+
+        loaded_itemB = compiled['item_sets'][('tagB', 'value')]['itemB']
+        self.assertIs(items['itemB'], loaded_itemB)
+        self.assertIs(loaded_itemB['parent'], items['itemA'])
+        self.assertEqual(loaded_itemB['parent'], itemA)
+
+    def test_non_string_tag_value(self):
+        with self.assertRaises(TypeError):
+            compile_manifest({
+                'items': {'itemA': ManifestItem('itemA', {'tagA': 1})},
+                'item_sets': {}
+            })
+
+    def test_invalid_buffer(self):
+        with self.assertRaises(ValueError):
+            CompiledManifest(b'not a compiled manifest')
+        with self.assertRaises(ValueError):
+            CompiledManifest(compile_manifest({
+                'items': {'itemA': ManifestItem('itemA')},
+                'item_sets': {}
+            })[:-10])
+
+    def test_memory_mapped_from_store(self):
+        raw = {
+            'items': {'itemA': ManifestItem('itemA', {'tagA': None})},
+            'item_sets': {}
+        }
+        with tempfile.TemporaryDirectory() as cache_dir:
+            store = Store(cache_dir)
+            store.setattr('test.compiled', 'type', 'binary')
+            store.set('test.compiled', compile_manifest(raw))
+            store.flush()
+
+            store = Store(cache_dir)
+            store.setattr('test.compiled', 'type', 'binary')
+            compiled = CompiledManifest(store.get('test.compiled')).raw()
+            self.assertEqual(dict(compiled['items']), raw['items'])
+
+            # Persisting must not overwrite the mapped file
+            store.flush()
+            self.assertEqual(
+                dict(CompiledManifest(store.get('test.compiled')).raw()['items']),
+                raw['items']
+            )
@@ -0,0 +1,90 @@
+import pickle
+import random
+from datetime import date, timedelta
+from unittest import TestCase
+
+# Under Test
+from modules.finance_utils.cover_index import CoverIndex
+
+def transaction(paid=None, cleared=None, coverStart=None, coverEnd=None):
+    return {
+        'paid': paid,
+        'cleared': cleared,
+        'coverStart': coverStart,
+        'coverEnd': coverEnd
+    }
+
+class TestCoverIndex(TestCase):
+    def test_default_cover_period(self):
+        index = CoverIndex.from_transactions({
+            'paid': transaction(paid=date(2023, 1, 10)),
+            'cleared': transaction(
+                paid=date(2023, 1, 10), cleared=date(2023, 1, 12)
+            ),
+            'covered': transaction(
+                paid=date(2023, 1, 1),
+                coverStart=date(2023, 1, 5), coverEnd=date(2023, 1, 20)
+            )
+        })
+
+        self.assertEqual(
+            index.overlapping(date(2023, 1, 11), date(2023, 1, 11)),
+            ['covered']
+        )
+        self.assertEqual(
+            index.overlapping(date(2023, 1, 12), date(2023, 1, 31)),
+            ['cleared', 'covered']
+        )
+        self.assertEqual(
+            index.overlapping(date(2023, 1, 1), date(2023, 1, 10)),
+            ['paid', 'covered']
+        )
+        self.assertEqual(
+            index.overlapping(date(2023, 1, 21), date(2023, 2, 1)),
+            []
+        )
+
+    def test_same_as_full_scan(self):
+        rand = random.Random(0)
+        start = date(2020, 1, 1)
+        items = {}
+        for i in range(500):
+            cover_start = start + timedelta(days=rand.randrange(1000))
+            items[f't{i}'] = transaction(
+                paid=cover_start,
+                coverStart=cover_start,
+                coverEnd=cover_start + timedelta(days=rand.choice((0, 6, 364)))
+            )
+        index = CoverIndex.from_transactions(items)
+
+        for _ in range(100):
+            window_start = start + timedelta(days=rand.randrange(-30, 1030))
+            window_end = window_start + timedelta(days=rand.randrange(60))
+            with self.subTest(window=(window_start, window_end)):
+                self.assertEqual(
+                    index.overlapping(window_start, window_end),
+                    [
+                        ref
+                        for ref, item in items.items()
+                        if (
+                            item['coverStart'] <= window_end and
+                            item['coverEnd'] >= window_start
+                        )
+                    ]
+                )
+
+    def test_pickle(self):
+        index = CoverIndex.from_transactions({
+            't1': transaction(paid=date(2023, 1, 1)),
+            't2': transaction(
+                paid=date(2022, 12, 1),
+                coverStart=date(2022, 12, 1), coverEnd=date(2023, 2, 1)
+            )
+        })
+        unpickled = pickle.loads(pickle.dumps(index))
+
+        self.assertEqual(len(unpickled), 2)
+        self.assertEqual(
+            unpickled.overlapping(date(2023, 1, 1), date(2023, 1, 1)),
+            ['t1', 't2']
+        )
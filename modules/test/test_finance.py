@@ -0,0 +1,456 @@
+from argparse import Namespace
+import random
+from datetime import date, timedelta
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+# Util
+from core.exceptions import LIMARException
+from modules.finance_utils.currency_amount import CurrencyAmount
+from modules.manifest_lang.parse import parse_manifest
+
+# Test Fixtures
+from modules.manifest_modules import (
+    finance,
+    financial_account,
+    financial_transaction
+)
+
+# Under Test
+from modules.finance import FinanceModule, FINANCE_LIFECYCLE
+
+try:
+    import numpy
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+MANIFEST = '''@finance {
+  @account (type: bank) {
+    current (joint)
+    savings
+  }
+  @account (type: shop) {
+    grocer
+    landlord (joint)
+  }
+  @account (type: foreign) {
+    wallet
+    hotel
+  }
+  @transaction (default-account: current) {
+    t-rent (to: landlord, paid: 2023-01-25, coverStart: 2023-01-28, coverEnd: 2023-02-25, amount: 1000.00, for: rent)
+    t-food (to: grocer, cleared: 2023-02-03, amount: 33.33)
+    t-save (to: savings, paid: 2023-02-14, cleared: 2023-02-16, amount: 250.00)
+    t-rent-2 (to: landlord, paid: 2023-02-25, coverStart: 2023-02-28, coverEnd: 2023-03-27, amount: 1000.01, for: rent)
+    t-food-2 (to: grocer, paid: 2023-03-01, coverStart: 2023-03-01, coverEnd: 2023-03-03, amount: 10.00)
+    t-refund (from: grocer, paid: 2023-03-02, amount: 5.55)
+  }
+  @transaction (default-account: hotel) {
+    t-hotel (to: hotel, from: wallet, paid: 2023-02-10, coverStart: 2023-02-10, coverEnd: 2023-02-12, amount: $300.00)
+  }
+}
+'''
+
+# MANIFEST, with a transaction added, one changed, and one removed
+MANIFEST_2 = (
+    MANIFEST
+        .replace('amount: 250.00', 'amount: 260.00')
+        .replace(
+            '    t-food-2 (to: grocer, paid: 2023-03-01, coverStart: 2023-03-01,'
+            ' coverEnd: 2023-03-03, amount: 10.00)\n',
+            '    t-food-3 (to: grocer, paid: 2023-03-10, amount: 20.00)\n'
+        )
+)
+
+QUERIES = [
+    {},
+    {'window': '2023-02-01:2023-02-28'},
+    {'window': '2023-02-01:2023-02-28', 'distribute': '7'},
+    {'distribute': '3', 'filter_transactions': 'account-type=shop'},
+    {'distribute': '1', 'filter_transactions': 'not:account-tag=joint'},
+    {'group_by_account': True},
+    {'distribute': '5', 'group_by_time': 'week'},
+    {
+        'window': '2023-02-01:2023-03-31', 'distribute': '2',
+        'group_by_account': True, 'group_by_time': 'month'
+    },
+    {
+        'distribute': '1', 'group_by_account': True,
+        'filter_groups': 'account-type=bank'
+    },
+    {'window': '2023-02-10:2023-03-20', 'distribute': '10', 'group_by_time': 'month'},
+    *(
+        {
+            'distribute': distribute, 'group_by_time': unit,
+            'filter_transactions': 'not:account-type=foreign',
+            'aggregate': aggregator
+        }
+        for distribute, unit, aggregator in (
+            ('30', 'month', 'mean'),
+            ('1', 'year', 'mean'),
+            ('2', 'day', 'sum')
+        )
+    ),
+    {
+        'distribute': '3', 'group_by_account': True, 'group_by_time': 'week',
+        'aggregate': 'sum'
+    },
+    *(
+        {
+            'distribute': '4', 'group_by_account': True,
+            'group_by_time': 'month', 'aggregate': aggregator
+        }
+        for aggregator in ('sum', 'mean', 'median', 'min', 'max')
+    )
+]
+
+class TestFinance(TestCase):
+    def test_dict_engine(self):
+        output = self._query('dict', MANIFEST,
+            window='2023-02-01:2023-02-28',
+            distribute='14',
+            filter_transactions='not:account-type=foreign',
+            group_by_account=True,
+            aggregate='sum'
+        )
+
+        # Rent for 2023-02-01 to 2023-02-25 (days 5-29 of 29) is split into 2
+        # periods, and rent for 2023-02-28 (day 1 of 28) into 1 period. Each
+        # period gets the pennies of the rent up to its end that weren't given
+        # to earlier periods.
+        self.assertEqual(
+            {ref: (row['amount'].currency, row['amount'].amount) for ref, row in output.items()},
+            {
+                'current': ('£', -(48275 + 37932 + 3571) - 3333 - 25000),
+                'landlord': ('£', 48275 + 37932 + 3571),
+                'grocer': ('£', 3333),
+                'savings': ('£', 25000)
+            }
+        )
+
+    def test_distribute_allocates_whole_amount(self):
+        for engine in self._engines():
+            for period_length in ('1', '3', '7', '30'):
+                with self.subTest(engine=engine, period_length=period_length):
+                    output = self._query(engine, MANIFEST,
+                        distribute=period_length,
+                        filter_transactions='account-type=shop',
+                        group_by_account=True,
+                        filter_groups='account-type=shop',
+                        aggregate='sum'
+                    )
+                    self.assertEqual(
+                        {ref: row['amount'].amount for ref, row in output.items()},
+                        {'landlord': 200001, 'grocer': 3333 + 1000 - 555}
+                    )
+
+    def test_unsupported_engine(self):
+        with self.assertRaises(LIMARException):
+            FinanceModule().configure(
+                mod=Mock(), env=Namespace(ENGINE='spreadsheet')
+            )
+
+    def test_grouping_and_aggregating_in_one_pass(self):
+        queries = [
+            query
+            for query in QUERIES
+            if 'aggregate' in query
+        ] + [
+            {
+                'distribute': '7', 'group_by_account': True,
+                'group_by_time': 'month', 'filter_groups': 'account-type=bank',
+                'aggregate': aggregator
+            }
+            for aggregator in ('sum', 'median', 'max')
+        ] + [
+            {'filter_groups': 'not:account-type=foreign', 'aggregate': 'min'},
+            {'filter_groups': 'account-type=none', 'aggregate': 'sum'}
+        ]
+
+        finance_module = FinanceModule()
+        finance_module.configure(mod=Mock(), env=Namespace(
+            ENGINE='dict', MATERIALISE_AGGREGATES=0
+        ))
+        for manifest in (MANIFEST, self._random_manifest(200)):
+            for query in queries:
+                with self.subTest(query=query):
+                    groups = self._query('dict', manifest, **{
+                        **query, 'aggregate': None
+                    })
+                    self.assertEqual(
+                        self._comparable(
+                            self._query('dict', manifest, **query)
+                        ),
+                        self._comparable(
+                            finance_module._aggregate(groups, query['aggregate'])
+                        )
+                    )
+
+    def test_deferred_grouping_without_aggregating(self):
+        for query in QUERIES[5:9]:
+            with self.subTest(query=query):
+                self.assertEqual(
+                    self._comparable(self._query('dict', MANIFEST,
+                        skip_phases=(FINANCE_LIFECYCLE.PHASES.AGGREGATE,),
+                        aggregate='sum',
+                        **query
+                    )),
+                    self._comparable(self._query('dict', MANIFEST, **query))
+                )
+
+    def test_materialised_aggregate_is_reused(self):
+        for engine in self._engines():
+            with self.subTest(engine=engine):
+                cache = {}
+                for aggregator in ('sum', 'max'):
+                    self._query(engine, MANIFEST,
+                        cache=cache, materialise=True,
+                        group_by_account=True, aggregate=aggregator
+                    )
+
+                # For the same version of the manifest, the query isn't run
+                for aggregator in ('sum', 'max'):
+                    with patch.object(FinanceModule, '_aggregate') as aggregate:
+                        output = self._query(engine, MANIFEST_2,
+                            cache=cache, materialise=True,
+                            group_by_account=True, aggregate=aggregator
+                        )
+                    aggregate.assert_not_called()
+                    self.assertEqual(
+                        self._comparable(output),
+                        self._comparable(self._query(engine, MANIFEST,
+                            group_by_account=True, aggregate=aggregator
+                        ))
+                    )
+
+    def test_materialised_aggregate_is_updated(self):
+        queries = [
+            query
+            for query in QUERIES
+            if query.get('aggregate') in ('sum', 'mean', 'median')
+        ] + [
+            {
+                'window': '2023-02-01:2023-03-15', 'distribute': '7',
+                'group_by_account': True, 'aggregate': 'sum'
+            },
+            {
+                'distribute': '7', 'group_by_account': True,
+                'filter_groups': 'account-tag=joint', 'aggregate': 'mean'
+            },
+            {
+                'distribute': '1', 'filter_transactions': 'account-type=shop',
+                'filter_groups': 'not:account-tag=joint', 'aggregate': 'sum'
+            }
+        ]
+
+        for engine in self._engines():
+            for query in queries:
+                with self.subTest(engine=engine, query=query):
+                    cache = {}
+                    self._query(engine, MANIFEST,
+                        cache=cache, manifest_key='1', materialise=True,
+                        **query
+                    )
+                    with patch.object(
+                        FinanceModule, '_contributions',
+                        autospec=True,
+                        side_effect=FinanceModule._contributions
+                    ) as contributions:
+                        output = self._query(engine, MANIFEST_2,
+                            cache=cache, manifest_key='2', materialise=True,
+                            **query
+                        )
+
+                    self.assertEqual(
+                        self._comparable(output),
+                        self._comparable(self._query(engine, MANIFEST_2, **query))
+                    )
+                    if query['aggregate'] != 'median':
+                        # Only added and changed transactions are queried
+                        [(_, item_set, _), _] = contributions.call_args
+                        self.assertEqual(
+                            sorted(item_set), ['t-food-3', 't-save']
+                        )
+
+    def test_materialised_aggregate_is_updated_when_accounts_change(self):
+        query = {
+            'group_by_account': True, 'filter_groups': 'account-tag=joint',
+            'aggregate': 'sum'
+        }
+        manifest_2 = MANIFEST.replace('    grocer\n', '    grocer (joint)\n')
+
+        cache = {}
+        self._query('dict', MANIFEST,
+            cache=cache, manifest_key='1', materialise=True, **query
+        )
+        self.assertEqual(
+            self._comparable(self._query('dict', manifest_2,
+                cache=cache, manifest_key='2', materialise=True, **query
+            )),
+            self._comparable(self._query('dict', manifest_2, **query))
+        )
+
+    def test_columnar_engine_gives_same_output_as_dict_engine(self):
+        if not HAS_NUMPY:
+            self.skipTest('numpy is not installed')
+
+        for manifest in (MANIFEST, self._random_manifest(200)):
+            for query in QUERIES:
+                with self.subTest(query=query):
+                    self.assertEqual(
+                        self._comparable(
+                            self._query('columnar', manifest, **query)
+                        ),
+                        self._comparable(
+                            self._query('dict', manifest, **query)
+                        )
+                    )
+
+    def test_window_uses_cached_cover_index(self):
+        for engine in self._engines():
+            with self.subTest(engine=engine):
+                cache = {}
+                outputs = [
+                    self._query(engine, MANIFEST,
+                        cache=cache,
+                        window='2023-02-01:2023-02-28'
+                    )
+                    for _ in range(2)
+                ]
+
+                self.assertEqual(
+                    [name for name in cache if name.startswith('objects/')],
+                    ['objects/finance.cover-index.manifest-version.v1']
+                )
+                self.assertEqual(
+                    self._comparable(outputs[0]), self._comparable(outputs[1])
+                )
+                [transactions] = outputs[0].values()
+                self.assertNotIn('t-refund', transactions)
+                self.assertIn('t-rent', transactions)
+
+    def test_columnar_engine_rejects_mixed_currencies(self):
+        if not HAS_NUMPY:
+            self.skipTest('numpy is not installed')
+
+        for engine in FinanceModule.ENGINES:
+            with self.subTest(engine=engine):
+                with self.assertRaisesRegex(
+                    LIMARException, "different currencies '£' and '\\$'"
+                ):
+                    self._query(engine, MANIFEST, aggregate='sum')
+
+    def test_materialised_aggregate_rejects_mixed_currencies(self):
+        with self.assertRaisesRegex(
+            LIMARException, "different currencies '£' and '\\$'"
+        ):
+            self._query('dict', MANIFEST, materialise=True, aggregate='sum')
+
+    def _engines(self):
+        return [
+            engine
+            for engine in FinanceModule.ENGINES
+            if engine != 'columnar' or HAS_NUMPY
+        ]
+
+    def _query(self,
+            engine,
+            manifest_text,
+            cache=None,
+            manifest_key='manifest-version',
+            materialise=False,
+            skip_phases=(),
+            **args
+    ):
+        manifest, _ = parse_manifest(Mock(), 'finance', manifest_text, 'native', {
+            'finance': [finance.Finance],
+            'account': [financial_account.FinancialAccount],
+            'transaction': [financial_transaction.FinancialTransaction]
+        })
+        transactions = {
+            ref: item
+            for ref, item in manifest.items().items()
+            if 'transaction' in item['tags']
+        }
+
+        mod = Mock()
+        mod.phase.create_process.return_value = (
+            lambda phase, run_by_default=None: (
+                phase not in skip_phases and
+                (run_by_default if run_by_default is not None else True)
+            )
+        )
+        mod.manifest.get_item_set.return_value = transactions
+        mod.manifest.get_cache_key.return_value = manifest_key
+
+        # Refs are stored alongside entries
+        if cache is None:
+            cache = {}
+        mod.cache.get.side_effect = lambda name: cache[name]
+        mod.cache.set.side_effect = (
+            lambda name, data: cache.__setitem__(name, data)
+        )
+        mod.cache.get_ref.side_effect = lambda ref: cache['refs/'+ref]
+        mod.cache.set_ref.side_effect = (
+            lambda ref, entries: cache.__setitem__('refs/'+ref, entries)
+        )
+
+        finance_module = FinanceModule()
+        finance_module.configure(mod=mod, env=Namespace(
+            ENGINE=engine, MATERIALISE_AGGREGATES=int(materialise)
+        ))
+        return finance_module(
+            mod=mod,
+            args=Namespace(**{
+                'window': None,
+                'distribute': None,
+                'filter_transactions': None,
+                'group_by_account': False,
+                'group_by_time': None,
+                'filter_groups': None,
+                'aggregate': None,
+                'output_is_forward': True,
+                'min_phase': None,
+                'max_phase': None,
+                **args
+            }),
+            forwarded_data=None
+        )
+
+    def _random_manifest(self, num_transactions):
+        rand = random.Random(0)
+        accounts = [f'account{i}' for i in range(8)]
+        lines = ['@finance {', '@account (type: bank) {']
+        lines.extend(f'  {account}' for account in accounts[:4])
+        lines.append('}')
+        lines.append('@account (type: shop) {')
+        lines.extend(f'  {account} (online)' for account in accounts[4:])
+        lines.append('}')
+        lines.append('@transaction (default-account: account0) {')
+        for i in range(num_transactions):
+            paid = date(2022, 1, 1) + timedelta(days=rand.randrange(365))
+            cover = (
+                f'coverStart: {paid}, coverEnd: {paid + timedelta(days=rand.randrange(90))}, '
+                if rand.random() < 0.5
+                else ''
+            )
+            lines.append(
+                f'  t{i} (to: {rand.choice(accounts[1:])}, paid: {paid}, {cover}'
+                f'amount: {rand.randrange(100_000) / 100:.2f})'
+            )
+        lines.extend(['}', '}'])
+        return '\n'.join(lines)+'\n'
+
+    def _comparable(self, data):
+        # Compares order as well as contents
+        if isinstance(data, CurrencyAmount):
+            return ('CurrencyAmount', data.currency, self._comparable(data.amount))
+        if isinstance(data, dict):
+            return [
+                (key, self._comparable(value))
+                for key, value in data.items()
+            ]
+        if isinstance(data, tuple):
+            return tuple(self._comparable(value) for value in data)
+        return data
@@ -1,14 +1,16 @@
+import os
+import tempfile
 from unittest import TestCase
-from unittest.mock import MagicMock, Mock, call, mock_open, patch
+from unittest.mock import ANY, MagicMock, Mock, call, mock_open, patch
 
 # Util
 from core.exceptions import LIMARException
 
 # Test Fixtures
-from modules.manifest_modules import uris_local, uris_remote
+from modules.manifest_modules import finance, project, uris_local, uris_remote
 
 # Under Test
-from modules.manifest import ManifestModule, ManifestItemTags
+from modules.manifest import ManifestModule, ManifestItem, ManifestItemTags
 
 class TestManifest(TestCase):
     # NOTE: Side-effects are often used in these tests because
@@ -17,7 +19,7 @@ class TestManifest(TestCase):
     def _log(self, *objs, error=False, level=0):
         print(*objs)
 
-    def _get_cache(self, name):
+    def _get_cache(self, name, type='pickle'):
         raise KeyError()
 
     def setUp(self):
@@ -26,17 +28,20 @@ class TestManifest(TestCase):
 
         cache_module = Mock()
         cache_module.get.side_effect = self._get_cache
-        cache_module.set.side_effect = lambda name, data: None
+        cache_module.set.side_effect = lambda name, data, type='pickle': None
+        cache_module.get_ref.side_effect = self._get_cache
+        cache_module.set_ref.side_effect = lambda ref, entries: None
         cache_module.flush.side_effect = lambda: None
 
         self.mock_mod = Mock()
-        self.mock_mod.log.return_value=log_module
-        self.mock_mod.cache.return_value=cache_module
+        self.mock_mod.log = log_module
+        self.mock_mod.cache = cache_module
 
         self.mock_env = Mock()
-        self.mock_env.LIMAR_MANIFEST_DEFAULT_ITEM_SET = None
-        self.mock_env.LIMAR_MANIFEST_ROOT = '/manifests'
-        self.mock_env.LIMAR_CACHE_ROOT = '/cache'
+        self.mock_env.DEFAULT_ITEM_SET = None
+        self.mock_env.ROOT = '/manifests'
+        self.mock_env.PARSER = 'native'
+        self.mock_env.PARSE_WORKERS = 1
 
     def test_item_basic(self):
         # Input
@@ -62,7 +67,8 @@ class TestManifest(TestCase):
                     'items': expected_items,
                     'item_sets': {}
                 }],
-                expected_items['itemA']
+                expected_items['itemA'],
+                logger=ANY
             )
         ]
 
@@ -71,7 +77,7 @@ class TestManifest(TestCase):
         context_mod.on_declare_item.side_effect = self._assert_has_calls(
             expected_declare_item_calls
         )
-        manifest.start() # Verifier runs here
+        manifest.start(mod=self.mock_mod) # Verifier runs here
 
         self.assertEqual(
             manifest.get_item('itemA'),
@@ -103,7 +109,8 @@ class TestManifest(TestCase):
                     'items': expected_items,
                     'item_sets': {}
                 }],
-                expected_items['itemA']
+                expected_items['itemA'],
+                logger=ANY
             )
         ]
 
@@ -112,7 +119,7 @@ class TestManifest(TestCase):
         context_mod.on_declare_item.side_effect = self._assert_has_calls(
             expected_declare_item_calls
         )
-        manifest.start() # Verifier runs here
+        manifest.start(mod=self.mock_mod) # Verifier runs here
 
         self.assertEqual(
             manifest.get_item('itemA'),
@@ -148,7 +155,8 @@ class TestManifest(TestCase):
                     'items': expected_items,
                     'item_sets': {}
                 }],
-                expected_items['itemA']
+                expected_items['itemA'],
+                logger=ANY
             )
         ]
 
@@ -157,7 +165,7 @@ class TestManifest(TestCase):
         context_mod.on_declare_item.side_effect = self._assert_has_calls(
             expected_declare_item_calls
         )
-        manifest.start() # Verifier runs here
+        manifest.start(mod=self.mock_mod) # Verifier runs here
 
         self.assertEqual(
             manifest.get_item('itemA'),
@@ -200,7 +208,8 @@ class TestManifest(TestCase):
                     },
                     'item_sets': {}
                 }],
-                expected_items['itemA']
+                expected_items['itemA'],
+                logger=ANY
             ),
             call(
                 [{
@@ -209,7 +218,8 @@ class TestManifest(TestCase):
                     'items': expected_items,
                     'item_sets': {}
                 }],
-                expected_items['itemB']
+                expected_items['itemB'],
+                logger=ANY
             )
         ]
 
@@ -218,7 +228,7 @@ class TestManifest(TestCase):
         context_mod.on_declare_item.side_effect = self._assert_has_calls(
             expected_declare_item_calls
         )
-        manifest.start() # Verifier runs here
+        manifest.start(mod=self.mock_mod) # Verifier runs here
 
         self.assertEqual(
             manifest.get_item('itemA'),
@@ -261,7 +271,8 @@ class TestManifest(TestCase):
                     },
                     'item_sets': {}
                 }],
-                expected_items['itemA']
+                expected_items['itemA'],
+                logger=ANY
             ),
             call(
                 [{
@@ -270,7 +281,8 @@ class TestManifest(TestCase):
                     'items': expected_items,
                     'item_sets': {}
                 }],
-                expected_items['itemB']
+                expected_items['itemB'],
+                logger=ANY
             )
         ]
 
@@ -279,7 +291,7 @@ class TestManifest(TestCase):
         context_mod.on_declare_item.side_effect = self._assert_has_calls(
             expected_declare_item_calls
         )
-        manifest.start() # Verifier runs here
+        manifest.start(mod=self.mock_mod) # Verifier runs here
 
         self.assertEqual(
             manifest.get_item('itemA'),
@@ -303,6 +315,331 @@ class TestManifest(TestCase):
         )
         context_mod.on_declare_item.assert_called()
 
+    def test_item_set_operators(self):
+        # Input
+        manifest_store = Mock()
+        manifest_store.get.side_effect = lambda key: {
+            'test.manifest.txt': '\n'.join([
+                'itemA (tagA, kind: x)',
+                'itemB (tagB, kind: y)',
+                'itemC (tagA, tagB, kind: x)',
+                'itemD (tagC)',
+                'setAnd [tagA & tagB]',
+                'setOr [tagB | tagA]',
+                'setValue [kind: x]',
+                'setItem [itemD | itemA]',
+                'setNested [[setOr & kind: y] | itemD]',
+                'setMissing [tagA & [tagZ | kind: z]]',
+                'setDifference [tagA - tagB]',
+                'setComplement [!tagA]',
+                'setComplementPrecedence [!tagA & tagB]',
+                'setComplementGroup [![tagA & tagB] - itemD]'
+            ])+'\n'
+        }[key]
+
+        # Run
+        manifest, _ = self._basic_manifest_setup(manifest_store)
+        manifest.start(mod=self.mock_mod)
+
+        # Verify (items are always in declaration order)
+        for item_set_ref, expected_refs in {
+            'setAnd': ['itemC'],
+            'setOr': ['itemA', 'itemB', 'itemC'],
+            'setValue': ['itemA', 'itemC'],
+            'setItem': ['itemA', 'itemD'],
+            'setNested': ['itemB', 'itemD'],
+            'setMissing': [],
+            'setDifference': ['itemA'],
+            'setComplement': ['itemB', 'itemD'],
+            'setComplementPrecedence': ['itemB'],
+            'setComplementGroup': ['itemA', 'itemB']
+        }.items():
+            with self.subTest(item_set=item_set_ref):
+                self.assertEqual(
+                    list(manifest.get_item_set(f'^{item_set_ref}$').keys()),
+                    expected_refs
+                )
+
+    def test_item_set_plan(self):
+        # Input
+        manifest_store = Mock()
+        manifest_store.get.side_effect = lambda key: {
+            'test.manifest.txt': '\n'.join([
+                'itemA (tagA, tagB)',
+                'itemB (tagA)',
+                'itemC (tagA, tagB)'
+            ])+'\n'
+        }[key]
+
+        # Run
+        manifest, _ = self._basic_manifest_setup(manifest_store)
+        manifest.start(mod=self.mock_mod)
+        global_manifest = manifest._global_manifest
+
+        # Verify - intersections are flattened and ordered smallest-first
+        max_size, operator, operands = global_manifest._plan_item_set({
+            'operator': '&',
+            'left': {'operator': '&', 'left': 'tagA', 'right': 'tagB'},
+            'right': 'itemB'
+        })
+        self.assertEqual(max_size, 1)
+        self.assertEqual(operator, '&')
+        self.assertEqual([operand[0] for operand in operands], [1, 2, 3])
+
+        # Verify - empty operands make the whole intersection empty
+        max_size, _, _ = global_manifest._plan_item_set({
+            'operator': '&',
+            'left': {'operator': '|', 'left': 'tagA', 'right': 'tagB'},
+            'right': 'tagZ'
+        })
+        self.assertEqual(max_size, 0)
+
+    def test_item_in_item_set(self):
+        # Input
+        manifest_store = Mock()
+        manifest_store.get.side_effect = lambda key: {
+            'test.manifest.txt': '\n'.join([
+                'itemA (tagA)',
+                'itemAB (tagB)'
+            ])+'\n'
+        }[key]
+
+        # Run
+        manifest, _ = self._basic_manifest_setup(manifest_store)
+        manifest.start(mod=self.mock_mod)
+
+        # Verify (the item index is created on first search of all items, so
+        # check searching an item set both before and after)
+        for _ in range(2):
+            self.assertEqual(
+                manifest.get_item(
+                    'itemA',
+                    item_set=manifest.get_item_set('^tagB$')
+                )['ref'],
+                'itemAB'
+            )
+            self.assertEqual(manifest.get_item('itemA')['ref'], 'itemA')
+        with self.assertRaises(LIMARException):
+            manifest.get_item('itemC')
+        with self.assertRaises(LIMARException):
+            manifest.get_item_set('^tagC$')
+
+    def test_flatten_items(self):
+        # Input
+        manifest_store = Mock()
+        manifest_store.get.side_effect = lambda key: {
+            'test.manifest.txt': '\n'.join([
+                'itemA (tagA, tagB)',
+                'itemB (tagA, key: value)'
+            ])+'\n'
+        }[key]
+
+        # Run
+        manifest, _ = self._basic_manifest_setup(manifest_store)
+        manifest.start(mod=self.mock_mod)
+        item_set = manifest.get_item_set('tagA')
+
+        # Verify
+        table = manifest._tabulate_flattened_items(item_set)
+        self.assertEqual(table, [
+            ['ref', ':tagA', ':tagB', ':key'],
+            ['itemA', '✓', '✓', None],
+            ['itemB', '✓', None, 'value']
+        ])
+        self.assertEqual(manifest._table_to_flattened_items(table), [
+            {'ref': 'itemA', ':tagA': '✓', ':tagB': '✓', ':key': None},
+            {'ref': 'itemB', ':tagA': '✓', ':tagB': None, ':key': 'value'}
+        ])
+
+        self.assertEqual(
+            manifest._tabulate_flattened_items(item_set, filter_tags=['key']),
+            [['ref', ':key'], ['itemA', None], ['itemB', 'value']]
+        )
+        self.assertEqual(
+            manifest._tabulate_flattened_items(item_set, filter_tags=[]),
+            [['ref'], ['itemA'], ['itemB']]
+        )
+
+    def test_cached_manifest(self):
+        # Data
+        manifest_store = Mock()
+        manifest_store.get.side_effect = lambda key: {
+            'test.manifest.txt': '\n'.join([
+                'itemA (tagA)',
+                'itemB (tagA, tagB: value)',
+                'setA [tagA - itemA]'
+            ])+'\n'
+        }[key]
+
+        cache, _ = self._use_dict_cache()
+
+        # Run
+        parsed, _ = self._basic_manifest_setup(manifest_store)
+        parsed.start(mod=self.mock_mod)
+
+        cached, context_mod = self._basic_manifest_setup(manifest_store)
+        cached.start(mod=self.mock_mod)
+
+        # Verify
+        self.assertEqual(len(cache), 2) # Compiled manifest and parsed blocks
+        context_mod.on_declare_item.assert_not_called()
+        self.assertEqual(
+            dict(cached.get_item_set()),
+            dict(parsed.get_item_set())
+        )
+        self.assertEqual(
+            dict(cached.get_item_set('setA')),
+            {'itemB': parsed.get_item('itemB')}
+        )
+        self.assertEqual(
+            dict(cached.get_item_set('tagB')),
+            {'itemB': parsed.get_item('itemB')}
+        )
+
+    def test_undecodable_manifest(self):
+        with tempfile.TemporaryDirectory() as root:
+            with open(os.path.join(root, 'test.manifest.txt'), 'wb') as file:
+                file.write(b'itemA (tag\xff)\n')
+            self.mock_env.ROOT = root
+
+            manifest, _ = self._basic_manifest_setup(None)
+            with self.assertRaisesRegex(LIMARException, "manifest 'test'"):
+                manifest.start(mod=self.mock_mod)
+
+            # The user's manifest is left where it is
+            self.assertEqual(os.listdir(root), ['test.manifest.txt'])
+
+    def test_incremental_reparse(self):
+        # Data
+        manifest_texts = {
+            'test.manifest.txt': '\n'.join([
+                'itemA (tagA)',
+                'setA [tagA]'
+            ])+'\n'
+        }
+        manifest_store = Mock()
+        manifest_store.get.side_effect = lambda key: manifest_texts[key]
+
+        cache, refs = self._use_dict_cache()
+
+        # Run
+        parsed, _ = self._basic_manifest_setup(manifest_store)
+        parsed.start(mod=self.mock_mod)
+
+        manifest_texts['test.manifest.txt'] += 'itemB (tagA, tagB)\n'
+        reparsed, context_mod = self._basic_manifest_setup(manifest_store)
+        reparsed.start(mod=self.mock_mod)
+
+        # Verify
+        self.assertEqual(context_mod.on_declare_item.call_count, 2)
+        self.assertEqual(sorted(cache), sorted(refs['test.manifest']))
+        self.assertEqual(
+            list(reparsed.get_item_set('tagA')),
+            ['itemA', 'itemB']
+        )
+        self.assertEqual(
+            dict(reparsed.get_item('itemB')['tags']),
+            {'tagA': None, 'tagB': None}
+        )
+
+    def test_cache_per_context_modules(self):
+        # Data
+        manifest_store = Mock()
+        manifest_store.get.side_effect = lambda key: {
+            'test.manifest.txt': 'itemA (tagA)\n'
+        }[key]
+
+        cache, refs = self._use_dict_cache()
+
+        # Run
+        manifest, _ = self._basic_manifest_setup(manifest_store)
+        manifest.start(mod=self.mock_mod)
+
+        # Eg. when another module that adds context modules is also loaded
+        manifest, context_mod = self._basic_manifest_setup(manifest_store)
+        manifest.add_context_modules(project.Project)
+        manifest.start(mod=self.mock_mod)
+
+        manifest, other_context_mod = self._basic_manifest_setup(manifest_store)
+        manifest.start(mod=self.mock_mod)
+
+        # Verify
+        context_mod.on_declare_item.assert_called_once()
+        other_context_mod.on_declare_item.assert_not_called()
+        self.assertEqual(len(cache), 3) # Two compiled manifests and blocks
+        self.assertEqual(sorted(cache), sorted(refs['test.manifest']))
+
+    def test_parallel_parse(self):
+        # Data
+        manifest_store = Mock()
+        manifest_store.get.side_effect = lambda key: {
+            'project.manifest.txt': '\n'.join([
+                'projectA (tagA)',
+                'projectB (tagB)',
+                'setA [tagA | tagB]'
+            ])+'\n',
+            'finance.manifest.txt': '\n'.join([
+                'accountA (tagA)',
+                'setA [tagA]'
+            ])+'\n'
+        }[key]
+
+        # Run
+        results = []
+        for workers in (1, 2):
+            self.mock_env.PARSE_WORKERS = workers
+            manifest = ManifestModule(manifest_store)
+            manifest.configure(mod=self.mock_mod, env=self.mock_env)
+            manifest.add_context_modules(project.Project, finance.Finance)
+            manifest.start(mod=self.mock_mod)
+            results.append(manifest)
+
+        # Verify
+        sequential, parallel = results
+        for pattern in (None, '^tagA$', '^setA$', '^project$'):
+            with self.subTest(item_set=pattern):
+                self.assertEqual(
+                    list(parallel.get_item_set(pattern).items()),
+                    list(sequential.get_item_set(pattern).items())
+                )
+        self.assertEqual(
+            list(parallel.get_item_set('^setA$').keys()),
+            ['projectA', 'projectB', 'accountA']
+        )
+
+    def test_manifest_item(self):
+        on_add_tags = Mock()
+        item = ManifestItem(
+            'itemA',
+            ManifestItemTags(on_add_tags, item_ref='itemA')
+        )
+
+        # Tags
+        item['tags'].add('tagA', key='value')
+        on_add_tags.assert_called_once_with(
+            'itemA', {'tagA': None, 'key': 'value'}
+        )
+
+        # Extra props
+        self.assertNotIn('prop', item)
+        item['prop'] = 1
+        self.assertIn('prop', item)
+        self.assertEqual(list(item.keys()), ['ref', 'tags', 'prop'])
+
+        # Dict-like
+        item['tags'] = item['tags'].raw()
+        self.assertEqual(item, {
+            'ref': 'itemA',
+            'tags': {'tagA': None, 'key': 'value'},
+            'prop': 1
+        })
+        self.assertEqual(item | {'prop': 2}, {**dict(item), 'prop': 2})
+
+        del item['prop']
+        self.assertEqual(len(item), 2)
+        with self.assertRaises(KeyError):
+            item['prop']
+
     # TODO:
 
     # ./ an item
@@ -331,6 +668,25 @@ class TestManifest(TestCase):
     # multiple context modules
     # multiple root context modules
 
+    def _use_dict_cache(self):
+        cache = {}
+        refs = {}
+        def get_cache(name, type='pickle'):
+            return cache[name]
+        def set_cache(name, data, type='pickle'):
+            cache[name] = data
+        def get_ref(ref):
+            return refs[ref]
+        def set_ref(ref, entries):
+            for entry in set(refs.get(ref, [])) - set(entries):
+                del cache[entry]
+            refs[ref] = entries
+        self.mock_mod.cache.get.side_effect = get_cache
+        self.mock_mod.cache.set.side_effect = set_cache
+        self.mock_mod.cache.get_ref.side_effect = get_ref
+        self.mock_mod.cache.set_ref.side_effect = set_ref
+        return cache, refs
+
     def _basic_manifest_setup(self, manifest_store):
         # Initialise
         manifest = ManifestModule(manifest_store)
@@ -340,6 +696,7 @@ class TestManifest(TestCase):
 
         mock_context_module = Mock()
         mock_context_module_factory = Mock(return_value=mock_context_module)
+        mock_context_module_factory.__qualname__ = 'TestContext'
         mock_context_module_factory.context_type.return_value = 'test'
         mock_context_module_factory.can_be_root.return_value = True
         manifest.add_context_modules(mock_context_module_factory)
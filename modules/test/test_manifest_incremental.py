@@ -0,0 +1,166 @@
+import os
+import pickle
+import random
+from unittest import TestCase
+from unittest.mock import Mock
+
+# Util
+from core.exceptions import LIMARException
+from modules.test.test_manifest_parser import ManifestGenerator
+
+# Under Test
+from modules.manifest_lang.incremental import parse_manifest_blocks
+
+FIXTURES_DIR = os.path.join(
+    os.path.dirname(__file__), 'fixtures', 'manifests'
+)
+
+class TestIncrementalParse(TestCase):
+    def setUp(self):
+        self.text = ''.join(
+            open(os.path.join(FIXTURES_DIR, name)).read() + '\n'
+            for name in sorted(os.listdir(FIXTURES_DIR))
+        )
+        self.lines = self.text.splitlines(keepends=True)
+
+    def test_edits_match_full_parse(self):
+        middle = len(self.lines) // 2
+        edits = {
+            'unchanged': self.text,
+            'append': self.text + 'itemNew (tagNew)\n',
+            'append to implicit context': (
+                self.text + '@ctx\nitemNew\n'
+            ) + 'itemNewer\n',
+            'prepend': 'itemNew (tagNew)\n' + self.text,
+            'insert': ''.join(
+                self.lines[:middle] + ['itemNew (tagNew)\n'] + self.lines[middle:]
+            ),
+            'delete': ''.join(self.lines[:middle] + self.lines[middle+1:]),
+            'extra newline': ''.join(
+                self.lines[:middle] + ['\n'] + self.lines[middle:]
+            ),
+            'unclosed literal': ''.join(
+                self.lines[:middle] + ['itemNew (tagNew: """)\n'] + self.lines[middle:]
+            ),
+            'unparsed content': ''.join(
+                self.lines[:middle] + ['  }\n'] + self.lines[middle:]
+            ),
+            'truncate': ''.join(self.lines[:middle])
+        }
+
+        previous = self._round_trip(parse_manifest_blocks(Mock(), self.text))
+        for edit, text in edits.items():
+            with self.subTest(edit=edit):
+                full_logger = Mock()
+                full = parse_manifest_blocks(full_logger, text)
+
+                incremental_logger = Mock()
+                incremental = parse_manifest_blocks(
+                    incremental_logger,
+                    text,
+                    self._round_trip(previous)
+                )
+
+                self.assertEqual(
+                    self._declarations(incremental),
+                    self._declarations(full)
+                )
+                self.assertEqual(
+                    incremental.unparsed_length,
+                    full.unparsed_length
+                )
+                self.assertEqual(
+                    incremental_logger.warning.call_args_list,
+                    full_logger.warning.call_args_list
+                )
+
+    def test_unchanged_blocks_are_reused(self):
+        # Implicit contexts extend to the end of the manifest and literals may
+        # extend past the edit, so use fixtures without them.
+        lines = ''.join(
+            open(os.path.join(FIXTURES_DIR, name)).read() + '\n'
+            for name in ('items.manifest.txt', 'tags.manifest.txt')
+        ).splitlines(keepends=True)
+        previous = parse_manifest_blocks(Mock(), ''.join(lines))
+
+        middle = len(lines) // 2
+        parsed = parse_manifest_blocks(
+            Mock(),
+            ''.join(lines[:middle] + ['itemNew (tagNew)\n'] + lines[middle:]),
+            previous
+        )
+
+        reused = [
+            block
+            for block in parsed.blocks
+            if any(block is old_block for old_block in previous.blocks)
+        ]
+        self.assertEqual(len(reused), len(previous.blocks))
+        self.assertEqual(len(parsed.blocks), len(previous.blocks) + 1)
+
+    def test_random_edits_match_full_parse(self):
+        lines = [
+            '\n', '  \n', '# comment\n', '  # comment\n', 'itemNew\n',
+            'itemNew (tagNew)\n', '  }\n', '| itemNew\n', 'tagNew)\n', ']\n',
+            '"""\n', 'x"""\n', '@ctx\n'
+        ]
+        edits = [
+            # Unparsed content that is parsed after a new block before it
+            ('\nitemA\n', 'itemNew\n\nitemA\n'),
+            # A literal block comment that is closed by the new text
+            ('itemA #"""a\nitemB\n', 'itemA #"""a\nitemB\nb"""\n')
+        ]
+        rand = random.Random(0)
+        while len(edits) < 500:
+            old_lines = ManifestGenerator(len(edits)).manifest() \
+                .splitlines(keepends=True)
+            for index in (0, len(old_lines)):
+                if rand.random() < 0.3:
+                    old_lines.insert(index, rand.choice(lines))
+
+            new_lines = list(old_lines)
+            for _ in range(rand.randint(1, 2)):
+                index = rand.randint(0, len(new_lines))
+                roll = rand.random()
+                if roll < 0.4:
+                    new_lines.insert(index, rand.choice(lines))
+                elif roll < 0.7 and index < len(new_lines):
+                    del new_lines[index]
+                elif index < len(new_lines):
+                    new_lines[index] = rand.choice(lines)
+            edits.append((''.join(old_lines), ''.join(new_lines)))
+
+        for old_text, text in edits:
+            try:
+                previous = parse_manifest_blocks(Mock(), old_text)
+            except LIMARException:
+                continue
+
+            with self.subTest(old_text=old_text, text=text):
+                self.assertEqual(
+                    self._result(text, self._round_trip(previous)),
+                    self._result(text)
+                )
+
+    def _result(self, text, previous=None):
+        # The declarations, unparsed length, and warnings, or the error
+        logger = Mock()
+        try:
+            parsed = parse_manifest_blocks(logger, text, previous)
+        except LIMARException as e:
+            return str(e)
+        return (
+            self._declarations(parsed),
+            parsed.unparsed_length,
+            logger.warning.call_args_list
+        )
+
+    def _round_trip(self, parsed):
+        return pickle.loads(pickle.dumps(parsed))
+
+    def _declarations(self, parsed):
+        return [
+            declaration
+            for block in parsed.blocks
+            for declaration in block.declarations
+        ]
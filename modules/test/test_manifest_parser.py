@@ -0,0 +1,373 @@
+import os
+import random
+from unittest import TestCase, skipUnless
+from unittest.mock import Mock
+
+# Util
+from core.exceptions import LIMARException
+
+# Under Test
+from modules.manifest import Manifest
+from modules.manifest_lang.incremental import DeclarationRecorder
+from modules.manifest_lang.native_parser import (
+    NativeManifestParser,
+    compile_item_set_spec
+)
+
+FIXTURES_DIR = os.path.join(
+    os.path.dirname(__file__), 'fixtures', 'manifests'
+)
+ANTLR_BUILD_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), 'manifest_lang', 'build'
+)
+
+try:
+    import antlr4
+    HAS_ANTLR = os.path.isdir(ANTLR_BUILD_DIR)
+except ImportError:
+    HAS_ANTLR = False
+
+class RecordingContextModule:
+    def __init__(self, events: list):
+        self._events = events
+
+    def on_enter_context(self, context, **_):
+        self._events.append(('enter', context['type'], dict(context['opts'])))
+
+    def on_declare_item(self, contexts, item, **_):
+        self._events.append(('item', item['ref']))
+
+    def on_declare_item_set(self, contexts, item_set, **_):
+        self._events.append(('item_set', list(item_set)))
+
+    def on_exit_context(self, context, items, item_sets, **_):
+        self._events.append(('exit', context['type']))
+
+class RecordingManifest(DeclarationRecorder):
+    def enter(self):
+        self.declarations.append(('enter', ()))
+
+    def exit(self):
+        self.declarations.append(('exit', ()))
+
+class ManifestGenerator:
+    """
+    Generates random manifests, including empty lines, comments, literal blocks,
+    and characters that the grammar treats specially, in the places the grammar
+    is most ambiguous. Many are not valid manifests.
+    """
+
+    REFS = ['a', 'b', 'tagA', 'x-y', '-x', 'a.b', "it's", 'p/q', '1', '"""r f"""']
+    NAMES = ['a', 'kind', 'x-y', '-x', '"""n m"""']
+    VALUES = [
+        '', 'v', 'x-y', 'a.b', 'v#', 'v#z', '#v', 'a:b', 'x!y', '@', '-', 'a-',
+        'v)', 'v]', 'a&b', '{', '!', '"""lit"""', '"""l # t"""', '"""l"""x',
+        '"""l\nm"""'
+    ]
+    COMMENTS = [
+        '#', '# c', '#x#', '# a ) b ]', '# - a', '# | b', '# """x"""',
+        '#"""x"""', '#"""x""" y', '#"""a\nb"""'
+    ]
+
+    def __init__(self, seed: int):
+        self._random = random.Random(seed)
+
+    def manifest(self):
+        text = self._pick('', '', '\n', ' \n')
+        for _ in range(self._random.randrange(1, 4)):
+            text += self._element(depth=0) + self._pick('\n', '\n', '\n\n')
+        return text if self._chance(0.8) else text.rstrip('\n')
+
+    def _element(self, depth: int):
+        roll = self._random.random()
+        if depth < 2 and roll < 0.15:
+            body = ''.join(
+                self._space() + self._element(depth + 1) + self._pick('\n', '\n\n')
+                for _ in range(self._random.randrange(3))
+            )
+            return (
+                self._context_header() + self._space() + '{' +
+                self._comment(0.2) + '\n' + body + self._space() + '}' +
+                self._comment(0.2)
+            )
+        if depth < 2 and roll < 0.25:
+            body = ''.join(
+                '\n' + self._space() + self._declaration()
+                for _ in range(self._random.randrange(3))
+            )
+            return self._context_header() + self._comment(0.2) + body
+        if roll < 0.35:
+            return self._comment()
+        return self._declaration()
+
+    def _context_header(self):
+        header = '@' + self._pick('root', 'ctx')
+        if self._chance(0.5):
+            header += self._space() + self._data(with_comments=True)
+        return header
+
+    def _declaration(self):
+        roll = self._random.random()
+        if roll < 0.4:
+            declaration = self._pick(*self.REFS)
+            if self._chance(0.6):
+                declaration += ' ' + self._data()
+        elif roll < 0.5:
+            declaration = ':' + self._pick(*self.REFS) + ' ' + self._data()
+        else:
+            declaration = (
+                self._pick(*self.REFS) + ' [' + self._comment(0.1) +
+                self._pick('', ' ', '\n') + self._item_set_spec(depth=0) +
+                self._pick('', ' ', '\n') + ']'
+            )
+        return declaration + self._comment(0.2)
+
+    def _data(self, with_comments: bool = False):
+        kv_pairs = []
+        for _ in range(self._random.randrange(1, 4)):
+            kv_pairs.append(
+                self._kv_pair() + (self._comment(0.2) if with_comments else '')
+            )
+        separators = (',', ', ', ' ,', ',\n', '\n', ',' + self._comment() + '\n')
+        data = kv_pairs[0]
+        for kv_pair in kv_pairs[1:]:
+            data += self._pick(*separators) + self._space() + kv_pair
+        return (
+            '(' + self._comment(0.1) + self._pick('', '\n') + self._space() +
+            data + self._pick('', ' ', '\n') + ')'
+        )
+
+    def _item_set_spec(self, depth: int):
+        roll = self._random.random()
+        if depth < 2 and roll < 0.15:
+            spec = (
+                '[' + self._comment(0.1) + self._pick('', '\n') + self._space() +
+                self._item_set_spec(depth + 1) + self._pick('', ' ', '\n') + ']'
+            )
+        elif depth < 2 and roll < 0.25:
+            spec = '!' + self._space() + self._item_set_spec(depth + 1)
+        elif roll < 0.55:
+            spec = self._kv_pair()
+        else:
+            spec = self._pick(*self.REFS)
+
+        if depth < 3 and self._chance(0.5):
+            spec += (
+                self._pick('', ' ', '\n', self._comment() + '\n') +
+                self._pick('&', '|', '-') +
+                self._pick('', ' ', '\n', self._comment() + '\n  ') +
+                self._item_set_spec(depth + 1)
+            )
+        return spec
+
+    def _kv_pair(self):
+        kv_pair = self._pick(*self.NAMES)
+        if self._chance(0.7):
+            kv_pair += self._pick(':', ': ', ' : ', ':  ')
+            kv_pair += self._pick(*self.VALUES)
+        return kv_pair
+
+    def _comment(self, chance: float = 1):
+        if not self._chance(chance):
+            return ''
+        return self._space(0.6) + self._pick(*self.COMMENTS)
+
+    def _space(self, chance: float = 0.3):
+        return self._pick(' ', '  ', '\t') if self._chance(chance) else ''
+
+    def _pick(self, *options: str):
+        return self._random.choice(options)
+
+    def _chance(self, chance: float):
+        return self._random.random() < chance
+
+class TestNativeManifestParser(TestCase):
+    def test_syntax_error_location(self):
+        manifest, _ = self._manifest()
+        parser = NativeManifestParser(Mock(), manifest)
+
+        with self.assertRaisesRegex(LIMARException, 'line 2, column 13'):
+            parser.parse_manifest('itemA\nitemB (tagA tagB)\n')
+
+    def test_unparsed_content_warning(self):
+        manifest, _ = self._manifest()
+        logger = Mock()
+        parser = NativeManifestParser(logger, manifest)
+
+        parser.parse_manifest('itemA\n  itemB\n')
+
+        self.assertEqual(list(manifest.raw()['items'].keys()), ['itemA'])
+        logger.warning.assert_called_once()
+
+    def test_compile_item_set_spec(self):
+        self.assertEqual(
+            compile_item_set_spec(' !a - [kind: x | b] # c\n'),
+            {
+                'operator': '-',
+                'left': {'operator': '!', 'operand': 'a'},
+                'right': {
+                    'operator': '|',
+                    'left': ('kind', 'x'),
+                    'right': 'b'
+                }
+            }
+        )
+        self.assertIs(
+            compile_item_set_spec('a & b'),
+            compile_item_set_spec('a & b')
+        )
+
+        with self.assertRaises(LIMARException):
+            compile_item_set_spec('a & ] b')
+
+    @skipUnless(HAS_ANTLR, 'requires the ANTLR4 runtime and generated parser')
+    def test_fixtures_match_antlr(self):
+        fixtures = sorted(
+            name
+            for name in os.listdir(FIXTURES_DIR)
+            if name.endswith('.manifest.txt')
+        )
+        self.assertNotEqual(fixtures, [])
+
+        for name in fixtures:
+            with self.subTest(fixture=name):
+                with open(os.path.join(FIXTURES_DIR, name)) as fixture:
+                    text = fixture.read()
+
+                native_manifest, native_events = self._manifest()
+                NativeManifestParser(Mock(), native_manifest) \
+                    .parse_manifest(text)
+
+                antlr_manifest, antlr_events = self._manifest()
+                self.assertEqual(
+                    self._parse_with_antlr(antlr_manifest, text), 0
+                )
+
+                self.assertEqual(native_manifest.raw(), antlr_manifest.raw())
+                self.assertEqual(native_events, antlr_events)
+
+    @skipUnless(HAS_ANTLR, 'requires the ANTLR4 runtime and generated parser')
+    def test_generated_manifests_match_antlr(self):
+        valid = 0
+        for seed in range(150):
+            text = ManifestGenerator(seed).manifest()
+
+            antlr_manifest = RecordingManifest()
+            if self._parse_with_antlr(antlr_manifest, text) != 0:
+                continue
+            valid += 1
+
+            native_manifest = RecordingManifest()
+            logger = Mock()
+            try:
+                NativeManifestParser(logger, native_manifest) \
+                    .parse_manifest(text)
+                native_result = native_manifest.declarations
+            except LIMARException as e:
+                native_result = str(e)
+
+            # The native parser may fail where ANTLR4 ends a comment other
+            # than at the end of its line because of something after that line
+            # (see its docstring), but must never silently parse differently.
+            if (
+                native_result != antlr_manifest.declarations and
+                (isinstance(native_result, str) or logger.warning.called) and
+                self._antlr_ends_comment_early_or_late(text)
+            ):
+                continue
+
+            with self.subTest(seed=seed, text=text):
+                self.assertEqual(native_result, antlr_manifest.declarations)
+
+        # Enough of them must be valid for the comparison to be meaningful
+        self.assertGreater(valid, 75)
+
+    @skipUnless(HAS_ANTLR, 'requires the ANTLR4 runtime and generated parser')
+    def test_lone_hyphen_matches_antlr(self):
+        # A lone '-' is always a difference operator, never a value or a name
+        invalid = ['s [k: -]\n', 's [-]\n', 's [a - - b]\n', 'i (k: -)\n']
+        difference = ['s [k: - a]\n', 's [k: -\na]\n', 's [k:\n  - a]\n']
+
+        for text in invalid:
+            with self.subTest(text=text):
+                self.assertNotEqual(
+                    self._parse_with_antlr(RecordingManifest(), text), 0
+                )
+                with self.assertRaises(LIMARException):
+                    NativeManifestParser(Mock(), RecordingManifest()) \
+                        .parse_manifest(text)
+
+        for text in difference:
+            with self.subTest(text=text):
+                antlr_manifest = RecordingManifest()
+                self.assertEqual(
+                    self._parse_with_antlr(antlr_manifest, text), 0
+                )
+                native_manifest = RecordingManifest()
+                NativeManifestParser(Mock(), native_manifest) \
+                    .parse_manifest(text)
+
+                self.assertEqual(
+                    native_manifest.declarations,
+                    antlr_manifest.declarations
+                )
+                self.assertEqual(
+                    native_manifest.declarations[1][1][1],
+                    {
+                        'operator': '-',
+                        'left': ('k', ''),
+                        'right': 'a'
+                    }
+                )
+
+    def _manifest(self):
+        events = []
+        manifest = Manifest(
+            Mock(),
+            initial_contexts=['root'],
+            context_modules={
+                context_type: [RecordingContextModule(events)]
+                for context_type in ('root', 'ctx')
+            }
+        )
+        return manifest, events
+
+    def _parse_with_antlr(self, manifest, text):
+        from antlr4 import InputStream, CommonTokenStream, ParseTreeWalker
+        from modules.manifest_lang.build.ManifestLexer import ManifestLexer
+        from modules.manifest_lang.build.ManifestParser import ManifestParser
+        from modules.manifest_lang.manifest_listener import ManifestListenerImpl
+
+        # Return the number of syntax errors, and only walk the parse tree if
+        # there were none
+        lexer = ManifestLexer(InputStream(text))
+        lexer.removeErrorListeners()
+        parser = ManifestParser(CommonTokenStream(lexer))
+        parser.removeErrorListeners()
+        tree = parser.manifest()
+        if parser.getNumberOfSyntaxErrors() != 0:
+            return parser.getNumberOfSyntaxErrors()
+
+        listener = ManifestListenerImpl(Mock(), manifest)
+        ParseTreeWalker().walk(listener, tree)
+        return 0
+
+    def _antlr_ends_comment_early_or_late(self, text):
+        # Whether ANTLR4 ends any comment before the end of its line, or on a
+        # later line (with a multi-line literal block)
+        from antlr4 import InputStream, CommonTokenStream, Token
+        from antlr4.tree.Trees import Trees
+        from modules.manifest_lang.build.ManifestLexer import ManifestLexer
+        from modules.manifest_lang.build.ManifestParser import ManifestParser
+
+        tokens = CommonTokenStream(ManifestLexer(InputStream(text)))
+        parser = ManifestParser(tokens)
+        parser.removeErrorListeners()
+        return any(
+            node.start.line != node.stop.line or
+            tokens.get(node.stop.tokenIndex + 1).type not in (
+                ManifestParser.NEWLINE, Token.EOF
+            )
+            for node in Trees.descendants(parser.manifest())
+            if isinstance(node, ManifestParser.CommentContext)
+        )
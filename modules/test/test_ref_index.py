@@ -0,0 +1,118 @@
+from itertools import product
+import random
+import re
+from unittest import TestCase
+
+# Under Test
+from modules.manifest_utils.ref_index import RefIndex, RefPattern
+
+class TestRefPattern(TestCase):
+    def test_exact(self):
+        ref_pattern = RefPattern.from_regex(re.compile('^project$'))
+        self.assertEqual(ref_pattern.exact, 'project')
+        self.assertEqual(ref_pattern.prefix, 'project')
+
+    def test_prefix(self):
+        ref_pattern = RefPattern.from_regex(re.compile('^proj.*x'))
+        self.assertIsNone(ref_pattern.exact)
+        self.assertEqual(ref_pattern.prefix, 'proj')
+        self.assertEqual(ref_pattern.literals, ['proj', 'x'])
+
+    def test_literals(self):
+        ref_pattern = RefPattern.from_regex(re.compile('abc+def(gh)ij'))
+        self.assertIsNone(ref_pattern.exact)
+        self.assertIsNone(ref_pattern.prefix)
+        self.assertEqual(ref_pattern.literals, ['ab', 'def', 'ij'])
+
+    def test_alternation_is_not_indexable(self):
+        ref_pattern = RefPattern.from_regex(re.compile('^abc$|def'))
+        self.assertIsNone(ref_pattern.exact)
+        self.assertIsNone(ref_pattern.prefix)
+        self.assertEqual(ref_pattern.literals, [])
+
+    def test_flags_are_not_indexable(self):
+        ref_pattern = RefPattern.from_regex(re.compile('(?i)^abc$'))
+        self.assertIsNone(ref_pattern.exact)
+        self.assertIsNone(ref_pattern.prefix)
+        self.assertEqual(ref_pattern.literals, [])
+
+class TestRefIndex(TestCase):
+    def test_first_match_in_order(self):
+        index = RefIndex(['b-project', 'project', 'a-project'])
+        self.assertEqual(index.search('project'), 'b-project')
+        self.assertEqual(index.search('^project$'), 'project')
+        self.assertEqual(index.search('^a-'), 'a-project')
+        self.assertIsNone(index.search('^c-'))
+
+    def test_among(self):
+        index = RefIndex(['b-project', 'project', 'a-project'])
+        self.assertEqual(
+            index.search('project', among={'a-project', 'project'}),
+            'project'
+        )
+        self.assertIsNone(index.search('b-', among={'a-project'}))
+
+    def test_text_of(self):
+        index = RefIndex(
+            ['tag', ('kind', 'x'), ('kind', 'y')],
+            text_of=lambda ref: ref[0] if type(ref) == tuple else ref
+        )
+        self.assertEqual(index.search('^kind$'), ('kind', 'x'))
+
+    def test_add(self):
+        index = RefIndex(['abc'])
+        index.add('abd')
+        index.add('abc')
+        self.assertEqual(len(index), 2)
+        self.assertEqual(index.search('^abd'), 'abd')
+        self.assertEqual(index.search('bd$'), 'abd')
+
+    def test_add_out_of_order(self):
+        index = RefIndex()
+        index.add('b')
+        index.add('a')
+        index.add('c')
+        self.assertEqual(index.search('^a'), 'a')
+        self.assertEqual(index.search('^b'), 'b')
+        self.assertEqual(index.search('^c'), 'c')
+
+    def test_matches_linear_scan(self):
+        rand = random.Random(0)
+        refs = list(dict.fromkeys(
+            ''.join(rand.choice('abc-/.') for _ in range(rand.randint(1, 8)))
+            for _ in range(500)
+        ))
+        added_index = RefIndex(refs[:250])
+        for ref in refs[250:]:
+            added_index.add(ref)
+        patterns = [
+            *(
+                ''.join(rand.choice('abc') for _ in range(rand.randint(1, 4)))
+                for _ in range(50)
+            ),
+            '^a', '^abc$', '^ab.*c$', 'a.c', r'a\.b', '^/', '-$', 'c+a',
+            '(ab|ba)c', '[ab]c-', '^$', 'abc|cba'
+        ]
+        among = set(rand.sample(refs, 50))
+
+        for (index_name, index), pattern in product(
+            [('built', RefIndex(refs)), ('added', added_index)],
+            patterns
+        ):
+            with self.subTest(index=index_name, pattern=pattern):
+                regex = re.compile(pattern)
+                self.assertEqual(
+                    index.search(pattern),
+                    next((ref for ref in refs if regex.search(ref)), None)
+                )
+                self.assertEqual(
+                    index.search(pattern, among=among),
+                    next(
+                        (
+                            ref
+                            for ref in refs
+                            if ref in among and regex.search(ref)
+                        ),
+                        None
+                    )
+                )
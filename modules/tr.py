@@ -1,6 +1,3 @@
-import jq
-import yaql
-
 from rich.table import Table
 from rich.tree import Tree
 from rich.console import RenderableType
@@ -18,7 +15,9 @@ class TrModule:
     """
 
     def __init__(self):
-        self.yaql_engine = yaql.factory.YaqlFactory().create()
+        # Created on first use, as importing yaql is slow and most commands
+        # that use tr (eg. to render tables) don't query
+        self.yaql_engine = None
 
     def configure_args(self, *, parser: ArgumentParser, **_):
         # Permit data forwarding
@@ -135,9 +134,13 @@ class TrModule:
     @ModuleAccessor.invokable_as_service
     def query(self, query: str, data: Any, *, lang: str, first=False):
         if lang == 'jq':
+            import jq
             transformer = jq.first if first is True else jq.all
 
         elif lang == 'yaql':
+            if self.yaql_engine is None:
+                import yaql
+                self.yaql_engine = yaql.factory.YaqlFactory().create()
             transformer = lambda qeury_, data_: (
                 self.yaql_engine(qeury_).evaluate(data=data_)
             )